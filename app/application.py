@@ -190,6 +190,14 @@ class Application:
                     self.logger.error(f"Error shutting down DI container: {e}")
                     shutdown_task.cancel()
                     self.logger.info("DI container forcefully terminated after error")
+                
+                # Plugins release loop-bound resources (async engines, shared cache connections) on this loop
+                try:
+                    await asyncio.wait_for(self.di_container.async_shutdown(), timeout=di_container_timeout)
+                except asyncio.TimeoutError:
+                    self.logger.warning("DI container async shutdown timeout")
+                except Exception as e:
+                    self.logger.error(f"Error in DI container async shutdown: {e}")
             
             # STEP 2: Cancel all application background tasks (service.run() tasks)
             if self._background_tasks:
@@ -16,6 +16,9 @@ class DIContainer:
         self._utilities_classes: Dict[str, Type] = {}
         self._services_classes: Dict[str, Type] = {}
         
+        # Plugins whose async_shutdown is awaited on application event loop after shutdown
+        self._async_shutdown_instances: List[Any] = []
+        
         # Register passed utilities as already initialized
         self._utilities['logger'] = logger
         self._utilities['plugins_manager'] = plugins_manager
@@ -418,10 +421,28 @@ class DIContainer:
                 except Exception as e:
                     self.logger.error(f"Error shutting down service {service_name}: {e}")
         
+        # Resources bound to event loop (connection pools, async clients) are released in async_shutdown
+        self._async_shutdown_instances = [
+            instance for instance in [*self._utilities.values(), *self._services.values()]
+            if hasattr(instance, 'async_shutdown')
+        ]
+        
         # Clear caches
         self._utilities.clear()
         self._services.clear()
         self._utilities_classes.clear()
         self._services_classes.clear()
         
-        self.logger.info("DI container terminated") 
\ No newline at end of file
+        self.logger.info("DI container terminated") 
+    
+    async def async_shutdown(self):
+        """
+        Second shutdown step, runs on application event loop after shutdown (which runs in worker thread)
+        Plugins close resources created on this loop (async engines, shared cache connections)
+        """
+        instances, self._async_shutdown_instances = self._async_shutdown_instances, []
+        for instance in instances:
+            try:
+                await instance.async_shutdown()
+            except Exception as e:
+                self.logger.error(f"Error in async shutdown of {type(instance).__name__}: {e}")
@@ -1,5 +1,7 @@
 from typing import Any, Dict
 
+from .modules.telegram_stream import TelegramStreamWriter
+
 
 class AIService:
     def __init__(self, **kwargs):
@@ -10,6 +12,10 @@ class AIService:
         # Get settings
         self.settings = self.settings_manager.get_plugin_settings('ai_service')
         self.allow_default_api_key = self.settings.get('allow_default_api_key', False)
+        self.stream_edit_interval = self.settings.get('stream_edit_interval', 1.0)
+        
+        # RateLimiter limits of telegram_api (streaming edits are throttled to them)
+        self.telegram_api_settings = self.settings_manager.get_plugin_settings('telegram_api') or {}
         
         # Register ourselves in ActionHub
         self.action_hub = kwargs['action_hub']
@@ -47,26 +53,41 @@ class AIService:
         
         return {"api_key": api_key}
     
+    def _get_completion_params(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Completion parameters from action data (common for completion and completion_stream)"""
+        return {
+            "prompt": data.get("prompt", ""),
+            "system_prompt": data.get("system_prompt", ""),
+            "context": data.get("context", ""),  # Custom context (added to final user message)
+            "model": data.get("model"),
+            "max_tokens": data.get("max_tokens"),
+            "temperature": data.get("temperature"),
+            "json_mode": data.get("json_mode"),
+            "json_schema": data.get("json_schema"),
+            "tools": data.get("tools"),
+            "tool_choice": data.get("tool_choice"),
+            "rag_chunks": data.get("rag_chunks"),  # Array of chunks from RAG search
+            "chunk_format": data.get("chunk_format")  # Chunk display format
+        }
+    
+    def _get_stream_edit_interval(self, chat_id: int) -> float:
+        """
+        Interval between message edits while streaming
+        For groups/channels telegram_api RateLimiter limits requests per chat: edits are not more frequent than its refill rate
+        """
+        interval = self.stream_edit_interval
+        if chat_id < 0:
+            chat_tokens_per_minute = self.telegram_api_settings.get('chat_tokens_per_minute', 20)
+            if chat_tokens_per_minute:
+                interval = max(interval, 60.0 / chat_tokens_per_minute)
+        return interval
+    
     async def completion(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         AI completion through AI
         """
         try:
             # Validation is done centrally in ActionRegistry
-            # Extract parameters from data
-            prompt = data.get("prompt", "")
-            system_prompt = data.get("system_prompt", "")
-            context = data.get("context", "")  # Custom context (added to final user message)
-            model = data.get("model")
-            max_tokens = data.get("max_tokens")
-            temperature = data.get("temperature")
-            json_mode = data.get("json_mode")
-            json_schema = data.get("json_schema")
-            tools = data.get("tools")
-            tool_choice = data.get("tool_choice")
-            rag_chunks = data.get("rag_chunks")  # Array of chunks from RAG search
-            chunk_format = data.get("chunk_format")  # Chunk display format
-            
             # Get and validate token
             api_key_result = self._get_api_key(data)
             if api_key_result.get("result") == "error":
@@ -75,19 +96,10 @@ class AIService:
             
             # Call utility for AI completion with token
             ai_response = await self.ai_client.completion(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                context=context,
-                model=model,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                json_mode=json_mode,
-                json_schema=json_schema,
-                tools=tools,
-                tool_choice=tool_choice,
                 api_key=api_key,  # Pass token
-                rag_chunks=rag_chunks,  # Pass chunks for RAG
-                chunk_format=chunk_format  # Pass chunk format
+                cache_ttl=data.get("cache_ttl"),  # Response cache for this step (opt-in)
+                cache_force=data.get("cache_force", False),
+                **self._get_completion_params(data)
             )
             
             # Return utility response as is (already in standard format)
@@ -103,6 +115,78 @@ class AIService:
                 }
             }
     
+    async def completion_stream(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        AI completion with progressive delivery to Telegram: response is shown in chat while it is generated
+        (one message is sent and then edited), result is same as completion plus delivery data
+        """
+        try:
+            bot_id = data.get("bot_id")
+            chat_id = data.get("target_chat_id") or data.get("chat_id")
+            if not bot_id or not chat_id:
+                return {
+                    "result": "error",
+                    "error": {
+                        "code": "VALIDATION_ERROR",
+                        "message": "bot_id and chat (target_chat_id or chat_id from event) are required for streaming"
+                    }
+                }
+            
+            # Get and validate token
+            api_key_result = self._get_api_key(data)
+            if api_key_result.get("result") == "error":
+                return api_key_result
+            api_key = api_key_result["api_key"]
+            
+            # Reply: true - to current message of event, integer - to message with this ID
+            message_reply = data.get("message_reply")
+            reply_to_message_id = data.get("message_id") if message_reply is True else message_reply or None
+            
+            writer = TelegramStreamWriter(
+                self.action_hub,
+                self.logger,
+                bot_id,
+                chat_id,
+                edit_interval=self._get_stream_edit_interval(chat_id),
+                parse_mode=data.get("parse_mode"),
+                reply_to_message_id=reply_to_message_id
+            )
+            
+            ai_response = await self.ai_client.completion_stream(
+                on_text=writer.update,
+                api_key=api_key,
+                **self._get_completion_params(data)
+            )
+            
+            # Final text (on error - text received before it stays in chat)
+            final_text = None
+            if ai_response.get("result") == "success":
+                final_text = ai_response["response_data"]["response_completion"]
+            delivery = await writer.finish(final_text)
+            
+            if ai_response.get("result") == "success":
+                ai_response["response_data"]["last_message_id"] = delivery["last_message_id"]
+                ai_response["response_data"]["time_to_first_visible_ms"] = delivery["time_to_first_visible_ms"]
+                ai_response["response_data"]["delivered"] = delivery["delivered"]
+                if not delivery["delivered"]:
+                    self.logger.warning(f"Final streamed completion text was not delivered to chat {chat_id}")
+                self.logger.info(
+                    f"Streamed completion to chat {chat_id}: first token {ai_response['response_data'].get('time_to_first_token_ms')} ms, "
+                    f"first visible {delivery['time_to_first_visible_ms']} ms, {delivery['telegram_requests']} Telegram requests"
+                )
+            
+            return ai_response
+            
+        except Exception as e:
+            self.logger.error(f"Error in AI Service (completion_stream): {e}")
+            return {
+                "result": "error",
+                "error": {
+                    "code": "INTERNAL_ERROR",
+                    "message": f"Internal service error: {str(e)}"
+                }
+            }
+    
     async def embedding(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate embedding for text through AI
@@ -141,3 +225,35 @@ class AIService:
                 }
             }
     
+    
+    async def embedding_batch(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate embeddings for list of texts through AI (vectors in order of texts)
+        """
+        try:
+            texts = data.get("texts") or []
+            model = data.get("model")
+            dimensions = data.get("dimensions")
+            
+            # Get and validate token
+            api_key_result = self._get_api_key(data)
+            if api_key_result.get("result") == "error":
+                return api_key_result
+            api_key = api_key_result["api_key"]
+            
+            return await self.ai_client.embedding_batch(
+                texts=texts,
+                model=model,
+                dimensions=dimensions,
+                api_key=api_key
+            )
+            
+        except Exception as e:
+            self.logger.error(f"Error in AI Service (embedding_batch): {e}")
+            return {
+                "result": "error",
+                "error": {
+                    "code": "INTERNAL_ERROR",
+                    "message": f"Internal service error: {str(e)}"
+                }
+            }
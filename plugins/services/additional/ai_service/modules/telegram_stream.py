@@ -0,0 +1,150 @@
+"""
+Progressive delivery of streamed completion to Telegram: first text is sent as new message, then this message is edited
+Only one send_message request is in flight and edits are at least edit_interval apart: text received meanwhile
+is collapsed into next edit, so stream does not queue request per token in telegram_api RateLimiter
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+# Telegram message text limit is 4096: reserve for markup conversion (MarkdownV2 escaping)
+STREAM_TEXT_LIMIT = 3800
+
+# Attempts to deliver final text in finish (edit_interval apart): nothing else will edit message after it
+FINAL_DELIVERY_ATTEMPTS = 3
+
+
+class TelegramStreamWriter:
+    """
+    Streaming callback (update) and final delivery (finish) for one chat
+    Text over text_limit continues in new message (split at last line break / space of message)
+    """
+
+    def __init__(self, action_hub, logger, bot_id: int, chat_id: int, edit_interval: float = 1.0,
+                 parse_mode: Optional[str] = None, reply_to_message_id: Optional[int] = None,
+                 text_limit: int = STREAM_TEXT_LIMIT):
+        self.action_hub = action_hub
+        self.logger = logger
+        self.bot_id = bot_id
+        self.chat_id = chat_id
+        self.edit_interval = edit_interval
+        self.parse_mode = parse_mode
+        self.reply_to_message_id = reply_to_message_id
+        self.text_limit = max(1, text_limit)
+
+        self._text = ""
+        # Start of current message in full text
+        self._offset = 0
+        self._message_id: Optional[int] = None
+        self._shown_text: Optional[str] = None
+        self._message_ids: List[int] = []
+        self._task: Optional[asyncio.Task] = None
+        self._last_publish: Optional[float] = None
+
+        self._started = time.monotonic()
+        self._first_visible_ms: Optional[float] = None
+        self._requests = 0
+        self._failed = 0
+
+    async def update(self, text: str) -> None:
+        """Full text received so far: publishing starts in background if no request in flight and interval passed"""
+        self._text = text
+        if self._task is not None and not self._task.done():
+            return
+        if self._last_publish is not None and time.monotonic() - self._last_publish < self.edit_interval:
+            return
+        self._task = asyncio.create_task(self._publish())
+
+    async def finish(self, text: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Waits for request in flight and publishes final text (last received if not passed), returns delivery stats
+        Failed final delivery is retried up to FINAL_DELIVERY_ATTEMPTS times, delivered is False if it still failed
+        """
+        if text is not None:
+            self._text = text
+        if self._task is not None:
+            await self._task
+        await self._publish()
+        for _ in range(FINAL_DELIVERY_ATTEMPTS - 1):
+            if self._delivered():
+                break
+            await asyncio.sleep(self.edit_interval)
+            await self._publish()
+        return {
+            "delivered": self._delivered(),
+            "last_message_id": self._message_ids[-1] if self._message_ids else None,
+            "message_ids": list(self._message_ids),
+            "time_to_first_visible_ms": self._first_visible_ms,
+            "telegram_requests": self._requests,
+            "telegram_errors": self._failed
+        }
+
+    async def _publish(self) -> None:
+        try:
+            # Completed messages: text over limit is closed at split position, rest goes to new message
+            while len(self._text) - self._offset > self.text_limit:
+                split = self._split_position()
+                # Message is closed only when its last part is shown, otherwise it is retried by next publish
+                if not await self._show(self._text[self._offset:split]):
+                    return
+                self._offset = split
+                self._message_id = None
+                self._shown_text = None
+            await self._show(self._text[self._offset:])
+        except Exception as e:
+            self.logger.warning(f"Error delivering streamed completion to chat {self.chat_id}: {e}")
+        finally:
+            self._last_publish = time.monotonic()
+
+    def _delivered(self) -> bool:
+        """Whole received text is shown in chat"""
+        rest = self._text[self._offset:]
+        return not rest.strip() or rest.rstrip() == self._shown_text
+
+    def _split_position(self) -> int:
+        end = self._offset + self.text_limit
+        position = max(self._text.rfind("\n", self._offset, end), self._text.rfind(" ", self._offset, end))
+        # No separator in second half of message - hard split
+        if position <= self._offset + self.text_limit // 2:
+            return end
+        return position + 1
+
+    async def _show(self, text: str) -> bool:
+        """
+        Send current message or edit it (unchanged text is not sent: Telegram rejects such edit,
+        trailing whitespace is trimmed by Telegram and does not change message)
+        Failed edit is not replaced by new message: text is delivered by next edit of same message
+        Returns False if text was not delivered
+        """
+        if not text.strip() or text.rstrip() == self._shown_text:
+            return True
+
+        data = {
+            'bot_id': self.bot_id,
+            'target_chat_id': self.chat_id,
+            'text': text,
+            'message_edit': self._message_id or False
+        }
+        if self._message_id is not None:
+            data['message_edit_only'] = True
+        if self.parse_mode:
+            data['parse_mode'] = self.parse_mode
+        if self._message_id is None and not self._message_ids and self.reply_to_message_id:
+            data['message_reply'] = self.reply_to_message_id
+
+        self._requests += 1
+        result = await self.action_hub.execute_action('send_message', data)
+        if result.get('result') != 'success':
+            self._failed += 1
+            self.logger.warning(f"Failed to deliver streamed text to chat {self.chat_id}: {result.get('error')}")
+            return False
+
+        if self._message_id is None:
+            self._message_id = (result.get('response_data') or {}).get('last_message_id')
+            if self._message_id is not None:
+                self._message_ids.append(self._message_id)
+        self._shown_text = text.rstrip()
+        if self._first_visible_ms is None:
+            self._first_visible_ms = round((time.monotonic() - self._started) * 1000, 1)
+        return True
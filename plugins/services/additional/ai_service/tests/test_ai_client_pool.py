@@ -0,0 +1,108 @@
+"""
+Tests for pool of AI API clients for tenant tokens: LRU by token hash, closing evicted clients, connection reuse stats
+"""
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp import web
+
+from plugins.utilities.ai.ai_client.ai_client import AIClient
+from plugins.utilities.ai.ai_client.modules.client_pool import AIClientPool
+
+BASE_URL = "http://127.0.0.1:1/v1"
+
+
+@pytest.fixture
+async def provider():
+    """Local embeddings endpoint (plain HTTP): base_url of running server"""
+    async def embeddings(request):
+        body = await request.json()
+        return web.json_response({
+            "object": "list",
+            "model": body["model"],
+            "data": [{"object": "embedding", "index": i, "embedding": [0.5]} for i, _ in enumerate(body["input"])],
+            "usage": {"prompt_tokens": 1, "total_tokens": 1},
+        })
+
+    app = web.Application()
+    app.router.add_post("/v1/embeddings", embeddings)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/v1"
+    await runner.cleanup()
+
+
+def create_ai_client(base_url, **overrides):
+    settings = {"api_key": "default_key", "base_url": base_url, "embedding_batch_window_ms": 0,
+                "embedding_cache_enabled": False, **overrides}
+    settings_manager = MagicMock()
+    settings_manager.get_plugin_settings.return_value = settings
+    return AIClient(logger=MagicMock(), settings_manager=settings_manager, data_converter=MagicMock())
+
+
+@pytest.mark.asyncio
+class TestPool:
+
+    async def test_lru_by_token(self):
+        pool = AIClientPool(MagicMock(), BASE_URL, max_clients=2)
+
+        first = pool.get("token-a")
+        second = pool.get("token-b")
+        assert pool.get("token-a") is first
+        pool.get("token-c")
+        await asyncio.sleep(0)
+
+        # token-b was least recently used
+        assert pool.get("token-a") is first
+        assert second.is_closed() and not first.is_closed()
+        assert pool.get("token-b") is not second
+        stats = pool.get_stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"], stats["clients"]) == (2, 4, 2, 2)
+        await pool.close()
+        assert first.is_closed()
+
+    async def test_busy_client_closed_after_request(self):
+        pool = AIClientPool(MagicMock(), BASE_URL, max_clients=1)
+        busy = pool.get("token-a")
+
+        async with pool.use(busy):
+            pool.get("token-b")
+            await asyncio.sleep(0)
+            assert not busy.is_closed()
+            assert pool.get_stats()["clients"] == 2
+        await asyncio.sleep(0)
+
+        assert busy.is_closed()
+        assert pool.get_stats()["clients"] == 1
+        await pool.close()
+
+
+@pytest.mark.asyncio
+class TestAIClient:
+
+    async def test_token_client_reused(self):
+        client = create_ai_client(BASE_URL)
+
+        pooled = client._get_client("tenant-token")
+
+        assert client._get_client("tenant-token") is pooled
+        assert client._get_client("default_key") is client.client
+        assert client._get_client(None) is client.client
+        assert client.get_client_pool_stats()["hits"] == 1
+        await client._close_clients()
+
+    async def test_connection_reused_between_requests(self, provider):
+        client = create_ai_client(provider)
+
+        for _ in range(3):
+            result = await client.embedding("text", api_key="tenant-token")
+            assert result["result"] == "success"
+
+        stats = client.get_client_pool_stats()
+        assert (stats["requests"], stats["connections_opened"], stats["misses"], stats["hits"]) == (3, 1, 1, 2)
+        assert stats["connection_reuse_ratio"] == pytest.approx(2 / 3, abs=1e-4)
+        await client._close_clients()
@@ -0,0 +1,95 @@
+"""
+Tests for completion response cache: opt-in by cache_ttl, key by final request parameters, temperature rule, TTL, hit ratio
+"""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from plugins.utilities.ai.ai_client.ai_client import AIClient
+from plugins.utilities.ai.ai_client.modules import completion_cache
+
+
+def create_ai_client(**overrides):
+    settings = {"api_key": "default_key", "default_model": "test-model", "embedding_cache_enabled": False, **overrides}
+    settings_manager = MagicMock()
+    settings_manager.get_plugin_settings.return_value = settings
+    client = AIClient(logger=MagicMock(), settings_manager=settings_manager, data_converter=MagicMock())
+
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="greeting", tool_calls=None))],
+        usage=SimpleNamespace(prompt_tokens=12, completion_tokens=1, total_tokens=13)
+    )
+    client.client.chat.completions.create = AsyncMock(return_value=response)
+    return client
+
+
+@pytest.mark.asyncio
+class TestCompletionCache:
+
+    async def test_deterministic_request_cached(self):
+        client = create_ai_client()
+
+        first = await client.completion("classify: hello", temperature=0, cache_ttl=60)
+        first["response_data"]["response_completion"] = "changed by caller"
+        second = await client.completion("classify: hello", temperature=0, cache_ttl=60)
+
+        assert client.client.chat.completions.create.await_count == 1
+        assert client.client.chat.completions.create.call_args.kwargs["temperature"] == 0
+        assert second["response_data"]["response_completion"] == "greeting"
+        assert second["response_data"]["cached"] is True and second["response_data"]["total_tokens"] == 0
+        assert "cached" not in first["response_data"] and first["response_data"]["total_tokens"] == 13
+        assert client.get_completion_cache_stats() == {
+            "lookups": 2, "hits": 1, "misses": 1, "hit_ratio": 0.5, "expired": 0, "bypassed": 0, "entries": 1
+        }
+
+    async def test_key_includes_built_messages(self):
+        client = create_ai_client()
+        chunks = [{"content": "Opening hours 9-18", "document_type": "knowledge", "similarity": 0.9}]
+
+        await client.completion("when open?", temperature=0, cache_ttl=60, rag_chunks=chunks)
+        await client.completion("when open?", temperature=0, cache_ttl=60, rag_chunks=[{**chunks[0], "content": "Closed"}])
+        await client.completion("when open?", temperature=0, cache_ttl=60, rag_chunks=chunks, json_mode="json_object")
+        await client.completion("when open?", temperature=0, cache_ttl=60, rag_chunks=chunks)
+
+        assert client.client.chat.completions.create.await_count == 3
+
+    async def test_sampled_request_needs_force(self):
+        client = create_ai_client()
+
+        # Default temperature from settings (0.7)
+        for _ in range(2):
+            await client.completion("tell a joke", cache_ttl=60)
+        assert client.client.chat.completions.create.await_count == 2
+        assert client.get_completion_cache_stats()["bypassed"] == 2
+
+        for _ in range(2):
+            await client.completion("tell a joke", cache_ttl=60, cache_force=True)
+        assert client.client.chat.completions.create.await_count == 3
+
+    async def test_opt_in_and_disabled(self):
+        client = create_ai_client()
+        for _ in range(2):
+            await client.completion("hello", temperature=0)
+        assert client.client.chat.completions.create.await_count == 2
+        assert client.get_completion_cache_stats()["lookups"] == 0
+
+        disabled = create_ai_client(completion_cache_max_entries=0)
+        for _ in range(2):
+            await disabled.completion("hello", temperature=0, cache_ttl=60)
+        assert disabled.client.chat.completions.create.await_count == 2
+        assert disabled.get_completion_cache_stats() is None
+
+    async def test_ttl(self, monkeypatch):
+        client = create_ai_client()
+        now = [1000.0]
+        monkeypatch.setattr(completion_cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+
+        await client.completion("hello", temperature=0, cache_ttl=30)
+        now[0] += 29
+        assert (await client.completion("hello", temperature=0, cache_ttl=30))["response_data"].get("cached")
+        now[0] += 2
+        assert "cached" not in (await client.completion("hello", temperature=0, cache_ttl=30))["response_data"]
+
+        assert client.client.chat.completions.create.await_count == 2
+        assert client.get_completion_cache_stats()["expired"] == 1
@@ -0,0 +1,236 @@
+"""
+Tests for streaming completion: stream parsing in AIClient, throttled send/edit delivery to Telegram, completion_stream action
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import web
+
+from plugins.services.additional.ai_service.ai_service import AIService
+from plugins.services.additional.ai_service.modules.telegram_stream import TelegramStreamWriter
+from plugins.utilities.ai.ai_client.ai_client import AIClient
+
+STREAM_CHUNKS = [
+    {"choices": [{"index": 0, "delta": {"role": "assistant", "content": "Hel"}}]},
+    {"choices": [{"index": 0, "delta": {"content": "lo"}}]},
+    {"choices": [{"index": 0, "delta": {"tool_calls": [
+        {"index": 0, "id": "call_1", "type": "function", "function": {"name": "search", "arguments": "{\"q\":"}}
+    ]}}]},
+    {"choices": [{"index": 0, "delta": {"tool_calls": [{"index": 0, "function": {"arguments": " \"x\"}"}}]}}]},
+    {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]},
+    {"choices": [], "usage": {"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10}},
+]
+
+
+@pytest.fixture
+async def provider():
+    """Local chat completions endpoint answering with server-sent events; yields (base_url, received request bodies)"""
+    requests = []
+
+    async def completions(request):
+        requests.append(await request.json())
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for chunk in STREAM_CHUNKS:
+            chunk = {"id": "c1", "object": "chat.completion.chunk", "created": 0, "model": "test-model", **chunk}
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/v1", requests
+    await runner.cleanup()
+
+
+def create_action_hub(message_ids=(100,)):
+    """action_hub whose send_message returns message IDs in order (last one repeats)"""
+    ids = list(message_ids)
+    calls = []
+
+    async def execute_action(action_name, data):
+        calls.append(dict(data))
+        message_id = data["message_edit"] or (ids.pop(0) if len(ids) > 1 else ids[0])
+        return {"result": "success", "response_data": {"last_message_id": message_id}}
+
+    action_hub = MagicMock()
+    action_hub.execute_action = AsyncMock(side_effect=execute_action)
+    return action_hub, calls
+
+
+@pytest.mark.asyncio
+async def test_client_stream(provider):
+    base_url, requests = provider
+    settings_manager = MagicMock()
+    settings_manager.get_plugin_settings.return_value = {"api_key": "key", "base_url": base_url, "default_model": "test-model"}
+    client = AIClient(logger=MagicMock(), settings_manager=settings_manager, data_converter=MagicMock())
+    received = []
+
+    async def on_text(text):
+        received.append(text)
+
+    result = await client.completion_stream("question", on_text=on_text)
+
+    assert result["result"] == "success"
+    data = result["response_data"]
+    assert received == ["Hel", "Hello"]
+    assert data["response_completion"] == "Hello"
+    assert (data["prompt_tokens"], data["completion_tokens"], data["total_tokens"]) == (7, 3, 10)
+    assert data["tool_calls"] == [{"id": "call_1", "type": "function", "function": {"name": "search", "arguments": "{\"q\": \"x\"}"}}]
+    assert data["time_to_first_token_ms"] >= 0
+    assert requests[0]["stream"] is True and requests[0]["stream_options"] == {"include_usage": True}
+    assert requests[0]["messages"][-1] == {"role": "user", "content": "question"}
+    await client._close_clients()
+
+
+@pytest.mark.asyncio
+class TestWriter:
+
+    async def test_throttled_edits(self):
+        action_hub, calls = create_action_hub()
+        writer = TelegramStreamWriter(action_hub, MagicMock(), bot_id=1, chat_id=5, edit_interval=60, reply_to_message_id=9)
+
+        text = ""
+        for word in ["a", "b", "c", "d"]:
+            text += word
+            await writer.update(text)
+            await asyncio.sleep(0)
+        stats = await writer.finish("abcd!")
+
+        # First text is sent at once, updates within interval are collapsed into final edit
+        assert [(call["text"], call["message_edit"]) for call in calls] == [("a", False), ("abcd!", 100)]
+        assert calls[0]["message_reply"] == 9 and "message_reply" not in calls[1]
+        assert stats["last_message_id"] == 100 and stats["telegram_requests"] == 2
+        assert stats["time_to_first_visible_ms"] is not None
+
+    async def test_one_request_in_flight(self):
+        action_hub, calls = create_action_hub()
+        release = asyncio.Event()
+        send = action_hub.execute_action.side_effect
+
+        async def slow_send(action_name, data):
+            await release.wait()
+            return await send(action_name, data)
+
+        action_hub.execute_action.side_effect = slow_send
+        writer = TelegramStreamWriter(action_hub, MagicMock(), bot_id=1, chat_id=5, edit_interval=0)
+
+        await writer.update("a")
+        await asyncio.sleep(0)
+        await writer.update("ab")
+        await writer.update("abc")
+        release.set()
+        await writer.finish()
+
+        assert [call["text"] for call in calls] == ["a", "abc"]
+
+    async def test_long_text_continues_in_new_message(self):
+        action_hub, calls = create_action_hub(message_ids=(100, 101))
+        writer = TelegramStreamWriter(action_hub, MagicMock(), bot_id=1, chat_id=5, text_limit=12)
+
+        await writer.update("alpha beta")
+        await asyncio.sleep(0)
+        stats = await writer.finish("alpha beta gamma delta")
+
+        # Message is closed at last space within limit, rest goes to new message
+        # (closing part differs only by trailing space - Telegram would reject such edit as unchanged)
+        assert [(call["text"], call["message_edit"]) for call in calls] == [("alpha beta", False), ("gamma delta", False)]
+        assert stats["message_ids"] == [100, 101] and stats["last_message_id"] == 101
+
+    async def test_failed_edit_not_replaced_by_new_message(self):
+        action_hub, calls = create_action_hub()
+        send = action_hub.execute_action.side_effect
+        failures = [True]
+
+        async def failing_edit(action_name, data):
+            if data["message_edit"] and failures:
+                failures.pop()
+                calls.append(dict(data))
+                return {"result": "error", "error": {"code": "API_ERROR", "message": "Too Many Requests"}}
+            return await send(action_name, data)
+
+        action_hub.execute_action.side_effect = failing_edit
+        writer = TelegramStreamWriter(action_hub, MagicMock(), bot_id=1, chat_id=5, edit_interval=0)
+
+        await writer.update("a")
+        await asyncio.sleep(0)
+        await writer.update("ab")
+        await asyncio.sleep(0)
+        stats = await writer.finish("abc")
+
+        # Failed edit is retried on same message with later text, no second message is sent
+        assert [(call["text"], call["message_edit"], call.get("message_edit_only")) for call in calls] == [
+            ("a", False, None), ("ab", 100, True), ("abc", 100, True)
+        ]
+        assert stats["message_ids"] == [100] and stats["telegram_errors"] == 1
+
+    @pytest.mark.parametrize("failures, delivered", [(1, True), (3, False)])
+    async def test_final_edit_retried(self, failures, delivered):
+        action_hub, calls = create_action_hub()
+        send = action_hub.execute_action.side_effect
+        failed = []
+
+        async def failing_final_edit(action_name, data):
+            if data["text"] == "abc" and len(failed) < failures:
+                failed.append(data["text"])
+                calls.append(dict(data))
+                return {"result": "error", "error": {"code": "API_ERROR", "message": "Too Many Requests"}}
+            return await send(action_name, data)
+
+        action_hub.execute_action.side_effect = failing_final_edit
+        writer = TelegramStreamWriter(action_hub, MagicMock(), bot_id=1, chat_id=5, edit_interval=0)
+
+        await writer.update("a")
+        await asyncio.sleep(0)
+        stats = await writer.finish("abc")
+
+        # Final text is retried on same message at most 3 times, failure is reported instead of success
+        edits = [call["message_edit"] for call in calls if call["text"] == "abc"]
+        assert edits == [100] * min(failures + 1, 3)
+        assert stats["delivered"] is delivered and stats["message_ids"] == [100]
+
+
+@pytest.mark.asyncio
+async def test_completion_stream_action():
+    action_hub, calls = create_action_hub()
+    settings = {"ai_service": {"allow_default_api_key": False}, "telegram_api": {"chat_tokens_per_minute": 20}}
+    settings_manager = MagicMock()
+    settings_manager.get_plugin_settings.side_effect = lambda name: settings[name]
+    ai_client = MagicMock()
+
+    async def completion_stream(on_text, **kwargs):
+        for text in ["Hi", "Hi there"]:
+            await on_text(text)
+            # Next delta arrives from network
+            await asyncio.sleep(0)
+        return {"result": "success", "response_data": {"response_completion": "Hi there", "total_tokens": 5,
+                                                       "time_to_first_token_ms": 1.0}}
+
+    ai_client.completion_stream = AsyncMock(side_effect=completion_stream)
+    service = AIService(logger=MagicMock(), ai_client=ai_client, settings_manager=settings_manager, action_hub=action_hub)
+
+    result = await service.completion_stream({
+        "prompt": "hello", "bot_id": 1, "chat_id": -50, "message_id": 7, "message_reply": True,
+        "parse_mode": "MarkdownV2", "_config": {"ai_token": "tenant-token"}
+    })
+
+    assert result["result"] == "success"
+    data = result["response_data"]
+    assert data["last_message_id"] == 100 and data["time_to_first_visible_ms"] is not None and data["delivered"] is True
+    assert data["response_completion"] == "Hi there" and data["total_tokens"] == 5
+    assert ai_client.completion_stream.call_args.kwargs["api_key"] == "tenant-token"
+    assert ai_client.completion_stream.call_args.kwargs["prompt"] == "hello"
+    assert [call["text"] for call in calls] == ["Hi", "Hi there"]
+    assert calls[0]["message_reply"] == 7 and calls[0]["target_chat_id"] == -50
+    assert calls[1]["parse_mode"] == "MarkdownV2"
+    # Group chat: edits are not more frequent than chat refill rate of RateLimiter
+    assert service._get_stream_edit_interval(-50) == 3.0 and service._get_stream_edit_interval(50) == 1.0
+
+    assert (await service.completion_stream({"prompt": "hello", "_config": {"ai_token": "t"}}))["error"]["code"] == "VALIDATION_ERROR"
@@ -0,0 +1,175 @@
+"""
+Tests for batch embeddings in ai_client: embedding_batch, streaming by batches and micro-batching of single calls
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from plugins.services.additional.ai_service.ai_service import AIService
+from plugins.utilities.ai.ai_client.ai_client import AIClient
+
+
+def make_response(texts, reverse=False):
+    """Embeddings API response: vector [len(text)] for each input, optionally in reversed order"""
+    data = [SimpleNamespace(index=i, embedding=[float(len(text))]) for i, text in enumerate(texts)]
+    if reverse:
+        data.reverse()
+    return SimpleNamespace(data=data, usage=SimpleNamespace(total_tokens=10 * len(texts)))
+
+
+@pytest.fixture
+def create_ai_client():
+    """Factory for AIClient with fake provider; keyword arguments override settings"""
+    def _create(**overrides):
+        settings = {
+            "api_key": "default_key",
+            "default_embedding_model": "text-embedding-3-small",
+            "default_embedding_dimensions": 1024,
+            "embedding_batch_window_ms": 20,
+        }
+        settings.update(overrides)
+        settings_manager = MagicMock()
+        settings_manager.get_plugin_settings.return_value = settings
+
+        client = AIClient(logger=MagicMock(), settings_manager=settings_manager, data_converter=MagicMock())
+        create = AsyncMock(side_effect=lambda **params: make_response(params["input"], reverse=True))
+        client.client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+        # Temporary clients for other tokens use same fake provider
+        client._get_client = lambda api_key=None: client.client
+        return client, create
+
+    return _create
+
+
+@pytest.mark.asyncio
+class TestEmbeddingBatch:
+    """List of texts in, list of vectors out"""
+
+    async def test_order_and_batch_size(self, create_ai_client):
+        client, create = create_ai_client(embedding_max_batch_size=2)
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+        result = await client.embedding_batch(texts)
+
+        assert result["result"] == "success"
+        assert result["response_data"]["embeddings"] == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        assert result["response_data"]["total_tokens"] == 50
+        assert [call.kwargs["input"] for call in create.call_args_list] == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+        assert create.call_args.kwargs["dimensions"] == 1024
+
+    async def test_token_budget(self, create_ai_client):
+        """Batch is closed before text that exceeds budget, long text goes alone"""
+        client, create = create_ai_client(embedding_max_batch_tokens=30)
+        texts = ["x" * 40, "y" * 40, "z" * 200, "w"]
+
+        await client.embedding_batch(texts)
+
+        assert [len(call.kwargs["input"]) for call in create.call_args_list] == [2, 1, 1]
+
+    async def test_iter_batches_offsets(self, create_ai_client):
+        client, _ = create_ai_client(embedding_max_batch_size=2)
+
+        batches = [item async for item in client.iter_embedding_batches(["a", "b", "c"])]
+
+        assert [(offset, len(vectors)) for offset, vectors, _ in batches] == [(0, 2), (2, 1)]
+
+    async def test_provider_error(self, create_ai_client):
+        client, create = create_ai_client()
+        create.side_effect = RuntimeError("rate limit")
+
+        result = await client.embedding_batch(["a"])
+
+        assert result["result"] == "error"
+        assert result["error"]["code"] == "API_ERROR"
+
+
+@pytest.mark.asyncio
+class TestMicroBatching:
+    """Concurrent single-text calls are merged into one provider call"""
+
+    async def test_concurrent_calls_merged(self, create_ai_client):
+        client, create = create_ai_client()
+
+        results = await asyncio.gather(*(client.embedding(text) for text in ["a", "bb", "ccc"]))
+
+        assert create.call_count == 1
+        assert [r["response_data"]["embedding"] for r in results] == [[1.0], [2.0], [3.0]]
+        assert sum(r["response_data"]["total_tokens"] for r in results) == 30
+        assert client.get_embedding_stats()["batching"]["avg_batch_size"] == 3.0
+
+    async def test_different_keys_not_merged(self, create_ai_client):
+        """Model and token are part of batch key"""
+        client, create = create_ai_client()
+
+        await asyncio.gather(
+            client.embedding("a"),
+            client.embedding("b", api_key="tenant_key"),
+            client.embedding("c", model="other-model"),
+        )
+
+        assert create.call_count == 3
+        assert "dimensions" not in [call.kwargs for call in create.call_args_list if call.kwargs["model"] == "other-model"][0]
+
+    async def test_max_batch_size_flushes_without_window(self, create_ai_client):
+        client, create = create_ai_client(embedding_batch_window_ms=10000, embedding_max_batch_size=2)
+
+        results = await asyncio.wait_for(asyncio.gather(*(client.embedding(t) for t in "abcd")), timeout=1)
+
+        assert create.call_count == 2
+        assert all(r["result"] == "success" for r in results)
+
+    async def test_error_reaches_all_callers(self, create_ai_client):
+        client, create = create_ai_client()
+        create.side_effect = RuntimeError("timeout")
+
+        results = await asyncio.gather(client.embedding("a"), client.embedding("b"))
+
+        assert [r["result"] for r in results] == ["error", "error"]
+        assert create.call_count == 1
+
+    async def test_input_error_isolated(self, create_ai_client):
+        """Batch rejected for one text is resent in halves: other callers get their vectors"""
+        client, create = create_ai_client()
+
+        class InputError(Exception):
+            status_code = 400
+
+        def provider(**params):
+            if "bad" in params["input"]:
+                raise InputError("input too long")
+            return make_response(params["input"])
+
+        create.side_effect = provider
+
+        results = await asyncio.gather(*(client.embedding(text) for text in ["a", "bad", "ccc", "dddd"]))
+
+        assert [r["result"] for r in results] == ["success", "error", "success", "success"]
+        assert [r["response_data"]["embedding"] for r in results if r["result"] == "success"] == [[1.0], [3.0], [4.0]]
+        # [a, bad, ccc, dddd] -> [a, bad] fails, [ccc, dddd] ok -> [a] ok, [bad] fails
+        assert create.call_count == 5
+        assert client.get_embedding_stats()["batching"]["split_retries"] == 2
+
+    async def test_disabled(self, create_ai_client):
+        client, create = create_ai_client(embedding_batch_window_ms=0)
+
+        await asyncio.gather(client.embedding("a"), client.embedding("b"))
+
+        assert create.call_count == 2
+        assert client.get_embedding_stats()["batching"] is None
+
+
+@pytest.mark.asyncio
+async def test_service_embedding_batch(logger):
+    """AIService action passes tenant token to ai_client"""
+    ai_client = MagicMock()
+    ai_client.embedding_batch = AsyncMock(return_value={"result": "success", "response_data": {"embeddings": []}})
+    settings_manager = MagicMock()
+    settings_manager.get_plugin_settings.return_value = {}
+    service = AIService(logger=logger, ai_client=ai_client, settings_manager=settings_manager, action_hub=MagicMock())
+
+    result = await service.embedding_batch({"texts": ["a", "b"], "_config": {"ai_token": "tenant_key"}})
+
+    assert result["result"] == "success"
+    ai_client.embedding_batch.assert_awaited_once_with(texts=["a", "b"], model=None, dimensions=None, api_key="tenant_key")
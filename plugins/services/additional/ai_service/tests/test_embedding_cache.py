@@ -0,0 +1,116 @@
+"""
+Tests for embedding cache in ai_client: repeated texts are served without provider calls
+"""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from plugins.utilities.ai.ai_client.ai_client import AIClient
+from plugins.utilities.ai.ai_client.modules.embedding_cache import EmbeddingCache, text_hash
+
+
+def make_response(texts):
+    """Embeddings API response: vector [len(text)] for each input"""
+    data = [SimpleNamespace(index=i, embedding=[float(len(text))]) for i, text in enumerate(texts)]
+    return SimpleNamespace(data=data, usage=SimpleNamespace(total_tokens=10 * len(texts)))
+
+
+@pytest.fixture
+def create_ai_client():
+    """Factory for AIClient with fake provider; keyword arguments override settings"""
+    def _create(**overrides):
+        settings = {
+            "api_key": "default_key",
+            "default_embedding_model": "text-embedding-3-small",
+            "default_embedding_dimensions": 1024,
+            "embedding_batch_window_ms": 0,
+        }
+        settings.update(overrides)
+        settings_manager = MagicMock()
+        settings_manager.get_plugin_settings.return_value = settings
+
+        client = AIClient(logger=MagicMock(), settings_manager=settings_manager, data_converter=MagicMock())
+        create = AsyncMock(side_effect=lambda **params: make_response(params["input"]))
+        client.client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+        client._get_client = lambda api_key=None: client.client
+        return client, create
+
+    return _create
+
+
+def test_text_hash_normalization():
+    assert text_hash("Hello   world\n") == text_hash("Hello world")
+    # NFC: composed and decomposed forms are same text
+    assert text_hash("\u0439") == text_hash("\u0438\u0306")
+    assert text_hash("Hello world") != text_hash("hello world")
+
+
+@pytest.mark.asyncio
+class TestEmbeddingCache:
+    """Provider is called only for texts not seen before"""
+
+    async def test_single_embedding_cached(self, create_ai_client):
+        client, create = create_ai_client()
+
+        first = await client.embedding("abc")
+        second = await client.embedding(" abc ")
+
+        assert create.call_count == 1
+        assert second["response_data"]["embedding"] == first["response_data"]["embedding"]
+        assert second["response_data"]["total_tokens"] == 0
+        assert client.get_embedding_stats()["cache"]["hit_ratio"] == 0.5
+
+    async def test_reingest_costs_no_calls(self, create_ai_client):
+        client, create = create_ai_client()
+        texts = ["a", "bb", "ccc"]
+
+        await client.embedding_batch(texts)
+        result = await client.embedding_batch(texts)
+
+        assert create.call_count == 1
+        assert result["response_data"]["embeddings"] == [[1.0], [2.0], [3.0]]
+        assert result["response_data"]["total_tokens"] == 0
+
+    async def test_only_misses_requested(self, create_ai_client):
+        """Changed document: cached chunks are reused, repeated new text is requested once"""
+        client, create = create_ai_client()
+        await client.embedding_batch(["a", "bb"])
+
+        result = await client.embedding_batch(["a", "dddd", "bb", "dddd"])
+
+        assert create.call_args.kwargs["input"] == ["dddd"]
+        assert result["response_data"]["embeddings"] == [[1.0], [4.0], [2.0], [4.0]]
+
+    async def test_dimensions_in_key(self, create_ai_client):
+        client, create = create_ai_client()
+
+        await client.embedding("a")
+        await client.embedding("a", dimensions=256)
+        # Dimensions are not sent for other models, so they don't split cache
+        await client.embedding("a", model="other-model", dimensions=256)
+        await client.embedding("a", model="other-model")
+
+        assert create.call_count == 3
+
+    async def test_disabled(self, create_ai_client):
+        client, create = create_ai_client(embedding_cache_enabled=False)
+
+        await client.embedding_batch(["a", "a"])
+        await client.embedding_batch(["a"])
+
+        # Repeated text in one batch is still sent once
+        assert [call.kwargs["input"] for call in create.call_args_list] == [["a"], ["a"]]
+        assert client.get_embedding_stats()["cache"] is None
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    cache = EmbeddingCache(MagicMock(), max_entries=2)
+    hashes, _ = await cache.get_many("m", 1, ["a", "b", "c"])
+    await cache.set_many("m", 1, hashes, [[1.0], [2.0], [3.0]])
+
+    _, vectors = await cache.get_many("m", 1, ["a", "b", "c"])
+
+    assert vectors == [None, [2.0], [3.0]]
+    assert cache.get_stats()["entries"] == 2
@@ -3,7 +3,7 @@ Core module for processing events from Telegram polling
 Contains main logic for processing and forwarding events
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 class EventHandler:
@@ -48,6 +48,10 @@ class EventHandler:
         Called from telegram_polling_service via event_callback
         """
         try:
+            # Filter by time relative to polling start (before parsing - stale backlog is dropped cheaply)
+            if await self._should_ignore_event_by_time(raw_event):
+                return
+            
             # Parse event into standard format
             parsed_event = await self.event_parser.parse_event(raw_event)
             
@@ -55,10 +59,6 @@ class EventHandler:
                 # Event was not recognized or parsing error occurred
                 return
             
-            # Filter by time relative to polling start
-            if await self._should_ignore_event_by_time(parsed_event, raw_event):
-                return
-            
             # Process media groups (if any)
             await self.media_group_processor.process_event(
                 parsed_event, 
@@ -82,33 +82,47 @@ class EventHandler:
         except Exception as e:
             self.logger.error(f"Error forwarding processed event to scenario_processor: {e}")
     
-    async def _should_ignore_event_by_time(self, parsed_event: dict, raw_event: dict) -> bool:
+    async def _get_polling_start_timestamp(self, system: dict) -> Optional[float]:
         """
-        Determine whether to ignore event by time
+        Get polling start time as epoch seconds
+        """
+        polling_start_timestamp = system.get('polling_start_timestamp')
+        if polling_start_timestamp:
+            return polling_start_timestamp
+        
+        # Fallback for pollers that pass only local datetime
+        polling_start_time = system.get('polling_start_time')
+        if not polling_start_time:
+            return None
+        
+        return (await self.datetime_formatter.to_utc_tz(polling_start_time)).timestamp()
+    
+    async def _should_ignore_event_by_time(self, raw_event: dict) -> bool:
+        """
+        Determine whether to ignore event by time (works on raw update, before parsing)
         """
         # If time comparison disabled, don't ignore events
         if not self.enable_time_comparison:
             return False
         
         try:
+            system = raw_event.get('system', {})
+            
             # Get polling start time from raw_event system data
-            polling_start_time = raw_event.get('system', {}).get('polling_start_time')
-            if not polling_start_time:
+            polling_start_timestamp = await self._get_polling_start_timestamp(system)
+            if not polling_start_timestamp:
                 # If no start time, don't filter
                 return False
             
-            # Get event time from parsed_event (already in local time)
-            event_date = parsed_event.get('event_date')
-            if not event_date:
+            # Event time (epoch seconds) is extracted from raw update by poller
+            # callback_query, pre_checkout_query have no own date - processed as current events
+            event_timestamp = system.get('event_timestamp')
+            if not event_timestamp:
                 # If no event time, don't filter
                 return False
             
-            # Calculate time difference between polling start and event
-            time_diff = await self.datetime_formatter.time_diff(event_date, polling_start_time)
-            time_diff_seconds = time_diff.total_seconds()
-            
             # Ignore events if difference is greater than startup_time_offset
-            return time_diff_seconds > self.startup_time_offset
+            return (polling_start_timestamp - event_timestamp) > self.startup_time_offset
                 
         except Exception as e:
             self.logger.warning(f"Error checking event time: {e}")
@@ -0,0 +1,65 @@
+"""
+Tests for event time filter of EventHandler: stale events are dropped before parsing by raw event time from poller
+"""
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from plugins.services.core.event_processor.core.event_handler import EventHandler
+
+START = 1_700_000_000
+
+
+def create_handler(enable_time_comparison=True, startup_time_offset=0):
+    settings_manager = MagicMock()
+    settings_manager.get_plugin_settings.return_value = {
+        "enable_time_comparison": enable_time_comparison, "startup_time_offset": startup_time_offset
+    }
+    datetime_formatter = MagicMock()
+    datetime_formatter.to_utc_tz = AsyncMock(side_effect=lambda value: value.astimezone(timezone.utc))
+    handler = EventHandler(MagicMock(), MagicMock(), datetime_formatter, settings_manager,
+                           MagicMock(), MagicMock(), MagicMock(), MagicMock())
+    handler.event_parser.parse_event = AsyncMock(return_value=None)
+    return handler
+
+
+def raw_event(event_timestamp, **system):
+    return {"update_id": 1, "message": {"text": "x"},
+            "system": {"bot_id": 1, "polling_start_timestamp": START, "event_timestamp": event_timestamp, **system}}
+
+
+@pytest.mark.asyncio
+class TestTimeFilter:
+
+    async def test_stale_event_not_parsed(self):
+        handler = create_handler()
+
+        await handler.handle_raw_event(raw_event(START - 60))
+        assert handler.event_parser.parse_event.await_count == 0
+
+        await handler.handle_raw_event(raw_event(START + 1))
+        assert handler.event_parser.parse_event.await_count == 1
+
+    async def test_event_without_date_passes(self):
+        """callback_query / pre_checkout_query have no own date (event_timestamp None)"""
+        handler = create_handler()
+
+        await handler.handle_raw_event(raw_event(None))
+
+        assert handler.event_parser.parse_event.await_count == 1
+
+    async def test_offset_disabled_and_local_start_time(self):
+        handler = create_handler(startup_time_offset=30)
+        await handler.handle_raw_event(raw_event(START - 20))
+        assert handler.event_parser.parse_event.await_count == 1
+
+        handler = create_handler(enable_time_comparison=False)
+        await handler.handle_raw_event(raw_event(START - 60))
+        assert handler.event_parser.parse_event.await_count == 1
+
+        # Poller passing only local start time
+        handler = create_handler()
+        local_start = datetime.fromtimestamp(START, timezone.utc)
+        await handler.handle_raw_event(raw_event(START - 60, polling_start_timestamp=None, polling_start_time=local_start))
+        assert handler.event_parser.parse_event.await_count == 0
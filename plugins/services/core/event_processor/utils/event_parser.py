@@ -673,37 +673,35 @@ class EventParser:
         Returns dictionary with config (e.g., {"ai_token": "..."})
         
         Logic: first check cache, if not found - load from DB and save to cache.
-        This solves the desynchronization problem when updating config.
+        Concurrent events of the same tenant share one DB query on cache miss.
         """
         try:
-            # Step 1: Check cache
             cache_key = self._get_tenant_config_key(tenant_id)
-            cached_config = await self.cache_manager.get(cache_key)
-            
-            if cached_config is not None:
-                return cached_config
-            
-            # Step 2: Cache not found - load from DB (fallback to solve desynchronization problem)
-            self.logger.warning(f"[Tenant-{tenant_id}] Tenant config not found in cache, loading from DB")
-            
-            master_repo = self.database_manager.get_master_repository()
-            tenant_data = await master_repo.get_tenant_by_id(tenant_id)
-            
-            if not tenant_data:
-                return None
-            
-            # Form config dictionary from all DB fields (exclude system fields)
-            # System fields: id, processed_at (and relationship fields, but they don't get into dictionary)
-            config = {}
-            excluded_fields = {'id', 'processed_at'}
-            for key, value in tenant_data.items():
-                if key not in excluded_fields and value is not None:
-                    config[key] = value
-            
-            # Don't save to cache - TenantCache manages it
-            # This is a rare case when cache is missing, so just return data from DB
-            return config
+            return await self.cache_manager.get_or_load(cache_key, lambda: self._load_tenant_config(tenant_id))
             
         except Exception as e:
             self.logger.error(f"[Tenant-{tenant_id}] Error getting tenant config: {e}")
             return None
+    
+    async def _load_tenant_config(self, tenant_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Load tenant config from DB (fallback to solve desynchronization problem)
+        TenantCache overwrites the same key on config sync, default TTL is used here
+        """
+        self.logger.warning(f"[Tenant-{tenant_id}] Tenant config not found in cache, loading from DB")
+        
+        master_repo = self.database_manager.get_master_repository()
+        tenant_data = await master_repo.get_tenant_by_id(tenant_id)
+        
+        if not tenant_data:
+            return None
+        
+        # Form config dictionary from all DB fields (exclude system fields)
+        # System fields: id, processed_at (and relationship fields, but they don't get into dictionary)
+        config = {}
+        excluded_fields = {'id', 'processed_at'}
+        for key, value in tenant_data.items():
+            if key not in excluded_fields and value is not None:
+                config[key] = value
+        
+        return config
@@ -0,0 +1,45 @@
+"""
+Cache Actions - CacheManager statistics ActionHub methods
+Exposes hit/miss, size and eviction counters for sizing TTLs and quotas
+"""
+
+from typing import Any, Dict
+
+from ..domain.error_handlers import handle_action_errors
+
+
+class CacheActions:
+    """Cache statistics actions for tenant hub"""
+    
+    def __init__(self, logger, cache_manager):
+        self.logger = logger
+        self.cache_manager = cache_manager
+    
+    @handle_action_errors()
+    async def get_cache_stats(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get cache statistics: totals and per-namespace counters.
+        format=prometheus returns metrics in Prometheus text format.
+        """
+        if data.get('format') == 'prometheus':
+            return {
+                "result": "success",
+                "response_data": {
+                    "metrics": await self.cache_manager.get_metrics()
+                }
+            }
+        
+        stats = await self.cache_manager.get_stats()
+        
+        # Filter by namespace (e.g. 'tenant', 'user')
+        namespace = data.get('namespace')
+        if namespace:
+            stats['namespace_stats'] = {
+                name: values for name, values in stats.get('namespace_stats', {}).items()
+                if name == namespace or name.startswith(f"{namespace}:")
+            }
+        
+        return {
+            "result": "success",
+            "response_data": stats
+        }
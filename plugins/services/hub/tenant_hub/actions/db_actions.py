@@ -0,0 +1,50 @@
+"""
+DB Actions - database_manager statistics ActionHub methods
+Exposes query latency by repository method, pool wait, DB thread pool and replica state
+"""
+
+from typing import Any, Dict
+
+from ..domain.error_handlers import handle_action_errors
+
+
+class DbActions:
+    """Database statistics actions for tenant hub"""
+    
+    def __init__(self, logger, database_manager):
+        self.logger = logger
+        self.database_manager = database_manager
+    
+    @handle_action_errors()
+    async def get_db_stats(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get DB statistics: query latency by repository method, pool checkout wait,
+        DB thread pool queue and read replicas.
+        format=prometheus returns metrics in Prometheus text format.
+        """
+        if data.get('format') == 'prometheus':
+            return {
+                "result": "success",
+                "response_data": {
+                    "metrics": self.database_manager.get_metrics()
+                }
+            }
+        
+        queries = self.database_manager.get_query_stats()
+        
+        # Filter by repository method prefix (e.g. 'UserStorageRepository')
+        method = data.get('method')
+        if method and queries:
+            queries['methods'] = {
+                name: values for name, values in queries['methods'].items()
+                if name.startswith(method)
+            }
+        
+        return {
+            "result": "success",
+            "response_data": {
+                "queries": queries,
+                "executor": self.database_manager.get_executor_stats(),
+                "replicas": self.database_manager.get_replica_stats()
+            }
+        }
@@ -168,37 +168,39 @@ class TenantCache:
         Returns dictionary with config (e.g., {"ai_token": "..."})
         """
         try:
-            # Step 1: Check cache
+            # Get from cache or DB (empty config is cached too, to avoid querying DB every time)
             cache_key = self._get_tenant_config_key(tenant_id)
-            cached_config = await self.cache_manager.get(cache_key)
-            
-            if cached_config is not None:
-                return cached_config
-            
-            # Step 2: Cache not found - get from DB
-            master_repo = self.database_manager.get_master_repository()
-            tenant_data = await master_repo.get_tenant_by_id(tenant_id)
-            
-            if not tenant_data:
-                return None
-            
-            # Form config dictionary from all DB fields (exclude system fields)
-            # System fields: id, processed_at (and relationship fields, but they don't get into dictionary)
-            config = {}
-            excluded_fields = {'id', 'processed_at'}
-            for key, value in tenant_data.items():
-                if key not in excluded_fields and value is not None:
-                    config[key] = value
-            
-            # Save to cache (even if empty, to avoid querying DB every time)
-            await self.cache_manager.set(cache_key, config, ttl=self._cache_ttl)
-            
-            return config
+            return await self.cache_manager.get_or_load(
+                cache_key,
+                lambda: self._load_tenant_config(tenant_id),
+                ttl=self._cache_ttl
+            )
             
         except Exception as e:
             self.logger.error(f"[Tenant-{tenant_id}] Error getting tenant config: {e}")
             return None
     
+    async def _load_tenant_config(self, tenant_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Load tenant config from DB
+        Returns None if tenant not found
+        """
+        master_repo = self.database_manager.get_master_repository()
+        tenant_data = await master_repo.get_tenant_by_id(tenant_id)
+        
+        if not tenant_data:
+            return None
+        
+        # Form config dictionary from all DB fields (exclude system fields)
+        # System fields: id, processed_at (and relationship fields, but they don't get into dictionary)
+        config = {}
+        excluded_fields = {'id', 'processed_at'}
+        for key, value in tenant_data.items():
+            if key not in excluded_fields and value is not None:
+                config[key] = value
+        
+        return config
+    
     async def update_tenant_config_cache(self, tenant_id: int) -> None:
         """
         Update tenant config cache from DB
@@ -207,24 +209,15 @@ class TenantCache:
         """
         try:
             # Get data from DB
-            master_repo = self.database_manager.get_master_repository()
-            tenant_data = await master_repo.get_tenant_by_id(tenant_id)
+            config = await self._load_tenant_config(tenant_id)
+            cache_key = self._get_tenant_config_key(tenant_id)
             
-            if not tenant_data:
+            if config is None:
                 # Tenant not found - delete cache
-                cache_key = self._get_tenant_config_key(tenant_id)
                 await self.cache_manager.delete(cache_key)
                 return
             
-            # Form config dictionary from all DB fields (exclude system fields)
-            config = {}
-            excluded_fields = {'id', 'processed_at'}
-            for key, value in tenant_data.items():
-                if key not in excluded_fields and value is not None:
-                    config[key] = value
-            
             # Update cache (overwrite with current data)
-            cache_key = self._get_tenant_config_key(tenant_id)
             await self.cache_manager.set(cache_key, config, ttl=self._cache_ttl)
             
         except Exception as e:
@@ -5,6 +5,8 @@ Coordinator for loading tenant data through specialized services
 
 from typing import Any, Dict
 
+from .actions.cache_actions import CacheActions
+from .actions.db_actions import DbActions
 from .actions.sync_actions import SyncActions
 from .actions.tenant_actions import TenantActions
 from .actions.webhook_actions import WebhookActions
@@ -112,6 +114,16 @@ class TenantHub:
             self.block_sync_executor
         )
         
+        self.cache_actions = CacheActions(
+            self.logger,
+            kwargs['cache_manager']
+        )
+        
+        self.db_actions = DbActions(
+            self.logger,
+            self.database_manager
+        )
+        
         # Register GitHub webhook endpoint (requires webhook_actions)
         if self.use_webhooks:
             self._register_github_webhook_endpoint()
@@ -244,4 +256,12 @@ class TenantHub:
     
     async def update_tenant_config(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update tenant config"""
-        return await self.tenant_actions.update_tenant_config(data)
\ No newline at end of file
+        return await self.tenant_actions.update_tenant_config(data)
+    
+    async def get_cache_stats(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Get cache hit/miss, size and eviction statistics"""
+        return await self.cache_actions.get_cache_stats(data)
+    
+    async def get_db_stats(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Get query latency, pool wait, DB thread pool and replica statistics"""
+        return await self.db_actions.get_db_stats(data)
\ No newline at end of file
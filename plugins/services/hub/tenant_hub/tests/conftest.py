@@ -74,7 +74,16 @@ def mock_cache_manager():
             del cache_storage[key]
         return len(keys_to_delete)
     
+    async def get_or_load_side_effect(key, loader, ttl=None, stale_ttl=None, cache_none=False):
+        if key in cache_storage:
+            return cache_storage[key]
+        value = await loader()
+        if value is not None or cache_none:
+            cache_storage[key] = value
+        return value
+    
     mock.get = AsyncMock(side_effect=get_side_effect)
+    mock.get_or_load = AsyncMock(side_effect=get_or_load_side_effect)
     mock.set = AsyncMock(side_effect=set_side_effect)
     mock.exists = AsyncMock(side_effect=exists_side_effect)
     mock.delete = AsyncMock(side_effect=delete_side_effect)
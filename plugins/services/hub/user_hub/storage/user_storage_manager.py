@@ -2,7 +2,6 @@
 UserStorageManager - submodule for working with user data storage
 """
 
-import json
 from typing import Any, Dict, List, Optional
 
 
@@ -12,6 +11,9 @@ class UserStorageManager:
     Manages user key-value data (without groups, flat structure)
     """
     
+    # Page size for reading all users found by storage value
+    SEARCH_BATCH_SIZE = 5000
+    
     def __init__(self, database_manager, logger, settings_manager):
         self.database_manager = database_manager
         self.logger = logger
@@ -234,63 +236,25 @@ class UserStorageManager:
                 }
             }
     
-    def _normalize_value(self, value: Any) -> str:
-        """
-        Normalize value for comparison
-        For JSON values: parses and serializes back with normalization
-        For simple values: converts to string
-        """
-        if value is None:
-            return ""
-        
-        # If value is already string, check if it's JSON
-        if isinstance(value, str):
-            try:
-                # Try to parse as JSON
-                parsed = json.loads(value)
-                # Serialize back with normalization (sort_keys=True for dict)
-                return json.dumps(parsed, sort_keys=True, ensure_ascii=False)
-            except (json.JSONDecodeError, TypeError):
-                # Not JSON, return as is
-                return str(value)
-        
-        # If value is dict or list, serialize to JSON with normalization
-        if isinstance(value, (dict, list)):
-            return json.dumps(value, sort_keys=True, ensure_ascii=False)
-        
-        # For simple types (int, float, bool) convert to string
-        return str(value)
-    
-    async def find_users_by_storage_value(self, tenant_id: int, key: str, value: Any) -> List[int]:
+    async def find_users_by_storage_value(self, tenant_id: int, key: str, value: Any, limit: Optional[int] = None, after_user_id: Optional[int] = None) -> List[int]:
         """
         Search users by key and value in storage
-        Uses index for fast search by tenant_id and key, then filters by value in memory
+        Comparison is done in DB by normalized value hash (index tenant_id + key + value_hash)
+        Result is sorted by user_id; without limit all users are read page by page
         """
         try:
-            # Get all records by tenant_id and key (fast through index)
             master_repo = self.database_manager.get_master_repository()
-            records = await master_repo.get_user_storage_by_tenant_and_key(tenant_id, key)
-            
-            if not records:
-                return []
             
-            # Normalize search value once
-            normalized_target_value = self._normalize_value(value)
-            
-            # Filter records by value in memory
-            matching_user_ids = []
-            for record in records:
-                record_value = record.get('value')
-                # Normalize value from DB for comparison (JSON objects may have different key order)
-                normalized_record_value = self._normalize_value(record_value)
-                
-                if normalized_record_value == normalized_target_value:
-                    user_id = record.get('user_id')
-                    if user_id is not None:
-                        matching_user_ids.append(user_id)
+            if limit:
+                user_ids = await master_repo.find_user_ids_by_storage_value(
+                    tenant_id, key, value, limit=limit, after_user_id=after_user_id
+                )
+                return user_ids or []
             
-            # Remove duplicates (in case user has multiple records with same value)
-            return list(set(matching_user_ids))
+            user_ids = []
+            async for page in master_repo.iter_user_ids_by_storage_value(tenant_id, key, value, batch_size=self.SEARCH_BATCH_SIZE):
+                user_ids.extend(page)
+            return user_ids
             
         except Exception as e:
             self.logger.error(f"[Tenant-{tenant_id}] Error searching users by storage key={key}, value={value}: {e}")
@@ -289,7 +289,9 @@ class UserHubService:
             user_ids = await self.user_storage_manager.find_users_by_storage_value(
                 tenant_id=tenant_id,
                 key=key,
-                value=value
+                value=value,
+                limit=data.get('limit'),
+                after_user_id=data.get('after_user_id')
             )
             
             return {
@@ -1,14 +1,21 @@
 import re
-from typing import Any, Dict, List, Optional, Union
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 
 from openai import AsyncOpenAI
 
+from .modules.client_pool import AIClientPool
+from .modules.completion_cache import CompletionCache, completion_key
+from .modules.embedding_batcher import EmbeddingBatcher, estimate_tokens
+from .modules.embedding_cache import EmbeddingCache, text_hash
+
 
 class AIClient:
     def __init__(self, **kwargs):
         self.logger = kwargs['logger']
         self.settings_manager = kwargs['settings_manager']
         self.data_converter = kwargs.get('data_converter')
+        self.database_manager = kwargs.get('database_manager')
         
         # Get settings
         self.settings = self.settings_manager.get_plugin_settings('ai_client')
@@ -21,12 +28,48 @@ class AIClient:
         self.temperature = self.settings.get("temperature", 0.7)
         self.default_embedding_model = self.settings.get("default_embedding_model", "text-embedding-3-small")
         self.default_embedding_dimensions = self.settings.get("default_embedding_dimensions", 1024)
+        self.embedding_max_batch_size = self.settings.get("embedding_max_batch_size", 128)
+        self.embedding_max_batch_tokens = self.settings.get("embedding_max_batch_tokens", 100000)
         
-        # Initialize OpenAI client
-        self.client = AsyncOpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
+        # Clients for tenant tokens are pooled (LRU by token hash), all clients share HTTP connection limits
+        self.client_pool = AIClientPool(
+            self.logger,
+            self.base_url,
+            max_clients=self.settings.get("client_pool_max_clients", 32),
+            max_connections=self.settings.get("http_max_connections", 20),
+            max_keepalive_connections=self.settings.get("http_max_keepalive_connections", 10),
+            keepalive_expiry=self.settings.get("http_keepalive_expiry", 30)
         )
+        
+        # Initialize OpenAI client
+        self.client = self.client_pool.create_client(self.api_key)
+        
+        # Micro-batching of single embedding calls (window 0 - each call is separate request)
+        self.embedding_batcher = None
+        batch_window_ms = self.settings.get("embedding_batch_window_ms", 10)
+        if batch_window_ms and batch_window_ms > 0:
+            self.embedding_batcher = EmbeddingBatcher(
+                self._request_batched_embeddings,
+                self.logger,
+                window_ms=batch_window_ms,
+                max_batch_size=self.embedding_max_batch_size,
+                max_batch_tokens=self.embedding_max_batch_tokens
+            )
+        
+        # Content-addressed embedding cache (DB tier if database_manager is available)
+        self.embedding_cache = None
+        if self.settings.get("embedding_cache_enabled", True):
+            self.embedding_cache = EmbeddingCache(
+                self.logger,
+                max_entries=self.settings.get("embedding_cache_max_entries", 5000),
+                database_manager=self.database_manager
+            )
+        
+        # Completion cache: used only by requests with cache_ttl (0 entries - disabled)
+        self.completion_cache = None
+        completion_cache_max_entries = self.settings.get("completion_cache_max_entries", 1000)
+        if completion_cache_max_entries and completion_cache_max_entries > 0:
+            self.completion_cache = CompletionCache(self.logger, max_entries=completion_cache_max_entries)
     
     async def completion(self, prompt: str, system_prompt: str = "", model: Optional[str] = None, 
                            max_tokens: Optional[int] = None, temperature: Optional[float] = None, 
@@ -36,61 +79,29 @@ class AIClient:
                            tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
                            api_key: Optional[str] = None,
                            rag_chunks: Optional[List[Dict[str, Any]]] = None,
-                           chunk_format: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+                           chunk_format: Optional[Dict[str, str]] = None,
+                           cache_ttl: Optional[float] = None, cache_force: bool = False) -> Dict[str, Any]:
         """
         Completion via AI API (Polza.ai, OpenRouter, etc.)
         Corresponds to /v1/chat/completions endpoint
+        With cache_ttl (seconds) successful response is cached for same request parameters (opt-in):
+        only for temperature 0 unless cache_force, cached response has zero tokens and cached flag
         """
         try:
-            # Prepare parameters
-            model = model or self.default_model
-            max_tokens = max_tokens or self.max_tokens
-            temperature = temperature or self.temperature
-            
-            # Determine which client to use
-            client_to_use = self.client
-            if api_key and api_key != self.api_key:
-                # Create temporary client with passed token
-                client_to_use = AsyncOpenAI(
-                    api_key=api_key,
-                    base_url=self.base_url
-                )
-            
-            # Build response_format for JSON modes
-            response_format = self._build_response_format(json_mode, json_schema)
-            
-            # Build messages for API
-            messages = self._build_messages(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                context=context,
-                json_mode=json_mode,
-                rag_chunks=rag_chunks,
-                chunk_format=chunk_format
+            client_to_use, api_params = self._prepare_completion(
+                prompt, system_prompt, model, max_tokens, temperature, context, json_mode, json_schema,
+                tools, tool_choice, api_key, rag_chunks, chunk_format
             )
             
-            # Parameters for API request
-            api_params = {
-                "model": model,
-                "messages": messages,
-                "max_tokens": max_tokens,
-                "temperature": temperature
-            }
-            
-            # Add response_format if specified
-            if response_format:
-                api_params["response_format"] = response_format
-            
-            # Add tools if specified
-            if tools:
-                api_params["tools"] = tools
-            
-            # Add tool_choice if specified
-            if tool_choice:
-                api_params["tool_choice"] = tool_choice
+            cache_key = self._get_completion_cache_key(api_params, cache_ttl, cache_force)
+            if cache_key is not None:
+                cached_result = self.completion_cache.get(cache_key)
+                if cached_result is not None:
+                    return cached_result
             
             # Call AI API via OpenAI SDK (use appropriate client)
-            response = await client_to_use.chat.completions.create(**api_params)
+            async with self.client_pool.use(client_to_use):
+                response = await client_to_use.chat.completions.create(**api_params)
             
             # Get model response
             message = response.choices[0].message
@@ -114,54 +125,86 @@ class AIClient:
                     for tool_call in message.tool_calls
                 ]
             
-            # Parse JSON string to dict if json_mode is used
-            parsed_dict = None
-            if json_mode and response_content and self.data_converter:
-                try:
-                    # Clean response from markdown code blocks (```json ... ```)
-                    cleaned_content = response_content.strip()
-                    if cleaned_content.startswith("```"):
-                        # Remove opening ```json or ```
-                        lines = cleaned_content.split("\n")
-                        if lines[0].startswith("```"):
-                            lines = lines[1:]
-                        # Remove closing ```
-                        if lines and lines[-1].strip() == "```":
-                            lines = lines[:-1]
-                        cleaned_content = "\n".join(lines)
-                    
-                    # Use data_converter to parse JSON string to dict
-                    parsed_dict = await self.data_converter.convert_string_to_type(cleaned_content)
-                    # Check that we got dict or list (valid JSON)
-                    if not isinstance(parsed_dict, (dict, list)):
-                        parsed_dict = None
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse JSON response to dict: {e}")
+            result = await self._build_completion_result(api_params["model"], response_content, tool_calls, response.usage, json_mode)
+            if cache_key is not None:
+                self.completion_cache.set(cache_key, result, cache_ttl)
+            return result
             
-            # Form result
-            result = {
-                "result": "success",
-                "response_data": {
-                    "response_completion": response_content,
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens,
-                    "model": model
+        except Exception as e:
+            self.logger.error(f"Error generating response: {e}")
+            return {
+                "result": "error",
+                "error": {
+                    "code": "API_ERROR",
+                    "message": str(e)
                 }
             }
+    
+    async def completion_stream(self, prompt: str, on_text: Optional[Callable[[str], Awaitable[None]]] = None,
+                                system_prompt: str = "", model: Optional[str] = None,
+                                max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+                                context: str = "", json_mode: Optional[str] = None,
+                                json_schema: Optional[Dict[str, Any]] = None,
+                                tools: Optional[List[Dict[str, Any]]] = None,
+                                tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+                                api_key: Optional[str] = None,
+                                rag_chunks: Optional[List[Dict[str, Any]]] = None,
+                                chunk_format: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Completion with streaming response: same parameters and result as completion
+        on_text(text) is awaited with full text received so far after each content delta
+        (while it runs, next deltas are read only after it returns - slow consumers should hand text off)
+        response_data additionally has time_to_first_token_ms (request start -> first content delta)
+        """
+        try:
+            client_to_use, api_params = self._prepare_completion(
+                prompt, system_prompt, model, max_tokens, temperature, context, json_mode, json_schema,
+                tools, tool_choice, api_key, rag_chunks, chunk_format
+            )
+            api_params["stream"] = True
+            # Usage comes in last chunk (without choices)
+            api_params["stream_options"] = {"include_usage": True}
             
-            # Add parsed dict if exists
-            if parsed_dict is not None:
-                result["response_data"]["response_dict"] = parsed_dict
+            text = ""
+            tool_call_parts: Dict[int, Dict[str, Any]] = {}
+            usage = None
+            first_token_ms = None
+            started = time.monotonic()
             
-            # Add tool_calls if model called functions
-            if tool_calls:
-                result["response_data"]["tool_calls"] = tool_calls
+            async with self.client_pool.use(client_to_use):
+                stream = await client_to_use.chat.completions.create(**api_params)
+                async for chunk in stream:
+                    if chunk.usage is not None:
+                        usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    
+                    # Tool call arrives in parts: id and name in first part, arguments are concatenated
+                    for tool_call in delta.tool_calls or []:
+                        collected = tool_call_parts.setdefault(tool_call.index, {
+                            "id": None, "type": "function", "function": {"name": "", "arguments": ""}
+                        })
+                        if tool_call.id:
+                            collected["id"] = tool_call.id
+                        if tool_call.function is not None:
+                            collected["function"]["name"] += tool_call.function.name or ""
+                            collected["function"]["arguments"] += tool_call.function.arguments or ""
+                    
+                    if delta.content:
+                        if first_token_ms is None:
+                            first_token_ms = round((time.monotonic() - started) * 1000, 1)
+                        text += delta.content
+                        if on_text is not None:
+                            await on_text(text)
             
+            tool_calls = [tool_call_parts[index] for index in sorted(tool_call_parts)] or None
+            result = await self._build_completion_result(api_params["model"], text, tool_calls, usage, json_mode)
+            result["response_data"]["time_to_first_token_ms"] = first_token_ms
             return result
             
         except Exception as e:
-            self.logger.error(f"Error generating response: {e}")
+            self.logger.error(f"Error generating streaming response: {e}")
             return {
                 "result": "error",
                 "error": {
@@ -170,6 +213,117 @@ class AIClient:
                 }
             }
     
+    def _prepare_completion(self, prompt: str, system_prompt: str, model: Optional[str], max_tokens: Optional[int],
+                            temperature: Optional[float], context: str, json_mode: Optional[str],
+                            json_schema: Optional[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]],
+                            tool_choice: Optional[Union[str, Dict[str, Any]]], api_key: Optional[str],
+                            rag_chunks: Optional[List[Dict[str, Any]]], chunk_format: Optional[Dict[str, str]]):
+        """Client and chat completions API parameters for completion request"""
+        # Prepare parameters
+        model = model or self.default_model
+        max_tokens = max_tokens or self.max_tokens
+        # Explicit 0 (deterministic request) is kept, not replaced with default
+        temperature = temperature if temperature is not None else self.temperature
+        
+        # Determine which client to use (pooled client for passed token)
+        client_to_use = self._get_client(api_key)
+        
+        # Build response_format for JSON modes
+        response_format = self._build_response_format(json_mode, json_schema)
+        
+        # Build messages for API
+        messages = self._build_messages(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            context=context,
+            json_mode=json_mode,
+            rag_chunks=rag_chunks,
+            chunk_format=chunk_format
+        )
+        
+        # Parameters for API request
+        api_params = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+        
+        # Add response_format if specified
+        if response_format:
+            api_params["response_format"] = response_format
+        
+        # Add tools if specified
+        if tools:
+            api_params["tools"] = tools
+        
+        # Add tool_choice if specified
+        if tool_choice:
+            api_params["tool_choice"] = tool_choice
+        
+        return client_to_use, api_params
+    
+    async def _build_completion_result(self, model: str, response_content: str,
+                                       tool_calls: Optional[List[Dict[str, Any]]], usage: Any,
+                                       json_mode: Optional[str]) -> Dict[str, Any]:
+        """Standard completion result (usage may be missing if provider does not report it for stream)"""
+        # Parse JSON string to dict if json_mode is used
+        parsed_dict = None
+        if json_mode and response_content and self.data_converter:
+            try:
+                # Clean response from markdown code blocks (```json ... ```)
+                cleaned_content = response_content.strip()
+                if cleaned_content.startswith("```"):
+                    # Remove opening ```json or ```
+                    lines = cleaned_content.split("\n")
+                    if lines[0].startswith("```"):
+                        lines = lines[1:]
+                    # Remove closing ```
+                    if lines and lines[-1].strip() == "```":
+                        lines = lines[:-1]
+                    cleaned_content = "\n".join(lines)
+                
+                # Use data_converter to parse JSON string to dict
+                parsed_dict = await self.data_converter.convert_string_to_type(cleaned_content)
+                # Check that we got dict or list (valid JSON)
+                if not isinstance(parsed_dict, (dict, list)):
+                    parsed_dict = None
+            except Exception as e:
+                self.logger.warning(f"Failed to parse JSON response to dict: {e}")
+        
+        # Form result
+        result = {
+            "result": "success",
+            "response_data": {
+                "response_completion": response_content,
+                "prompt_tokens": usage.prompt_tokens if usage is not None else 0,
+                "completion_tokens": usage.completion_tokens if usage is not None else 0,
+                "total_tokens": usage.total_tokens if usage is not None else 0,
+                "model": model
+            }
+        }
+        
+        # Add parsed dict if exists
+        if parsed_dict is not None:
+            result["response_data"]["response_dict"] = parsed_dict
+        
+        # Add tool_calls if model called functions
+        if tool_calls:
+            result["response_data"]["tool_calls"] = tool_calls
+        
+        return result
+    
+    def _get_completion_cache_key(self, api_params: Dict[str, Any], cache_ttl: Optional[float],
+                                  cache_force: bool) -> Optional[str]:
+        """Cache key if response of request may be cached, otherwise None"""
+        if self.completion_cache is None or not cache_ttl or cache_ttl <= 0:
+            return None
+        # Sampled response differs between calls: cached only when explicitly forced
+        if api_params["temperature"] > 0 and not cache_force:
+            self.completion_cache.count_bypass()
+            return None
+        return completion_key(api_params)
+    
     def _build_response_format(self, json_mode: Optional[str], 
                                json_schema: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """
@@ -391,6 +545,8 @@ class AIClient:
                        dimensions: Optional[int] = None, api_key: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate embedding for text via AI API (Polza.ai, OpenRouter, etc.)
+        Cached vectors are returned without provider call (total_tokens 0)
+        Concurrent calls with same model, dimensions and token are merged into one provider call (micro-batching)
         
         Note: dimensions parameter is supported only for OpenAI text-embedding-3-small 
         and text-embedding-3-large. For other models (Cohere, HuggingFace, etc.) dimension is fixed.
@@ -400,32 +556,19 @@ class AIClient:
             model = model or self.default_embedding_model
             dimensions = dimensions if dimensions is not None else self.default_embedding_dimensions
             
-            # Determine which client to use
-            client_to_use = self.client
-            if api_key and api_key != self.api_key:
-                # Create temporary client with passed token
-                client_to_use = AsyncOpenAI(
-                    api_key=api_key,
-                    base_url=self.base_url
+            cached_hashes, cached_vectors = await self._get_cached_embeddings(model, dimensions, [text])
+            if cached_vectors[0] is not None:
+                embedding_vector, total_tokens = cached_vectors[0], 0
+            elif self.embedding_batcher is not None:
+                embedding_vector, total_tokens = await self.embedding_batcher.embed(
+                    (model, dimensions, api_key or self.api_key), text
                 )
+            else:
+                vectors, total_tokens = await self._request_embeddings(self._get_client(api_key), model, dimensions, [text])
+                embedding_vector = vectors[0]
             
-            # Prepare parameters for API
-            api_params = {
-                "model": model,
-                "input": text
-            }
-            
-            # dimensions parameter supported only for OpenAI text-embedding-3 models
-            # For other models (Cohere, HuggingFace, etc.) don't pass dimensions
-            if "text-embedding-3" in model.lower():
-                api_params["dimensions"] = dimensions
-            
-            # Call embeddings API
-            response = await client_to_use.embeddings.create(**api_params)
-            
-            # Get embedding
-            embedding_data = response.data[0]
-            embedding_vector = embedding_data.embedding
+            if cached_vectors[0] is None:
+                await self._save_cached_embeddings(model, dimensions, cached_hashes, [embedding_vector])
             
             # Form result (flat structure like in completion)
             result = {
@@ -434,7 +577,7 @@ class AIClient:
                     "embedding": embedding_vector,
                     "model": model,
                     "dimensions": len(embedding_vector),
-                    "total_tokens": response.usage.total_tokens
+                    "total_tokens": total_tokens
                 }
             }
             
@@ -450,6 +593,164 @@ class AIClient:
                 }
             }
     
+    async def embedding_batch(self, texts: List[str], model: Optional[str] = None,
+                              dimensions: Optional[int] = None, api_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generate embeddings for list of texts: vectors are returned in order of texts
+        Texts are sent in provider calls of up to embedding_max_batch_size texts / embedding_max_batch_tokens tokens
+        """
+        try:
+            model = model or self.default_embedding_model
+            embeddings = []
+            total_tokens = 0
+            async for _, vectors, tokens in self.iter_embedding_batches(texts, model, dimensions, api_key):
+                embeddings.extend(vectors)
+                total_tokens += tokens
+            
+            return {
+                "result": "success",
+                "response_data": {
+                    "embeddings": embeddings,
+                    "model": model,
+                    "dimensions": len(embeddings[0]) if embeddings else 0,
+                    "total_tokens": total_tokens
+                }
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error generating embeddings batch: {e}")
+            return {
+                "result": "error",
+                "error": {
+                    "code": "API_ERROR",
+                    "message": str(e)
+                }
+            }
+    
+    async def iter_embedding_batches(self, texts: List[str], model: Optional[str] = None,
+                                     dimensions: Optional[int] = None, api_key: Optional[str] = None):
+        """
+        Stream embeddings batch by batch: yields (offset, vectors, total_tokens) after each provider call
+        Lets ingest save chunks (create_chunks_batch) while next batch is requested; raises on provider error
+        Only cache misses are sent to provider (repeated texts of batch - once), fully cached batch costs no call
+        """
+        model = model or self.default_embedding_model
+        dimensions = dimensions if dimensions is not None else self.default_embedding_dimensions
+        client = self._get_client(api_key)
+        
+        # Pooled client stays busy between batches (not closed by eviction while generator is consumed)
+        async with self.client_pool.use(client):
+            offset = 0
+            for batch in self._split_embedding_batches(texts):
+                hashes, vectors = await self._get_cached_embeddings(model, dimensions, batch)
+                total_tokens = 0
+                
+                # First position of each missing text hash
+                missing = {}
+                for index, vector in enumerate(vectors):
+                    if vector is None:
+                        missing.setdefault(hashes[index], index)
+                
+                if missing:
+                    new_vectors, total_tokens = await self._request_embeddings(
+                        client, model, dimensions, [batch[index] for index in missing.values()]
+                    )
+                    by_hash = dict(zip(missing, new_vectors, strict=False))
+                    vectors = [vector if vector is not None else by_hash[hashes[index]] for index, vector in enumerate(vectors)]
+                    await self._save_cached_embeddings(model, dimensions, list(by_hash), list(by_hash.values()))
+                
+                yield offset, vectors, total_tokens
+                offset += len(batch)
+    
+    def _split_embedding_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts by batch size and estimated token budget (text over budget goes alone)"""
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for text in texts:
+            tokens = estimate_tokens(text)
+            if batch and (len(batch) >= self.embedding_max_batch_size or batch_tokens + tokens > self.embedding_max_batch_tokens):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(text)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    async def _request_batched_embeddings(self, key, texts: List[str]):
+        """Provider call for micro-batch (key: model, dimensions, api_key)"""
+        model, dimensions, api_key = key
+        return await self._request_embeddings(self._get_client(api_key), model, dimensions, texts)
+    
+    async def _request_embeddings(self, client: AsyncOpenAI, model: str, dimensions: int, texts: List[str]):
+        """One embeddings API call; returns (vectors in order of texts, total tokens)"""
+        # Prepare parameters for API
+        api_params = {
+            "model": model,
+            "input": texts
+        }
+        
+        # dimensions parameter supported only for OpenAI text-embedding-3 models
+        # For other models (Cohere, HuggingFace, etc.) don't pass dimensions
+        if self._supports_dimensions(model):
+            api_params["dimensions"] = dimensions
+        
+        # Call embeddings API
+        async with self.client_pool.use(client):
+            response = await client.embeddings.create(**api_params)
+        
+        # Provider may return items in any order, index points to input position
+        data = sorted(response.data, key=lambda item: item.index)
+        return [item.embedding for item in data], response.usage.total_tokens
+    
+    @staticmethod
+    def _supports_dimensions(model: str) -> bool:
+        return "text-embedding-3" in model.lower()
+    
+    async def _get_cached_embeddings(self, model: str, dimensions: int, texts: List[str]):
+        """Cache lookup: (text hashes, vectors or None) in order of texts; all misses if cache is disabled"""
+        if self.embedding_cache is None:
+            return [text_hash(text) for text in texts], [None] * len(texts)
+        # Dimensions are ignored by provider for other models, so they are not part of key
+        cache_dimensions = dimensions if self._supports_dimensions(model) else 0
+        return await self.embedding_cache.get_many(model, cache_dimensions, texts)
+    
+    async def _save_cached_embeddings(self, model: str, dimensions: int, hashes: List[str], vectors: List[List[float]]):
+        if self.embedding_cache is None:
+            return
+        cache_dimensions = dimensions if self._supports_dimensions(model) else 0
+        try:
+            await self.embedding_cache.set_many(model, cache_dimensions, hashes, vectors)
+        except Exception as e:
+            self.logger.warning(f"Error saving embeddings to cache: {e}")
+    
+    def get_embedding_stats(self) -> Dict[str, Any]:
+        """Embedding micro-batching and cache statistics (None if disabled)"""
+        return {
+            "batching": self.embedding_batcher.get_stats() if self.embedding_batcher is not None else None,
+            "cache": self.embedding_cache.get_stats() if self.embedding_cache is not None else None
+        }
+    
+    def get_completion_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Completion cache statistics: lookups, hits, misses, hit_ratio, expired, bypassed, entries (None if disabled)"""
+        return self.completion_cache.get_stats() if self.completion_cache is not None else None
+    
+    def get_client_pool_stats(self) -> Dict[str, Any]:
+        """Token client pool (hits, misses, evictions) and HTTP connection reuse statistics"""
+        return self.client_pool.get_stats()
+    
+    def _get_client(self, api_key: Optional[str] = None) -> AsyncOpenAI:
+        """Default client or pooled client for passed token"""
+        if api_key and api_key != self.api_key:
+            return self.client_pool.get(api_key)
+        return self.client
+    
+    async def _close_clients(self):
+        await self.client.close()
+        await self.client_pool.close()
+    
     def shutdown(self):
         """Properly close client and all connections"""
         try:
@@ -460,13 +761,13 @@ class AIClient:
                     loop = asyncio.get_event_loop()
                     if loop.is_running():
                         # If loop is running, create task for closing
-                        loop.create_task(self.client.close())
+                        loop.create_task(self._close_clients())
                     else:
                         # If loop not running, run it for closing
-                        loop.run_until_complete(self.client.close())
+                        loop.run_until_complete(self._close_clients())
                 except RuntimeError:
                     # If no event loop, create new one
-                    asyncio.run(self.client.close())
+                    asyncio.run(self._close_clients())
                 except Exception as e:
                     self.logger.warning(f"Error closing AI client: {e}")
         except Exception as e:
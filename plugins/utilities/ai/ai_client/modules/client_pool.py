@@ -0,0 +1,153 @@
+"""
+Pool of AsyncOpenAI clients for tenant tokens
+Key is (base_url, sha256 of token): client and its HTTP connection pool (keep-alive connections, TLS sessions)
+are reused by all requests with same token instead of new client (new TCP + TLS handshake) per request
+All clients share same connection limits; connection reuse is counted through HTTP trace events
+"""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Set, Tuple
+
+from openai import DEFAULT_CONNECTION_LIMITS, AsyncOpenAI, DefaultAsyncHttpxClient
+
+# Limits class of HTTP library used by installed openai SDK
+HttpLimits = type(DEFAULT_CONNECTION_LIMITS)
+
+
+class _PooledClient:
+    __slots__ = ('key', 'client', 'in_use')
+
+    def __init__(self, key: Tuple[str, str], client: AsyncOpenAI):
+        self.key = key
+        self.client = client
+        self.in_use = 0
+
+
+class AIClientPool:
+    """
+    Bounded LRU: when pool is full least recently used client is removed and closed
+    Client with request in progress (see use) is not closed: pool grows over max_clients until request ends
+    """
+
+    def __init__(self, logger: Any, base_url: str, max_clients: int = 32, max_connections: int = 20,
+                 max_keepalive_connections: int = 10, keepalive_expiry: float = 30.0):
+        self.logger = logger
+        self.base_url = base_url
+        self.max_clients = max(1, max_clients)
+        self.limits = HttpLimits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+
+        self._clients: 'OrderedDict[Tuple[str, str], _PooledClient]' = OrderedDict()
+        self._by_client: Dict[int, _PooledClient] = {}
+        self._closing: Set[asyncio.Task] = set()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._requests = 0
+        self._connections = 0
+        self._tls_handshakes = 0
+
+    def create_client(self, api_key: str) -> AsyncOpenAI:
+        """Client with pool connection limits and reuse tracing (not pooled: caller owns it)"""
+        http_client = DefaultAsyncHttpxClient(limits=self.limits, event_hooks={'request': [self._trace_request]})
+        return AsyncOpenAI(api_key=api_key, base_url=self.base_url, http_client=http_client)
+
+    def get(self, api_key: str) -> AsyncOpenAI:
+        """Pooled client for token"""
+        key = (self.base_url, hashlib.sha256(api_key.encode('utf-8')).hexdigest())
+        entry = self._clients.get(key)
+        if entry is not None:
+            self._hits += 1
+            self._clients.move_to_end(key)
+            return entry.client
+
+        self._misses += 1
+        entry = _PooledClient(key, self.create_client(api_key))
+        self._clients[key] = entry
+        self._by_client[id(entry.client)] = entry
+        self._evict(keep=entry)
+        return entry.client
+
+    @asynccontextmanager
+    async def use(self, client: AsyncOpenAI):
+        """Marks pooled client busy for request duration (clients outside pool are passed through)"""
+        entry = self._by_client.get(id(client))
+        if entry is None:
+            yield client
+            return
+
+        entry.in_use += 1
+        try:
+            yield client
+        finally:
+            entry.in_use -= 1
+            # Eviction postponed while client was busy
+            if not entry.in_use and len(self._clients) > self.max_clients:
+                self._evict()
+
+    def _evict(self, keep: Optional[_PooledClient] = None) -> None:
+        for entry in list(self._clients.values()):
+            if len(self._clients) <= self.max_clients:
+                break
+            if entry.in_use or entry is keep:
+                continue
+            del self._clients[entry.key]
+            del self._by_client[id(entry.client)]
+            self._evictions += 1
+            self._close_later(entry.client)
+
+    def _close_later(self, client: AsyncOpenAI) -> None:
+        try:
+            task = asyncio.get_running_loop().create_task(client.close())
+        except RuntimeError:
+            # No event loop (shutdown): connections are released with client object
+            return
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _trace_request(self, request: Any) -> None:
+        self._requests += 1
+        request.extensions['trace'] = self._trace
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        # New connection: TCP connect (plus TLS handshake for https); reused keep-alive connection has neither
+        if event_name == 'connection.connect_tcp.complete':
+            self._connections += 1
+        elif event_name == 'connection.start_tls.complete':
+            self._tls_handshakes += 1
+
+    async def close(self) -> None:
+        """Close all pooled clients (and clients being closed after eviction)"""
+        clients = [entry.client for entry in self._clients.values()]
+        self._clients.clear()
+        self._by_client.clear()
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                self.logger.warning(f"Error closing pooled AI client: {e}")
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            'clients': len(self._clients),
+            'max_clients': self.max_clients,
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_ratio': round(self._hits / lookups, 4) if lookups else 0.0,
+            'evictions': self._evictions,
+            'requests': self._requests,
+            'connections_opened': self._connections,
+            'tls_handshakes': self._tls_handshakes,
+            # Requests served by already open keep-alive connection
+            'connection_reuse_ratio': round(max(0.0, 1 - self._connections / self._requests), 4) if self._requests else 0.0,
+        }
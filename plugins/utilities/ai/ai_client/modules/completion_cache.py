@@ -0,0 +1,80 @@
+"""
+Completion response cache for deterministic requests
+Key is sha256 of request parameters that define response (model, final messages with RAG context, response_format,
+tools, temperature): in-memory LRU, each entry expires after TTL given by caller
+"""
+
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Chat completions parameters included in key (max_tokens and tool_choice also change response)
+CACHE_KEY_PARAMS = ('model', 'messages', 'response_format', 'tools', 'tool_choice', 'temperature', 'max_tokens')
+
+
+def completion_key(api_params: Dict[str, Any]) -> str:
+    payload = {name: api_params.get(name) for name in CACHE_KEY_PARAMS}
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class CompletionCache:
+    """
+    Stored results are copied on set and get: callers may modify returned result
+    Hits are returned with zero token counts and cached flag (no provider call - nothing spent)
+    """
+
+    def __init__(self, logger: Any, max_entries: int = 1000):
+        self.logger = logger
+        self.max_entries = max(0, max_entries)
+
+        self._entries: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+
+        self._lookups = 0
+        self._hits = 0
+        self._expired = 0
+        self._bypassed = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        self._lookups += 1
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._expired += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        result = copy.deepcopy(result)
+        response_data = result['response_data']
+        response_data.update(prompt_tokens=0, completion_tokens=0, total_tokens=0, cached=True)
+        return result
+
+    def set(self, key: str, result: Dict[str, Any], ttl: float) -> None:
+        if not self.max_entries or ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def count_bypass(self) -> None:
+        """Cache requested for non-deterministic request (temperature > 0 without force)"""
+        self._bypassed += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'lookups': self._lookups,
+            'hits': self._hits,
+            'misses': self._lookups - self._hits,
+            'hit_ratio': round(self._hits / self._lookups, 4) if self._lookups else 0.0,
+            'expired': self._expired,
+            'bypassed': self._bypassed,
+            'entries': len(self._entries),
+        }
@@ -0,0 +1,131 @@
+"""
+Micro-batching of single-text embedding requests
+Concurrent requests with same (model, dimensions, api_key) are collected for a short window and sent as one provider call
+Batch rejected because of its input is split in halves and resent, so only caller of bad text gets error
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Embedding request function: (key, texts) -> (vectors in order of texts, total tokens)
+RequestFunc = Callable[[Hashable, List[str]], Awaitable[Tuple[List[List[float]], int]]]
+
+# Provider HTTP statuses caused by request input (text too long, invalid content): other texts of batch may be fine
+INPUT_ERROR_STATUSES = frozenset({400, 413, 422})
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate without tokenizer (~4 characters per token), used only for batch budget"""
+    return len(text) // 4 + 1
+
+
+def is_input_error(error: Exception) -> bool:
+    """Error caused by texts of request (status_code of provider API error), not by provider or connection"""
+    return getattr(error, 'status_code', None) in INPUT_ERROR_STATUSES
+
+
+class _PendingBatch:
+    __slots__ = ('texts', 'futures', 'tokens', 'timer')
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.futures: List[asyncio.Future] = []
+        self.tokens = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class EmbeddingBatcher:
+    """
+    Batch is sent when window expires, max_batch_size is reached or next text would exceed max_batch_tokens
+    Provider usage is split between texts of batch proportionally to estimated tokens
+    Input error of batch is narrowed down by halving (about log2(batch size) extra calls per bad text),
+    provider and connection errors are not retried and reach all callers of batch
+    """
+
+    def __init__(self, request_func: RequestFunc, logger: Any, window_ms: float = 10,
+                 max_batch_size: int = 128, max_batch_tokens: int = 100000):
+        self.request_func = request_func
+        self.logger = logger
+        self.window = window_ms / 1000
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_batch_tokens = max_batch_tokens
+
+        self._pending: Dict[Hashable, _PendingBatch] = {}
+        self._tasks = set()
+
+        self._requests = 0
+        self._batches = 0
+        self._split_retries = 0
+
+    async def embed(self, key: Hashable, text: str) -> Tuple[List[float], int]:
+        """Returns (vector, tokens share) for text; raises provider error of whole batch or input error of this text"""
+        loop = asyncio.get_running_loop()
+        tokens = estimate_tokens(text)
+
+        batch = self._pending.get(key)
+        if batch is not None and batch.texts and batch.tokens + tokens > self.max_batch_tokens:
+            self._flush(key)
+            batch = None
+        if batch is None:
+            batch = self._pending[key] = _PendingBatch()
+            batch.timer = loop.call_later(self.window, self._flush, key)
+
+        future = loop.create_future()
+        batch.texts.append(text)
+        batch.futures.append(future)
+        batch.tokens += tokens
+        self._requests += 1
+
+        if len(batch.texts) >= self.max_batch_size:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        self._batches += 1
+        task = asyncio.get_running_loop().create_task(self._send(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, key: Hashable, batch: _PendingBatch) -> None:
+        await self._send_texts(key, batch.texts, batch.futures)
+
+    async def _send_texts(self, key: Hashable, texts: List[str], futures: List[asyncio.Future]) -> None:
+        try:
+            vectors, total_tokens = await self.request_func(key, texts)
+            if len(vectors) != len(texts):
+                raise ValueError(f"provider returned {len(vectors)} embeddings for {len(texts)} texts")
+        except Exception as e:
+            if len(texts) > 1 and is_input_error(e):
+                self._split_retries += 1
+                self.logger.warning(f"Embedding batch of {len(texts)} texts rejected ({e}), resending in halves")
+                middle = len(texts) // 2
+                await asyncio.gather(
+                    self._send_texts(key, texts[:middle], futures[:middle]),
+                    self._send_texts(key, texts[middle:], futures[middle:])
+                )
+                return
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        estimated = [estimate_tokens(text) for text in texts]
+        estimated_total = sum(estimated)
+        for future, vector, text_tokens in zip(futures, vectors, estimated, strict=False):
+            if not future.done():
+                future.set_result((vector, round(total_tokens * text_tokens / estimated_total)))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self._requests,
+            'batches': self._batches,
+            'avg_batch_size': round(self._requests / self._batches, 2) if self._batches else 0.0,
+            'pending': sum(len(batch.texts) for batch in self._pending.values()),
+            'split_retries': self._split_retries,
+        }
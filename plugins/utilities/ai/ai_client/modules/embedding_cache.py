@@ -0,0 +1,107 @@
+"""
+Content-addressed embedding cache
+Key is (model, dimensions, sha256 of normalized text): in-memory LRU tier and optional DB tier (embedding_cache table)
+Vectors are stored as float32 (same precision as vector column in DB)
+"""
+
+import hashlib
+import re
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Unicode NFC and collapsed whitespace: texts differing only in formatting share one vector"""
+    return _WHITESPACE_RE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Lookup goes memory -> DB, DB hits are promoted to memory
+    DB errors are treated as misses (cache never fails embedding request)
+    """
+
+    def __init__(self, logger: Any, max_entries: int = 5000, database_manager: Any = None):
+        self.logger = logger
+        self.max_entries = max(0, max_entries)
+        self.database_manager = database_manager
+
+        self._memory: 'OrderedDict[Tuple[str, int, str], array]' = OrderedDict()
+
+        self._lookups = 0
+        self._memory_hits = 0
+        self._db_hits = 0
+
+    async def get_many(self, model: str, dimensions: int, texts: List[str]) -> Tuple[List[str], List[Optional[List[float]]]]:
+        """Returns (hashes, vectors) in order of texts, vector is None on miss"""
+        hashes = [text_hash(text) for text in texts]
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        self._lookups += len(texts)
+
+        missing: Dict[str, List[int]] = {}
+        for index, key_hash in enumerate(hashes):
+            packed = self._memory_get((model, dimensions, key_hash))
+            if packed is not None:
+                vectors[index] = packed.tolist()
+                self._memory_hits += 1
+            else:
+                missing.setdefault(key_hash, []).append(index)
+
+        if missing and self.database_manager is not None:
+            found = await self.database_manager.get_master_repository().get_cached_embeddings(
+                model, dimensions, list(missing)
+            )
+            for key_hash, data in (found or {}).items():
+                packed = array('f')
+                packed.frombytes(data)
+                self._memory_set((model, dimensions, key_hash), packed)
+                for index in missing[key_hash]:
+                    vectors[index] = packed.tolist()
+                    self._db_hits += 1
+
+        return hashes, vectors
+
+    async def set_many(self, model: str, dimensions: int, hashes: List[str], vectors: List[List[float]]) -> None:
+        """Save vectors for text hashes (from get_many) in both tiers"""
+        packed_by_hash = {}
+        for key_hash, vector in zip(hashes, vectors, strict=False):
+            packed = array('f', vector)
+            self._memory_set((model, dimensions, key_hash), packed)
+            packed_by_hash[key_hash] = packed.tobytes()
+
+        if packed_by_hash and self.database_manager is not None:
+            await self.database_manager.get_master_repository().save_cached_embeddings(model, dimensions, packed_by_hash)
+
+    def _memory_get(self, key: Tuple[str, int, str]) -> Optional[array]:
+        packed = self._memory.get(key)
+        if packed is not None:
+            self._memory.move_to_end(key)
+        return packed
+
+    def _memory_set(self, key: Tuple[str, int, str], packed: array) -> None:
+        if not self.max_entries:
+            return
+        self._memory[key] = packed
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self._memory_hits + self._db_hits
+        return {
+            'lookups': self._lookups,
+            'memory_hits': self._memory_hits,
+            'db_hits': self._db_hits,
+            'misses': self._lookups - hits,
+            'hit_ratio': round(hits / self._lookups, 4) if self._lookups else 0.0,
+            'entries': len(self._memory),
+            'persistent': self.database_manager is not None,
+        }
@@ -1,6 +1,9 @@
 import json
 from typing import Any, Dict, List, Optional, Union
 
+# First characters of JSON document (leading whitespace is allowed by json.loads)
+_JSON_START_CHARS = frozenset('{["-0123456789tfnNI \t\n\r')
+
 
 class DataConverter:
     """
@@ -163,6 +166,10 @@ class DataConverter:
         
         Async method for consistency with rest of project code.
         """
+        return self.string_to_type(value)
+    
+    def string_to_type(self, value: Any) -> Union[str, int, float, bool, list, dict, None]:
+        """Sync version of convert_string_to_type (for row mappers in hot read paths)"""
         if value is None:
             return None
 
@@ -209,6 +216,34 @@ class DataConverter:
         # Return as string
         return value
     
+    def decode_stored_value(self, value: Any) -> Any:
+        """
+        Decodes value stored in Text column same way as to_dict + convert_string_to_type:
+        JSON (objects, arrays, numbers, literals, strings) with bytes restore, otherwise type by content
+        JSON parsing is attempted only for strings that can start JSON document
+        """
+        if not isinstance(value, str) or not value:
+            return value
+        
+        if value[0] in _JSON_START_CHARS:
+            try:
+                decoded = json.loads(value)
+            except ValueError:
+                pass
+            else:
+                decoded = self._restore_bytes_recursive(decoded)
+                # JSON string literal is typed by content too
+                return self.string_to_type(decoded) if isinstance(decoded, str) else decoded
+        
+        if value.startswith("bytes:"):
+            try:
+                return bytes.fromhex(value[6:])
+            except ValueError as e:
+                self.logger.warning(f"Error restoring bytes: {e}")
+                return value
+        
+        return self.string_to_type(value)
+    
     # === Universal Conversion ===
     
     async def to_safe_dict(self, obj: Any) -> Union[Dict[str, Any], List[Any], Any]:
@@ -1,10 +1,20 @@
+import asyncio
+import os
 from typing import Optional
 
+from sqlalchemy import inspect, text
+from sqlalchemy.pool import SingletonThreadPool
+
 from .db_config.postgresql_manager import PostgreSQLManager
 from .db_config.sqlite_manager import SQLiteManager
-from .models import Base
+from .models import Base, embedding_index_sql
 from .modules.backup_operations import BackupOperations
 from .modules.data_preparer import DataPreparer
+from .modules.db_executor import DbExecutor
+from .modules.local_vector_index import LocalVectorIndex
+from .modules.query_stats import QueryStats, get_executor_metrics, get_replica_metrics
+from .modules.replica_router import ReplicaRouter
+from .modules.vector_search_planner import VectorSearchPlanner
 from .modules.view_operations import ViewOperations
 
 
@@ -30,7 +40,13 @@ class DatabaseManager:
         # Variables for storing current manager
         self.current_manager = None
         self.engine = None
+        self.async_engine = None
         self.session_factory = None
+        self.db_executor = None
+        self.replica_router = None
+        self.query_stats = None
+        self.vector_index = None
+        self.vector_search_planner = None
         
         # ViewOperations will be created after connection initialization
         self.view_ops = None
@@ -42,8 +58,20 @@ class DatabaseManager:
         self._initialize_database_connection()
 
     def shutdown(self):
-        """Correct shutdown of database_manager"""
+        """Correct shutdown of database_manager (async engines are disposed in async_shutdown)"""
         try:
+            if getattr(self, 'replica_router', None) is not None:
+                self.replica_router.stop()
+                for replica in self.replica_router.replicas:
+                    replica.engine.dispose()
+            
+            # Wait for running sync DB calls before closing pool
+            if getattr(self, 'db_executor', None) is not None:
+                self.db_executor.shutdown()
+            
+            if getattr(self, 'vector_index', None) is not None:
+                self.vector_index.close()
+            
             # Close all connections from SQLAlchemy pool
             if hasattr(self, 'engine') and self.engine is not None:
                 self.engine.dispose()
@@ -51,6 +79,22 @@ class DatabaseManager:
         except Exception as e:
             self.logger.warning(f"Error closing connections: {e}")
     
+    async def async_shutdown(self):
+        """Disposes async engine pools on event loop their connections belong to"""
+        async_engines = [getattr(self, 'async_engine', None)]
+        if getattr(self, 'replica_router', None) is not None:
+            async_engines.extend(replica.async_engine for replica in self.replica_router.replicas)
+        async_engines = [async_engine for async_engine in async_engines if async_engine is not None]
+        if not async_engines:
+            return
+        
+        for async_engine in async_engines:
+            try:
+                await async_engine.dispose()
+            except Exception as e:
+                self.logger.warning(f"Async engine dispose error: {e}")
+        self.logger.info("Async connections pool closed")
+    
     def _shutdown_application(self, reason: str):
         """Stops entire application on critical database error."""
         self.logger.critical(f"CRITICAL DATABASE ERROR: {reason}")
@@ -86,7 +130,11 @@ class DatabaseManager:
                 self.logger.info("All tables successfully created (vector_storage skipped for SQLite).")
             else:
                 # For PostgreSQL create all tables including vector_storage
+                vector_storage_exists = inspect(self.engine).has_table('vector_storage')
                 Base.metadata.create_all(self.engine)
+                # ANN index precision is a setting, index is created with new table (existing table: migration or sync_embedding_index)
+                if not vector_storage_exists:
+                    self._create_embedding_index()
                 self.logger.info("All tables successfully created.")
             
             # Create views for PostgreSQL (ignored for SQLite)
@@ -96,6 +144,20 @@ class DatabaseManager:
             self.logger.error(f"Error creating tables: {e}")
             self._shutdown_application(f"Critical error creating tables: {e}")
     
+    def _create_embedding_index(self):
+        """Creates vector_storage HNSW index of configured precision (database.postgresql.vector_search)."""
+        search_config = self._vector_search_config(self.settings_manager.get_plugin_settings("database_manager"))
+        with self.engine.begin() as connection:
+            connection.execute(text(embedding_index_sql(
+                search_config.get('index_precision', 'vector'),
+                search_config.get('index_m', 16),
+                search_config.get('index_ef_construction', 64)
+            )))
+    
+    @staticmethod
+    def _vector_search_config(settings: dict) -> dict:
+        return settings.get('database', {}).get('postgresql', {}).get('vector_search') or {}
+    
     def drop_all_views(self) -> bool:
         """
         Drops all system views for PostgreSQL (ignored for SQLite)
@@ -152,6 +214,32 @@ class DatabaseManager:
         self.engine = self.current_manager.get_engine()
         self.session_factory = self.current_manager.get_session_factory()
         
+        # Native async mode: repositories get async session factory, sync engine stays for DDL/views/backups
+        if settings.get('async_engine', False):
+            self._initialize_async_engine()
+        
+        # Sync engine off event loop: session calls run in dedicated DB thread pool
+        if settings.get('sync_executor', False) and self.async_engine is None:
+            self._initialize_db_executor(settings)
+        
+        # Read replicas (PostgreSQL only): db_read repository methods are routed to healthy replicas
+        if self.db_type == 'postgresql':
+            self._initialize_replica_router(settings)
+            self._initialize_vector_search_planner(settings)
+        
+        # Statement latency by repository method, slow query log, pool usage (opt-in: hooks on every statement)
+        if settings.get('query_stats', False):
+            self._initialize_query_stats(settings)
+        
+        # Vector storage for SQLite preset (vector_storage table is PostgreSQL only)
+        if self.db_type == 'sqlite':
+            self._initialize_vector_index(settings)
+        
+        # Repositories get executor and router through kwargs (None - calls run in event loop thread / on primary)
+        self._kwargs['db_executor'] = self.db_executor
+        self._kwargs['replica_router'] = self.replica_router
+        self._kwargs['vector_search_planner'] = self.vector_search_planner
+        
         # Initialize ViewOperations for PostgreSQL
         if self.db_type == 'postgresql':
             self.view_ops = ViewOperations(self.engine, self.db_type, self.logger)
@@ -169,6 +257,188 @@ class DatabaseManager:
         # Create tables on initialization
         self.create_all()
     
+    def _initialize_async_engine(self):
+        """Creates async engine, on missing driver keeps sync session factory."""
+        try:
+            self.async_engine, self.session_factory = self.current_manager.create_async_engine()
+        except Exception as e:
+            self.async_engine = None
+            self.session_factory = self.current_manager.get_session_factory()
+            self.logger.error(f"Failed to create async engine ({e}), using sync engine")
+    
+    def _initialize_db_executor(self, settings: dict):
+        """Creates DB thread pool sized to connection pool (pool_size + max_overflow)."""
+        # SingletonThreadPool (in-memory SQLite) gives each thread its own connection and database
+        if isinstance(self.engine.pool, SingletonThreadPool):
+            self.logger.error("sync_executor is not supported for in-memory SQLite, DB calls run in event loop thread")
+            return
+        
+        pool_config = settings.get('database', {}).get(self.db_type, {}).get('connection_pool', {})
+        max_workers = max(1, pool_config.get('pool_size', 5) + pool_config.get('max_overflow', 0))
+        self.db_executor = DbExecutor(max_workers)
+        self.logger.info(f"DB thread pool executor created: max_workers={max_workers}")
+    
+    def _initialize_replica_router(self, settings: dict):
+        """Creates replica engines and router if database.postgresql.replicas.hosts is configured."""
+        replicas_config = settings.get('database', {}).get('postgresql', {}).get('replicas') or {}
+        if not replicas_config.get('hosts'):
+            return
+        
+        replicas = self.current_manager.create_replicas(async_mode=self.async_engine is not None)
+        if not replicas:
+            self.logger.error("No read replica could be created, all queries go to primary")
+            return
+        
+        self.replica_router = ReplicaRouter(
+            replicas,
+            self.logger,
+            max_lag_seconds=replicas_config.get('max_lag_seconds', 5),
+            health_check_interval=replicas_config.get('health_check_interval', 10),
+            sticky_seconds=replicas_config.get('sticky_seconds')
+        )
+        self.replica_router.start()
+    
+    def _initialize_vector_search_planner(self, settings: dict):
+        """Creates exact/HNSW strategy planner for vector_storage searches (database.postgresql.vector_search)."""
+        search_config = self._vector_search_config(settings)
+        if not search_config.get('enabled', True):
+            return
+        
+        self.vector_search_planner = VectorSearchPlanner(
+            self.logger,
+            exact_max_rows=search_config.get('exact_max_rows', 10000),
+            hnsw_ef_search=search_config.get('hnsw_ef_search', 40),
+            ef_search_per_result=search_config.get('ef_search_per_result', 2),
+            iterative_scan=search_config.get('iterative_scan', 'strict_order'),
+            max_scan_tuples=search_config.get('max_scan_tuples', 20000),
+            tenant_index_min_rows=search_config.get('tenant_index_min_rows', 100000),
+            tenant_index_m=search_config.get('tenant_index_m', 16),
+            tenant_index_ef_construction=search_config.get('tenant_index_ef_construction', 64),
+            stats_ttl=search_config.get('stats_ttl', 300),
+            index_precision=search_config.get('index_precision', 'vector'),
+            rerank_factor=search_config.get('rerank_factor', 4),
+            index_m=search_config.get('index_m', 16),
+            index_ef_construction=search_config.get('index_ef_construction', 64)
+        )
+    
+    def _initialize_query_stats(self, settings: dict):
+        """Attaches query instrumentation to all engines (primary, async, replicas)."""
+        self.query_stats = QueryStats(self.logger, slow_query_ms=settings.get('slow_query_ms', 500))
+        self.query_stats.instrument(self.engine, 'primary')
+        if self.async_engine is not None:
+            self.query_stats.instrument(self.async_engine.sync_engine, 'primary:async')
+        if self.replica_router is not None:
+            for replica in self.replica_router.replicas:
+                self.query_stats.instrument(replica.engine, replica.name)
+                if replica.async_engine is not None:
+                    self.query_stats.instrument(replica.async_engine.sync_engine, f"{replica.name}:async")
+    
+    def _initialize_vector_index(self, settings: dict):
+        """Creates local vector index next to SQLite database file (database.sqlite.vector_index)."""
+        index_config = settings.get('database', {}).get('sqlite', {}).get('vector_index') or {}
+        if not index_config.get('enabled', True):
+            return
+        
+        path = index_config.get('path')
+        if not path:
+            # In-memory database gets temporary index (removed on shutdown)
+            db_path = self.current_manager.get_database_url()[len('sqlite:///'):]
+            path = os.path.join(os.path.dirname(db_path) or '.', 'vector_index') if db_path and db_path != ':memory:' else None
+        
+        self.vector_index = LocalVectorIndex(
+            self.logger,
+            path=path,
+            dtype=index_config.get('dtype', 'float32'),
+            hnsw_min_rows=index_config.get('hnsw_min_rows', 20000),
+            hnsw_m=index_config.get('hnsw_m', 16),
+            hnsw_ef_construction=index_config.get('hnsw_ef_construction', 64),
+            hnsw_ef_search=index_config.get('hnsw_ef_search', 64)
+        )
+        self.logger.info(f"Local vector index: {self.vector_index.path}")
+    
+    def get_vector_index_stats(self) -> Optional[dict]:
+        """
+        Returns local vector index state for SQLite preset (None for PostgreSQL or disabled index)
+        Chunks, vectors, matrix capacity, dimensions and HNSW usage per opened tenant
+        """
+        if self.vector_index is None:
+            return None
+        return self.vector_index.get_stats()
+    
+    def get_vector_search_stats(self) -> Optional[dict]:
+        """
+        Returns vector search planner statistics for PostgreSQL (None for SQLite or disabled planner)
+        Exact and HNSW search counts, searches by own tenant index, cached tenant slices
+        """
+        if self.vector_search_planner is None:
+            return None
+        return self.vector_search_planner.get_stats()
+    
+    async def sync_tenant_vector_indexes(self) -> Optional[dict]:
+        """
+        Creates partial HNSW indexes for large tenants and drops indexes of tenants that shrank (PostgreSQL only)
+        Index build takes minutes on large tenants, so it runs in separate thread
+        """
+        if self.vector_search_planner is None:
+            return None
+        try:
+            return await asyncio.to_thread(self.vector_search_planner.sync_tenant_indexes, self.engine)
+        except Exception as e:
+            self.logger.error(f"Error syncing tenant vector indexes: {e}")
+            return None
+    
+    async def sync_embedding_index(self) -> Optional[dict]:
+        """
+        Creates vector_storage HNSW index of configured index_precision and drops indexes of other precisions
+        (PostgreSQL only, CONCURRENTLY in separate thread); used after index_precision change
+        """
+        if self.vector_search_planner is None:
+            return None
+        try:
+            return await asyncio.to_thread(self.vector_search_planner.sync_embedding_index, self.engine)
+        except Exception as e:
+            self.logger.error(f"Error syncing vector index: {e}")
+            return None
+    
+    def get_query_stats(self) -> Optional[dict]:
+        """
+        Returns statement latency by repository method (count, avg/max, p50/p95/p99, errors),
+        slow query count and pool usage per engine (None if query_stats is disabled)
+        """
+        if self.query_stats is None:
+            return None
+        return self.query_stats.get_stats()
+    
+    def get_metrics(self) -> str:
+        """
+        Export DB statistics in Prometheus text format:
+        query and pool histograms, DB thread pool queue, replica health and lag
+        """
+        lines = []
+        if self.query_stats is not None:
+            lines.extend(self.query_stats.get_metrics())
+        lines.extend(get_executor_metrics(self.get_executor_stats()))
+        lines.extend(get_replica_metrics(self.get_replica_stats()))
+        return '\n'.join(lines) + '\n' if lines else ''
+    
+    def get_replica_stats(self) -> Optional[dict]:
+        """
+        Returns read replica state (None if replicas are not configured)
+        Health, lag and read distribution per replica, reads kept on primary by stickiness or missing replicas
+        """
+        if self.replica_router is None:
+            return None
+        return self.replica_router.get_stats()
+    
+    def get_executor_stats(self) -> Optional[dict]:
+        """
+        Returns DB thread pool statistics (None if sync_executor is disabled)
+        Queue depth and wait time show when executor is the bottleneck
+        """
+        if self.db_executor is None:
+            return None
+        return self.db_executor.get_stats()
+    
     def _create_database_manager(self, db_type: str):
         """Creates manager for specified database type."""
         if db_type == 'postgresql':
@@ -1,7 +1,10 @@
 import socket
+from typing import List, Optional
 
 import psycopg2
 
+from ..modules.replica_router import Replica
+
 
 class PostgreSQLManager:
     """Manager for managing PostgreSQL database (connection to external server)."""
@@ -148,8 +151,11 @@ class PostgreSQLManager:
             self.logger.error(f"[PostgreSQL] Error creating database: {e}")
             raise Exception(f"Failed to create database: {e}") from e
     
-    def create_engine(self, connection_pool_config):
-        """Creates engine for PostgreSQL."""
+    def create_engine(self, connection_pool_config, connection: Optional[dict] = None):
+        """
+        Creates engine for PostgreSQL
+        connection: replica connection parameters (see get_replica_configs), None - primary engine (saved in manager)
+        """
         try:
             from sqlalchemy import create_engine
             from sqlalchemy.orm import sessionmaker
@@ -185,27 +191,121 @@ class PostgreSQLManager:
                 }
             }
             
-            self.engine = create_engine(self.get_database_url(), **engine_kwargs)
-            self.session_factory = sessionmaker(
-                bind=self.engine, 
+            engine = create_engine(self.get_database_url(connection), **engine_kwargs)
+            session_factory = sessionmaker(
+                bind=engine, 
                 autoflush=session_config.get('autoflush', False),
                 autocommit=session_config.get('autocommit', False),
                 future=session_config.get('future', True)
             )
+            if connection is None:
+                self.engine, self.session_factory = engine, session_factory
             
             self.logger.info(f"[PostgreSQL] Engine created: pool_size={pool_size}, max_overflow={max_overflow}")
-            return self.engine, self.session_factory
+            return engine, session_factory
             
         except Exception as e:
             self.logger.error(f"[PostgreSQL] Error creating engine: {e}")
             raise Exception(f"Failed to create PostgreSQL engine: {e}") from e
     
-    def get_database_url(self):
-        """Returns URL for connecting to PostgreSQL."""
-        if self.postgresql_password:
-            return f"postgresql://{self.postgresql_username}:{self.postgresql_password}@{self.postgresql_host}:{self.postgresql_port}/{self.postgresql_database}"
+    def create_async_engine(self, connection: Optional[dict] = None):
+        """
+        Creates async engine (SQLAlchemy asyncio + asyncpg) with same pool settings as sync engine
+        Sync engine stays for DDL, views and backups
+        connection: replica connection parameters, None - primary
+        """
+        from sqlalchemy import event
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        
+        settings = self.settings_manager.get_plugin_settings("database_manager")
+        postgresql_config = settings.get('database', {}).get('postgresql', {})
+        connection_pool_config = (connection or {}).get('connection_pool') or postgresql_config.get('connection_pool', {})
+        engine_config = postgresql_config.get('engine_settings', {})
+        session_config = engine_config.get('session_settings', {})
+        
+        pool_size = connection_pool_config.get('pool_size', 30)
+        max_overflow = connection_pool_config.get('max_overflow', 0)
+        
+        async_engine = create_async_engine(
+            self.get_database_url(connection).replace('postgresql://', 'postgresql+asyncpg://', 1),
+            echo=engine_config.get('echo', False),
+            echo_pool=engine_config.get('echo_pool', False),
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=connection_pool_config.get('pool_pre_ping', True),
+            pool_recycle=connection_pool_config.get('pool_recycle', 600),
+            connect_args={
+                'timeout': connection_pool_config.get('connect_timeout', 2),
+                'server_settings': {'client_encoding': 'utf8'}
+            }
+        )
+        
+        # asyncpg needs codec for pgvector 'vector' type on each connection
+        try:
+            from pgvector.asyncpg import register_vector
+            
+            @event.listens_for(async_engine.sync_engine, "connect")
+            def register_vector_codec(dbapi_connection, connection_record):
+                dbapi_connection.run_async(register_vector)
+        except ImportError:
+            self.logger.warning("[PostgreSQL] pgvector not installed, vector columns unavailable with async engine")
+        
+        # expire_on_commit=False: returned objects are read after commit without lazy refresh (no implicit IO)
+        async_session_factory = async_sessionmaker(
+            bind=async_engine,
+            autoflush=session_config.get('autoflush', False),
+            expire_on_commit=False
+        )
+        
+        self.logger.info(f"[PostgreSQL] Async engine (asyncpg) created: pool_size={pool_size}, max_overflow={max_overflow}")
+        return async_engine, async_session_factory
+    
+    def get_database_url(self, connection: Optional[dict] = None):
+        """Returns URL for connecting to PostgreSQL (primary or replica connection parameters)."""
+        connection = connection or self.get_config()
+        host, port, database = connection['host'], connection['port'], connection['database']
+        if connection['password']:
+            return f"postgresql://{connection['username']}:{connection['password']}@{host}:{port}/{database}"
         else:
-            return f"postgresql://{self.postgresql_username}@{self.postgresql_host}:{self.postgresql_port}/{self.postgresql_database}"
+            return f"postgresql://{connection['username']}@{host}:{port}/{database}"
+    
+    def get_replica_configs(self) -> List[dict]:
+        """
+        Read replica connection parameters from database.postgresql.replicas.hosts
+        Missing port, username, password and database are taken from primary
+        """
+        settings = self.settings_manager.get_plugin_settings("database_manager")
+        replicas_config = settings.get('database', {}).get('postgresql', {}).get('replicas') or {}
+        
+        configs = []
+        for host_config in replicas_config.get('hosts') or []:
+            if isinstance(host_config, str):
+                host_config = {'host': host_config}
+            configs.append({**self.get_config(), **host_config})
+        return configs
+    
+    def create_replicas(self, async_mode: bool = False) -> List[Replica]:
+        """
+        Creates engines for read replicas
+        Sync engine is used for health checks, in async_mode queries go through separate asyncpg engine
+        Replica that fails to create is skipped (reads stay on primary)
+        """
+        settings = self.settings_manager.get_plugin_settings("database_manager")
+        primary_pool_config = settings.get('database', {}).get('postgresql', {}).get('connection_pool', {})
+        
+        replicas = []
+        for connection in self.get_replica_configs():
+            name = f"{connection['host']}:{connection['port']}"
+            try:
+                engine, session_factory = self.create_engine(connection.get('connection_pool') or primary_pool_config, connection)
+                async_engine = None
+                if async_mode:
+                    async_engine, session_factory = self.create_async_engine(connection)
+                replicas.append(Replica(name, engine, session_factory, async_engine))
+                self.logger.info(f"[PostgreSQL] Read replica added: {name}")
+            except Exception as e:
+                self.logger.error(f"[PostgreSQL] Failed to create read replica {name}: {e}")
+        return replicas
     
     def get_engine(self):
         """Returns PostgreSQL engine."""
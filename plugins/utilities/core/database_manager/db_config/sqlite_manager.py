@@ -93,7 +93,7 @@ class SQLiteManager:
             self.engine = create_engine(self.database_url, **engine_kwargs)
             
             # Add SQLite optimizations via event listener
-            self._setup_sqlite_optimizations()
+            self._setup_sqlite_optimizations(self.engine)
             
             self.session_factory = sessionmaker(
                 bind=self.engine,
@@ -138,7 +138,52 @@ class SQLiteManager:
             'db_path': db_path
         }
     
-    def _setup_sqlite_optimizations(self):
+    def create_async_engine(self):
+        """
+        Creates async engine (SQLAlchemy asyncio + aiosqlite) with same PRAGMA settings
+        Sync engine stays for DDL and backups
+        """
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+        
+        # Tables are created by sync engine, in-memory database would be separate for each engine
+        if ':memory:' in self.database_url:
+            raise ValueError("in-memory SQLite database can't be shared between sync and async engines")
+        
+        settings = self.settings_manager.get_plugin_settings("database_manager")
+        sqlite_config = settings.get('database', {}).get('sqlite', {})
+        pool_config = sqlite_config.get('connection_pool', {})
+        engine_config = sqlite_config.get('engine_settings', {})
+        
+        pool_size = pool_config.get('pool_size', 5)
+        
+        async_engine = create_async_engine(
+            self.database_url.replace('sqlite:///', 'sqlite+aiosqlite:///', 1),
+            echo=engine_config.get('echo', False),
+            # aiosqlite defaults to NullPool (new thread and connection per session)
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=pool_size,
+            max_overflow=pool_config.get('max_overflow', 10),
+            connect_args={
+                'timeout': pool_config.get('connect_timeout', 1),
+                'isolation_level': engine_config.get('isolation_level', None),
+            }
+        )
+        
+        # PRAGMA listener is attached to sync facade of async engine
+        self._setup_sqlite_optimizations(async_engine.sync_engine)
+        
+        # expire_on_commit=False: returned objects are read after commit without lazy refresh (no implicit IO)
+        async_session_factory = async_sessionmaker(
+            bind=async_engine,
+            autoflush=False,
+            expire_on_commit=False
+        )
+        
+        self.logger.info(f"SQLite async engine (aiosqlite) created with pool: size={pool_size}")
+        return async_engine, async_session_factory
+    
+    def _setup_sqlite_optimizations(self, engine):
         """Configures SQLite optimizations via PRAGMA commands from config."""
         try:
             # Get PRAGMA settings from config
@@ -160,7 +205,7 @@ class SQLiteManager:
             # Merge with default settings
             pragma_config = {**default_pragma, **pragma_settings}
             
-            @event.listens_for(self.engine, "connect")
+            @event.listens_for(engine, "connect")
             def set_sqlite_pragma(dbapi_connection, connection_record):
                 """Sets PRAGMA settings for each connection."""
                 cursor = dbapi_connection.cursor()
@@ -1,10 +1,48 @@
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import TIMESTAMP, BigInteger, Boolean, Column, ForeignKey, Index, Integer, PrimaryKeyConstraint, String, Text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import TIMESTAMP, BigInteger, Boolean, Column, Computed, ForeignKey, Index, Integer, LargeBinary, PrimaryKeyConstraint, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
 
+# Text search configuration of vector_storage.content_tsv: 'simple' has no stemming and no stop words,
+# so product names, codes and exact phrases match as written in any language
+TEXT_SEARCH_CONFIG = 'simple'
+
+# ANN index of vector_storage by precision (database.postgresql.vector_search.index_precision), only selected one exists
+# HNSW graph of 1024-dim float32 vectors takes ~4 KB per row, halfvec ~2 KB, binary quantized (Hamming distance) 128 bytes
+# halfvec and binary are coarse expression indexes over embedding (no extra stored column, nothing added to tables
+# of deployments on full precision): candidates are reranked by exact distance on embedding column
+EMBEDDING_INDEX_PRECISIONS = ('vector', 'halfvec', 'binary')
+EMBEDDING_INDEX_NAMES = {
+    'vector': 'idx_vector_storage_embedding_hnsw',
+    'halfvec': 'idx_vector_storage_embedding_half_hnsw',
+    'binary': 'idx_vector_storage_embedding_bq_hnsw',
+}
+EMBEDDING_INDEX_EXPRESSIONS = {
+    'vector': 'embedding vector_cosine_ops',
+    'halfvec': '(embedding::halfvec(1024)) halfvec_cosine_ops',
+    'binary': '(binary_quantize(embedding)::bit(1024)) bit_hamming_ops',
+}
+
+
+def embedding_index_sql(precision: str, m: int = 16, ef_construction: int = 64, tenant_id=None,
+                        concurrently: bool = False) -> str:
+    """
+    CREATE INDEX for vector_storage ANN index of given precision
+    tenant_id - partial index of one tenant (name gets _t<tenant_id> suffix)
+    """
+    name = EMBEDDING_INDEX_NAMES[precision]
+    where = ''
+    if tenant_id is not None:
+        name = f"{name}_t{int(tenant_id)}"
+        where = f" where tenant_id = {int(tenant_id)}"
+    return (
+        f"create index {'concurrently ' if concurrently else ''}if not exists {name} "
+        f"on vector_storage using hnsw ({EMBEDDING_INDEX_EXPRESSIONS[precision]}) "
+        f"with (m = {int(m)}, ef_construction = {int(ef_construction)}){where}"
+    )
+
 # Use Python datetime to get local time
 def dtf_now_local():
     from datetime import datetime
@@ -73,6 +111,7 @@ class UserStorage(Base):
     user_id = Column(BigInteger, nullable=False)                              # Telegram user_id (64-bit)
     key = Column(String(100), nullable=False)                               # Attribute key
     value = Column(Text, nullable=True)                                     # Value (simple types: strings, numbers, float, bool; complex: arrays, JSON objects - serialized to JSON)
+    value_hash = Column(String(64), nullable=True)                          # SHA-256 of normalized value (search by value; rows written before column appeared are filled by core_manager migration)
     processed_at = Column(TIMESTAMP, nullable=False, default=dtf_now_local)  # Processing/update date
     
     # Meta information (NOT used for data loading!)
@@ -82,6 +121,7 @@ class UserStorage(Base):
         PrimaryKeyConstraint('tenant_id', 'user_id', 'key'),
         Index('idx_user_storage_tenant_user', 'tenant_id', 'user_id'),
         Index('idx_user_storage_tenant_key', 'tenant_id', 'key'),
+        Index('idx_user_storage_tenant_key_hash', 'tenant_id', 'key', 'value_hash', 'user_id'),  # Search users by value, ordered by user_id
     )
 
 class TenantUser(Base):
@@ -293,7 +333,8 @@ class VectorStorage(Base):
     PostgreSQL with pgvector extension only
     
     Table is created only for PostgreSQL via migration.
-    For SQLite table is not created (check in migration).
+    For SQLite table is not created (check in migration), chunks are kept in local vector index
+    (modules/local_vector_index.py) with same repository contract.
     """
     __tablename__ = 'vector_storage'
     
@@ -316,6 +357,9 @@ class VectorStorage(Base):
     embedding = Column(Vector(1024), nullable=True)  # Text vector representation (optional, can be NULL for history without search)
     embedding_model = Column(String(100), nullable=True)  # Model used for embedding generation (e.g., "text-embedding-3-small", "text-embedding-3-large")
     
+    # Lexical representation for hybrid search (generated column, maintained by PostgreSQL on insert/update)
+    content_tsv = Column(TSVECTOR, Computed(f"to_tsvector('{TEXT_SEARCH_CONFIG}', content)", persisted=True))
+    
     created_at = Column(TIMESTAMP, nullable=False, default=dtf_now_local)  # Real creation date (for correct history sorting)
     processed_at = Column(TIMESTAMP, nullable=False, default=dtf_now_local)  # Processing/update date
     
@@ -327,12 +371,28 @@ class VectorStorage(Base):
         Index('idx_vector_storage_tenant', 'tenant_id'),
         Index('idx_vector_storage_document', 'tenant_id', 'document_id'),
         Index('idx_vector_storage_type', 'tenant_id', 'document_type'),
-        # HNSW index for vector search (dimension 1024 < 2000, so supported)
-        Index(
-            'idx_vector_storage_embedding_hnsw',
-            'embedding',
-            postgresql_using='hnsw',
-            postgresql_ops={'embedding': 'vector_cosine_ops'},
-            postgresql_with={'m': 16, 'ef_construction': 64}
-        ),
-    )
\ No newline at end of file
+        # HNSW index for vector search is not declared here: its precision is a setting (see embedding_index_sql)
+        # GIN index for full-text part of hybrid search
+        Index('idx_vector_storage_content_tsv', 'content_tsv', postgresql_using='gin'),
+    )
+
+# =============================================================================
+# EMBEDDING CACHE
+# =============================================================================
+
+class EmbeddingCache(Base):
+    """
+    Content-addressed embedding cache (shared by all tenants, works on SQLite and PostgreSQL)
+    Key: model, dimensions, sha256 of normalized text; vector is stored as packed float32
+    """
+    __tablename__ = 'embedding_cache'
+    
+    model = Column(String(100), nullable=False)  # Embedding model
+    dimensions = Column(Integer, nullable=False)  # Requested dimensions (0 for models with fixed dimension)
+    text_hash = Column(String(64), nullable=False)  # sha256 of normalized text (hex)
+    embedding = Column(LargeBinary, nullable=False)  # float32 vector (little-endian)
+    created_at = Column(TIMESTAMP, nullable=False, default=dtf_now_local)  # System field
+    
+    __table_args__ = (
+        PrimaryKeyConstraint('model', 'dimensions', 'text_hash'),
+    )
@@ -0,0 +1,89 @@
+"""
+Streaming ingestion of document chunks: chunks from (async) iterable are written in batches, each batch in own transaction
+Resume after failure: chunks with chunk_index up to last committed one are skipped, so import restarts with same stream
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+# Chunks per COPY / transaction: larger batches - fewer round trips and commits, more work lost on failure
+INGEST_BATCH_SIZE = 1000
+
+ChunkSource = Union[AsyncIterator[Dict[str, Any]], Any]
+
+
+def chunk_fields(tenant_id: int, document_id: str, chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """Insert fields of chunk, tenant and document come from ingestion (created_at is set by data_preparer if missing)"""
+    return {
+        'tenant_id': tenant_id,
+        'document_id': document_id,
+        'document_type': chunk.get('document_type'),
+        'role': chunk.get('role', 'user'),
+        'chunk_index': chunk.get('chunk_index'),
+        'content': chunk.get('content'),
+        'embedding': chunk.get('embedding'),
+        'embedding_model': chunk.get('embedding_model'),
+        'chunk_metadata': chunk.get('chunk_metadata'),
+        **({'created_at': chunk['created_at']} if chunk.get('created_at') is not None else {})
+    }
+
+
+async def _iterate(chunks: ChunkSource) -> AsyncIterator[Dict[str, Any]]:
+    if hasattr(chunks, '__aiter__'):
+        async for chunk in chunks:
+            yield chunk
+    else:
+        for chunk in chunks:
+            yield chunk
+
+
+async def ingest_in_batches(chunks: ChunkSource, batch_size: int, resume_after: int,
+                            write_batch: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+                            progress: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    Collects chunks into batches of batch_size and awaits write_batch(batch) for each (batch is committed when it returns)
+    Chunks must come in ascending chunk_index order: resume relies on all chunks up to last committed index being stored
+    progress(stats) (sync or async) is called after each committed batch
+    Returns stats: inserted, skipped (already stored), batches, resumed_after, last_chunk_index (-1 - document is empty)
+    """
+    batch_size = max(1, int(batch_size))
+    stats = {
+        'inserted': 0,
+        'skipped': 0,
+        'batches': 0,
+        'resumed_after': resume_after,
+        'last_chunk_index': resume_after,
+    }
+    previous_index = None
+    batch: List[Dict[str, Any]] = []
+
+    async def flush():
+        await write_batch(batch)
+        stats['inserted'] += len(batch)
+        stats['batches'] += 1
+        stats['last_chunk_index'] = batch[-1]['chunk_index']
+        batch.clear()
+        if progress is not None:
+            if asyncio.iscoroutinefunction(progress):
+                await progress(dict(stats))
+            else:
+                progress(dict(stats))
+
+    async for chunk in _iterate(chunks):
+        chunk_index = chunk.get('chunk_index')
+        if chunk_index is None:
+            raise ValueError("Chunk without chunk_index")
+        if previous_index is not None and chunk_index <= previous_index:
+            raise ValueError(f"Chunks must be in ascending chunk_index order: {chunk_index} after {previous_index}")
+        previous_index = chunk_index
+
+        if chunk_index <= resume_after:
+            stats['skipped'] += 1
+            continue
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            await flush()
+
+    if batch:
+        await flush()
+    return stats
@@ -16,6 +16,7 @@ class DataPreparer:
         self.logger = kwargs['logger']
         self.datetime_formatter = kwargs['datetime_formatter']
         self._model_fields_cache = {}  # Model fields cache
+        self._column_converters_cache = {}  # Model column converters cache
     
     def _get_model_fields(self, model: DeclarativeMeta) -> set:
         """Gets list of model fields with caching."""
@@ -24,6 +25,36 @@ class DataPreparer:
             self._model_fields_cache[model_name] = set(model.__table__.columns.keys())
         return self._model_fields_cache[model_name]
     
+    def _get_column_converters(self, model: DeclarativeMeta) -> Dict[str, Any]:
+        """
+        Gets converters for model columns with caching (column type is resolved once per model)
+        None means conversion needs async path (date/time parsing)
+        """
+        model_name = model.__name__
+        converters = self._column_converters_cache.get(model_name)
+        if converters is None:
+            converters = {
+                column.name: self._build_converter(type(column.type))
+                for column in model.__table__.columns
+            }
+            self._column_converters_cache[model_name] = converters
+        return converters
+    
+    @staticmethod
+    def _build_converter(column_type):
+        """Builds sync converter for column type (same rules as _convert_single_field)."""
+        if column_type == Text:
+            return _convert_text
+        if column_type in (String, JSON, JSONB):
+            return str
+        if column_type in (Integer, BigInteger):
+            return int
+        if column_type == Boolean:
+            return _convert_boolean
+        if column_type in (DateTime, TIMESTAMP):
+            return None
+        return _identity
+    
     async def prepare_for_update(self, model: DeclarativeMeta, fields: Dict[str, Any],
                           json_fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """Prepares fields for updating record with automatic addition of service fields."""
@@ -79,6 +110,31 @@ class DataPreparer:
         # Prepare fields with is_update=False flag
         return await self.prepare_fields(model, all_fields, json_fields=json_fields, is_update=False)
     
+    async def prepare_for_upsert(self, model: DeclarativeMeta, records: List[Dict[str, Any]],
+                          json_fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Prepares batch of records for INSERT ... ON CONFLICT DO UPDATE (executemany)
+        Service fields get one timestamp for whole batch, records without valid fields are skipped
+        """
+        if not records:
+            return []
+        
+        model_fields = self._get_model_fields(model)
+        service_fields = [field for field in ('created_at', 'updated_at', 'processed_at') if field in model_fields]
+        now = await self.datetime_formatter.now_local() if service_fields else None
+        
+        prepared_records = []
+        for record in records:
+            all_fields = record.copy()
+            for service_field in service_fields:
+                if service_field not in all_fields:
+                    all_fields[service_field] = now
+            prepared_fields = await self.prepare_fields(model, all_fields, json_fields=json_fields, is_update=False)
+            if prepared_fields:
+                prepared_records.append(prepared_fields)
+        
+        return prepared_records
+    
     async def prepare_fields(self, model: DeclarativeMeta, fields: Dict[str, Any], 
                       json_fields: Optional[List[str]] = None, is_update: bool = False) -> Optional[Dict[str, Any]]:
         """Prepares fields for creating/updating record."""
@@ -120,17 +176,24 @@ class DataPreparer:
                            json_fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """Converts fields to required types based on table schema."""
         result = {}
+        converters = self._get_column_converters(model)
         
         for field_name, value in fields.items():
             if value is None:
                 result[field_name] = None
                 continue
-                
-            column = model.__table__.columns.get(field_name)
-            if column is None:
+            
+            if field_name not in converters:
                 continue
             
             try:
+                converter = converters[field_name]
+                if converter is not None and not (json_fields and field_name in json_fields):
+                    result[field_name] = converter(value)
+                    continue
+                
+                # JSON fields and date/time strings
+                column = model.__table__.columns.get(field_name)
                 converted_value = await self._convert_single_field(column, value, field_name, json_fields)
                 result[field_name] = converted_value
             except Exception as e:
@@ -215,3 +278,27 @@ class DataPreparer:
         
         # For other types return as is
         return value
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _convert_text(value: Any) -> str:
+    # For Text columns: if value is array or dictionary, serialize to JSON string
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return str(value)
+
+
+def _convert_boolean(value: Any) -> bool:
+    if isinstance(value, str):
+        # Convert only strings 'true' and 'false' to boolean values
+        value_lower = value.lower().strip()
+        if value_lower == 'true':
+            return True
+        if value_lower == 'false':
+            return False
+        # For other strings use explicit conversion
+        return bool(value)
+    return bool(value)
@@ -0,0 +1,77 @@
+"""
+Dedicated thread pool for synchronous DB calls
+Sync engine (psycopg2, sqlite3) blocks the calling thread, so session operations are moved off event loop
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class DbExecutor:
+    """
+    ThreadPoolExecutor with queue depth and wait time statistics
+    Pool size matches DB connection pool (pool_size + max_overflow): more threads would only wait for connection
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db')
+        self._lock = threading.Lock()
+
+        # Submitted but not started (waiting for free thread)
+        self._queued = 0
+        self._active = 0
+        self._max_queued = 0
+        self._submitted = 0
+        self._completed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func in DB thread, await result in event loop"""
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+            self._submitted += 1
+            self._max_queued = max(self._max_queued, self._queued)
+
+        # Context is copied so engine event hooks in DB thread see caller context (repository method tag)
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, context.run, self._call, submitted_at, func, args, kwargs)
+
+    def _call(self, submitted_at: float, func: Callable, args: tuple, kwargs: dict) -> Any:
+        wait = time.perf_counter() - submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth (calls waiting for thread) and wait time; growing wait means pool is bottleneck"""
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                'max_workers': self.max_workers,
+                'active': self._active,
+                'queue_depth': self._queued,
+                'max_queue_depth': self._max_queued,
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'wait_avg_ms': round(self._wait_total / started * 1000, 3) if started else 0.0,
+                'wait_max_ms': round(self._wait_max * 1000, 3),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,688 @@
+"""
+In-process vector index for SQLite preset (vector_storage table requires PostgreSQL with pgvector)
+Each tenant has own directory: memory-mapped matrix of vectors (float32 or float16) and sidecar SQLite file
+with chunk fields; chunk row in sidecar points to its row in matrix (vector_row)
+Search is exact (vectorized dot products over matrix), large tenants can use HNSW graph (hnswlib, optional)
+"""
+
+import json
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:  # HNSW is optional, exact search is used without it
+    hnswlib = None
+
+# Initial matrix capacity in rows (grows x2)
+INITIAL_CAPACITY = 1024
+
+# Rows per matrix block in exact search (bounds temporary float32 copy for float16 storage)
+SEARCH_BLOCK_ROWS = 65536
+
+SUPPORTED_DTYPES = ('float32', 'float16')
+
+CHUNK_FIELDS = (
+    'document_id', 'chunk_index', 'document_type', 'role', 'chunk_metadata',
+    'content', 'embedding_model', 'created_at', 'processed_at'
+)
+
+SIDECAR_SCHEMA = """
+create table if not exists chunks (
+    id integer primary key,
+    document_id text not null,
+    chunk_index integer not null,
+    document_type text not null,
+    role text not null default 'user',
+    chunk_metadata text,
+    content text not null,
+    embedding_model text,
+    vector_row integer unique,
+    created_at text not null,
+    processed_at text not null,
+    unique (document_id, chunk_index)
+);
+create index if not exists idx_chunks_type on chunks (document_type);
+create index if not exists idx_chunks_created on chunks (created_at);
+create index if not exists idx_chunks_processed on chunks (processed_at);
+create table if not exists free_rows (vector_row integer primary key);
+create table if not exists meta (key text primary key, value text not null);
+"""
+
+# Full-text index over chunks.content (external content: text is not stored twice), kept in sync by triggers
+FTS_SCHEMA = """
+create virtual table chunks_fts using fts5(content, content='chunks', content_rowid='rowid');
+create trigger chunks_fts_insert after insert on chunks begin
+    insert into chunks_fts (rowid, content) values (new.rowid, new.content);
+end;
+create trigger chunks_fts_delete after delete on chunks begin
+    insert into chunks_fts (chunks_fts, rowid, content) values ('delete', old.rowid, old.content);
+end;
+create trigger chunks_fts_update after update of content on chunks begin
+    insert into chunks_fts (chunks_fts, rowid, content) values ('delete', old.rowid, old.content);
+    insert into chunks_fts (rowid, content) values (new.rowid, new.content);
+end;
+insert into chunks_fts (chunks_fts) values ('rebuild');
+"""
+
+_FTS_TOKEN_RE = re.compile(r'"([^"]+)"|(\w+)')
+
+
+def fts_query(query_text: str) -> str:
+    """
+    FTS5 query from user text: words and "quoted phrases", all required (like websearch_to_tsquery)
+    Every term is quoted, so FTS5 operators and punctuation in text are not interpreted
+    """
+    terms = []
+    for phrase, word in _FTS_TOKEN_RE.findall(query_text or ''):
+        words = re.findall(r'\w+', phrase) if phrase else [word]
+        if words:
+            terms.append('"' + ' '.join(words) + '"')
+    return ' '.join(terms)
+
+
+def to_iso(value: Any) -> Optional[str]:
+    """Dates are stored as ISO strings (same format compares correctly as text)"""
+    if value is None:
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def metadata_contains(metadata: Any, expected: Any) -> bool:
+    """Same semantics as JSONB @> operator: nested objects are subsets, arrays contain all expected items"""
+    if isinstance(expected, dict):
+        return isinstance(metadata, dict) and all(
+            key in metadata and metadata_contains(metadata[key], value) for key, value in expected.items()
+        )
+    if isinstance(expected, list):
+        if not isinstance(metadata, list):
+            return False
+        return all(any(metadata_contains(item, value) for item in metadata) for value in expected)
+    if isinstance(metadata, list):
+        # Top-level scalar matches array containing it
+        return expected in metadata
+    return metadata == expected
+
+
+class ChunkFilter:
+    """Chunk filters of vector_storage contract: document_type, document_id, date range, metadata containment"""
+
+    def __init__(self, document_type=None, document_id=None, until_date=None, since_date=None,
+                 metadata_filter: Optional[Dict[str, Any]] = None, date_field: str = 'processed_at'):
+        self.document_type = [document_type] if isinstance(document_type, str) else (document_type or None)
+        self.document_id = [document_id] if isinstance(document_id, str) else (document_id or None)
+        self.until_date = to_iso(until_date)
+        self.since_date = to_iso(since_date)
+        self.metadata_filter = metadata_filter or None
+        self.date_field = date_field
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.document_type or self.document_id or self.until_date or self.since_date or self.metadata_filter)
+
+    def to_sql(self) -> Tuple[List[str], List[Any]]:
+        """WHERE conditions for sidecar (metadata is checked in Python)"""
+        conditions, params = [], []
+        for field, values in (('document_type', self.document_type), ('document_id', self.document_id)):
+            if values:
+                conditions.append(f"{field} in ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if self.until_date is not None:
+            conditions.append(f"{self.date_field} <= ?")
+            params.append(self.until_date)
+        if self.since_date is not None:
+            conditions.append(f"{self.date_field} >= ?")
+            params.append(self.since_date)
+        return conditions, params
+
+    def matches_metadata(self, metadata_json: Optional[str]) -> bool:
+        if not self.metadata_filter:
+            return True
+        return metadata_contains(json.loads(metadata_json) if metadata_json else None, self.metadata_filter)
+
+
+class TenantVectorStore:
+    """
+    Vectors and chunks of one tenant
+    Vector is written to matrix and flushed before sidecar commit, so sidecar never points to unwritten row
+    Calls are serialized by lock (store may be used from DB executor threads)
+    """
+
+    def __init__(self, directory: str, logger: Any, dtype: str = 'float32', hnsw_min_rows: int = 20000,
+                 hnsw_m: int = 16, hnsw_ef_construction: int = 64, hnsw_ef_search: int = 64):
+        self.directory = directory
+        self.logger = logger
+        self.hnsw_min_rows = hnsw_min_rows
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, 'chunks.db'), check_same_thread=False, isolation_level=None)
+        self._db.execute("pragma journal_mode=WAL")
+        self._db.execute("pragma synchronous=NORMAL")
+        self._db.executescript(SIDECAR_SCHEMA)
+        if self._db.execute("select 1 from sqlite_master where name = 'chunks_fts'").fetchone() is None:
+            self._db.executescript(FTS_SCHEMA)
+
+        meta = dict(self._db.execute("select key, value from meta").fetchall())
+        self.dtype = meta.get('dtype', dtype)
+        self.dimensions = int(meta['dimensions']) if 'dimensions' in meta else None
+        self._next_row = int(meta.get('next_row', 0))
+
+        self._matrix: Optional[np.memmap] = None
+        self._capacity = 0
+        # Row norms (cosine similarity) and live rows mask, rebuilt from sidecar on open
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._hnsw = None
+
+        if self.dimensions is not None:
+            self._open_matrix()
+            rows = [row for (row,) in self._db.execute("select vector_row from chunks where vector_row is not null")]
+            self._live[rows] = True
+            self._norms[:self._next_row] = self._row_norms(0, self._next_row)
+
+    # === Matrix ===
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, f'vectors.{self.dtype}')
+
+    def _open_matrix(self) -> None:
+        row_bytes = self.dimensions * np.dtype(self.dtype).itemsize
+        size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+        self._resize_matrix(max(size // row_bytes, self._next_row, INITIAL_CAPACITY))
+
+    def _resize_matrix(self, capacity: int) -> None:
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        with open(self._vectors_path, 'ab') as file:
+            file.truncate(capacity * self.dimensions * np.dtype(self.dtype).itemsize)
+        self._matrix = np.memmap(self._vectors_path, dtype=self.dtype, mode='r+', shape=(capacity, self.dimensions))
+
+        norms = np.zeros(capacity, dtype=np.float32)
+        norms[:len(self._norms)] = self._norms[:capacity]
+        live = np.zeros(capacity, dtype=bool)
+        live[:len(self._live)] = self._live[:capacity]
+        self._norms, self._live, self._capacity = norms, live, capacity
+
+        if self._hnsw is not None:
+            self._hnsw.resize_index(capacity)
+
+    def _row_norms(self, start: int, end: int) -> np.ndarray:
+        norms = np.zeros(end - start, dtype=np.float32)
+        for block in range(start, end, SEARCH_BLOCK_ROWS):
+            block_end = min(block + SEARCH_BLOCK_ROWS, end)
+            norms[block - start:block_end - start] = np.linalg.norm(
+                np.asarray(self._matrix[block:block_end], dtype=np.float32), axis=1
+            )
+        return norms
+
+    def _as_vector(self, embedding: Any) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        if self.dimensions is None:
+            self.dimensions = len(vector)
+            self._db.execute("insert or replace into meta values ('dimensions', ?), ('dtype', ?)",
+                             (str(self.dimensions), self.dtype))
+            self._open_matrix()
+        elif len(vector) != self.dimensions:
+            raise ValueError(f"expected {self.dimensions} dimensions, not {len(vector)}")
+        return vector
+
+    def _allocate_rows(self, count: int) -> List[int]:
+        rows = [row for (row,) in self._db.execute("select vector_row from free_rows order by vector_row limit ?", (count,))]
+        if rows:
+            self._db.execute(f"delete from free_rows where vector_row in ({', '.join('?' * len(rows))})", rows)
+        while len(rows) < count:
+            rows.append(self._next_row)
+            self._next_row += 1
+        self._db.execute("insert or replace into meta values ('next_row', ?)", (str(self._next_row),))
+        if self._next_row > self._capacity:
+            self._resize_matrix(max(self._next_row, self._capacity * 2))
+        return rows
+
+    def _write_vectors(self, rows: List[int], vectors: List[np.ndarray]) -> None:
+        matrix_rows = np.asarray(rows)
+        block = np.stack(vectors)
+        self._matrix[matrix_rows] = block
+        self._matrix.flush()
+        self._norms[matrix_rows] = np.linalg.norm(np.asarray(self._matrix[matrix_rows], dtype=np.float32), axis=1)
+
+    def _release_rows(self, rows: List[int]) -> None:
+        if not rows:
+            return
+        self._live[rows] = False
+        self._db.executemany("insert or ignore into free_rows values (?)", [(row,) for row in rows])
+        if self._hnsw is not None:
+            for row in rows:
+                self._hnsw.mark_deleted(row)
+
+    # === Writes ===
+
+    def add_chunks(self, chunks: List[Dict[str, Any]]) -> int:
+        """Insert chunks in one transaction (duplicate (document_id, chunk_index) fails whole batch)"""
+        with self._lock:
+            self._db.execute("begin")
+            try:
+                with_vectors = [chunk for chunk in chunks if chunk.get('embedding') is not None]
+                vectors = [self._as_vector(chunk['embedding']) for chunk in with_vectors]
+                rows = self._allocate_rows(len(vectors)) if vectors else []
+                row_by_chunk = {id(chunk): row for chunk, row in zip(with_vectors, rows, strict=False)}
+
+                self._db.executemany(
+                    "insert into chunks (document_id, chunk_index, document_type, role, chunk_metadata, content, "
+                    "embedding_model, vector_row, created_at, processed_at) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self._chunk_params(chunk, row_by_chunk.get(id(chunk))) for chunk in chunks]
+                )
+                if rows:
+                    self._write_vectors(rows, vectors)
+                self._db.execute("commit")
+            except Exception:
+                self._db.execute("rollback")
+                self._reload_meta()
+                raise
+
+            if rows:
+                self._live[rows] = True
+                self._hnsw_add(rows)
+            return len(chunks)
+
+    def update_chunk(self, document_id: str, chunk_index: int, fields: Dict[str, Any]) -> bool:
+        """Update content, embedding, embedding_model and processed_at of chunk"""
+        with self._lock:
+            found = self._db.execute(
+                "select vector_row from chunks where document_id = ? and chunk_index = ?", (document_id, chunk_index)
+            ).fetchone()
+            if found is None:
+                return True
+
+            self._db.execute("begin")
+            try:
+                row = found[0]
+                if fields.get('embedding') is not None:
+                    vector = self._as_vector(fields['embedding'])
+                    if row is None:
+                        row = self._allocate_rows(1)[0]
+                    self._write_vectors([row], [vector])
+                elif row is not None:
+                    # Embedding set to NULL: chunk stays, vector row is freed
+                    self._release_rows([row])
+                    row = None
+                values = {key: fields[key] for key in ('content', 'embedding_model') if fields.get(key) is not None}
+                if fields.get('processed_at') is not None:
+                    values['processed_at'] = to_iso(fields['processed_at'])
+                values['vector_row'] = row
+                self._db.execute(
+                    f"update chunks set {', '.join(f'{key} = ?' for key in values)} where document_id = ? and chunk_index = ?",
+                    [*values.values(), document_id, chunk_index]
+                )
+                self._db.execute("commit")
+            except Exception:
+                self._db.execute("rollback")
+                self._reload_meta()
+                raise
+
+            if row is not None:
+                self._live[row] = True
+                self._hnsw_add([row])
+            return True
+
+    def delete(self, chunk_filter: ChunkFilter) -> int:
+        with self._lock:
+            conditions, params = chunk_filter.to_sql()
+            where = f"where {' and '.join(conditions)}" if conditions else ""
+            found = [
+                (rowid, row) for rowid, row, metadata in
+                self._db.execute(f"select rowid, vector_row, chunk_metadata from chunks {where}", params)
+                if chunk_filter.matches_metadata(metadata)
+            ]
+            if not found:
+                return 0
+
+            self._db.execute("begin")
+            try:
+                self._db.executemany("delete from chunks where rowid = ?", [(rowid,) for rowid, _ in found])
+                self._release_rows([row for _, row in found if row is not None])
+                self._db.execute("commit")
+            except Exception:
+                self._db.execute("rollback")
+                raise
+            return len(found)
+
+    def _reload_meta(self) -> None:
+        """After rollback: row counter and free rows come back from sidecar"""
+        meta = dict(self._db.execute("select key, value from meta").fetchall())
+        self._next_row = int(meta.get('next_row', 0))
+        if 'dimensions' not in meta:
+            self.dimensions = None
+
+    @staticmethod
+    def _chunk_params(chunk: Dict[str, Any], row: Optional[int]) -> tuple:
+        metadata = chunk.get('chunk_metadata')
+        if metadata is not None and not isinstance(metadata, str):
+            metadata = json.dumps(metadata, ensure_ascii=False, default=str)
+        return (
+            chunk['document_id'], chunk['chunk_index'], chunk['document_type'], chunk.get('role') or 'user',
+            metadata, chunk['content'], chunk.get('embedding_model'), row,
+            to_iso(chunk['created_at']), to_iso(chunk['processed_at'])
+        )
+
+    # === Reads ===
+
+    def get_chunks(self, chunk_filter: ChunkFilter, chunk_index: Optional[int] = None,
+                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Chunks with embedding in document order"""
+        with self._lock:
+            conditions, params = chunk_filter.to_sql()
+            if chunk_index is not None:
+                conditions.append("chunk_index = ?")
+                params.append(chunk_index)
+            where = f"where {' and '.join(conditions)}" if conditions else ""
+            cursor = self._db.execute(
+                f"select {', '.join(CHUNK_FIELDS)}, vector_row from chunks {where} order by document_id, chunk_index", params
+            )
+            chunks = []
+            for row in self._iter_matching(cursor, chunk_filter, limit):
+                chunk = self._row_to_chunk(row)
+                vector_row = row[-1]
+                chunk['embedding'] = (
+                    np.asarray(self._matrix[vector_row], dtype=np.float32).tolist() if vector_row is not None else None
+                )
+                chunks.append(chunk)
+            return chunks
+
+    def last_chunk_index(self, document_id: str) -> int:
+        """Last chunk_index of document (-1 - no chunks)"""
+        with self._lock:
+            last_index = self._db.execute(
+                "select max(chunk_index) from chunks where document_id = ?", (document_id,)
+            ).fetchone()[0]
+            return -1 if last_index is None else last_index
+
+    def recent(self, limit: int, chunk_filter: ChunkFilter) -> List[Dict[str, Any]]:
+        """Last chunks by created_at (same multi-level order as vector_storage repository)"""
+        with self._lock:
+            conditions, params = chunk_filter.to_sql()
+            where = f"where {' and '.join(conditions)}" if conditions else ""
+            cursor = self._db.execute(
+                f"select {', '.join(CHUNK_FIELDS)} from chunks {where} "
+                "order by created_at desc, processed_at desc, chunk_index asc, document_id asc", params
+            )
+            return [self._row_to_chunk(row) for row in self._iter_matching(cursor, chunk_filter, limit)]
+
+    def search(self, query_vector: List[float], limit: int, min_similarity: float,
+               chunk_filter: ChunkFilter) -> List[Dict[str, Any]]:
+        """Top chunks by cosine similarity (exact or HNSW for large candidate sets)"""
+        with self._lock:
+            query = self._normalized_query(query_vector)
+            if query is None or limit <= 0:
+                return []
+            rows, scores = self._nearest(query, limit, chunk_filter)
+            keep = scores >= min_similarity
+            return self._load_results(rows[keep], scores[keep])
+
+    def search_hybrid(self, query_text: str, query_vector: Optional[List[float]], limit: int, chunk_filter: ChunkFilter,
+                      min_similarity: Optional[float] = None, candidates: int = 20, lexical_weight: float = 1.0,
+                      vector_weight: float = 1.0, rrf_k: int = 60) -> List[Dict[str, Any]]:
+        """
+        Full-text (FTS5, bm25) and vector candidates combined by reciprocal rank fusion
+        min_similarity limits only vector candidates
+        """
+        with self._lock:
+            if limit <= 0:
+                return []
+            fused: Dict[Tuple[str, int], Dict[str, Any]] = {}
+
+            def add_rank(key, rank_field, rank, weight):
+                entry = fused.setdefault(key, {'score': 0.0, 'lexical_rank': None, 'vector_rank': None})
+                entry[rank_field] = rank
+                entry['score'] += weight / (rrf_k + rank)
+
+            match = fts_query(query_text)
+            if match:
+                conditions, params = chunk_filter.to_sql()
+                where = ''.join(f" and {condition}" for condition in conditions)
+                cursor = self._db.execute(
+                    "select chunks.document_id, chunks.chunk_index, chunks.chunk_metadata "
+                    f"from chunks_fts join chunks on chunks.rowid = chunks_fts.rowid where chunks_fts match ?{where} "
+                    "order by bm25(chunks_fts)", [match, *params]
+                )
+                rank = 0
+                for document_id, chunk_index, metadata in cursor:
+                    if rank >= candidates:
+                        break
+                    if chunk_filter.matches_metadata(metadata):
+                        rank += 1
+                        add_rank((document_id, chunk_index), 'lexical_rank', rank, lexical_weight)
+
+            query = self._normalized_query(query_vector) if query_vector is not None else None
+            if query is not None:
+                rows, scores = self._nearest(query, candidates, chunk_filter)
+                if min_similarity is not None:
+                    rows = rows[scores >= min_similarity]
+                keys = self._keys_by_vector_row(rows.tolist())
+                for rank, row in enumerate(rows.tolist(), start=1):
+                    add_rank(keys[row], 'vector_rank', rank, vector_weight)
+
+            top = sorted(fused.items(), key=lambda item: (-item[1]['score'], item[0]))[:limit]
+            results = []
+            for (document_id, chunk_index), entry in top:
+                row = self._db.execute(
+                    f"select {', '.join(CHUNK_FIELDS)}, vector_row from chunks where document_id = ? and chunk_index = ?",
+                    (document_id, chunk_index)
+                ).fetchone()
+                chunk = self._row_to_chunk(row)
+                vector_row = row[-1]
+                similarity = None
+                if query is not None and vector_row is not None and self._norms[vector_row] > 0:
+                    vector = np.asarray(self._matrix[vector_row], dtype=np.float32)
+                    similarity = round(float(vector @ query / self._norms[vector_row]), 4)
+                chunk.update({
+                    'similarity': similarity,
+                    'score': round(entry['score'], 6),
+                    'lexical_rank': entry['lexical_rank'],
+                    'vector_rank': entry['vector_rank'],
+                })
+                results.append(chunk)
+            return results
+
+    def _normalized_query(self, query_vector: List[float]) -> Optional[np.ndarray]:
+        if self.dimensions is None:
+            return None
+        query = self._as_vector(query_vector)
+        query_norm = float(np.linalg.norm(query))
+        return query / query_norm if query_norm else None
+
+    def _nearest(self, query: np.ndarray, limit: int, chunk_filter: ChunkFilter):
+        """(vector rows, similarities) of top chunks passing filter"""
+        candidates = None
+        if not chunk_filter.is_empty:
+            conditions, params = chunk_filter.to_sql()
+            conditions.append("vector_row is not null")
+            cursor = self._db.execute(
+                f"select vector_row, chunk_metadata from chunks where {' and '.join(conditions)}", params
+            )
+            candidates = np.fromiter(
+                (row for row, metadata in cursor if chunk_filter.matches_metadata(metadata)), dtype=np.int64
+            )
+            if not len(candidates):
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        candidate_count = len(candidates) if candidates is not None else int(self._live.sum())
+        if hnswlib is not None and candidate_count >= self.hnsw_min_rows:
+            return self._search_hnsw(query, limit, candidates)
+        return self._search_exact(query, limit, candidates)
+
+    def _keys_by_vector_row(self, rows: List[int]) -> Dict[int, Tuple[str, int]]:
+        keys = {}
+        for start in range(0, len(rows), 500):
+            part = rows[start:start + 500]
+            for document_id, chunk_index, row in self._db.execute(
+                f"select document_id, chunk_index, vector_row from chunks where vector_row in ({', '.join('?' * len(part))})",
+                part
+            ):
+                keys[row] = (document_id, chunk_index)
+        return keys
+
+    def _search_exact(self, query: np.ndarray, limit: int, candidates: Optional[np.ndarray]):
+        if candidates is None:
+            candidates = np.flatnonzero(self._live[:self._next_row])
+        best_rows = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0, dtype=np.float32)
+        for start in range(0, len(candidates), SEARCH_BLOCK_ROWS):
+            rows = candidates[start:start + SEARCH_BLOCK_ROWS]
+            vectors = np.asarray(self._matrix[rows], dtype=np.float32)
+            norms = self._norms[rows]
+            scores = np.divide(vectors @ query, norms, out=np.zeros(len(rows), dtype=np.float32), where=norms > 0)
+            best_rows = np.concatenate([best_rows, rows])
+            best_scores = np.concatenate([best_scores, scores])
+            if len(best_scores) > limit:
+                top = np.argpartition(-best_scores, limit - 1)[:limit]
+                best_rows, best_scores = best_rows[top], best_scores[top]
+        order = np.argsort(-best_scores, kind='stable')
+        return best_rows[order], best_scores[order]
+
+    def _search_hnsw(self, query: np.ndarray, limit: int, candidates: Optional[np.ndarray]):
+        index = self._ensure_hnsw()
+        allowed = set(candidates.tolist()) if candidates is not None else None
+        k = min(limit, len(allowed) if allowed is not None else int(self._live.sum()))
+        index.set_ef(max(self.hnsw_ef_search, k))
+        labels, distances = index.knn_query(
+            query, k=k, filter=(lambda label: label in allowed) if allowed is not None else None
+        )
+        return labels[0].astype(np.int64), (1 - distances[0]).astype(np.float32)
+
+    def _ensure_hnsw(self):
+        if self._hnsw is None:
+            index = hnswlib.Index(space='cosine', dim=self.dimensions)
+            index.init_index(max_elements=self._capacity, ef_construction=self.hnsw_ef_construction, M=self.hnsw_m)
+            rows = np.flatnonzero(self._live[:self._next_row])
+            for start in range(0, len(rows), SEARCH_BLOCK_ROWS):
+                block = rows[start:start + SEARCH_BLOCK_ROWS]
+                index.add_items(np.asarray(self._matrix[block], dtype=np.float32), block)
+            self._hnsw = index
+            self.logger.info(f"HNSW index built for {len(rows)} vectors ({self.directory})")
+        return self._hnsw
+
+    def _hnsw_add(self, rows: List[int]) -> None:
+        """Keep built graph in sync (graph is built lazily on first large search)"""
+        if self._hnsw is None:
+            return
+        for row in rows:
+            try:
+                self._hnsw.unmark_deleted(row)
+            except RuntimeError:
+                pass
+        self._hnsw.add_items(np.asarray(self._matrix[rows], dtype=np.float32), rows)
+
+    def _load_results(self, rows: np.ndarray, scores: np.ndarray) -> List[Dict[str, Any]]:
+        if not len(rows):
+            return []
+        found = {}
+        row_list = rows.tolist()
+        for start in range(0, len(row_list), 500):
+            part = row_list[start:start + 500]
+            for row in self._db.execute(
+                f"select {', '.join(CHUNK_FIELDS)}, vector_row from chunks where vector_row in ({', '.join('?' * len(part))})",
+                part
+            ):
+                found[row[-1]] = self._row_to_chunk(row)
+        results = []
+        for row, score in zip(row_list, scores.tolist(), strict=False):
+            chunk = found.get(row)
+            if chunk is not None:
+                chunk['similarity'] = round(score, 4)
+                results.append(chunk)
+        return results
+
+    @staticmethod
+    def _iter_matching(cursor: Iterable[tuple], chunk_filter: ChunkFilter, limit: Optional[int]):
+        metadata_position = CHUNK_FIELDS.index('chunk_metadata')
+        returned = 0
+        for row in cursor:
+            if limit is not None and returned >= limit:
+                break
+            if chunk_filter.matches_metadata(row[metadata_position]):
+                returned += 1
+                yield row
+
+    @staticmethod
+    def _row_to_chunk(row: tuple) -> Dict[str, Any]:
+        chunk = dict(zip(CHUNK_FIELDS, row, strict=False))
+        if chunk['chunk_metadata'] is not None:
+            chunk['chunk_metadata'] = json.loads(chunk['chunk_metadata'])
+        return chunk
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'chunks': self._db.execute("select count(*) from chunks").fetchone()[0],
+                'vectors': int(self._live.sum()),
+                'capacity': self._capacity,
+                'dimensions': self.dimensions,
+                'dtype': self.dtype,
+                'hnsw': self._hnsw is not None,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._matrix is not None:
+                self._matrix.flush()
+                self._matrix = None
+            self._db.close()
+
+
+class LocalVectorIndex:
+    """Tenant stores opened on first access; for in-memory SQLite database index lives in temporary directory"""
+
+    def __init__(self, logger: Any, path: Optional[str] = None, dtype: str = 'float32', hnsw_min_rows: int = 20000,
+                 hnsw_m: int = 16, hnsw_ef_construction: int = 64, hnsw_ef_search: int = 64):
+        self.logger = logger
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"vector_index dtype must be one of {SUPPORTED_DTYPES}, not {dtype!r}")
+
+        self._temporary = path is None
+        self.path = tempfile.mkdtemp(prefix='vector_index_') if path is None else path
+        self._store_settings = {
+            'dtype': dtype, 'hnsw_min_rows': hnsw_min_rows, 'hnsw_m': hnsw_m,
+            'hnsw_ef_construction': hnsw_ef_construction, 'hnsw_ef_search': hnsw_ef_search,
+        }
+        self._stores: Dict[int, TenantVectorStore] = {}
+        self._lock = threading.Lock()
+
+    def get_store(self, tenant_id: int) -> TenantVectorStore:
+        store = self._stores.get(tenant_id)
+        if store is None:
+            with self._lock:
+                store = self._stores.get(tenant_id)
+                if store is None:
+                    directory = os.path.join(self.path, f'tenant_{int(tenant_id)}')
+                    store = self._stores[tenant_id] = TenantVectorStore(directory, self.logger, **self._store_settings)
+        return store
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'hnsw_available': hnswlib is not None,
+            'tenants': {tenant_id: store.get_stats() for tenant_id, store in sorted(self._stores.items())},
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            for store in self._stores.values():
+                store.close()
+            self._stores.clear()
+        if self._temporary:
+            shutil.rmtree(self.path, ignore_errors=True)
@@ -0,0 +1,128 @@
+"""
+Binary COPY (COPY ... FROM STDIN WITH (FORMAT binary)) for PostgreSQL bulk inserts
+Rows are encoded on client once: vectors go as float4 arrays (no text literal per value, no parsing on server),
+same payload is sent through psycopg2 (copy_expert) and asyncpg (copy_to_table)
+"""
+
+import json
+import struct
+from datetime import datetime
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterable, Sequence
+
+import numpy as np
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import JSON, BigInteger, Boolean, DateTime, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.util import await_only
+
+COPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)  # signature, flags, header extension length
+COPY_TRAILER = struct.pack('>h', -1)
+NULL_FIELD = struct.pack('>i', -1)
+
+# timestamp binary format: microseconds since 2000-01-01
+POSTGRES_EPOCH = datetime(2000, 1, 1)
+
+
+def _encode_int4(value: Any) -> bytes:
+    return struct.pack('>i', int(value))
+
+
+def _encode_int8(value: Any) -> bytes:
+    return struct.pack('>q', int(value))
+
+
+def _encode_bool(value: Any) -> bytes:
+    return b'\x01' if value else b'\x00'
+
+
+def _encode_text(value: Any) -> bytes:
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value, ensure_ascii=False, default=str)
+    return str(value).encode('utf-8')
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, default=str)
+    # jsonb binary format: version byte + json text
+    return b'\x01' + value.encode('utf-8')
+
+
+def _encode_timestamp(value: datetime) -> bytes:
+    if value.tzinfo is not None:
+        # timestamp without time zone keeps local time (same as values from datetime_formatter.now_local)
+        value = value.astimezone().replace(tzinfo=None)
+    delta = value - POSTGRES_EPOCH
+    return struct.pack('>q', (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+
+
+def _encode_vector(value: Any) -> bytes:
+    # pgvector binary format: int16 dimensions, int16 unused, big-endian float4 values
+    vector = np.asarray(value, dtype='>f4')
+    return struct.pack('>hh', vector.size, 0) + vector.tobytes()
+
+
+def _get_encoder(column_type: Any) -> Callable[[Any], bytes]:
+    # Subclasses first: BigInteger is Integer, JSONB is JSON, TIMESTAMP is DateTime
+    if isinstance(column_type, Vector):
+        return _encode_vector
+    if isinstance(column_type, JSONB):
+        return _encode_jsonb
+    if isinstance(column_type, BigInteger):
+        return _encode_int8
+    if isinstance(column_type, Integer):
+        return _encode_int4
+    if isinstance(column_type, Boolean):
+        return _encode_bool
+    if isinstance(column_type, DateTime) and not column_type.timezone:
+        return _encode_timestamp
+    if isinstance(column_type, (String, Text, JSON)):
+        return _encode_text
+    raise TypeError(f"Binary COPY encoding is not supported for column type {column_type!r}")
+
+
+class BinaryCopy:
+    """
+    COPY of listed columns of model table (generated and omitted columns are filled by PostgreSQL)
+    Encoders are resolved once from column types
+    """
+
+    def __init__(self, table: Any, columns: Sequence[str]):
+        self.table_name = table.name
+        self.columns = tuple(columns)
+        self.sql = f"copy {table.name} ({', '.join(self.columns)}) from stdin with (format binary)"
+        self._encoders = [(name, _get_encoder(table.columns[name].type)) for name in self.columns]
+        self._field_count = struct.pack('>h', len(self.columns))
+
+    def encode(self, rows: Iterable[Dict[str, Any]]) -> bytes:
+        """Full COPY stream (header, tuples, trailer) for rows (missing keys and None are NULL)"""
+        parts = [COPY_HEADER]
+        for row in rows:
+            parts.append(self._field_count)
+            for name, encode in self._encoders:
+                value = row.get(name)
+                if value is None:
+                    parts.append(NULL_FIELD)
+                    continue
+                data = encode(value)
+                parts.append(struct.pack('>i', len(data)))
+                parts.append(data)
+        parts.append(COPY_TRAILER)
+        return b''.join(parts)
+
+    def copy(self, session: Any, payload: bytes) -> None:
+        """
+        Sends encoded payload on connection of sync Session, called through session.run_sync
+        (AsyncSession.run_sync or SyncSessionAdapter.run_sync)
+        One COPY statement is atomic: whole payload is inserted or none of it
+        """
+        connection = session.connection().connection.driver_connection
+        if hasattr(connection, 'copy_to_table'):
+            # asyncpg: run_sync body runs in greenlet of AsyncSession, driver coroutine is awaited by SQLAlchemy
+            await_only(connection.copy_to_table(
+                self.table_name, source=payload, columns=list(self.columns), format='binary'
+            ))
+            return
+        with connection.cursor() as cursor:
+            cursor.copy_expert(self.sql, BytesIO(payload))
@@ -0,0 +1,296 @@
+"""
+Query latency instrumentation through SQLAlchemy engine events
+Execution time per statement is grouped by calling repository method (db_read / db_write annotation),
+memory is bounded: fixed histogram buckets per method, limited number of methods
+"""
+
+import bisect
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+
+from .replica_router import current_method
+
+# Histogram bucket upper bounds in milliseconds (last bucket is +Inf)
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Statements outside annotated repository methods (DDL, views, backups)
+OTHER_METHOD = 'other'
+
+# Methods over limit are counted under OTHER_METHOD
+MAX_METHODS = 500
+
+SLOW_STATEMENT_MAX_CHARS = 1000
+
+# Pool connection record info keys (record outlives checkouts, dropped on invalidation)
+_CONNECT_STARTED_AT = '_query_stats_connect_started_at'
+_CHECKED_OUT_AT = '_query_stats_checked_out_at'
+
+
+class LatencyHistogram:
+    """Count, sum, max and fixed buckets; percentiles are estimated by bucket upper bound"""
+
+    __slots__ = ('count', 'total_ms', 'max_ms', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        self.buckets[bisect.bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                # Upper bound of bucket, values above last bound are reported as max
+                return float(BUCKETS_MS[index]) if index < len(BUCKETS_MS) else round(self.max_ms, 3)
+        return round(self.max_ms, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+        }
+
+
+class QueryStats:
+    """
+    Statement latency by repository method, slow query log and pool usage per engine
+    Event hooks run in thread executing statement (event loop, DB executor thread or async engine greenlet)
+    Pool usage: time to open new DB connection, time connection is held out of pool, connections checked out now
+    """
+
+    def __init__(self, logger: Any, slow_query_ms: float = 500.0):
+        self.logger = logger
+        self.slow_query_ms = slow_query_ms
+
+        self._lock = threading.Lock()
+        self._queries: Dict[str, LatencyHistogram] = {}
+        self._errors: Dict[str, int] = {}
+        self._connects: Dict[str, LatencyHistogram] = {}
+        self._checkouts: Dict[str, LatencyHistogram] = {}
+        # pool name -> [checked out now, max checked out]
+        self._checked_out: Dict[str, List[int]] = {}
+        self._slow_queries = 0
+
+    def instrument(self, engine: Any, pool_name: str = 'primary') -> None:
+        """
+        Attach hooks to sync engine (for async engine pass async_engine.sync_engine)
+        Pool hooks are registered through engine, so pool recreated on dispose keeps them
+        """
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        event.listen(engine, 'handle_error', self._handle_error)
+
+        def do_connect(dialect, connection_record, cargs, cparams):
+            connection_record.info[_CONNECT_STARTED_AT] = time.perf_counter()
+
+        def on_connect(dbapi_connection, connection_record):
+            started_at = connection_record.info.pop(_CONNECT_STARTED_AT, None)
+            if started_at is not None:
+                self.record_connect(pool_name, (time.perf_counter() - started_at) * 1000)
+
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            connection_record.info[_CHECKED_OUT_AT] = time.perf_counter()
+            self.record_checkout(pool_name)
+
+        def on_checkin(dbapi_connection, connection_record):
+            started_at = connection_record.info.pop(_CHECKED_OUT_AT, None)
+            if started_at is not None:
+                self.record_checkin(pool_name, (time.perf_counter() - started_at) * 1000)
+
+        event.listen(engine, 'do_connect', do_connect)
+        event.listen(engine, 'connect', on_connect)
+        event.listen(engine, 'checkout', on_checkout)
+        event.listen(engine, 'checkin', on_checkin)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started_at = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started_at = getattr(context, '_query_started_at', None)
+        if started_at is None:
+            return
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        method = self.record_query(elapsed_ms)
+        if elapsed_ms >= self.slow_query_ms:
+            self._log_slow_query(method, elapsed_ms, statement, parameters, executemany)
+
+    def _handle_error(self, exception_context):
+        context = exception_context.execution_context
+        started_at = getattr(context, '_query_started_at', None)
+        if started_at is None:
+            return
+        self.record_query((time.perf_counter() - started_at) * 1000, error=True)
+
+    def _method_key(self) -> str:
+        method = current_method() or OTHER_METHOD
+        if method not in self._queries and len(self._queries) >= MAX_METHODS:
+            return OTHER_METHOD
+        return method
+
+    def record_query(self, elapsed_ms: float, error: bool = False) -> str:
+        """Add statement time to histogram of current repository method, returns method tag"""
+        with self._lock:
+            method = self._method_key()
+            histogram = self._queries.get(method)
+            if histogram is None:
+                histogram = self._queries[method] = LatencyHistogram()
+            histogram.add(elapsed_ms)
+            if error:
+                self._errors[method] = self._errors.get(method, 0) + 1
+            elif elapsed_ms >= self.slow_query_ms:
+                self._slow_queries += 1
+        return method
+
+    def record_connect(self, pool_name: str, elapsed_ms: float) -> None:
+        """New DB connection opened by pool"""
+        with self._lock:
+            self._histogram(self._connects, pool_name).add(elapsed_ms)
+
+    def record_checkout(self, pool_name: str) -> None:
+        with self._lock:
+            counters = self._checked_out.setdefault(pool_name, [0, 0])
+            counters[0] += 1
+            counters[1] = max(counters[1], counters[0])
+
+    def record_checkin(self, pool_name: str, held_ms: float) -> None:
+        """Connection returned to pool after held_ms out of it"""
+        with self._lock:
+            counters = self._checked_out.setdefault(pool_name, [1, 1])
+            counters[0] = max(0, counters[0] - 1)
+            self._histogram(self._checkouts, pool_name).add(held_ms)
+
+    @staticmethod
+    def _histogram(histograms: Dict[str, LatencyHistogram], name: str) -> LatencyHistogram:
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = LatencyHistogram()
+        return histogram
+
+    def _log_slow_query(self, method: str, elapsed_ms: float, statement: str, parameters: Any, executemany: bool) -> None:
+        """Statement text with placeholders only, parameter values are never logged"""
+        text = ' '.join(statement.split())
+        if len(text) > SLOW_STATEMENT_MAX_CHARS:
+            text = text[:SLOW_STATEMENT_MAX_CHARS] + '...'
+        if executemany:
+            redacted = f"{len(parameters)} rows redacted"
+        else:
+            redacted = f"{len(parameters) if parameters else 0} values redacted"
+        self.logger.warning(f"[SlowQuery] {method}: {elapsed_ms:.1f} ms, {text} [parameters: {redacted}]")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            methods = {}
+            for method, histogram in sorted(self._queries.items()):
+                methods[method] = histogram.to_dict()
+                methods[method]['errors'] = self._errors.get(method, 0)
+            return {
+                'slow_query_ms': self.slow_query_ms,
+                'slow_queries': self._slow_queries,
+                'methods': methods,
+                'pool_connect': {name: histogram.to_dict() for name, histogram in sorted(self._connects.items())},
+                'pool_checkout': {
+                    name: {
+                        **(self._checkouts[name].to_dict() if name in self._checkouts else LatencyHistogram().to_dict()),
+                        'checked_out': counters[0],
+                        'max_checked_out': counters[1],
+                    }
+                    for name, counters in sorted(self._checked_out.items())
+                },
+            }
+
+    def get_metrics(self) -> List[str]:
+        """Prometheus text format lines: query and pool histograms, error and slow query counters, checked out connections"""
+        with self._lock:
+            lines = []
+            lines.extend(self._histogram_lines(
+                'db_query_duration_seconds', 'Statement execution time by repository method', 'method', self._queries
+            ))
+            lines.append("# HELP db_query_errors_total Failed statements by repository method")
+            lines.append("# TYPE db_query_errors_total counter")
+            for method in sorted(self._queries):
+                lines.append(f'db_query_errors_total{{method="{_escape_label(method)}"}} {self._errors.get(method, 0)}')
+            lines.append("# HELP db_slow_queries_total Statements slower than slow_query_ms")
+            lines.append("# TYPE db_slow_queries_total counter")
+            lines.append(f"db_slow_queries_total {self._slow_queries}")
+            lines.extend(self._histogram_lines(
+                'db_pool_connect_seconds', 'Opening new connection by pool', 'pool', self._connects
+            ))
+            lines.extend(self._histogram_lines(
+                'db_pool_checkout_seconds', 'Time connection is held out of pool', 'pool', self._checkouts
+            ))
+            lines.append("# HELP db_pool_checked_out Connections checked out of pool")
+            lines.append("# TYPE db_pool_checked_out gauge")
+            for name, counters in sorted(self._checked_out.items()):
+                lines.append(f'db_pool_checked_out{{pool="{_escape_label(name)}"}} {counters[0]}')
+            return lines
+
+    @staticmethod
+    def _histogram_lines(name: str, help_text: str, label: str, histograms: Dict[str, LatencyHistogram]) -> List[str]:
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for key, histogram in sorted(histograms.items()):
+            label_value = _escape_label(key)
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS_MS, histogram.buckets, strict=False):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{{label}="{label_value}",le="{bound / 1000:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{label}="{label_value}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{{label}="{label_value}"}} {histogram.total_ms / 1000:.6f}')
+            lines.append(f'{name}_count{{{label}="{label_value}"}} {histogram.count}')
+        return lines
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def get_executor_metrics(executor_stats: Optional[Dict[str, Any]]) -> List[str]:
+    """Gauges for DB thread pool queue (sync_executor)"""
+    if executor_stats is None:
+        return []
+    return [
+        "# HELP db_executor_queue_depth Sync DB calls waiting for thread",
+        "# TYPE db_executor_queue_depth gauge",
+        f"db_executor_queue_depth {executor_stats['queue_depth']}",
+        "# HELP db_executor_active Sync DB calls running",
+        "# TYPE db_executor_active gauge",
+        f"db_executor_active {executor_stats['active']}",
+    ]
+
+
+def get_replica_metrics(replica_stats: Optional[Dict[str, Any]]) -> List[str]:
+    """Gauges for read replica health and lag"""
+    if replica_stats is None:
+        return []
+    lines = [
+        "# HELP db_replica_healthy Replica in read rotation (1) or not (0)",
+        "# TYPE db_replica_healthy gauge",
+    ]
+    for replica in replica_stats['replicas']:
+        lines.append(f'db_replica_healthy{{replica="{_escape_label(replica["name"])}"}} {int(replica["healthy"])}')
+    lines.append("# HELP db_replica_lag_seconds Replication lag from last health check")
+    lines.append("# TYPE db_replica_lag_seconds gauge")
+    for replica in replica_stats['replicas']:
+        if replica['lag_seconds'] is not None:
+            lines.append(f'db_replica_lag_seconds{{replica="{_escape_label(replica["name"])}"}} {replica["lag_seconds"]}')
+    return lines
@@ -0,0 +1,273 @@
+"""
+Read replica routing for PostgreSQL
+Repository methods are annotated with db_read / db_write, only db_read methods may go to replica
+Read-your-writes: after write in current context (event processing task) reads stay on primary for sticky_seconds
+"""
+
+import functools
+import inspect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+READ = 'read'
+WRITE = 'write'
+
+# Access mode of repository method being executed (None - not annotated, treated as write)
+_access_mode: ContextVar[Optional[str]] = ContextVar('db_access_mode', default=None)
+
+# Repository method being executed ('UserStorageRepository.get_records'), used as query stats tag
+_current_method: ContextVar[Optional[str]] = ContextVar('db_current_method', default=None)
+
+# Monotonic time of last write in current context
+_last_write_at: ContextVar[float] = ContextVar('db_last_write_at', default=0.0)
+
+# Replica query of current db_read call failed (repository methods usually swallow errors): call is repeated on primary
+_replica_failed: ContextVar[bool] = ContextVar('db_replica_failed', default=False)
+
+# db_read call is repeated on primary after replica failure
+_primary_only: ContextVar[bool] = ContextVar('db_primary_only', default=False)
+
+# Replication lag in seconds; replica that replayed all received WAL has no lag even if primary is idle
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+def db_read(func: Callable) -> Callable:
+    """
+    Repository method only reads: may be served by replica
+    Inside db_write method (nested call) read stays on primary
+    If replica connection fails during call, call is repeated once on primary
+    """
+    if not inspect.iscoroutinefunction(func):
+        raise TypeError(f"db_read expects coroutine function, got {func!r}")
+
+    method = func.__qualname__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        method_token = _current_method.set(method)
+        token = _access_mode.set(READ) if _access_mode.get() != WRITE else None
+        failed_token = _replica_failed.set(False)
+        try:
+            try:
+                result = await func(*args, **kwargs)
+            except Exception:
+                if not _replica_failed.get():
+                    raise
+            else:
+                if not _replica_failed.get():
+                    return result
+
+            primary_token = _primary_only.set(True)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _primary_only.reset(primary_token)
+        finally:
+            _replica_failed.reset(failed_token)
+            if token is not None:
+                _access_mode.reset(token)
+            _current_method.reset(method_token)
+
+    wrapper.db_access = READ
+    return wrapper
+
+
+def db_write(func: Callable) -> Callable:
+    """Repository method writes (or reads before write): always primary, makes current context sticky"""
+    if not inspect.iscoroutinefunction(func):
+        raise TypeError(f"db_write expects coroutine function, got {func!r}")
+
+    method = func.__qualname__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        method_token = _current_method.set(method)
+        token = _access_mode.set(WRITE)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _access_mode.reset(token)
+            _current_method.reset(method_token)
+
+    wrapper.db_access = WRITE
+    return wrapper
+
+
+def is_read_context() -> bool:
+    """Current repository call is annotated as read"""
+    return _access_mode.get() == READ
+
+
+def current_method() -> Optional[str]:
+    """Annotated repository method of current call (None outside repositories)"""
+    return _current_method.get()
+
+
+def mark_write() -> None:
+    """Remember write in current context (read-your-writes)"""
+    _last_write_at.set(time.monotonic())
+
+
+def is_primary_only() -> bool:
+    """Current db_read call is repeated on primary after replica failure"""
+    return _primary_only.get()
+
+
+def mark_replica_failed() -> None:
+    """Replica query of current db_read call failed: call will be repeated on primary"""
+    _replica_failed.set(True)
+
+
+class Replica:
+    """Replica connection: sync engine (health checks), session factory for queries (sync or async) and state"""
+
+    def __init__(self, name: str, engine: Any, session_factory: Any, async_engine: Any = None):
+        self.name = name
+        self.engine = engine
+        self.session_factory = session_factory
+        self.async_engine = async_engine
+
+        # Replica is out of rotation until first successful check
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_check_at: Optional[float] = None
+        self.reads = 0
+        self.failures = 0
+
+
+class ReplicaRouter:
+    """
+    Chooses replica for repository read session (round robin), None means primary
+    Replicas with lag above max_lag_seconds or failed check are out of rotation until next successful check
+    Checks run in background thread through sync engine (independent of event loop)
+    """
+
+    def __init__(self, replicas: List[Replica], logger: Any,
+                 max_lag_seconds: float = 5.0, health_check_interval: float = 10.0,
+                 sticky_seconds: Optional[float] = None):
+        self.replicas = replicas
+        self.logger = logger
+        self.max_lag_seconds = max_lag_seconds
+        self.health_check_interval = health_check_interval
+        # Replica within allowed lag has caught up after max_lag_seconds
+        self.sticky_seconds = max_lag_seconds if sticky_seconds is None else sticky_seconds
+
+        self._lock = threading.Lock()
+        self._rotation: List[Replica] = []
+        self._next = 0
+        self._fallback_reads = 0
+        self._sticky_reads = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """First check synchronously (replicas enter rotation before first query), then background checks"""
+        self.check_replicas()
+        if self.health_check_interval and self.health_check_interval > 0:
+            self._thread = threading.Thread(target=self._health_loop, name='db-replica-health', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.health_check_interval + 5)
+            self._thread = None
+
+    def _health_loop(self) -> None:
+        while not self._stop_event.wait(self.health_check_interval):
+            self.check_replicas()
+
+    def check_replicas(self) -> None:
+        """Measures lag of each replica and rebuilds rotation"""
+        for replica in self.replicas:
+            try:
+                lag = self._measure_lag(replica)
+                replica.lag_seconds = lag
+                replica.last_error = None
+                healthy = lag <= self.max_lag_seconds
+                if not healthy:
+                    replica.last_error = f"lag {lag:.1f}s exceeds {self.max_lag_seconds}s"
+            except Exception as e:
+                replica.lag_seconds = None
+                replica.last_error = str(e)
+                healthy = False
+            replica.last_check_at = time.time()
+
+            if healthy != replica.healthy:
+                if healthy:
+                    self.logger.info(f"[Replica {replica.name}] Back in rotation (lag {replica.lag_seconds:.1f}s)")
+                else:
+                    self.logger.warning(f"[Replica {replica.name}] Out of rotation: {replica.last_error}")
+            replica.healthy = healthy
+
+        with self._lock:
+            self._rotation = [replica for replica in self.replicas if replica.healthy]
+
+    def _measure_lag(self, replica: Replica) -> float:
+        with replica.engine.connect() as connection:
+            return float(connection.execute(LAG_QUERY).scalar() or 0)
+
+    def is_sticky(self) -> bool:
+        """There was write in current context within sticky window"""
+        last_write_at = _last_write_at.get()
+        return bool(last_write_at) and time.monotonic() - last_write_at < self.sticky_seconds
+
+    def choose_replica(self) -> Optional[Replica]:
+        """
+        Replica for read of current context or None (read goes to primary)
+        None when there is recent write in context or no healthy replica
+        """
+        if self.is_sticky():
+            with self._lock:
+                self._sticky_reads += 1
+            return None
+
+        with self._lock:
+            if not self._rotation:
+                self._fallback_reads += 1
+                return None
+            replica = self._rotation[self._next % len(self._rotation)]
+            self._next += 1
+            replica.reads += 1
+            return replica
+
+    def report_failure(self, replica: Replica, error: Exception) -> None:
+        """Query on replica failed with connection error: out of rotation until next successful check"""
+        with self._lock:
+            replica.failures += 1
+            if replica in self._rotation:
+                self._rotation.remove(replica)
+        replica.healthy = False
+        replica.last_error = str(error)
+        self.logger.warning(f"[Replica {replica.name}] Query failed, out of rotation: {error}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'max_lag_seconds': self.max_lag_seconds,
+                'sticky_seconds': self.sticky_seconds,
+                'fallback_reads': self._fallback_reads,
+                'sticky_reads': self._sticky_reads,
+                'replicas': [
+                    {
+                        'name': replica.name,
+                        'healthy': replica.healthy,
+                        'lag_seconds': replica.lag_seconds,
+                        'reads': replica.reads,
+                        'failures': replica.failures,
+                        'last_error': replica.last_error,
+                    }
+                    for replica in self.replicas
+                ],
+            }
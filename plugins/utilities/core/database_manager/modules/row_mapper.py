@@ -0,0 +1,60 @@
+"""
+Row mappers for Core select(columns) queries
+Column list and per-column converters are compiled once, rows are mapped without ORM objects
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class RowMapper:
+    """
+    Maps result rows to dictionaries
+    Only declared columns are converted: typed text columns (stored value decoding) and JSON columns
+    """
+
+    def __init__(self, names: Sequence[str], converters: Sequence[Tuple[str, Callable[[Any], Any]]]):
+        self.names = tuple(names)
+        self.converters = tuple(converters)
+
+    def map_row(self, row: Sequence[Any]) -> Dict[str, Any]:
+        item = dict(zip(self.names, row, strict=False))
+        for name, convert in self.converters:
+            value = item[name]
+            if value is not None:
+                item[name] = convert(value)
+        return item
+
+    def map_rows(self, rows: Sequence[Sequence[Any]]) -> List[Dict[str, Any]]:
+        if not self.converters:
+            names = self.names
+            return [dict(zip(names, row, strict=False)) for row in rows]
+        map_row = self.map_row
+        return [map_row(row) for row in rows]
+
+
+def build_row_mapper(columns: Sequence[Any], data_converter: Any,
+                     typed_fields: Optional[Sequence[str]] = None,
+                     json_fields: Optional[Sequence[str]] = None) -> RowMapper:
+    """
+    Creates mapper for select(*columns) result
+    typed_fields: Text columns with stored values (JSON or typed by content, see DataConverter.decode_stored_value)
+    json_fields: columns with serialized JSON (JSON/JSONB columns are already decoded by driver)
+    """
+    names = [column.key for column in columns]
+    converters = []
+    for name in names:
+        if typed_fields and name in typed_fields:
+            converters.append((name, data_converter.decode_stored_value))
+        elif json_fields and name in json_fields:
+            converters.append((name, _decode_json))
+    return RowMapper(names, converters)
+
+
+def _decode_json(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
@@ -0,0 +1,235 @@
+"""
+Vector search planning for PostgreSQL (pgvector)
+Per tenant slice chooses exact scan or HNSW and sets index parameters for one query (SET LOCAL in search transaction)
+Large tenants get own partial HNSW index (where tenant_id = N): graph contains only their rows, filter by tenant costs nothing
+With halfvec or binary index precision HNSW search is coarse pass, candidates are reranked by exact distance
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from ..models import EMBEDDING_INDEX_NAMES, EMBEDDING_INDEX_PRECISIONS, embedding_index_sql
+
+EXACT = 'exact'
+HNSW = 'hnsw'
+
+ITERATIVE_SCAN_MODES = ('off', 'strict_order', 'relaxed_order')
+
+# Tenant slice size (capped count), own index existence and pgvector version in one round trip
+TENANT_STATS_SQL = text("""
+    select (select count(*)
+              from (select 1
+                      from vector_storage
+                     where tenant_id = :tenant_id
+                       and embedding is not null
+                     limit :rows_cap) slice) as rows,
+           exists(select 1 from pg_indexes where tablename = 'vector_storage' and indexname = :index_name) as has_index,
+           (select extversion from pg_extension where extname = 'vector') as version
+""")
+
+
+class VectorSearchPlan:
+    """coarse - index precision of coarse pass ('halfvec', 'binary'), None - search by exact distance"""
+    __slots__ = ('strategy', 'ef_search', 'tenant_index', 'coarse', 'rerank_factor')
+
+    def __init__(self, strategy: str, ef_search: Optional[int] = None, tenant_index: bool = False,
+                 coarse: Optional[str] = None, rerank_factor: int = 1):
+        self.strategy = strategy
+        self.ef_search = ef_search
+        self.tenant_index = tenant_index
+        self.coarse = coarse
+        self.rerank_factor = rerank_factor
+
+
+class _TenantSlice:
+    __slots__ = ('rows', 'has_index', 'fetched_at')
+
+    def __init__(self, rows: int, has_index: bool, fetched_at: float):
+        self.rows = rows
+        self.has_index = has_index
+        self.fetched_at = fetched_at
+
+
+class VectorSearchPlanner:
+    """
+    Exact scan for tenant slices up to exact_max_rows vectors: HNSW post-filtering of global graph returns
+    too few rows for small tenants, while exact scan of few thousand vectors is both complete and fast
+    HNSW for larger slices: ef_search grows with limit, iterative scan (pgvector >= 0.8) continues graph
+    traversal until enough rows pass filters (document_type, dates, metadata)
+    halfvec / binary precision: HNSW index is built over reduced-precision vectors (2x / 32x smaller than float32),
+    top limit * rerank_factor candidates of coarse pass are reranked by exact distance on full vectors
+    Tenant slice sizes are cached for stats_ttl seconds
+    """
+
+    def __init__(self, logger: Any, exact_max_rows: int = 10000, hnsw_ef_search: int = 40,
+                 ef_search_per_result: int = 2, iterative_scan: str = 'strict_order', max_scan_tuples: int = 20000,
+                 tenant_index_min_rows: int = 100000, tenant_index_m: int = 16,
+                 tenant_index_ef_construction: int = 64, stats_ttl: float = 300, index_precision: str = 'vector',
+                 rerank_factor: int = 4, index_m: int = 16, index_ef_construction: int = 64):
+        if iterative_scan not in ITERATIVE_SCAN_MODES:
+            raise ValueError(f"iterative_scan must be one of {ITERATIVE_SCAN_MODES}, got {iterative_scan!r}")
+        if index_precision not in EMBEDDING_INDEX_PRECISIONS:
+            raise ValueError(f"index_precision must be one of {EMBEDDING_INDEX_PRECISIONS}, got {index_precision!r}")
+        self.logger = logger
+        self.exact_max_rows = exact_max_rows
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ef_search_per_result = ef_search_per_result
+        self.iterative_scan = iterative_scan
+        self.max_scan_tuples = max_scan_tuples
+        self.tenant_index_min_rows = tenant_index_min_rows
+        self.tenant_index_m = tenant_index_m
+        self.tenant_index_ef_construction = tenant_index_ef_construction
+        self.stats_ttl = stats_ttl
+        self.index_precision = index_precision
+        self.rerank_factor = max(1, rerank_factor)
+        self.index_m = index_m
+        self.index_ef_construction = index_ef_construction
+
+        self._tenants: Dict[int, _TenantSlice] = {}
+        self._iterative_scan_supported: Optional[bool] = None
+        self._plans = {EXACT: 0, HNSW: 0}
+        self._tenant_index_plans = 0
+
+    def tenant_index_name(self, tenant_id: int) -> str:
+        return f"{EMBEDDING_INDEX_NAMES[self.index_precision]}_t{int(tenant_id)}"
+
+    async def plan(self, session: Any, tenant_id: int, limit: int) -> VectorSearchPlan:
+        """Chooses strategy for tenant and applies its settings to session transaction"""
+        tenant_slice = await self._get_tenant_slice(session, tenant_id)
+
+        if tenant_slice.rows <= self.exact_max_rows:
+            plan = VectorSearchPlan(EXACT)
+            # Index scan off: planner sorts tenant rows (bitmap scan by tenant index) instead of walking HNSW graph
+            await session.execute(text("set local enable_indexscan = off"))
+        else:
+            coarse = self.index_precision if self.index_precision != 'vector' else None
+            rerank_factor = self.rerank_factor if coarse else 1
+            plan = VectorSearchPlan(
+                HNSW, ef_search=min(max(self.hnsw_ef_search, limit * rerank_factor * self.ef_search_per_result), 1000),
+                tenant_index=tenant_slice.has_index, coarse=coarse, rerank_factor=rerank_factor
+            )
+            await session.execute(text(f"set local hnsw.ef_search = {plan.ef_search}"))
+            if self._iterative_scan_supported and self.iterative_scan != 'off':
+                await session.execute(text(f"set local hnsw.iterative_scan = {self.iterative_scan}"))
+                await session.execute(text(f"set local hnsw.max_scan_tuples = {int(self.max_scan_tuples)}"))
+
+        self._plans[plan.strategy] += 1
+        if plan.tenant_index:
+            self._tenant_index_plans += 1
+        return plan
+
+    async def _get_tenant_slice(self, session: Any, tenant_id: int) -> _TenantSlice:
+        tenant_slice = self._tenants.get(tenant_id)
+        now = time.monotonic()
+        if tenant_slice is not None and now - tenant_slice.fetched_at < self.stats_ttl:
+            return tenant_slice
+
+        row = (await session.execute(TENANT_STATS_SQL, {
+            'tenant_id': tenant_id,
+            'rows_cap': self.exact_max_rows + 1,
+            'index_name': self.tenant_index_name(tenant_id),
+        })).one()
+        if self._iterative_scan_supported is None:
+            self._iterative_scan_supported = self._version_at_least(row.version, (0, 8))
+        tenant_slice = self._tenants[tenant_id] = _TenantSlice(int(row.rows), bool(row.has_index), now)
+        return tenant_slice
+
+    @staticmethod
+    def _version_at_least(version: Optional[str], required: tuple) -> bool:
+        try:
+            return tuple(int(part) for part in version.split('.')[:2]) >= required
+        except (AttributeError, ValueError):
+            return False
+
+    def invalidate(self, tenant_id: Optional[int] = None) -> None:
+        """Forget cached tenant slice (all tenants if tenant_id is None)"""
+        if tenant_id is None:
+            self._tenants.clear()
+        else:
+            self._tenants.pop(tenant_id, None)
+
+    def sync_tenant_indexes(self, engine: Any) -> Dict[str, List[int]]:
+        """
+        Creates partial HNSW indexes for tenants with >= tenant_index_min_rows vectors and drops indexes of tenants
+        that shrank below half of threshold (hysteresis: tenant near threshold is not rebuilt on every run)
+        Tenant indexes of other precision (after index_precision change) are dropped too
+        Runs CREATE/DROP INDEX CONCURRENTLY (writes are not blocked), so it takes sync engine and autocommit connection
+        """
+        created, dropped = [], []
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            counts = dict(connection.execute(text("""
+                select tenant_id, count(*)
+                  from vector_storage
+                 where embedding is not null
+                 group by tenant_id
+            """)).all())
+            indexed = {}
+            for (name,) in connection.execute(text(
+                "select indexname from pg_indexes where tablename = 'vector_storage' and indexname like :pattern"
+            ), {'pattern': 'idx_vector_storage_embedding%'}):
+                for precision, base_name in EMBEDDING_INDEX_NAMES.items():
+                    suffix = name[len(base_name) + 2:]
+                    if name.startswith(f"{base_name}_t") and suffix.isdigit():
+                        indexed[name] = (int(suffix), precision)
+
+            current = {tenant_id for tenant_id, precision in indexed.values() if precision == self.index_precision}
+            for tenant_id, rows in sorted(counts.items()):
+                if rows >= self.tenant_index_min_rows and tenant_id not in current:
+                    tenant_id = int(tenant_id)
+                    connection.execute(text(embedding_index_sql(
+                        self.index_precision, self.tenant_index_m, self.tenant_index_ef_construction,
+                        tenant_id=tenant_id, concurrently=True
+                    )))
+                    created.append(tenant_id)
+
+            for name, (tenant_id, precision) in sorted(indexed.items(), key=lambda item: item[1]):
+                if precision != self.index_precision or counts.get(tenant_id, 0) < self.tenant_index_min_rows // 2:
+                    connection.execute(text(f"drop index concurrently if exists {name}"))
+                    dropped.append(tenant_id)
+
+        for tenant_id in created + dropped:
+            self.invalidate(tenant_id)
+        if created or dropped:
+            self.logger.info(f"Tenant vector indexes: created for {created}, dropped for {dropped}")
+        return {'created': created, 'dropped': dropped}
+
+    def sync_embedding_index(self, engine: Any) -> Dict[str, Any]:
+        """
+        Creates global HNSW index of index_precision and drops global indexes of other precisions
+        (CONCURRENTLY, same as tenant indexes); used after index_precision change on existing table
+        """
+        name = EMBEDDING_INDEX_NAMES[self.index_precision]
+        dropped = []
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            existing = {
+                row[0] for row in connection.execute(text(
+                    "select indexname from pg_indexes where tablename = 'vector_storage' and indexname = any(:names)"
+                ), {'names': list(EMBEDDING_INDEX_NAMES.values())})
+            }
+            created = name not in existing
+            if created:
+                connection.execute(text(embedding_index_sql(
+                    self.index_precision, self.index_m, self.index_ef_construction, concurrently=True
+                )))
+            for other in sorted(existing - {name}):
+                connection.execute(text(f"drop index concurrently if exists {other}"))
+                dropped.append(other)
+
+        if created or dropped:
+            self.logger.info(f"Vector index: {name} {'created' if created else 'kept'}, dropped {dropped}")
+        return {'index': name, 'created': created, 'dropped': dropped}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'plans': dict(self._plans),
+            'tenant_index_plans': self._tenant_index_plans,
+            'tenants_cached': len(self._tenants),
+            'tenants_with_index': sum(1 for tenant_slice in self._tenants.values() if tenant_slice.has_index),
+            'index_precision': self.index_precision,
+            'rerank_factor': self.rerank_factor,
+            'iterative_scan': self.iterative_scan,
+            # None until first search (pgvector version is read together with tenant slice)
+            'iterative_scan_supported': self._iterative_scan_supported,
+        }
@@ -2,13 +2,70 @@
 Base repository with common methods
 """
 
-from contextlib import contextmanager
+import functools
+from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional, Union
 
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..modules.replica_router import is_primary_only, is_read_context, mark_replica_failed, mark_write
+from ..modules.row_mapper import RowMapper, build_row_mapper
+
+
+class SyncSessionAdapter:
+    """
+    Awaitable facade over synchronous Session
+    Repositories are written against async session API (await session.execute / commit),
+    so one implementation works with both sync and async engines
+    With db_executor session calls run in DB thread pool instead of event loop thread
+    """
+    
+    def __init__(self, session, db_executor=None):
+        self.session = session
+        self.db_executor = db_executor
+    
+    async def execute(self, *args, **kwargs):
+        if self.db_executor is None:
+            return self.session.execute(*args, **kwargs)
+        return await self.db_executor.run(self._execute_buffered, *args, **kwargs)
+    
+    def _execute_buffered(self, *args, **kwargs):
+        # Rows are fetched in DB thread too, event loop gets buffered result (same as AsyncSession does)
+        kwargs['execution_options'] = {**kwargs.get('execution_options', {}), 'prebuffer_rows': True}
+        result = self.session.execute(*args, **kwargs)
+        # Core statements (text) bypass ORM buffering
+        if isinstance(result, CursorResult) and result.returns_rows:
+            return result.freeze()()
+        return result
+    
+    async def commit(self):
+        await self._run(self.session.commit)
+    
+    async def rollback(self):
+        await self._run(self.session.rollback)
+    
+    async def flush(self):
+        await self._run(self.session.flush)
+    
+    async def close(self):
+        await self._run(self.session.close)
+    
+    async def run_sync(self, func, *args, **kwargs):
+        """Calls func(session, ...) with sync Session (same as AsyncSession.run_sync)"""
+        return await self._run(functools.partial(func, self.session, *args, **kwargs))
+    
+    async def _run(self, func):
+        if self.db_executor is None:
+            return func()
+        return await self.db_executor.run(func)
+
 
 class BaseRepository:
     """
     Base repository with common methods
+    Session is sync (SQLAlchemy Session) or async (AsyncSession) depending on database_manager async_engine setting
     """
     
     def __init__(self, session_factory, **kwargs):
@@ -16,6 +73,10 @@ class BaseRepository:
         self.logger = kwargs['logger']
         self.data_converter = kwargs['data_converter']
         self.data_preparer = kwargs['data_preparer']
+        self.db_executor = kwargs.get('db_executor')
+        self.replica_router = kwargs.get('replica_router')
+        self._is_async = isinstance(session_factory, async_sessionmaker)
+        self._row_mappers = {}
     
     async def _to_dict(self, obj: Any, json_fields: Optional[List[str]] = None, convert_text_fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """
@@ -62,6 +123,19 @@ class BaseRepository:
             self.logger.error(f"Error converting list of objects to dictionaries: {e}")
             return None
     
+    def _get_row_mapper(self, columns: List[Any], typed_fields: Optional[List[str]] = None,
+                        json_fields: Optional[List[str]] = None) -> RowMapper:
+        """
+        Row mapper for Core select(*columns) query (compiled once per column set)
+        Used in hot read paths instead of ORM objects + _to_dict_list
+        """
+        cache_key = (tuple(str(column) for column in columns), tuple(typed_fields or ()), tuple(json_fields or ()))
+        mapper = self._row_mappers.get(cache_key)
+        if mapper is None:
+            mapper = build_row_mapper(columns, self.data_converter, typed_fields=typed_fields, json_fields=json_fields)
+            self._row_mappers[cache_key] = mapper
+        return mapper
+    
     async def _convert_value_from_db(self, value: Any, column_type: Optional[Any] = None) -> Union[str, int, float, bool, list, None]:
         """
         Converts value from DB to Python type based on string content
@@ -76,17 +150,72 @@ class BaseRepository:
         """
         return await self.data_converter.convert_string_to_type(value)
     
-    @contextmanager
-    def _get_session(self):
+    def _get_dialect_name(self) -> str:
+        """DB dialect name of session factory engine ('postgresql', 'sqlite')"""
+        bind = self.session_factory.kw.get('bind')
+        return bind.dialect.name if bind is not None else ''
+    
+    def _build_upsert(self, model: Any, update_fields: List[str]):
+        """
+        INSERT ... ON CONFLICT (primary key) DO UPDATE for current dialect
+        Executed with list of parameters (executemany): any number of records in one statement
+        """
+        if self._get_dialect_name() == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        
+        stmt = dialect_insert(model)
+        return stmt.on_conflict_do_update(
+            index_elements=[column.name for column in model.__table__.primary_key.columns],
+            set_={field: stmt.excluded[field] for field in update_fields}
+        )
+    
+    @asynccontextmanager
+    async def _get_session(self):
         """
-        Context manager for getting DB session
+        Async context manager for getting DB session
+        Commits on exit, rolls back on error
+        Methods annotated with db_read may get replica session (see ReplicaRouter), others use primary
+        Replica connection error makes db_read repeat the call on primary
         """
-        session = self.session_factory()
+        replica = None
+        if not is_read_context():
+            mark_write()
+        elif self.replica_router is not None and not is_primary_only():
+            replica = self.replica_router.choose_replica()
+        
+        if replica is None:
+            async with self._open_session(self.session_factory) as session:
+                yield session
+            return
+        
+        try:
+            async with self._open_session(replica.session_factory) as session:
+                yield session
+        except (OperationalError, InterfaceError) as e:
+            self.replica_router.report_failure(replica, e)
+            mark_replica_failed()
+            raise
+    
+    @asynccontextmanager
+    async def _open_session(self, session_factory):
+        if self._is_async:
+            async with session_factory() as session:
+                try:
+                    yield session
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+            return
+        
+        session = SyncSessionAdapter(session_factory(), self.db_executor)
         try:
             yield session
-            session.commit()
+            await session.commit()
         except Exception:
-            session.rollback()
+            await session.rollback()
             raise
         finally:
-            session.close()
\ No newline at end of file
+            await session.close()
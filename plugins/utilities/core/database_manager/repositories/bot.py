@@ -7,20 +7,22 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy import delete, insert, select
 
 from ..models import Bot, BotCommand
+from ..modules.replica_router import db_read, db_write
 from .base import BaseRepository
 
 
 class BotRepository(BaseRepository):
     """Repository for working with bots and commands"""
     
+    @db_read
     async def get_all_bots(self) -> Optional[List[Dict[str, Any]]]:
         """
         Get all bots
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(Bot)
-                result = session.execute(stmt).scalars().all()
+                result = (await session.execute(stmt)).scalars().all()
                 
                 return await self._to_dict_list(result)
                 
@@ -28,14 +30,15 @@ class BotRepository(BaseRepository):
             self.logger.error(f"Error getting all bots: {e}")
             return None
     
+    @db_read
     async def get_bot_by_id(self, bot_id: int) -> Optional[Dict[str, Any]]:
         """
         Get bot configuration by ID
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(Bot).where(Bot.id == bot_id)
-                result = session.execute(stmt).scalar_one_or_none()
+                result = (await session.execute(stmt)).scalar_one_or_none()
                 
                 return await self._to_dict(result)
                 
@@ -43,14 +46,15 @@ class BotRepository(BaseRepository):
             self.logger.error(f"[Bot-{bot_id}] Error getting bot: {e}")
             return None
     
+    @db_read
     async def get_bot_by_telegram_id(self, telegram_bot_id: int) -> Optional[Dict[str, Any]]:
         """
         Get bot by telegram_bot_id
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(Bot).where(Bot.telegram_bot_id == telegram_bot_id)
-                result = session.execute(stmt).scalar_one_or_none()
+                result = (await session.execute(stmt)).scalar_one_or_none()
                 
                 return await self._to_dict(result)
                 
@@ -58,14 +62,15 @@ class BotRepository(BaseRepository):
             self.logger.error(f"[TelegramBot-{telegram_bot_id}] Error getting bot: {e}")
             return None
     
+    @db_read
     async def get_bot_by_tenant_id(self, tenant_id: int) -> Optional[Dict[str, Any]]:
         """
         Get bot by tenant_id
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(Bot).where(Bot.tenant_id == tenant_id)
-                result = session.execute(stmt).scalar_one_or_none()
+                result = (await session.execute(stmt)).scalar_one_or_none()
                 
                 return await self._to_dict(result)
                 
@@ -73,14 +78,15 @@ class BotRepository(BaseRepository):
             self.logger.error(f"[Tenant-{tenant_id}] Error getting bot for tenant: {e}")
             return None
     
+    @db_read
     async def get_commands_by_bot(self, bot_id: int) -> Optional[List[Dict[str, Any]]]:
         """
         Get bot commands
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(BotCommand).where(BotCommand.bot_id == bot_id)
-                result = session.execute(stmt).scalars().all()
+                result = (await session.execute(stmt)).scalars().all()
                 
                 return await self._to_dict_list(result)
                 
@@ -88,15 +94,16 @@ class BotRepository(BaseRepository):
             self.logger.error(f"[Bot-{bot_id}] Error getting bot commands: {e}")
             return None
     
+    @db_write
     async def delete_commands_by_bot(self, bot_id: int) -> Optional[bool]:
         """
         Delete all bot commands
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = delete(BotCommand).where(BotCommand.bot_id == bot_id)
-                session.execute(stmt)
-                session.commit()
+                await session.execute(stmt)
+                await session.commit()
                 
                 return True
                 
@@ -104,12 +111,13 @@ class BotRepository(BaseRepository):
             self.logger.error(f"[Bot-{bot_id}] Error deleting bot commands: {e}")
             return None
     
+    @db_write
     async def save_commands_by_bot(self, bot_id: int, command_list: List[Dict[str, Any]]) -> Optional[int]:
         """
         Save bot commands
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 saved_count = 0
                 
                 for cmd_data in command_list:
@@ -130,22 +138,23 @@ class BotRepository(BaseRepository):
                     
                     # Insert command
                     stmt = insert(BotCommand).values(**prepared_fields)
-                    session.execute(stmt)
+                    await session.execute(stmt)
                     saved_count += 1
                 
-                session.commit()
+                await session.commit()
                 return saved_count
                 
         except Exception as e:
             self.logger.error(f"[Bot-{bot_id}] Error saving bot commands: {e}")
             return None
     
+    @db_write
     async def create_bot(self, bot_data: Dict[str, Any]) -> Optional[int]:
         """
         Create bot
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 # Prepare data for insertion via data_preparer
                 prepared_fields = await self.data_preparer.prepare_for_insert(
                     model=Bot,
@@ -161,8 +170,8 @@ class BotRepository(BaseRepository):
                 )
                 
                 stmt = insert(Bot).values(**prepared_fields)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 bot_id = result.inserted_primary_key[0]
                 return bot_id
@@ -171,12 +180,13 @@ class BotRepository(BaseRepository):
             self.logger.error(f"Error creating bot: {e}")
             return None
     
+    @db_write
     async def update_bot(self, bot_id: int, bot_data: Dict[str, Any]) -> Optional[bool]:
         """
         Update bot
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 from sqlalchemy import update
                 
                 # Prepare data for update via data_preparer
@@ -191,8 +201,8 @@ class BotRepository(BaseRepository):
                     return False
                 
                 stmt = update(Bot).where(Bot.id == bot_id).values(**prepared_fields)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 if result.rowcount > 0:
                     return True
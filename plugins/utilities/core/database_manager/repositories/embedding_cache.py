@@ -0,0 +1,72 @@
+"""
+Repository for content-addressed embedding cache (embedding_cache)
+"""
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+
+from ..models import EmbeddingCache
+from ..modules.replica_router import db_read, db_write
+from .base import BaseRepository
+
+
+class EmbeddingCacheRepository(BaseRepository):
+    """
+    Repository for embedding cache
+    Vectors are opaque bytes (packing is done by caller)
+    """
+    
+    # Hashes per IN (...) query (SQLite bound parameter limit)
+    LOOKUP_BATCH_SIZE = 500
+    
+    @db_read
+    async def get_many(self, model: str, dimensions: int, text_hashes: List[str]) -> Optional[Dict[str, bytes]]:
+        """
+        Get cached vectors by text hashes
+        Returns {text_hash: embedding bytes} for found hashes
+        """
+        try:
+            found = {}
+            async with self._get_session() as session:
+                for start in range(0, len(text_hashes), self.LOOKUP_BATCH_SIZE):
+                    stmt = select(EmbeddingCache.text_hash, EmbeddingCache.embedding).where(
+                        EmbeddingCache.model == model,
+                        EmbeddingCache.dimensions == dimensions,
+                        EmbeddingCache.text_hash.in_(text_hashes[start:start + self.LOOKUP_BATCH_SIZE])
+                    )
+                    for text_hash, embedding in (await session.execute(stmt)).all():
+                        found[text_hash] = bytes(embedding)
+            return found
+                
+        except Exception as e:
+            self.logger.error(f"Error reading embedding cache for model {model}: {e}")
+            return None
+    
+    @db_write
+    async def set_many(self, model: str, dimensions: int, embeddings: Dict[str, bytes]) -> Optional[int]:
+        """
+        Save vectors by text hashes (existing keys are kept: same text gives same vector)
+        Returns number of passed records
+        """
+        try:
+            if not embeddings:
+                return 0
+            
+            if self._get_dialect_name() == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            
+            records = await self.data_preparer.prepare_for_upsert(EmbeddingCache, [
+                {'model': model, 'dimensions': dimensions, 'text_hash': text_hash, 'embedding': embedding}
+                for text_hash, embedding in embeddings.items()
+            ])
+            
+            async with self._get_session() as session:
+                await session.execute(dialect_insert(EmbeddingCache).on_conflict_do_nothing(), records)
+            return len(records)
+                
+        except Exception as e:
+            self.logger.error(f"Error saving embedding cache for model {model}: {e}")
+            return None
@@ -7,6 +7,7 @@ from typing import Any, Dict, Optional
 from sqlalchemy import insert, select
 
 from ..models import IdSequence
+from ..modules.replica_router import db_read, db_write
 from .base import BaseRepository
 
 
@@ -15,14 +16,15 @@ class IdSequenceRepository(BaseRepository):
     Repository for working with unique ID generator
     """
     
+    @db_read
     async def get_by_hash(self, hash_value: str) -> Optional[Dict[str, Any]]:
         """
         Get record by hash
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(IdSequence).where(IdSequence.hash == hash_value)
-                result = session.execute(stmt).scalar_one_or_none()
+                result = (await session.execute(stmt)).scalar_one_or_none()
                 
                 if result:
                     return await self._to_dict(result)
@@ -33,14 +35,15 @@ class IdSequenceRepository(BaseRepository):
             self.logger.error(f"Error getting record by hash {hash_value}: {e}")
             return None
     
+    @db_read
     async def get_id_by_hash(self, hash_value: str) -> Optional[int]:
         """
         Get ID by hash (fast method, returns only ID)
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(IdSequence.id).where(IdSequence.hash == hash_value)
-                result = session.execute(stmt).scalar_one_or_none()
+                result = (await session.execute(stmt)).scalar_one_or_none()
                 
                 return result if result else None
                     
@@ -48,13 +51,14 @@ class IdSequenceRepository(BaseRepository):
             # If record not found, it's normal - return None
             return None
     
+    @db_write
     async def create(self, hash_value: str, seed: Optional[str] = None) -> Optional[int]:
         """
         Create new record with unique ID
         Returns created ID
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 prepared_fields = await self.data_preparer.prepare_for_insert(
                     model=IdSequence,
                     fields={
@@ -65,8 +69,8 @@ class IdSequenceRepository(BaseRepository):
                 )
                 
                 stmt = insert(IdSequence).values(**prepared_fields)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 return result.inserted_primary_key[0] if result.inserted_primary_key else None
                 
@@ -74,6 +78,7 @@ class IdSequenceRepository(BaseRepository):
             self.logger.error(f"Error creating id_sequence record with hash {hash_value}: {e}")
             return None
     
+    @db_write
     async def get_or_create(self, hash_value: str, seed: Optional[str] = None) -> Optional[int]:
         """
         Get existing ID by hash or create new record
@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy import insert, select, update
 
 from ..models import Invoice
+from ..modules.replica_router import db_read, db_write
 from .base import BaseRepository
 
 
@@ -16,14 +17,15 @@ class InvoiceRepository(BaseRepository):
     Repository for working with invoices
     """
     
+    @db_read
     async def get_by_id(self, invoice_id: int) -> Optional[Dict[str, Any]]:
         """
         Get invoice by ID
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(Invoice).where(Invoice.id == invoice_id)
-                result = session.execute(stmt).scalar_one_or_none()
+                result = (await session.execute(stmt)).scalar_one_or_none()
                 
                 return await self._to_dict(result)
                     
@@ -31,12 +33,13 @@ class InvoiceRepository(BaseRepository):
             self.logger.error(f"Error getting invoice {invoice_id}: {e}")
             return None
     
+    @db_read
     async def get_by_user(self, tenant_id: int, user_id: int, include_cancelled: bool = False) -> Optional[List[Dict[str, Any]]]:
         """
         Get all user invoices
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(Invoice).where(
                     Invoice.tenant_id == tenant_id,
                     Invoice.user_id == user_id
@@ -46,7 +49,7 @@ class InvoiceRepository(BaseRepository):
                     stmt = stmt.where(Invoice.is_cancelled.is_(False))
                 
                 stmt = stmt.order_by(Invoice.created_at.desc())
-                result = session.execute(stmt).scalars().all()
+                result = (await session.execute(stmt)).scalars().all()
                 
                 return await self._to_dict_list(result)
                     
@@ -54,12 +57,13 @@ class InvoiceRepository(BaseRepository):
             self.logger.error(f"[Tenant-{tenant_id}] [User-{user_id}] Error getting invoices: {e}")
             return None
     
+    @db_write
     async def create(self, invoice_data: Dict[str, Any]) -> Optional[int]:
         """
         Create new invoice
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 prepared_fields = await self.data_preparer.prepare_for_insert(
                     model=Invoice,
                     fields={
@@ -77,8 +81,8 @@ class InvoiceRepository(BaseRepository):
                 )
                 
                 stmt = insert(Invoice).values(**prepared_fields)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 return result.inserted_primary_key[0] if result.inserted_primary_key else None
                 
@@ -86,12 +90,13 @@ class InvoiceRepository(BaseRepository):
             self.logger.error(f"[Tenant-{invoice_data.get('tenant_id')}] Error creating invoice: {e}")
             return None
     
+    @db_write
     async def update(self, invoice_id: int, invoice_data: Dict[str, Any]) -> Optional[bool]:
         """
         Update invoice
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 prepared_fields = await self.data_preparer.prepare_for_update(
                     model=Invoice,
                     fields=invoice_data,
@@ -105,8 +110,8 @@ class InvoiceRepository(BaseRepository):
                     Invoice.id == invoice_id
                 ).values(**prepared_fields)
                 
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 return result.rowcount > 0
                 
@@ -114,12 +119,13 @@ class InvoiceRepository(BaseRepository):
             self.logger.error(f"Error updating invoice {invoice_id}: {e}")
             return None
     
+    @db_write
     async def mark_as_paid(self, invoice_id: int, telegram_payment_charge_id: str, paid_at: datetime) -> Optional[bool]:
         """
         Mark invoice as paid
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 prepared_fields = await self.data_preparer.prepare_for_update(
                     model=Invoice,
                     fields={
@@ -133,8 +139,8 @@ class InvoiceRepository(BaseRepository):
                     Invoice.id == invoice_id
                 ).values(**prepared_fields)
                 
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 return result.rowcount > 0
                 
@@ -142,12 +148,13 @@ class InvoiceRepository(BaseRepository):
             self.logger.error(f"Error marking invoice {invoice_id} as paid: {e}")
             return None
     
+    @db_write
     async def cancel(self, invoice_id: int) -> Optional[bool]:
         """
         Cancel invoice (mark as inactive)
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 prepared_fields = await self.data_preparer.prepare_for_update(
                     model=Invoice,
                     fields={
@@ -160,8 +167,8 @@ class InvoiceRepository(BaseRepository):
                     Invoice.id == invoice_id
                 ).values(**prepared_fields)
                 
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 return result.rowcount > 0
                 
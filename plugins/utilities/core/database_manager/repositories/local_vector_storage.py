@@ -0,0 +1,266 @@
+"""
+Repository for vector storage on SQLite preset (local vector index instead of vector_storage table)
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from ..models import VectorStorage
+from ..modules.chunk_ingestion import INGEST_BATCH_SIZE, ChunkSource, chunk_fields, ingest_in_batches
+from ..modules.local_vector_index import ChunkFilter
+from .base import BaseRepository
+
+
+class LocalVectorStorageRepository(BaseRepository):
+    """
+    Same contract as VectorStorageRepository, data is kept in LocalVectorIndex (per tenant matrix + sidecar)
+    Index calls run in DB thread pool when sync_executor is enabled
+    """
+
+    # Same fusion parameters as VectorStorageRepository.search_hybrid
+    RRF_K = 60
+    HYBRID_MIN_CANDIDATES = 20
+
+    def __init__(self, session_factory, **kwargs):
+        super().__init__(session_factory, **kwargs)
+        self.vector_index = kwargs['vector_index']
+
+    async def _run(self, func, *args, **kwargs):
+        if self.db_executor is None:
+            return func(*args, **kwargs)
+        return await self.db_executor.run(func, *args, **kwargs)
+
+    async def get_chunks_by_document(self, tenant_id: int, document_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get all document chunks by document_id
+        """
+        try:
+            store = self.vector_index.get_store(tenant_id)
+            chunks = await self._run(store.get_chunks, ChunkFilter(document_id=document_id))
+            return self._with_tenant(tenant_id, chunks)
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error getting document chunks {document_id}: {e}")
+            return None
+
+    async def get_chunks_by_type(self, tenant_id: int, document_type: str, limit: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get chunks by document type
+        """
+        try:
+            store = self.vector_index.get_store(tenant_id)
+            chunks = await self._run(
+                store.get_chunks, ChunkFilter(document_type=document_type), limit=limit if limit and limit > 0 else None
+            )
+            return self._with_tenant(tenant_id, chunks)
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error getting chunks of type {document_type}: {e}")
+            return None
+
+    async def get_recent_chunks(self, tenant_id: int, limit: int, document_type: Optional[List[str]] = None,
+                                document_id: Optional[List[str]] = None, until_date=None, since_date=None,
+                                metadata_filter: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get last N chunks by created_at date (descending sort), date filters by processed_at
+        """
+        try:
+            store = self.vector_index.get_store(tenant_id)
+            chunk_filter = ChunkFilter(document_type, document_id, until_date, since_date, metadata_filter)
+            return await self._run(store.recent, limit, chunk_filter)
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error getting recent chunks: {e}")
+            return None
+
+    async def delete_document(self, tenant_id: int, document_id: str) -> Optional[int]:
+        """
+        Delete all document chunks by document_id
+        Returns number of deleted chunks
+        """
+        try:
+            store = self.vector_index.get_store(tenant_id)
+            return await self._run(store.delete, ChunkFilter(document_id=document_id))
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error deleting document {document_id}: {e}")
+            return None
+
+    async def delete_by_date(self, tenant_id: int, until_date=None, since_date=None,
+                            metadata_filter: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        """
+        Delete chunks by processed_at date and/or metadata_filter
+        """
+        try:
+            if until_date is None and since_date is None and not metadata_filter:
+                self.logger.error("Must specify at least one parameter: until_date, since_date or metadata_filter")
+                return None
+
+            store = self.vector_index.get_store(tenant_id)
+            chunk_filter = ChunkFilter(until_date=until_date, since_date=since_date, metadata_filter=metadata_filter)
+            return await self._run(store.delete, chunk_filter)
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error deleting by date: {e}")
+            return None
+
+    async def create_chunk(self, chunk_data: Dict[str, Any]) -> Optional[bool]:
+        """
+        Create document chunk
+        Returns True on successful creation
+        """
+        result = await self.create_chunks_batch([chunk_data])
+        return True if result else None
+
+    async def create_chunks_batch(self, chunks_data: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        Create multiple chunks in one sidecar transaction (chunks are grouped by tenant)
+        Returns number of created chunks
+        """
+        try:
+            if not chunks_data:
+                return 0
+
+            # Same field preparation as vector_storage table (one timestamp for whole batch)
+            prepared = await self.data_preparer.prepare_for_upsert(VectorStorage, [
+                {
+                    'tenant_id': chunk_data.get('tenant_id'),
+                    'document_id': chunk_data.get('document_id'),
+                    'document_type': chunk_data.get('document_type'),
+                    'role': chunk_data.get('role', 'user'),
+                    'chunk_index': chunk_data.get('chunk_index'),
+                    'content': chunk_data.get('content'),
+                    'embedding': chunk_data.get('embedding'),
+                    'embedding_model': chunk_data.get('embedding_model'),
+                    'chunk_metadata': chunk_data.get('chunk_metadata'),
+                    **({'created_at': chunk_data['created_at']} if chunk_data.get('created_at') is not None else {})
+                }
+                for chunk_data in chunks_data
+            ], json_fields=['chunk_metadata'])
+
+            by_tenant: Dict[int, List[Dict[str, Any]]] = {}
+            for chunk in prepared:
+                by_tenant.setdefault(chunk['tenant_id'], []).append(chunk)
+
+            created = 0
+            for tenant_id, chunks in by_tenant.items():
+                store = self.vector_index.get_store(tenant_id)
+                created += await self._run(store.add_chunks, chunks)
+            return created
+
+        except Exception as e:
+            self.logger.error(f"Error batch creating chunks: {e}")
+            return None
+
+    async def get_last_chunk_index(self, tenant_id: int, document_id: str) -> Optional[int]:
+        """
+        Last stored chunk_index of document (-1 - no chunks)
+        """
+        try:
+            store = self.vector_index.get_store(tenant_id)
+            return await self._run(store.last_chunk_index, document_id)
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error getting last chunk index of {document_id}: {e}")
+            return None
+
+    async def ingest_chunks(self, tenant_id: int, document_id: str, chunks: ChunkSource,
+                            batch_size: int = INGEST_BATCH_SIZE, progress: Optional[Callable] = None) -> Optional[Dict[str, Any]]:
+        """
+        Streaming insert of document chunks, one sidecar transaction per batch_size chunks
+        Same contract as VectorStorageRepository.ingest_chunks (resume after last committed chunk_index, progress)
+        """
+        try:
+            resume_after = await self.get_last_chunk_index(tenant_id, document_id)
+            if resume_after is None:
+                return None
+
+            store = self.vector_index.get_store(tenant_id)
+
+            async def write_batch(batch):
+                prepared = await self.data_preparer.prepare_for_upsert(
+                    VectorStorage, [chunk_fields(tenant_id, document_id, chunk) for chunk in batch],
+                    json_fields=['chunk_metadata']
+                )
+                await self._run(store.add_chunks, prepared)
+
+            stats = await ingest_in_batches(chunks, batch_size, resume_after, write_batch, progress)
+            self.logger.info(
+                f"[Tenant-{tenant_id}] Document {document_id} ingested: {stats['inserted']} chunks in "
+                f"{stats['batches']} batches, {stats['skipped']} already stored"
+            )
+            return stats
+
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error ingesting chunks of document {document_id}: {e}")
+            return None
+
+    async def get_chunk(self, tenant_id: int, document_id: str, chunk_index: int) -> Optional[Dict[str, Any]]:
+        """
+        Get chunk by composite key (tenant_id, document_id, chunk_index)
+        """
+        try:
+            store = self.vector_index.get_store(tenant_id)
+            chunks = await self._run(store.get_chunks, ChunkFilter(document_id=document_id), chunk_index=chunk_index)
+            return self._with_tenant(tenant_id, chunks)[0] if chunks else None
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error getting chunk {document_id}[{chunk_index}]: {e}")
+            return None
+
+    async def update_chunk(self, tenant_id: int, document_id: str, chunk_index: int, chunk_data: Dict[str, Any]) -> Optional[bool]:
+        """
+        Update chunk by composite key (tenant_id, document_id, chunk_index)
+        """
+        try:
+            prepared_fields = await self.data_preparer.prepare_for_update(
+                model=VectorStorage,
+                fields={
+                    'content': chunk_data.get('content'),
+                    'embedding': chunk_data.get('embedding'),
+                    'embedding_model': chunk_data.get('embedding_model')
+                }
+            )
+            store = self.vector_index.get_store(tenant_id)
+            return await self._run(store.update_chunk, document_id, chunk_index, prepared_fields or {})
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error updating chunk {document_id}[{chunk_index}]: {e}")
+            return None
+
+    async def search_similar(self, tenant_id: int, query_vector: List[float], limit: int = 5,
+                            min_similarity: float = 0.7, document_type: Optional[List[str]] = None,
+                            document_id: Optional[List[str]] = None, until_date=None, since_date=None,
+                            metadata_filter: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Search similar chunks by vector (cosine similarity), date filters by created_at
+        """
+        try:
+            store = self.vector_index.get_store(tenant_id)
+            chunk_filter = ChunkFilter(document_type, document_id, until_date, since_date, metadata_filter,
+                                       date_field='created_at')
+            return await self._run(store.search, query_vector, limit, min_similarity, chunk_filter)
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error searching similar chunks: {e}")
+            return None
+
+    async def search_hybrid(self, tenant_id: int, query_text: str, query_vector: Optional[List[float]] = None,
+                            limit: int = 5, document_type: Optional[List[str]] = None,
+                            document_id: Optional[List[str]] = None, until_date=None, since_date=None,
+                            metadata_filter: Optional[Dict[str, Any]] = None, min_similarity: Optional[float] = None,
+                            candidates: Optional[int] = None, lexical_weight: float = 1.0,
+                            vector_weight: float = 1.0) -> Optional[List[Dict[str, Any]]]:
+        """
+        Hybrid search: FTS5 (bm25) and vector candidates combined by reciprocal rank fusion, date filters by created_at
+        """
+        try:
+            store = self.vector_index.get_store(tenant_id)
+            chunk_filter = ChunkFilter(document_type, document_id, until_date, since_date, metadata_filter,
+                                       date_field='created_at')
+            results = await self._run(
+                store.search_hybrid, query_text, query_vector, limit, chunk_filter,
+                min_similarity=min_similarity,
+                candidates=max(candidates or limit * 4, limit, self.HYBRID_MIN_CANDIDATES),
+                lexical_weight=lexical_weight, vector_weight=vector_weight, rrf_k=self.RRF_K
+            )
+            return self._with_tenant(tenant_id, results)
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error in hybrid search: {e}")
+            return None
+
+    @staticmethod
+    def _with_tenant(tenant_id: int, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for chunk in chunks:
+            chunk['tenant_id'] = tenant_id
+        return chunks
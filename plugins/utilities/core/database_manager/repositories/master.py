@@ -4,7 +4,9 @@ Single entry point for all repositories
 """
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from ..modules.chunk_ingestion import INGEST_BATCH_SIZE, ChunkSource
 
 
 class MasterRepository:
@@ -24,6 +26,7 @@ class MasterRepository:
         self._invoice_repo = None
         self._id_sequence_repo = None
         self._vector_storage_repo = None
+        self._embedding_cache_repo = None
         self._repositories_cache = {}
     
     # === Lazy loading repositories ===
@@ -117,14 +120,33 @@ class MasterRepository:
     
     @property
     def vector_storage(self):
-        """Lazy load VectorStorageRepository"""
+        """Lazy load VectorStorageRepository (LocalVectorStorageRepository for SQLite preset)"""
         if self._vector_storage_repo is None:
-            from .vector_storage import VectorStorageRepository
-            self._vector_storage_repo = VectorStorageRepository(
+            if self.database_manager.vector_index is not None:
+                from .local_vector_storage import LocalVectorStorageRepository
+                self._vector_storage_repo = LocalVectorStorageRepository(
+                    session_factory=self.database_manager.session_factory,
+                    vector_index=self.database_manager.vector_index,
+                    **self.database_manager._kwargs
+                )
+            else:
+                from .vector_storage import VectorStorageRepository
+                self._vector_storage_repo = VectorStorageRepository(
+                    session_factory=self.database_manager.session_factory,
+                    **self.database_manager._kwargs
+                )
+        return self._vector_storage_repo
+    
+    @property
+    def embedding_cache(self):
+        """Lazy load EmbeddingCacheRepository"""
+        if self._embedding_cache_repo is None:
+            from .embedding_cache import EmbeddingCacheRepository
+            self._embedding_cache_repo = EmbeddingCacheRepository(
                 session_factory=self.database_manager.session_factory,
                 **self.database_manager._kwargs
             )
-        return self._vector_storage_repo
+        return self._embedding_cache_repo
     
     # === Tenant operations ===
     
@@ -300,6 +322,14 @@ class MasterRepository:
         """Get all storage records for tenant by key (for user search)"""
         return await self.user_storage.get_by_tenant_and_key(tenant_id, key)
     
+    async def find_user_ids_by_storage_value(self, tenant_id: int, key: str, value: Any, limit: Optional[int] = None, after_user_id: Optional[int] = None) -> Optional[List[int]]:
+        """Get user_ids with storage[key] == value (sorted by user_id, paginated)"""
+        return await self.user_storage.find_user_ids_by_value(tenant_id, key, value, limit=limit, after_user_id=after_user_id)
+    
+    def iter_user_ids_by_storage_value(self, tenant_id: int, key: str, value: Any, batch_size: int = 1000):
+        """Stream user_ids with storage[key] == value in pages (async iterator)"""
+        return self.user_storage.iter_user_ids_by_value(tenant_id, key, value, batch_size=batch_size)
+    
     # === Invoice operations ===
     
     async def get_invoice_by_id(self, invoice_id: int) -> Optional[Dict[str, Any]]:
@@ -366,6 +396,15 @@ class MasterRepository:
         """Create multiple chunks with one query (batch insert)"""
         return await self.vector_storage.create_chunks_batch(chunks_data)
     
+    async def ingest_chunks(self, tenant_id: int, document_id: str, chunks: ChunkSource,
+                            batch_size: int = INGEST_BATCH_SIZE, progress: Optional[Callable] = None) -> Optional[Dict[str, Any]]:
+        """Streaming insert of document chunks from (async) iterable in committed batches, resumes after last stored chunk_index"""
+        return await self.vector_storage.ingest_chunks(tenant_id, document_id, chunks, batch_size, progress)
+    
+    async def get_last_chunk_index(self, tenant_id: int, document_id: str) -> Optional[int]:
+        """Last stored chunk_index of document (-1 - no chunks)"""
+        return await self.vector_storage.get_last_chunk_index(tenant_id, document_id)
+    
     async def update_chunk(self, tenant_id: int, document_id: str, chunk_index: int, chunk_data: Dict[str, Any]) -> Optional[bool]:
         """Update chunk by composite key (tenant_id, document_id, chunk_index)"""
         return await self.vector_storage.update_chunk(tenant_id, document_id, chunk_index, chunk_data)
@@ -385,7 +424,28 @@ class MasterRepository:
         """Search similar chunks by vector (cosine similarity)"""
         return await self.vector_storage.search_similar(tenant_id, query_vector, limit, min_similarity, document_type, document_id, until_date, since_date, metadata_filter)
     
+    async def search_vector_storage_hybrid(self, tenant_id: int, query_text: str, query_vector: Optional[List[float]] = None,
+                                           limit: int = 5, document_type=None, document_id=None, until_date=None, since_date=None,
+                                           metadata_filter: Optional[Dict[str, Any]] = None, min_similarity: Optional[float] = None,
+                                           candidates: Optional[int] = None, lexical_weight: float = 1.0,
+                                           vector_weight: float = 1.0) -> Optional[List[Dict[str, Any]]]:
+        """Hybrid search: full-text and vector candidates combined by reciprocal rank fusion"""
+        return await self.vector_storage.search_hybrid(
+            tenant_id, query_text, query_vector, limit, document_type, document_id, until_date, since_date,
+            metadata_filter, min_similarity, candidates, lexical_weight, vector_weight
+        )
+    
     async def get_recent_vector_storage_chunks(self, tenant_id: int, limit: int, document_type=None, document_id=None,
                                                until_date=None, since_date=None, metadata_filter: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
         """Get last N chunks by processed_at date"""
-        return await self.vector_storage.get_recent_chunks(tenant_id, limit, document_type, document_id, until_date, since_date, metadata_filter)
\ No newline at end of file
+        return await self.vector_storage.get_recent_chunks(tenant_id, limit, document_type, document_id, until_date, since_date, metadata_filter)
+    
+    # === EmbeddingCache operations ===
+    
+    async def get_cached_embeddings(self, model: str, dimensions: int, text_hashes: List[str]) -> Optional[Dict[str, bytes]]:
+        """Get cached vectors (packed float32) by text hashes"""
+        return await self.embedding_cache.get_many(model, dimensions, text_hashes)
+    
+    async def save_cached_embeddings(self, model: str, dimensions: int, embeddings: Dict[str, bytes]) -> Optional[int]:
+        """Save vectors (packed float32) by text hashes"""
+        return await self.embedding_cache.set_many(model, dimensions, embeddings)
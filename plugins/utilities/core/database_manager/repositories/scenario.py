@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy import delete, insert, select
 
 from ..models import Scenario, ScenarioStep, ScenarioStepTransition, ScenarioTrigger
+from ..modules.replica_router import db_read, db_write
 from .base import BaseRepository
 
 
@@ -20,14 +21,15 @@ class ScenarioRepository(BaseRepository):
     def __init__(self, session_factory, **kwargs):
         super().__init__(session_factory, **kwargs)
     
+    @db_read
     async def get_scenarios_by_tenant(self, tenant_id: int) -> Optional[List[Dict[str, Any]]]:
         """
         Get all scenarios for tenant
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(Scenario).where(Scenario.tenant_id == tenant_id)
-                result = session.execute(stmt).scalars().all()
+                result = (await session.execute(stmt)).scalars().all()
                 
                 return await self._to_dict_list(result)
                 
@@ -35,14 +37,15 @@ class ScenarioRepository(BaseRepository):
             self.logger.error(f"Error getting scenarios for tenant {tenant_id}: {e}")
             return None
     
+    @db_read
     async def get_triggers_by_scenario(self, scenario_id: int) -> Optional[List[Dict[str, Any]]]:
         """
         Get scenario triggers
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(ScenarioTrigger).where(ScenarioTrigger.scenario_id == scenario_id)
-                result = session.execute(stmt).scalars().all()
+                result = (await session.execute(stmt)).scalars().all()
                 
                 return await self._to_dict_list(result)
                 
@@ -50,14 +53,15 @@ class ScenarioRepository(BaseRepository):
             self.logger.error(f"Error getting triggers for scenario {scenario_id}: {e}")
             return None
     
+    @db_read
     async def get_steps_by_scenario(self, scenario_id: int) -> Optional[List[Dict[str, Any]]]:
         """
         Get scenario steps
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(ScenarioStep).where(ScenarioStep.scenario_id == scenario_id)
-                result = session.execute(stmt).scalars().all()
+                result = (await session.execute(stmt)).scalars().all()
                 
                 return await self._to_dict_list(result)
                 
@@ -65,14 +69,15 @@ class ScenarioRepository(BaseRepository):
             self.logger.error(f"Error getting steps for scenario {scenario_id}: {e}")
             return None
     
+    @db_read
     async def get_transitions_by_step(self, step_id: int) -> Optional[List[Dict[str, Any]]]:
         """
         Get step transitions
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(ScenarioStepTransition).where(ScenarioStepTransition.step_id == step_id)
-                result = session.execute(stmt).scalars().all()
+                result = (await session.execute(stmt)).scalars().all()
                 
                 return await self._to_dict_list(result)
                 
@@ -82,56 +87,59 @@ class ScenarioRepository(BaseRepository):
     
     # === Deletion methods ===
     
+    @db_write
     async def delete_steps_by_scenario(self, scenario_id: int) -> Optional[bool]:
         """
         Delete all scenario steps (including their transitions)
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 # First delete step transitions
                 stmt_transitions = delete(ScenarioStepTransition).where(
                     ScenarioStepTransition.step_id.in_(
                         select(ScenarioStep.id).where(ScenarioStep.scenario_id == scenario_id)
                     )
                 )
-                session.execute(stmt_transitions)
+                await session.execute(stmt_transitions)
                 
                 # Then delete steps themselves
                 stmt_steps = delete(ScenarioStep).where(ScenarioStep.scenario_id == scenario_id)
-                session.execute(stmt_steps)
+                await session.execute(stmt_steps)
                 
-                session.commit()
+                await session.commit()
                 return True
                 
         except Exception as e:
             self.logger.error(f"Error deleting steps for scenario {scenario_id}: {e}")
             return None
     
+    @db_write
     async def delete_triggers_by_scenario(self, scenario_id: int) -> Optional[bool]:
         """
         Delete all scenario triggers
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt_triggers = delete(ScenarioTrigger).where(ScenarioTrigger.scenario_id == scenario_id)
-                session.execute(stmt_triggers)
+                await session.execute(stmt_triggers)
                 
-                session.commit()
+                await session.commit()
                 return True
                 
         except Exception as e:
             self.logger.error(f"Error deleting triggers for scenario {scenario_id}: {e}")
             return None
     
+    @db_write
     async def delete_scenario(self, scenario_id: int) -> Optional[bool]:
         """
         Delete scenario
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = delete(Scenario).where(Scenario.id == scenario_id)
-                session.execute(stmt)
-                session.commit()
+                await session.execute(stmt)
+                await session.commit()
                 
                 return True
                 
@@ -141,12 +149,13 @@ class ScenarioRepository(BaseRepository):
     
     # === Creation methods ===
     
+    @db_write
     async def create_scenario(self, scenario_data: Dict[str, Any]) -> Optional[int]:
         """
         Create scenario
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 # Prepare data for insertion via data_preparer
                 prepared_fields = await self.data_preparer.prepare_for_insert(
                     model=Scenario,
@@ -161,8 +170,8 @@ class ScenarioRepository(BaseRepository):
                 )
                 
                 stmt = insert(Scenario).values(**prepared_fields)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 scenario_id = result.inserted_primary_key[0]
                 return scenario_id
@@ -171,12 +180,13 @@ class ScenarioRepository(BaseRepository):
             self.logger.error(f"Error creating scenario: {e}")
             return None
     
+    @db_write
     async def create_trigger(self, trigger_data: Dict[str, Any]) -> Optional[int]:
         """
         Create scenario trigger
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 # Prepare data for insertion via data_preparer
                 prepared_fields = await self.data_preparer.prepare_for_insert(
                     model=ScenarioTrigger,
@@ -188,8 +198,8 @@ class ScenarioRepository(BaseRepository):
                 )
                 
                 stmt = insert(ScenarioTrigger).values(**prepared_fields)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 trigger_id = result.inserted_primary_key[0]
                 return trigger_id
@@ -198,12 +208,13 @@ class ScenarioRepository(BaseRepository):
             self.logger.error(f"Error creating trigger: {e}")
             return None
     
+    @db_write
     async def create_step(self, step_data: Dict[str, Any]) -> Optional[int]:
         """
         Create scenario step
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 # Prepare data for insertion via data_preparer
                 prepared_fields = await self.data_preparer.prepare_for_insert(
                     model=ScenarioStep,
@@ -219,8 +230,8 @@ class ScenarioRepository(BaseRepository):
                 )
                 
                 stmt = insert(ScenarioStep).values(**prepared_fields)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 step_id = result.inserted_primary_key[0]
                 return step_id
@@ -229,12 +240,13 @@ class ScenarioRepository(BaseRepository):
             self.logger.error(f"Error creating step: {e}")
             return None
     
+    @db_write
     async def create_transition(self, transition_data: Dict[str, Any]) -> Optional[int]:
         """
         Create step transition
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 # Prepare data for insertion via data_preparer
                 prepared_fields = await self.data_preparer.prepare_for_insert(
                     model=ScenarioStepTransition,
@@ -248,8 +260,8 @@ class ScenarioRepository(BaseRepository):
                 )
                 
                 stmt = insert(ScenarioStepTransition).values(**prepared_fields)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 transition_id = result.inserted_primary_key[0]
                 return transition_id
@@ -260,12 +272,13 @@ class ScenarioRepository(BaseRepository):
     
     # === Methods for scheduled scenarios ===
     
+    @db_read
     async def get_scheduled_scenarios(self, tenant_id: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
         """
         Get all scheduled scenarios (with schedule IS NOT NULL)
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(Scenario).where(
                     Scenario.schedule.isnot(None)
                 )
@@ -274,7 +287,7 @@ class ScenarioRepository(BaseRepository):
                 if tenant_id is not None:
                     stmt = stmt.where(Scenario.tenant_id == tenant_id)
                 
-                result = session.execute(stmt).scalars().all()
+                result = (await session.execute(stmt)).scalars().all()
                 
                 return await self._to_dict_list(result)
                 
@@ -282,12 +295,13 @@ class ScenarioRepository(BaseRepository):
             self.logger.error(f"Error getting scheduled scenarios: {e}")
             return None
     
+    @db_write
     async def update_scenario_last_run(self, scenario_id: int, last_run: datetime) -> Optional[bool]:
         """
         Update last run time of scheduled scenario
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 from sqlalchemy import update
                 
                 stmt = update(Scenario).where(
@@ -296,8 +310,8 @@ class ScenarioRepository(BaseRepository):
                     last_scheduled_run=last_run
                 )
                 
-                session.execute(stmt)
-                session.commit()
+                await session.execute(stmt)
+                await session.commit()
                 
                 return True
                 
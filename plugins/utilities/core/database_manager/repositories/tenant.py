@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy import insert, select
 
 from ..models import Tenant
+from ..modules.replica_router import db_read, db_write
 from .base import BaseRepository
 
 
@@ -19,14 +20,15 @@ class TenantRepository(BaseRepository):
     def __init__(self, session_factory, **kwargs):
         super().__init__(session_factory, **kwargs)
     
+    @db_read
     async def get_all_tenant_ids(self) -> Optional[List[int]]:
         """
         Get list of all tenant IDs
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(Tenant.id)
-                result = session.execute(stmt).scalars().all()
+                result = (await session.execute(stmt)).scalars().all()
                 
                 return list(result)
                 
@@ -34,14 +36,15 @@ class TenantRepository(BaseRepository):
             self.logger.error(f"Error getting tenant list: {e}")
             return None
     
+    @db_read
     async def get_tenant_by_id(self, tenant_id: int) -> Optional[Dict[str, Any]]:
         """
         Get tenant by ID
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(Tenant).where(Tenant.id == tenant_id)
-                result = session.execute(stmt).scalar_one_or_none()
+                result = (await session.execute(stmt)).scalar_one_or_none()
                 
                 return await self._to_dict(result)
                 
@@ -49,12 +52,13 @@ class TenantRepository(BaseRepository):
             self.logger.error(f"[Tenant-{tenant_id}] Error getting tenant")
             return None
     
+    @db_write
     async def create_tenant(self, tenant_data: Dict[str, Any]) -> Optional[int]:
         """
         Create tenant
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 # Prepare data for insertion via data_preparer
                 prepared_fields = await self.data_preparer.prepare_for_insert(
                     model=Tenant,
@@ -66,8 +70,8 @@ class TenantRepository(BaseRepository):
                 )
                 
                 stmt = insert(Tenant).values(**prepared_fields)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 tenant_id = result.inserted_primary_key[0]
                 return tenant_id
@@ -76,12 +80,13 @@ class TenantRepository(BaseRepository):
             self.logger.error(f"Error creating tenant: {e}")
             return None
     
+    @db_write
     async def update_tenant(self, tenant_id: int, tenant_data: Dict[str, Any]) -> Optional[bool]:
         """
         Update tenant
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 from sqlalchemy import update
                 
                 # Prepare data for update via data_preparer
@@ -96,8 +101,8 @@ class TenantRepository(BaseRepository):
                     return False
                 
                 stmt = update(Tenant).where(Tenant.id == tenant_id).values(**prepared_fields)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 if result.rowcount > 0:
                     return True
@@ -4,17 +4,21 @@ Repository for working with tenant data storage (tenant_storage)
 
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import delete, distinct, insert, select, update
+from sqlalchemy import delete, distinct, select
 
 from ..models import TenantStorage
+from ..modules.replica_router import db_read, db_write
 from .base import BaseRepository
 
+RECORD_COLUMNS = [TenantStorage.tenant_id, TenantStorage.group_key, TenantStorage.key, TenantStorage.value, TenantStorage.processed_at]
+
 
 class TenantStorageRepository(BaseRepository):
     """
     Repository for working with tenant data storage
     """
     
+    @db_read
     async def get_records(
         self,
         tenant_id: int,
@@ -37,7 +41,7 @@ class TenantStorageRepository(BaseRepository):
         limit: optional limit on number of returned records
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 conditions = [TenantStorage.tenant_id == tenant_id]
                 
                 # Group: if exact value exists - use it, otherwise pattern
@@ -53,21 +57,22 @@ class TenantStorageRepository(BaseRepository):
                 elif key_pattern:
                     conditions.append(TenantStorage.key.ilike(key_pattern))
                 
-                stmt = select(TenantStorage).where(*conditions)
+                stmt = select(*RECORD_COLUMNS).where(*conditions)
                 
                 # Apply limit if specified
                 if limit is not None and limit > 0:
                     stmt = stmt.limit(limit)
                 
-                result = session.execute(stmt).scalars().all()
+                rows = (await session.execute(stmt)).all()
                 
-                # Convert value automatically via convert_text_fields
-                return await self._to_dict_list(result, convert_text_fields=['value'])
+                # Value is converted to type by row mapper
+                return self._get_row_mapper(RECORD_COLUMNS, typed_fields=['value']).map_rows(rows)
                     
         except Exception as e:
             self.logger.error(f"[Tenant-{tenant_id}] Error getting storage records: {e}")
             return None
     
+    @db_write
     async def delete_records(
         self,
         tenant_id: int,
@@ -87,7 +92,7 @@ class TenantStorageRepository(BaseRepository):
         Returns number of deleted records
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 conditions = [TenantStorage.tenant_id == tenant_id]
                 
                 # Group: if exact value exists - use it, otherwise pattern
@@ -104,8 +109,8 @@ class TenantStorageRepository(BaseRepository):
                     conditions.append(TenantStorage.key.ilike(key_pattern))
                 
                 stmt = delete(TenantStorage).where(*conditions)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 return result.rowcount
                     
@@ -113,6 +118,7 @@ class TenantStorageRepository(BaseRepository):
             self.logger.error(f"[Tenant-{tenant_id}] Error deleting storage records: {e}")
             return None
     
+    @db_write
     async def set_records(
         self,
         tenant_id: int,
@@ -122,99 +128,36 @@ class TenantStorageRepository(BaseRepository):
         Universal set storage records (batch for all groups)
         
         Accepts structure {group_key: {key: value}} for setting one or multiple values
-        Optimized version: first get all existing records with one query,
-        then perform batch insert/update
+        All keys are written with one INSERT ... ON CONFLICT DO UPDATE statement
         """
         try:
             if not values:
                 return True  # No data to set
             
-            with self._get_session() as session:
-                # Collect all keys for existence check
-                all_keys_to_check = []
-                for group_key, group_data in values.items():
-                    for key in group_data.keys():
-                        all_keys_to_check.append((group_key, key))
-                
-                # Get all existing records with one query
-                existing_records = set()
-                if all_keys_to_check:
-                    # Build conditions for all combinations of tenant_id + group_key + key
-                    from sqlalchemy import or_
-                    combined_conditions = []
-                    
-                    for group_key, key in all_keys_to_check:
-                        # Convert key to string, as key has String type in DB
-                        combined_conditions.append(
-                            (TenantStorage.tenant_id == tenant_id) &
-                            (TenantStorage.group_key == str(group_key)) & 
-                            (TenantStorage.key == str(key))
-                        )
-                    
-                    if combined_conditions:
-                        conditions = [or_(*combined_conditions)]
-                        
-                        existing = session.execute(
-                            select(TenantStorage.tenant_id, TenantStorage.group_key, TenantStorage.key).where(*conditions)
-                        ).all()
-                        existing_records = {(r.tenant_id, r.group_key, r.key) for r in existing}
-                
-                # Split into insert and update
-                to_insert = []
-                to_update = []
-                
-                for group_key, group_data in values.items():
-                    for key, value in group_data.items():
-                        # Convert key to string for comparison and saving, as key has String type in DB
-                        key_str = str(key)
-                        group_key_str = str(group_key)
-                        if (tenant_id, group_key_str, key_str) in existing_records:
-                            to_update.append((group_key_str, key_str, value))
-                        else:
-                            to_insert.append({
-                                'tenant_id': tenant_id,
-                                'group_key': group_key_str,
-                                'key': key_str,
-                                'value': value
-                            })
-                
-                # Batch insert for new records
-                if to_insert:
-                    prepared_inserts = []
-                    for record in to_insert:
-                        prepared_fields = await self.data_preparer.prepare_for_insert(
-                            model=TenantStorage,
-                            fields=record,
-                            json_fields=[]
-                        )
-                        prepared_inserts.append(prepared_fields)
-                    
-                    if prepared_inserts:
-                        session.execute(insert(TenantStorage), prepared_inserts)
-                
-                # Batch update for existing records
-                if to_update:
-                    for group_key, key, value in to_update:
-                        prepared_fields = await self.data_preparer.prepare_for_update(
-                            model=TenantStorage,
-                            fields={'value': value},
-                            json_fields=[]
-                        )
-                        # Convert key and group_key to strings, as they have String type in DB
-                        stmt = update(TenantStorage).where(
-                            TenantStorage.tenant_id == tenant_id,
-                            TenantStorage.group_key == str(group_key),
-                            TenantStorage.key == str(key)
-                        ).values(**prepared_fields)
-                        session.execute(stmt)
-                
-                session.commit()
+            # Convert key and group_key to strings, as they have String type in DB
+            records = await self.data_preparer.prepare_for_upsert(
+                model=TenantStorage,
+                records=[
+                    {'tenant_id': tenant_id, 'group_key': str(group_key), 'key': str(key), 'value': value}
+                    for group_key, group_data in values.items()
+                    for key, value in group_data.items()
+                ],
+                json_fields=[]
+            )
+            if not records:
+                return True  # No data to set
+            
+            async with self._get_session() as session:
+                # One upsert statement for all groups and keys (new and existing)
+                await session.execute(self._build_upsert(TenantStorage, ['value', 'processed_at']), records)
+                await session.commit()
                 return True
                 
         except Exception as e:
             self.logger.error(f"[Tenant-{tenant_id}] Error setting storage records: {e}")
             return None
     
+    @db_write
     async def delete_groups_batch(self, tenant_id: int, group_keys: List[str]) -> Optional[int]:
         """
         Batch delete multiple groups with one query
@@ -228,7 +171,7 @@ class TenantStorageRepository(BaseRepository):
             if not group_keys:
                 return 0
             
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 from sqlalchemy import or_
                 
                 # Build OR conditions for all groups
@@ -244,8 +187,8 @@ class TenantStorageRepository(BaseRepository):
                     ]
                     
                     stmt = delete(TenantStorage).where(*conditions)
-                    result = session.execute(stmt)
-                    session.commit()
+                    result = await session.execute(stmt)
+                    await session.commit()
                     
                     return result.rowcount
                 else:
@@ -255,6 +198,7 @@ class TenantStorageRepository(BaseRepository):
             self.logger.error(f"[Tenant-{tenant_id}] Error batch deleting storage groups: {e}")
             return None
     
+    @db_read
     async def get_group_keys(self, tenant_id: int, limit: Optional[int] = None) -> Optional[List[str]]:
         """
         Get list of unique group keys for tenant
@@ -263,7 +207,7 @@ class TenantStorageRepository(BaseRepository):
         limit: optional limit on number of returned groups
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(distinct(TenantStorage.group_key)).where(
                     TenantStorage.tenant_id == tenant_id
                 ).order_by(TenantStorage.group_key)
@@ -272,7 +216,7 @@ class TenantStorageRepository(BaseRepository):
                 if limit is not None and limit > 0:
                     stmt = stmt.limit(limit)
                 
-                result = session.execute(stmt).scalars().all()
+                result = (await session.execute(stmt)).scalars().all()
                 return list(result) if result else []
                     
         except Exception as e:
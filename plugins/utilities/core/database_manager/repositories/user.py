@@ -7,22 +7,26 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy import insert, select, update
 
 from ..models import TenantUser
+from ..modules.replica_router import db_read, db_write
 from .base import BaseRepository
 
+USER_COLUMNS = list(TenantUser.__table__.columns)
+
 
 class UserRepository(BaseRepository):
     """
     Repository for working with users
     """
     
+    @db_read
     async def get_user_ids_by_tenant(self, tenant_id: int) -> Optional[List[int]]:
         """
         Get list of all user_id for specified tenant
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(TenantUser.user_id).where(TenantUser.tenant_id == tenant_id)
-                result = session.execute(stmt).scalars().all()
+                result = (await session.execute(stmt)).scalars().all()
                 
                 return list(result)
                 
@@ -30,30 +34,32 @@ class UserRepository(BaseRepository):
             self.logger.error(f"[Tenant-{tenant_id}] Error getting user list: {e}")
             return None
     
+    @db_read
     async def get_user_by_id(self, user_id: int, tenant_id: int) -> Optional[Dict[str, Any]]:
         """
         Get user data by Telegram user_id and tenant_id
         """
         try:
-            with self._get_session() as session:
-                stmt = select(TenantUser).where(
+            async with self._get_session() as session:
+                stmt = select(*USER_COLUMNS).where(
                     TenantUser.tenant_id == tenant_id,
                     TenantUser.user_id == user_id
                 )
-                result = session.execute(stmt).scalar_one_or_none()
+                row = (await session.execute(stmt)).one_or_none()
                 
-                return await self._to_dict(result)
+                return self._get_row_mapper(USER_COLUMNS).map_row(row) if row is not None else None
                     
         except Exception as e:
             self.logger.error(f"Error getting user data: {e}")
             return None
     
+    @db_write
     async def create_user(self, user_data: Dict[str, Any]) -> Optional[bool]:
         """
         Create user
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 # Prepare data for insertion via data_preparer
                 prepared_fields = await self.data_preparer.prepare_for_insert(
                     model=TenantUser,
@@ -71,8 +77,8 @@ class UserRepository(BaseRepository):
                 )
                 
                 stmt = insert(TenantUser).values(**prepared_fields)
-                session.execute(stmt)
-                session.commit()
+                await session.execute(stmt)
+                await session.commit()
                 
                 return True
                 
@@ -80,12 +86,13 @@ class UserRepository(BaseRepository):
             self.logger.error(f"Error creating user: {e}")
             return None
     
+    @db_write
     async def update_user(self, user_id: int, tenant_id: int, user_data: Dict[str, Any]) -> Optional[bool]:
         """
         Update user
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 # Prepare data for update via data_preparer
                 # Pass entire user_data - data_preparer will filter existing fields itself
                 prepared_fields = await self.data_preparer.prepare_for_update(
@@ -102,8 +109,8 @@ class UserRepository(BaseRepository):
                     TenantUser.tenant_id == tenant_id,
                     TenantUser.user_id == user_id
                 ).values(**prepared_fields)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 if result.rowcount > 0:
                     return True
@@ -2,19 +2,53 @@
 Repository for working with user data storage (user_storage)
 """
 
-from typing import Any, Dict, List, Optional
+import hashlib
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import delete, select
 
 from ..models import UserStorage
+from ..modules.replica_router import db_read, db_write
 from .base import BaseRepository
 
 
+def normalize_storage_value(value: Any) -> str:
+    """
+    Normalize value for comparison
+    JSON values (and JSON strings) are serialized with sorted keys, simple values are converted to string
+    """
+    if value is None:
+        return ""
+    
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+            return json.dumps(parsed, sort_keys=True, ensure_ascii=False)
+        except (json.JSONDecodeError, TypeError):
+            return value
+    
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, ensure_ascii=False)
+    
+    return str(value)
+
+
+def storage_value_hash(value: Any) -> str:
+    """Hash of normalized value (stored in value_hash column)"""
+    return hashlib.sha256(normalize_storage_value(value).encode('utf-8')).hexdigest()
+
+
+# Columns returned by record reads (value_hash is internal)
+RECORD_COLUMNS = [UserStorage.tenant_id, UserStorage.user_id, UserStorage.key, UserStorage.value, UserStorage.processed_at]
+
+
 class UserStorageRepository(BaseRepository):
     """
     Repository for working with user data storage
     """
     
+    @db_read
     async def get_records(self, tenant_id: int, user_id: int, key: Optional[str] = None, key_pattern: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Universal get storage records
@@ -29,7 +63,7 @@ class UserStorageRepository(BaseRepository):
         limit: optional limit on number of returned records
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 conditions = [
                     UserStorage.tenant_id == tenant_id,
                     UserStorage.user_id == user_id
@@ -41,97 +75,58 @@ class UserStorageRepository(BaseRepository):
                 elif key_pattern:
                     conditions.append(UserStorage.key.ilike(key_pattern))
                 
-                stmt = select(UserStorage).where(*conditions)
+                stmt = select(*RECORD_COLUMNS).where(*conditions)
                 
                 # Apply limit if specified
                 if limit is not None and limit > 0:
                     stmt = stmt.limit(limit)
                 
-                result = session.execute(stmt).scalars().all()
+                rows = (await session.execute(stmt)).all()
                 
-                # Convert value automatically via convert_text_fields
-                return await self._to_dict_list(result, convert_text_fields=['value'])
+                # Value is converted to type by row mapper
+                return self._get_row_mapper(RECORD_COLUMNS, typed_fields=['value']).map_rows(rows)
                     
         except Exception as e:
             self.logger.error(f"[Tenant-{tenant_id}] [User-{user_id}] Error getting storage records: {e}")
             return None
     
+    @db_write
     async def set_records(self, tenant_id: int, user_id: int, values: Dict[str, Any]) -> Optional[bool]:
         """
         Universal set storage records (batch for all keys)
         
         Accepts structure {key: value} for setting one or multiple values
-        Optimized version: first get all existing records with one query,
-        then perform batch insert/update
+        All keys are written with one INSERT ... ON CONFLICT DO UPDATE statement
         """
         try:
             if not values:
                 return True  # No data to set
             
-            with self._get_session() as session:
-                # Get all existing records for user with one query
-                existing_keys = set()
-                if values:
-                    existing_records = session.execute(
-                        select(UserStorage.key).where(
-                            UserStorage.tenant_id == tenant_id,
-                            UserStorage.user_id == user_id,
-                            UserStorage.key.in_(values.keys())
-                        )
-                    ).scalars().all()
-                    existing_keys = set(existing_records)
-                
-                # Split into insert and update
-                to_insert = []
-                to_update = []
-                
-                for key, value in values.items():
-                    if key in existing_keys:
-                        to_update.append((key, value))
-                    else:
-                        to_insert.append({
-                            'tenant_id': tenant_id,
-                            'user_id': user_id,
-                            'key': key,
-                            'value': value
-                        })
-                
-                # Batch insert for new records
-                if to_insert:
-                    prepared_inserts = []
-                    for record in to_insert:
-                        prepared_fields = await self.data_preparer.prepare_for_insert(
-                            model=UserStorage,
-                            fields=record,
-                            json_fields=[]
-                        )
-                        prepared_inserts.append(prepared_fields)
-                    
-                    if prepared_inserts:
-                        session.execute(insert(UserStorage), prepared_inserts)
-                
-                # Batch update for existing records
-                if to_update:
-                    for key, value in to_update:
-                        prepared_fields = await self.data_preparer.prepare_for_update(
-                            model=UserStorage,
-                            fields={'value': value},
-                            json_fields=[]
-                        )
-                        stmt = update(UserStorage).where(
-                            UserStorage.tenant_id == tenant_id,
-                            UserStorage.user_id == user_id,
-                            UserStorage.key == key
-                        ).values(**prepared_fields)
-                        session.execute(stmt)
-                
-                session.commit()
+            records = await self.data_preparer.prepare_for_upsert(
+                model=UserStorage,
+                records=[
+                    {'tenant_id': tenant_id, 'user_id': user_id, 'key': key, 'value': value}
+                    for key, value in values.items()
+                ],
+                json_fields=[]
+            )
+            if not records:
+                return None
+            
+            for record in records:
+                record['value_hash'] = self._stored_value_hash(record.get('value'))
+            
+            async with self._get_session() as session:
+                # One upsert statement for all keys (new and existing)
+                await session.execute(self._build_upsert(UserStorage, ['value', 'value_hash', 'processed_at']), records)
+                await session.commit()
                 return True
                 
         except Exception as e:
             self.logger.error(f"[Tenant-{tenant_id}] [User-{user_id}] Error setting storage records: {e}")
             return None
     
+    @db_write
     async def delete_records(self, tenant_id: int, user_id: int, key: Optional[str] = None, key_pattern: Optional[str] = None) -> Optional[int]:
         """
         Universal delete storage records
@@ -143,7 +138,7 @@ class UserStorageRepository(BaseRepository):
         Returns number of deleted records
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 conditions = [
                     UserStorage.tenant_id == tenant_id,
                     UserStorage.user_id == user_id
@@ -156,8 +151,8 @@ class UserStorageRepository(BaseRepository):
                     conditions.append(UserStorage.key.ilike(key_pattern))
                 
                 stmt = delete(UserStorage).where(*conditions)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 return result.rowcount
                     
@@ -165,24 +160,83 @@ class UserStorageRepository(BaseRepository):
             self.logger.error(f"[Tenant-{tenant_id}] [User-{user_id}] Error deleting storage records: {e}")
             return None
     
+    def _stored_value_hash(self, stored_value: Optional[str]) -> str:
+        """Hash of value as it is read back from DB (same decoding as get_records)"""
+        return storage_value_hash(self.data_converter.decode_stored_value(stored_value))
+    
+    @db_read
+    async def find_user_ids_by_value(
+        self,
+        tenant_id: int,
+        key: str,
+        value: Any,
+        limit: Optional[int] = None,
+        after_user_id: Optional[int] = None
+    ) -> Optional[List[int]]:
+        """
+        Get user_ids with storage[key] == value (values are compared normalized)
+        Search by idx_user_storage_tenant_key_hash index, result sorted by user_id
+        Rows written before value_hash column appeared are found after core_manager migration fills their hashes
+        
+        Pagination: limit + after_user_id (last user_id of previous page)
+        """
+        try:
+            target_hash = storage_value_hash(value)
+            
+            async with self._get_session() as session:
+                conditions = [
+                    UserStorage.tenant_id == tenant_id,
+                    UserStorage.key == key,
+                    UserStorage.value_hash == target_hash
+                ]
+                if after_user_id is not None:
+                    conditions.append(UserStorage.user_id > after_user_id)
+                
+                stmt = select(UserStorage.user_id).where(*conditions).order_by(UserStorage.user_id)
+                if limit is not None and limit > 0:
+                    stmt = stmt.limit(limit)
+                
+                user_ids = (await session.execute(stmt)).scalars().all()
+                return list(user_ids)
+                
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error searching users by storage key {key}: {e}")
+            return None
+    
+    async def iter_user_ids_by_value(self, tenant_id: int, key: str, value: Any, batch_size: int = 1000) -> AsyncIterator[List[int]]:
+        """
+        Stream user_ids with storage[key] == value in pages of batch_size
+        Each page is separate short query (keyset pagination by user_id)
+        """
+        after_user_id = None
+        while True:
+            user_ids = await self.find_user_ids_by_value(tenant_id, key, value, limit=batch_size, after_user_id=after_user_id)
+            if user_ids is None:
+                raise RuntimeError(f"Error searching users by storage key {key}")
+            if user_ids:
+                yield user_ids
+            if len(user_ids) < batch_size:
+                return
+            after_user_id = user_ids[-1]
+    
+    @db_read
     async def get_by_tenant_and_key(self, tenant_id: int, key: str) -> Optional[List[Dict[str, Any]]]:
         """
         Get all storage records for tenant by key
         Uses idx_user_storage_tenant_key index for fast search
         Values are converted to required types (int, float, bool, list or str)
         
-        Used for finding users by value (find_users_by_storage_value)
         """
         try:
-            with self._get_session() as session:
-                stmt = select(UserStorage).where(
+            async with self._get_session() as session:
+                stmt = select(*RECORD_COLUMNS).where(
                     UserStorage.tenant_id == tenant_id,
                     UserStorage.key == key
                 )
-                result = session.execute(stmt).scalars().all()
+                rows = (await session.execute(stmt)).all()
                 
-                # Convert value automatically via convert_text_fields
-                return await self._to_dict_list(result, convert_text_fields=['value'])
+                # Value is converted to type by row mapper
+                return self._get_row_mapper(RECORD_COLUMNS, typed_fields=['value']).map_rows(rows)
                     
         except Exception as e:
             self.logger.error(f"[Tenant-{tenant_id}] Error getting records by key {key}: {e}")
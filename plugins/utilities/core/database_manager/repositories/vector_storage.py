@@ -2,45 +2,70 @@
 Repository for working with vector storage (vector_storage)
 """
 
-import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
+from pgvector.sqlalchemy import BIT, HALFVEC
 from pgvector.sqlalchemy import Vector as PgVector
-from sqlalchemy import delete, insert, literal, select, text, update
+from sqlalchemy import and_, cast, delete, func, insert, literal, literal_column, null, select, update
 
-from ..models import VectorStorage
+from ..models import TEXT_SEARCH_CONFIG, VectorStorage
+from ..modules.chunk_ingestion import INGEST_BATCH_SIZE, ChunkSource, chunk_fields, ingest_in_batches
+from ..modules.pg_copy import BinaryCopy
+from ..modules.replica_router import db_read, db_write
 from .base import BaseRepository
 
+# Generated column content_tsv is filled by PostgreSQL
+CHUNKS_COPY = BinaryCopy(VectorStorage.__table__, (
+    'tenant_id', 'document_id', 'chunk_index', 'document_type', 'role', 'chunk_metadata', 'content',
+    'embedding', 'embedding_model', 'created_at', 'processed_at'
+))
+
 
 class VectorStorageRepository(BaseRepository):
     """
     Repository for working with vector storage (RAG)
     """
     
+    # Reciprocal rank fusion constant: score = sum(weight / (RRF_K + rank)) over lexical and vector rankings
+    RRF_K = 60
+    
+    # Candidates taken from each ranking in hybrid search (not less than limit)
+    HYBRID_MIN_CANDIDATES = 20
+    
+    # Generated columns used only by search (full-text vector)
+    SEARCH_COLUMNS = ('content_tsv',)
+    
+    def __init__(self, session_factory, **kwargs):
+        super().__init__(session_factory, **kwargs)
+        # Exact/HNSW choice and per-query index settings (None - planner defaults of PostgreSQL)
+        self.vector_search_planner = kwargs.get('vector_search_planner')
+    
+    @db_read
     async def get_chunks_by_document(self, tenant_id: int, document_id: str) -> Optional[List[Dict[str, Any]]]:
         """
         Get all document chunks by document_id
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(VectorStorage).where(
                     VectorStorage.tenant_id == tenant_id,
                     VectorStorage.document_id == document_id
                 ).order_by(VectorStorage.chunk_index)
                 
-                result = session.execute(stmt).scalars().all()
-                return await self._to_dict_list(result)  # JSONB is automatically handled by SQLAlchemy
+                result = (await session.execute(stmt)).scalars().all()
+                return self._drop_search_columns(await self._to_dict_list(result))  # JSONB is automatically handled by SQLAlchemy
                 
         except Exception as e:
             self.logger.error(f"[Tenant-{tenant_id}] Error getting document chunks {document_id}: {e}")
             return None
     
+    @db_read
     async def get_chunks_by_type(self, tenant_id: int, document_type: str, limit: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
         """
         Get chunks by document type
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(VectorStorage).where(
                     VectorStorage.tenant_id == tenant_id,
                     VectorStorage.document_type == document_type
@@ -49,13 +74,14 @@ class VectorStorageRepository(BaseRepository):
                 if limit is not None and limit > 0:
                     stmt = stmt.limit(limit)
                 
-                result = session.execute(stmt).scalars().all()
-                return await self._to_dict_list(result)  # JSONB is automatically handled by SQLAlchemy
+                result = (await session.execute(stmt)).scalars().all()
+                return self._drop_search_columns(await self._to_dict_list(result))  # JSONB is automatically handled by SQLAlchemy
                 
         except Exception as e:
             self.logger.error(f"[Tenant-{tenant_id}] Error getting chunks of type {document_type}: {e}")
             return None
     
+    @db_read
     async def get_recent_chunks(self, tenant_id: int, limit: int, document_type: Optional[List[str]] = None,
                                 document_id: Optional[List[str]] = None, until_date=None, since_date=None,
                                 metadata_filter: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
@@ -70,7 +96,7 @@ class VectorStorageRepository(BaseRepository):
         4. document_id ASC (fourth level - for full determinism)
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 # Base conditions
                 conditions = [VectorStorage.tenant_id == tenant_id]
                 
@@ -95,11 +121,10 @@ class VectorStorageRepository(BaseRepository):
                 if since_date is not None:
                     conditions.append(VectorStorage.processed_at >= since_date)
                 
-                # Filter by metadata (JSONB)
+                # Filter by metadata (JSONB containment, bound parameter)
                 if metadata_filter:
-                    metadata_json = json.dumps(metadata_filter)
                     conditions.append(
-                        VectorStorage.chunk_metadata.op('@>')(text(f"'{metadata_json}'::jsonb"))
+                        VectorStorage.chunk_metadata.op('@>')(literal(metadata_filter, type_=VectorStorage.chunk_metadata.type))
                     )
                 
                 stmt = select(
@@ -121,7 +146,7 @@ class VectorStorageRepository(BaseRepository):
                     VectorStorage.document_id.asc()  # Fourth level: by document_id (ascending) for determinism
                 ).limit(limit)
                 
-                result = session.execute(stmt).all()
+                result = (await session.execute(stmt)).all()
                 
                 # Form result
                 chunks = []
@@ -144,19 +169,20 @@ class VectorStorageRepository(BaseRepository):
             self.logger.error(f"[Tenant-{tenant_id}] Error getting recent chunks: {e}")
             return None
     
+    @db_write
     async def delete_document(self, tenant_id: int, document_id: str) -> Optional[int]:
         """
         Delete all document chunks by document_id
         Returns number of deleted chunks
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = delete(VectorStorage).where(
                     VectorStorage.tenant_id == tenant_id,
                     VectorStorage.document_id == document_id
                 )
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 return result.rowcount
                 
@@ -164,6 +190,7 @@ class VectorStorageRepository(BaseRepository):
             self.logger.error(f"[Tenant-{tenant_id}] Error deleting document {document_id}: {e}")
             return None
     
+    @db_write
     async def delete_by_date(self, tenant_id: int, until_date=None, since_date=None,
                             metadata_filter: Optional[Dict[str, Any]] = None) -> Optional[int]:
         """
@@ -172,7 +199,7 @@ class VectorStorageRepository(BaseRepository):
         Can also specify metadata_filter for filtering by metadata
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 conditions = [VectorStorage.tenant_id == tenant_id]
                 
                 if until_date is not None:
@@ -181,11 +208,10 @@ class VectorStorageRepository(BaseRepository):
                 if since_date is not None:
                     conditions.append(VectorStorage.processed_at >= since_date)
                 
-                # Filter by metadata (JSONB)
+                # Filter by metadata (JSONB containment, bound parameter)
                 if metadata_filter:
-                    metadata_json = json.dumps(metadata_filter)
                     conditions.append(
-                        VectorStorage.chunk_metadata.op('@>')(text(f"'{metadata_json}'::jsonb"))
+                        VectorStorage.chunk_metadata.op('@>')(literal(metadata_filter, type_=VectorStorage.chunk_metadata.type))
                     )
                 
                 if until_date is None and since_date is None and not metadata_filter:
@@ -193,8 +219,8 @@ class VectorStorageRepository(BaseRepository):
                     return None
                 
                 stmt = delete(VectorStorage).where(*conditions)
-                result = session.execute(stmt)
-                session.commit()
+                result = await session.execute(stmt)
+                await session.commit()
                 
                 return result.rowcount
                 
@@ -202,13 +228,14 @@ class VectorStorageRepository(BaseRepository):
             self.logger.error(f"[Tenant-{tenant_id}] Error deleting by date: {e}")
             return None
     
+    @db_write
     async def create_chunk(self, chunk_data: Dict[str, Any]) -> Optional[bool]:
         """
         Create document chunk
         Returns True on successful creation
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 fields_dict = {
                     'tenant_id': chunk_data.get('tenant_id'),
                     'document_id': chunk_data.get('document_id'),
@@ -229,8 +256,8 @@ class VectorStorageRepository(BaseRepository):
                 )
                 
                 stmt = insert(VectorStorage).values(**prepared_fields)
-                session.execute(stmt)
-                session.commit()
+                await session.execute(stmt)
+                await session.commit()
                 
                 return True
                 
@@ -238,6 +265,7 @@ class VectorStorageRepository(BaseRepository):
             self.logger.error(f"Error creating chunk: {e}")
             return None
     
+    @db_write
     async def create_chunks_batch(self, chunks_data: List[Dict[str, Any]]) -> Optional[int]:
         """
         Create multiple chunks with one query (batch insert)
@@ -247,7 +275,7 @@ class VectorStorageRepository(BaseRepository):
             if not chunks_data:
                 return 0
             
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 prepared_inserts = []
                 for chunk_data in chunks_data:
                     fields_dict = {
@@ -271,8 +299,8 @@ class VectorStorageRepository(BaseRepository):
                     prepared_inserts.append(prepared_fields)
                 
                 if prepared_inserts:
-                    session.execute(insert(VectorStorage), prepared_inserts)
-                    session.commit()
+                    await session.execute(insert(VectorStorage), prepared_inserts)
+                    await session.commit()
                     
                     return len(prepared_inserts)
                 else:
@@ -282,31 +310,97 @@ class VectorStorageRepository(BaseRepository):
             self.logger.error(f"Error batch creating chunks: {e}")
             return None
     
+    @db_write
+    async def get_last_chunk_index(self, tenant_id: int, document_id: str) -> Optional[int]:
+        """
+        Last stored chunk_index of document (-1 - no chunks), read on primary: ingestion resumes after it
+        """
+        try:
+            async with self._get_session() as session:
+                result = await session.execute(
+                    select(func.max(VectorStorage.chunk_index)).where(
+                        VectorStorage.tenant_id == tenant_id, VectorStorage.document_id == document_id
+                    )
+                )
+                last_index = result.scalar()
+                return -1 if last_index is None else last_index
+                
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error getting last chunk index of {document_id}: {e}")
+            return None
+    
+    @db_write
+    async def ingest_chunks(self, tenant_id: int, document_id: str, chunks: ChunkSource,
+                            batch_size: int = INGEST_BATCH_SIZE, progress: Optional[Callable] = None) -> Optional[Dict[str, Any]]:
+        """
+        Streaming insert of document chunks with binary COPY, one transaction per batch_size chunks
+        chunks - async (or sync) iterable of chunk dicts in ascending chunk_index order, memory holds one batch
+        Chunks up to last committed chunk_index of document are skipped: failed import is restarted with same stream
+        progress(stats) is called after each committed batch
+        Returns stats: inserted, skipped, batches, resumed_after, last_chunk_index
+        """
+        try:
+            resume_after = await self.get_last_chunk_index(tenant_id, document_id)
+            if resume_after is None:
+                return None
+            
+            async def write_batch(batch):
+                prepared = await self.data_preparer.prepare_for_upsert(
+                    VectorStorage, [chunk_fields(tenant_id, document_id, chunk) for chunk in batch],
+                    json_fields=['chunk_metadata']
+                )
+                payload = CHUNKS_COPY.encode(prepared)
+                async with self._get_session() as session:
+                    await session.run_sync(CHUNKS_COPY.copy, payload)
+            
+            try:
+                stats = await ingest_in_batches(chunks, batch_size, resume_after, write_batch, progress)
+            finally:
+                # Tenant slice grew (committed batches stay after failure too)
+                if self.vector_search_planner is not None:
+                    self.vector_search_planner.invalidate(tenant_id)
+            
+            self.logger.info(
+                f"[Tenant-{tenant_id}] Document {document_id} ingested: {stats['inserted']} chunks in "
+                f"{stats['batches']} batches, {stats['skipped']} already stored"
+            )
+            return stats
+            
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error ingesting chunks of document {document_id}: {e}")
+            return None
+    
+    @db_read
     async def get_chunk(self, tenant_id: int, document_id: str, chunk_index: int) -> Optional[Dict[str, Any]]:
         """
         Get chunk by composite key (tenant_id, document_id, chunk_index)
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 stmt = select(VectorStorage).where(
                     VectorStorage.tenant_id == tenant_id,
                     VectorStorage.document_id == document_id,
                     VectorStorage.chunk_index == chunk_index
                 )
-                result = session.execute(stmt).scalar_one_or_none()
+                result = (await session.execute(stmt)).scalar_one_or_none()
                 
-                return await self._to_dict(result)  # JSONB is automatically handled by SQLAlchemy
+                chunk = await self._to_dict(result)  # JSONB is automatically handled by SQLAlchemy
+                if chunk:
+                    for column in self.SEARCH_COLUMNS:
+                        chunk.pop(column, None)
+                return chunk
                 
         except Exception as e:
             self.logger.error(f"[Tenant-{tenant_id}] Error getting chunk {document_id}[{chunk_index}]: {e}")
             return None
     
+    @db_write
     async def update_chunk(self, tenant_id: int, document_id: str, chunk_index: int, chunk_data: Dict[str, Any]) -> Optional[bool]:
         """
         Update chunk by composite key (tenant_id, document_id, chunk_index)
         """
         try:
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 prepared_fields = await self.data_preparer.prepare_for_update(
                     model=VectorStorage,
                     fields={
@@ -323,8 +417,8 @@ class VectorStorageRepository(BaseRepository):
                     VectorStorage.chunk_index == chunk_index
                 ).values(**prepared_fields)
                 
-                session.execute(stmt)
-                session.commit()
+                await session.execute(stmt)
+                await session.commit()
                 
                 return True
                 
@@ -332,6 +426,7 @@ class VectorStorageRepository(BaseRepository):
             self.logger.error(f"[Tenant-{tenant_id}] Error updating chunk {document_id}[{chunk_index}]: {e}")
             return None
     
+    @db_read
     async def search_similar(self, tenant_id: int, query_vector: List[float], limit: int = 5,
                             min_similarity: float = 0.7, document_type: Optional[List[str]] = None,
                             document_id: Optional[List[str]] = None, until_date=None, since_date=None,
@@ -340,49 +435,20 @@ class VectorStorageRepository(BaseRepository):
         Search similar chunks by vector (cosine similarity)
         """
         try:
-            from sqlalchemy import text
-            
-            with self._get_session() as session:
+            async with self._get_session() as session:
                 # pgvector uses <=> operator for cosine distance
                 # similarity = 1 - (embedding <=> query_vector)
                 # embedding action returns ready Python list, pass it directly
                 
-                # Base conditions
-                conditions = [VectorStorage.tenant_id == tenant_id]
-                
-                # Filter by document_type
-                if document_type:
-                    if isinstance(document_type, str):
-                        conditions.append(VectorStorage.document_type == document_type)
-                    elif isinstance(document_type, list) and document_type:
-                        conditions.append(VectorStorage.document_type.in_(document_type))
-                
-                # Filter by document_id
-                if document_id:
-                    if isinstance(document_id, str):
-                        conditions.append(VectorStorage.document_id == document_id)
-                    elif isinstance(document_id, list) and document_id:
-                        conditions.append(VectorStorage.document_id.in_(document_id))
-                
-                # Filter by created_at date (inclusive) - use created_at for correct sorting
-                if until_date is not None:
-                    conditions.append(VectorStorage.created_at <= until_date)
-                
-                if since_date is not None:
-                    conditions.append(VectorStorage.created_at >= since_date)
-                
-                # Filter by metadata (JSONB)
-                if metadata_filter:
-                    # Use @> operator to check for keys and values in JSONB
-                    # This works faster and supports indexes
-                    metadata_json = json.dumps(metadata_filter)
-                    conditions.append(
-                        VectorStorage.chunk_metadata.op('@>')(text(f"'{metadata_json}'::jsonb"))
-                    )
+                conditions = self._build_search_conditions(
+                    tenant_id, document_type, document_id, until_date, since_date, metadata_filter
+                )
                 
                 # Filter: only records with non-null embedding (for vector search)
                 conditions.append(VectorStorage.embedding.isnot(None))
                 
+                plan = await self._plan_vector_search(session, tenant_id, limit, conditions)
+                
                 # Search by cosine similarity
                 # Use SQL expression to calculate similarity
                 # 1 - (embedding <=> query_vector) = cosine similarity
@@ -396,11 +462,13 @@ class VectorStorageRepository(BaseRepository):
                 # Use PgVector for correct list to vector type conversion
                 query_vec_expr = literal(query_vector, type_=PgVector(1024))
                 
-                # Create similarity expression using <=> operator via .op()
+                # Cosine distance via <=> operator; HNSW index is used only for ORDER BY distance ASC LIMIT,
+                # so results are sorted by distance and similarity is computed only in select list
                 # Use literal(1) for literal value 1 so it doesn't become a parameter
-                similarity_expr = literal(1) - (VectorStorage.embedding.op('<=>')(query_vec_expr))
+                distance_expr = VectorStorage.embedding.op('<=>')(query_vec_expr)
+                similarity_expr = literal(1) - distance_expr
                 
-                stmt = select(
+                result_columns = [
                     VectorStorage.content,
                     VectorStorage.document_id,
                     VectorStorage.chunk_index,
@@ -409,16 +477,28 @@ class VectorStorageRepository(BaseRepository):
                     VectorStorage.chunk_metadata,
                     VectorStorage.embedding_model,
                     VectorStorage.created_at,
-                    VectorStorage.processed_at,
-                    similarity_expr.label('similarity')  # Now .label() works correctly
-                ).where(
-                    *conditions
-                ).order_by(
-                    similarity_expr.desc()  # Use same expression for sorting
-                ).limit(limit)
+                    VectorStorage.processed_at
+                ]
+                
+                if plan is not None and plan.coarse:
+                    # Coarse pass by reduced-precision index, rerank of candidates by exact distance
+                    coarse = self._coarse_candidates(result_columns, conditions, query_vec_expr, limit, plan)
+                    stmt = select(
+                        *[coarse.c[column.key] for column in result_columns],
+                        (literal(1) - coarse.c.distance).label('similarity')
+                    ).order_by(coarse.c.distance).limit(limit)
+                else:
+                    stmt = select(
+                        *result_columns,
+                        similarity_expr.label('similarity')  # Now .label() works correctly
+                    ).where(
+                        *conditions
+                    ).order_by(
+                        distance_expr  # Ascending distance: index order of HNSW
+                    ).limit(limit)
                 
                 # Execute query (query_vector already converted to vector via cast)
-                result = session.execute(stmt).all()
+                result = (await session.execute(stmt)).all()
                 
                 # Form result (filtering by min_similarity already done in SQL)
                 chunks = []
@@ -444,4 +524,209 @@ class VectorStorageRepository(BaseRepository):
         except Exception as e:
             self.logger.error(f"[Tenant-{tenant_id}] Error searching similar chunks: {e}")
             return None
-
+    
+    @db_read
+    async def search_hybrid(self, tenant_id: int, query_text: str, query_vector: Optional[List[float]] = None,
+                            limit: int = 5, document_type: Optional[List[str]] = None,
+                            document_id: Optional[List[str]] = None, until_date=None, since_date=None,
+                            metadata_filter: Optional[Dict[str, Any]] = None, min_similarity: Optional[float] = None,
+                            candidates: Optional[int] = None, lexical_weight: float = 1.0,
+                            vector_weight: float = 1.0) -> Optional[List[Dict[str, Any]]]:
+        """
+        Hybrid search: full-text (content_tsv, GIN) and vector (HNSW) candidates combined by reciprocal rank fusion
+        Both rankings, fusion and chunk fields are one SQL statement (one round trip)
+        min_similarity limits only vector candidates: chunk found by words is kept even with low similarity
+        Without query_vector only lexical ranking is used
+        """
+        try:
+            async with self._get_session() as session:
+                conditions = self._build_search_conditions(
+                    tenant_id, document_type, document_id, until_date, since_date, metadata_filter
+                )
+                candidate_limit = max(candidates or limit * 4, limit, self.HYBRID_MIN_CANDIDATES)
+                plan = None
+                if query_vector is not None:
+                    plan = await self._plan_vector_search(session, tenant_id, candidate_limit, conditions)
+                
+                # Lexical candidates: websearch syntax ("exact phrase", -exclude, or), words are AND by default
+                tsquery = func.websearch_to_tsquery(literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig"), query_text)
+                text_rank = func.ts_rank_cd(VectorStorage.content_tsv, tsquery)
+                lexical_top = select(
+                    VectorStorage.document_id, VectorStorage.chunk_index, text_rank.label('text_rank')
+                ).where(
+                    *conditions, VectorStorage.content_tsv.op('@@')(tsquery)
+                ).order_by(text_rank.desc()).limit(candidate_limit).subquery('lexical_top')
+                # Rank is numbered after LIMIT so index scan is not replaced by window over all matches
+                lexical = select(
+                    lexical_top.c.document_id, lexical_top.c.chunk_index,
+                    func.row_number().over(order_by=lexical_top.c.text_rank.desc()).label('rank')
+                ).cte('lexical')
+                
+                similarity_expr = None
+                if query_vector is not None:
+                    query_vec_expr = literal(query_vector, type_=PgVector(1024))
+                    distance = VectorStorage.embedding.op('<=>')(query_vec_expr)
+                    similarity_expr = literal(1) - distance
+                    vector_conditions = [*conditions, VectorStorage.embedding.isnot(None)]
+                    if plan is not None and plan.coarse:
+                        coarse = self._coarse_candidates(
+                            [VectorStorage.document_id, VectorStorage.chunk_index], vector_conditions,
+                            query_vec_expr, candidate_limit, plan
+                        )
+                        vector_top = select(coarse).where(
+                            *([coarse.c.distance <= 1 - min_similarity] if min_similarity is not None else [])
+                        ).order_by(coarse.c.distance).limit(candidate_limit).subquery('vector_top')
+                    else:
+                        if min_similarity is not None:
+                            vector_conditions.append(distance <= 1 - min_similarity)
+                        vector_top = select(
+                            VectorStorage.document_id, VectorStorage.chunk_index, distance.label('distance')
+                        ).where(*vector_conditions).order_by(distance).limit(candidate_limit).subquery('vector_top')
+                    semantic = select(
+                        vector_top.c.document_id, vector_top.c.chunk_index,
+                        func.row_number().over(order_by=vector_top.c.distance).label('rank')
+                    ).cte('semantic')
+                    
+                    # Full outer join: chunk can be found by one ranking only
+                    join_on = and_(
+                        lexical.c.document_id == semantic.c.document_id,
+                        lexical.c.chunk_index == semantic.c.chunk_index
+                    )
+                    score = (
+                        func.coalesce(literal(lexical_weight) / (literal(self.RRF_K) + lexical.c.rank), 0)
+                        + func.coalesce(literal(vector_weight) / (literal(self.RRF_K) + semantic.c.rank), 0)
+                    )
+                    fused = select(
+                        func.coalesce(lexical.c.document_id, semantic.c.document_id).label('document_id'),
+                        func.coalesce(lexical.c.chunk_index, semantic.c.chunk_index).label('chunk_index'),
+                        lexical.c.rank.label('lexical_rank'),
+                        semantic.c.rank.label('vector_rank'),
+                        score.label('score')
+                    ).select_from(lexical.outerjoin(semantic, join_on, full=True))
+                else:
+                    fused = select(
+                        lexical.c.document_id,
+                        lexical.c.chunk_index,
+                        lexical.c.rank.label('lexical_rank'),
+                        null().label('vector_rank'),
+                        (literal(lexical_weight) / (literal(self.RRF_K) + lexical.c.rank)).label('score')
+                    )
+                fused = fused.order_by(literal_column('score').desc()).limit(limit).cte('fused')
+                
+                stmt = select(
+                    VectorStorage.content,
+                    VectorStorage.document_id,
+                    VectorStorage.chunk_index,
+                    VectorStorage.document_type,
+                    VectorStorage.role,
+                    VectorStorage.chunk_metadata,
+                    VectorStorage.embedding_model,
+                    VectorStorage.created_at,
+                    VectorStorage.processed_at,
+                    fused.c.score,
+                    fused.c.lexical_rank,
+                    fused.c.vector_rank,
+                    (similarity_expr if similarity_expr is not None else null()).label('similarity')
+                ).join(
+                    fused, and_(
+                        VectorStorage.tenant_id == tenant_id,
+                        VectorStorage.document_id == fused.c.document_id,
+                        VectorStorage.chunk_index == fused.c.chunk_index
+                    )
+                ).order_by(
+                    fused.c.score.desc(), VectorStorage.document_id.asc(), VectorStorage.chunk_index.asc()
+                )
+                
+                result = (await session.execute(stmt)).all()
+                
+                chunks = []
+                for row in result:
+                    chunks.append({
+                        "content": row.content,
+                        "document_id": row.document_id,
+                        "chunk_index": row.chunk_index,
+                        "document_type": row.document_type,
+                        "role": row.role,
+                        "chunk_metadata": row.chunk_metadata,
+                        "embedding_model": row.embedding_model,
+                        "created_at": row.created_at.isoformat() if row.created_at else None,
+                        "processed_at": row.processed_at.isoformat() if row.processed_at else None,
+                        "similarity": round(float(row.similarity), 4) if row.similarity is not None else None,
+                        "score": round(float(row.score), 6),
+                        "lexical_rank": row.lexical_rank,
+                        "vector_rank": row.vector_rank
+                    })
+                
+                return chunks
+                
+        except Exception as e:
+            self.logger.error(f"[Tenant-{tenant_id}] Error in hybrid search: {e}")
+            return None
+    
+    async def _plan_vector_search(self, session, tenant_id: int, limit: int, conditions: List[Any]):
+        """
+        Applies search plan to session transaction (exact scan for small tenant slice, HNSW parameters otherwise)
+        With own partial index tenant_id is inlined: planner matches index predicate only against constant
+        Returns plan (None without planner)
+        """
+        if self.vector_search_planner is None:
+            return None
+        plan = await self.vector_search_planner.plan(session, tenant_id, limit)
+        if plan.tenant_index:
+            conditions[0] = VectorStorage.tenant_id == literal_column(str(int(tenant_id)))
+        return plan
+    
+    @staticmethod
+    def _coarse_candidates(columns: List[Any], conditions: List[Any], query_vec_expr, limit: int, plan):
+        """
+        Coarse pass over reduced-precision index: limit * rerank_factor nearest rows by halfvec or Hamming distance
+        Subquery with given columns and exact cosine distance ('distance') of full vector for rerank
+        """
+        if plan.coarse == 'halfvec':
+            coarse_distance = cast(VectorStorage.embedding, HALFVEC(1024)).op('<=>')(cast(query_vec_expr, HALFVEC(1024)))
+        else:
+            # Same expression as binary index (embedding_index_sql), otherwise index is not used
+            coarse_distance = cast(func.binary_quantize(VectorStorage.embedding), BIT(1024)).op('<~>')(
+                func.binary_quantize(query_vec_expr, type_=BIT(1024))
+            )
+        return select(
+            *columns, VectorStorage.embedding.op('<=>')(query_vec_expr).label('distance')
+        ).where(*conditions).order_by(coarse_distance).limit(limit * plan.rerank_factor).subquery('coarse')
+    
+    def _build_search_conditions(self, tenant_id: int, document_type=None, document_id=None, until_date=None,
+                                 since_date=None, metadata_filter: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Filters of search methods (dates by created_at, metadata by JSONB containment)"""
+        conditions = [VectorStorage.tenant_id == tenant_id]
+        
+        if document_type:
+            if isinstance(document_type, str):
+                conditions.append(VectorStorage.document_type == document_type)
+            elif isinstance(document_type, list) and document_type:
+                conditions.append(VectorStorage.document_type.in_(document_type))
+        
+        if document_id:
+            if isinstance(document_id, str):
+                conditions.append(VectorStorage.document_id == document_id)
+            elif isinstance(document_id, list) and document_id:
+                conditions.append(VectorStorage.document_id.in_(document_id))
+        
+        if until_date is not None:
+            conditions.append(VectorStorage.created_at <= until_date)
+        
+        if since_date is not None:
+            conditions.append(VectorStorage.created_at >= since_date)
+        
+        if metadata_filter:
+            # Bound parameter instead of inline literal (value may contain quotes)
+            conditions.append(VectorStorage.chunk_metadata.op('@>')(literal(metadata_filter, type_=VectorStorage.chunk_metadata.type)))
+        
+        return conditions
+    
+    @staticmethod
+    def _drop_search_columns(chunks: Optional[List[Dict[str, Any]]]) -> Optional[List[Dict[str, Any]]]:
+        """Search-only columns are not returned to callers"""
+        if chunks:
+            for chunk in chunks:
+                for column in VectorStorageRepository.SEARCH_COLUMNS:
+                    chunk.pop(column, None)
+        return chunks
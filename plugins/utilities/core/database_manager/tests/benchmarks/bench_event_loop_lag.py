@@ -0,0 +1,116 @@
+"""
+Benchmark: event loop lag and throughput of repository calls, sync engine, sync engine in DB thread pool, native async engine
+
+Run from project root:
+    python plugins/utilities/core/database_manager/tests/benchmarks/bench_event_loop_lag.py [concurrency] [rounds]
+"""
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# plugins/utilities/core/ and plugins/utilities/foundation/ - import through subfolders, preserving package structure
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / 'foundation'))
+
+from data_converter.data_converter import DataConverter  # noqa: E402
+from database_manager.database_manager import DatabaseManager  # noqa: E402
+from datetime_formatter.datetime_formatter import DatetimeFormatter  # noqa: E402
+
+TICK_INTERVAL = 0.005
+
+
+def _create_database_manager(database_url: str, mode: str) -> DatabaseManager:
+    settings = {
+        'database_preset': 'sqlite',
+        'async_engine': mode == 'async',
+        'sync_executor': mode == 'executor',
+        'database': {'sqlite': {
+            'database_url': database_url,
+            'connection_pool': {'pool_size': 20, 'max_overflow': 10},
+            'pragma_settings': {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'busy_timeout': 30000},
+        }},
+    }
+    settings_manager = MagicMock()
+    settings_manager.get_plugin_settings.side_effect = lambda name: settings if name == 'database_manager' else {}
+    logger = MagicMock()
+    datetime_formatter = DatetimeFormatter(logger=logger, settings_manager=settings_manager)
+    data_converter = DataConverter(logger=logger, settings_manager=settings_manager, datetime_formatter=datetime_formatter)
+    return DatabaseManager(
+        logger=logger,
+        settings_manager=settings_manager,
+        datetime_formatter=datetime_formatter,
+        data_converter=data_converter
+    )
+
+
+async def _ticker(lags: list, stop: asyncio.Event):
+    """Measures how late the loop wakes up a sleeping task"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_INTERVAL)
+        lags.append(time.perf_counter() - started - TICK_INTERVAL)
+
+
+async def _run(mode: str, concurrency: int, rounds: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager = _create_database_manager(f"sqlite:///{directory}/bench.db", mode)
+        master = database_manager.get_master_repository()
+        
+        await master.create_tenant({'id': 1})
+        for user_id in range(concurrency):
+            await master.create_user({'user_id': user_id, 'tenant_id': 1, 'username': f"user{user_id}"})
+        
+        async def worker(user_id: int):
+            for i in range(rounds):
+                await master.set_user_storage_records(1, user_id, {'counter': i})
+                await master.get_user_by_id(user_id, 1)
+                await master.get_user_storage_records(1, user_id)
+        
+        lags = []
+        stop = asyncio.Event()
+        ticker = asyncio.create_task(_ticker(lags, stop))
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(user_id) for user_id in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        
+        stop.set()
+        await ticker
+        executor_stats = database_manager.get_executor_stats()
+        await asyncio.to_thread(database_manager.shutdown)
+    
+    lags.sort()
+    return {
+        'mode': mode,
+        'executor': executor_stats,
+        'ops_per_sec': concurrency * rounds * 3 / elapsed,
+        'lag_p50_ms': lags[len(lags) // 2] * 1000 if lags else 0.0,
+        'lag_p99_ms': lags[int(len(lags) * 0.99)] * 1000 if lags else 0.0,
+        'lag_max_ms': lags[-1] * 1000 if lags else 0.0,
+    }
+
+
+async def main(concurrency: int, rounds: int):
+    print(f"concurrency={concurrency}, rounds={rounds} (3 repository calls per round)")
+    for mode in ('sync', 'executor', 'async'):
+        result = await _run(mode, concurrency, rounds)
+        print(
+            f"  {result['mode']:8}: {result['ops_per_sec']:8.0f} ops/s, "
+            f"loop lag p50 {result['lag_p50_ms']:6.2f} ms, p99 {result['lag_p99_ms']:7.2f} ms, "
+            f"max {result['lag_max_ms']:7.2f} ms"
+        )
+        if result['executor']:
+            executor = result['executor']
+            print(
+                f"            executor: {executor['max_workers']} threads, max queue depth {executor['max_queue_depth']}, "
+                f"wait avg {executor['wait_avg_ms']:.2f} ms, max {executor['wait_max_ms']:.2f} ms"
+            )
+
+
+if __name__ == '__main__':
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(main(concurrency, rounds))
@@ -0,0 +1,101 @@
+"""
+Benchmark: storage reads through ORM objects + DataConverter.to_dict vs Core select(columns) + row mapper
+
+Run from project root:
+    python plugins/utilities/core/database_manager/tests/benchmarks/bench_storage_reads.py [rows] [iterations]
+"""
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# plugins/utilities/core/ and plugins/utilities/foundation/ - import through subfolders, preserving package structure
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / 'foundation'))
+
+from data_converter.data_converter import DataConverter  # noqa: E402
+from database_manager.database_manager import DatabaseManager  # noqa: E402
+from database_manager.models import TenantStorage, UserStorage  # noqa: E402
+from datetime_formatter.datetime_formatter import DatetimeFormatter  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+
+def _create_database_manager(database_url: str) -> DatabaseManager:
+    settings = {
+        'database_preset': 'sqlite',
+        'database': {'sqlite': {'database_url': database_url, 'pragma_settings': {'journal_mode': 'WAL'}}},
+    }
+    settings_manager = MagicMock()
+    settings_manager.get_plugin_settings.side_effect = lambda name: settings if name == 'database_manager' else {}
+    logger = MagicMock()
+    datetime_formatter = DatetimeFormatter(logger=logger, settings_manager=settings_manager)
+    data_converter = DataConverter(logger=logger, settings_manager=settings_manager, datetime_formatter=datetime_formatter)
+    return DatabaseManager(
+        logger=logger,
+        settings_manager=settings_manager,
+        datetime_formatter=datetime_formatter,
+        data_converter=data_converter
+    )
+
+
+def _sample_value(i: int):
+    """Mix of storage value kinds: numbers, flags, strings, lists, objects"""
+    kind = i % 5
+    if kind == 0:
+        return i
+    if kind == 1:
+        return i % 2 == 0
+    if kind == 2:
+        return f"text value {i}"
+    if kind == 3:
+        return [i, i + 1, f"item {i}"]
+    return {'id': i, 'name': f"name {i}", 'tags': ['a', 'b']}
+
+
+async def _orm_records(repository, model, conditions):
+    """Previous implementation: ORM objects + _to_dict_list with convert_text_fields"""
+    async with repository._get_session() as session:
+        objects = (await session.execute(select(model).where(*conditions))).scalars().all()
+        return await repository._to_dict_list(objects, convert_text_fields=['value'])
+
+
+async def _measure(name: str, call, iterations: int):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        records = await call()
+    elapsed = (time.perf_counter() - started) / iterations
+    print(f"  {name:34}: {elapsed * 1000:8.2f} ms per call ({len(records)} rows)")
+    return elapsed
+
+
+async def main(rows: int, iterations: int):
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager = _create_database_manager(f"sqlite:///{directory}/bench.db")
+        master = database_manager.get_master_repository()
+        await master.create_tenant({'id': 1})
+        await master.set_user_storage_records(1, 1, {f"key_{i}": _sample_value(i) for i in range(rows)})
+        await master.set_storage_records(1, {'group': {f"key_{i}": _sample_value(i) for i in range(rows)}})
+        
+        print(f"rows={rows}, iterations={iterations}")
+        
+        print("user_storage get_records:")
+        user_conditions = [UserStorage.tenant_id == 1, UserStorage.user_id == 1]
+        before = await _measure("ORM + to_dict", lambda: _orm_records(master.user_storage, UserStorage, user_conditions), iterations)
+        after = await _measure("Core select + row mapper", lambda: master.get_user_storage_records(1, 1), iterations)
+        print(f"  speedup: {before / after:.1f}x")
+        
+        print("tenant_storage get_storage_records:")
+        tenant_conditions = [TenantStorage.tenant_id == 1, TenantStorage.group_key == 'group']
+        before = await _measure("ORM + to_dict", lambda: _orm_records(master.tenant_storage, TenantStorage, tenant_conditions), iterations)
+        after = await _measure("Core select + row mapper", lambda: master.get_storage_records(1, group_key='group'), iterations)
+        print(f"  speedup: {before / after:.1f}x")
+        
+        database_manager.shutdown()
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    asyncio.run(main(rows, iterations))
@@ -0,0 +1,123 @@
+"""
+Benchmark: recall@k of reduced-precision vector index (halfvec, binary quantization) with exact rerank
+of top k * rerank_factor candidates, and index size per row
+
+Simulation (always): coarse pass is brute force over quantized vectors with numpy (float16 cosine, Hamming distance
+of sign bits), so it measures quantization loss alone, without HNSW approximation
+PostgreSQL with pgvector (BENCH_PG_HOST, see bench_vector_search.py): same queries through search_similar
+with global HNSW index of each precision (sync_embedding_index switches index between runs)
+
+Run from project root:
+    python plugins/utilities/core/database_manager/tests/benchmarks/bench_vector_quantization.py [rows] [queries]
+"""
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+from bench_vector_search import (
+    CLUSTERS,
+    DIMENSIONS,
+    LARGE_TENANT,
+    TOP_K,
+    _create_database_manager,
+    _generate,
+    _load,
+    _settings,
+    _unit,
+)
+from sqlalchemy import text
+
+RERANK_FACTORS = (1, 2, 4, 8, 16, 32)
+# Bytes per row of HNSW index element (vector data only, graph links are same for all precisions)
+ROW_BYTES = {'vector': DIMENSIONS * 4, 'halfvec': DIMENSIONS * 2, 'binary': DIMENSIONS // 8}
+
+
+def _queries(rng: np.random.Generator, vectors: np.ndarray, count: int) -> list:
+    """[(query, truth chunk indexes)], truth is exact top-k by cosine over full vectors"""
+    cases = []
+    for _ in range(count):
+        source = vectors[rng.integers(0, len(vectors))]
+        query = _unit(source + rng.normal(scale=0.3, size=DIMENSIONS).astype(np.float32) / np.sqrt(DIMENSIONS))
+        cases.append((query, set(np.argsort(-(vectors @ query))[:TOP_K].tolist())))
+    return cases
+
+
+def _simulate(vectors: np.ndarray, cases: list) -> None:
+    half = vectors.astype(np.float16).astype(np.float32)
+    # Sign bits as +-1: dot product = dimensions - 2 * Hamming distance, same order as bit_hamming_ops
+    signs = np.where(vectors > 0, 1, -1).astype(np.float32)
+
+    print(f"simulation (brute-force coarse pass), {len(vectors)} rows:")
+    for precision, quantized, quantize in (
+        ('halfvec', half, lambda query: query.astype(np.float16).astype(np.float32)),
+        ('binary', signs, lambda query: np.where(query > 0, 1, -1).astype(np.float32)),
+    ):
+        recalls = {factor: [] for factor in RERANK_FACTORS}
+        for query, truth in cases:
+            order = np.argsort(-(quantized @ quantize(query)))
+            for factor in RERANK_FACTORS:
+                candidates = order[:TOP_K * factor]
+                found = candidates[np.argsort(-(vectors[candidates] @ query))[:TOP_K]]
+                recalls[factor].append(len(set(found.tolist()) & truth) / TOP_K)
+        for factor in RERANK_FACTORS:
+            print(f"  {precision:8} rerank x{factor:<3}: recall@{TOP_K} {np.mean(recalls[factor]):.3f}, "
+                  f"{ROW_BYTES[precision]} B/row vs {ROW_BYTES['vector']} B/row")
+
+
+async def _measure_postgresql(rows: int, vectors: np.ndarray, cases: list) -> None:
+    settings = _settings('', rows)
+    # Every search goes through HNSW: exact threshold below tenant size, no tenant index
+    settings['database']['postgresql']['vector_search'] = {'exact_max_rows': 0, 'tenant_index_min_rows': rows * 10}
+    database_manager = _create_database_manager(settings)
+    master = database_manager.get_master_repository()
+    planner = database_manager.vector_search_planner
+
+    await _load(master, LARGE_TENANT, vectors)
+    with database_manager.engine.connect() as connection:
+        connection.execute(text("analyze vector_storage"))
+        connection.commit()
+
+    print(f"postgresql (HNSW), {rows} rows:")
+    for precision in ('vector', 'halfvec', 'binary'):
+        planner.index_precision = precision
+        started = time.perf_counter()
+        print(f"  sync_embedding_index: {await database_manager.sync_embedding_index()} "
+              f"in {time.perf_counter() - started:.1f} s")
+        for factor in RERANK_FACTORS if precision != 'vector' else (1,):
+            planner.rerank_factor = factor
+            recalls, latencies = [], []
+            for query, truth in cases:
+                started = time.perf_counter()
+                results = await master.search_vector_storage_similar(
+                    LARGE_TENANT, query.tolist(), limit=TOP_K, min_similarity=-1
+                )
+                latencies.append((time.perf_counter() - started) * 1000)
+                recalls.append(len({result['chunk_index'] for result in results or []} & truth) / TOP_K)
+            latencies.sort()
+            print(f"  {precision:8} rerank x{factor:<3}: recall@{TOP_K} {np.mean(recalls):.3f}, "
+                  f"p50 {latencies[len(latencies) // 2]:7.2f} ms")
+
+    with database_manager.engine.connect() as connection:
+        sizes = connection.execute(text(
+            "select indexname, pg_relation_size(indexname::regclass) from pg_indexes "
+            "where tablename = 'vector_storage' and indexname like 'idx_vector_storage_embedding%'"
+        )).all()
+    print(f"  index size: {dict(sizes)}")
+    database_manager.shutdown()
+
+
+def main(rows: int, queries: int):
+    rng = np.random.default_rng(42)
+    centers = rng.normal(size=(CLUSTERS, DIMENSIONS)).astype(np.float32)
+    vectors = _generate(rng, rows, centers)
+    cases = _queries(rng, vectors, queries)
+
+    _simulate(vectors, cases)
+    if os.environ.get('BENCH_PG_HOST'):
+        asyncio.run(_measure_postgresql(rows, vectors, cases))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000, int(sys.argv[2]) if len(sys.argv) > 2 else 100)
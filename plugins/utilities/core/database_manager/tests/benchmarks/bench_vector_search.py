@@ -0,0 +1,223 @@
+"""
+Benchmark: recall@k and latency of search_similar by tenant slice (small tenants in large table, large tenant,
+large tenant with selective metadata filter) for search strategies of vector storage backend
+
+Synthetic data: clustered unit vectors (1024 dims, same as vector_storage.embedding), queries are noisy copies of
+tenant vectors, ground truth is exact top-k computed with numpy over same filtered slice
+
+Run from project root:
+    python plugins/utilities/core/database_manager/tests/benchmarks/bench_vector_search.py [large_rows] [small_tenants] [small_rows] [queries]
+
+Default backend is local vector index of SQLite preset (exact; HNSW too when hnswlib is installed)
+PostgreSQL with pgvector: set BENCH_PG_HOST (optional BENCH_PG_PORT, BENCH_PG_USER, BENCH_PG_PASSWORD, BENCH_PG_DATABASE),
+compares global HNSW index with default settings, search planner, planner with own index of large tenant
+Database must be disposable: chunks of bench tenants are replaced
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+
+# plugins/utilities/core/ and plugins/utilities/foundation/ - import through subfolders, preserving package structure
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / 'foundation'))
+
+from data_converter.data_converter import DataConverter  # noqa: E402
+from database_manager.database_manager import DatabaseManager  # noqa: E402
+from database_manager.modules import local_vector_index  # noqa: E402
+from datetime_formatter.datetime_formatter import DatetimeFormatter  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+DIMENSIONS = 1024
+CLUSTERS = 64
+TOP_K = 10
+METADATA_GROUPS = 20  # filter {'group': 0} keeps 5% of tenant rows
+LARGE_TENANT = 1
+INSERT_BATCH = 1000
+
+
+def _settings(directory: str, large_rows: int) -> dict:
+    if not os.environ.get('BENCH_PG_HOST'):
+        return {
+            'database_preset': 'sqlite',
+            'database': {'sqlite': {
+                'database_url': f"sqlite:///{directory}/bench.db",
+                'pragma_settings': {'journal_mode': 'WAL'},
+            }},
+        }
+    return {
+        'database_preset': 'postgresql',
+        'database': {'postgresql': {
+            'host': os.environ['BENCH_PG_HOST'],
+            'port': int(os.environ.get('BENCH_PG_PORT', 5432)),
+            'username': os.environ.get('BENCH_PG_USER', 'postgres'),
+            'password': os.environ.get('BENCH_PG_PASSWORD', ''),
+            'database': os.environ.get('BENCH_PG_DATABASE', 'core_db'),
+            # Large tenant qualifies for own index, small tenants stay below exact threshold
+            'vector_search': {'tenant_index_min_rows': large_rows},
+        }},
+    }
+
+
+def _create_database_manager(settings: dict) -> DatabaseManager:
+    settings_manager = MagicMock()
+    settings_manager.get_plugin_settings.side_effect = lambda name: settings if name == 'database_manager' else {}
+    logger = MagicMock()
+    datetime_formatter = DatetimeFormatter(logger=logger, settings_manager=settings_manager)
+    data_converter = DataConverter(logger=logger, settings_manager=settings_manager, datetime_formatter=datetime_formatter)
+    return DatabaseManager(
+        logger=logger,
+        settings_manager=settings_manager,
+        datetime_formatter=datetime_formatter,
+        data_converter=data_converter
+    )
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    return (vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)).astype(np.float32)
+
+
+def _generate(rng: np.random.Generator, rows: int, centers: np.ndarray) -> np.ndarray:
+    return _unit(centers[rng.integers(0, len(centers), rows)] + rng.normal(scale=0.6, size=(rows, DIMENSIONS)) / np.sqrt(DIMENSIONS) * 8)
+
+
+async def _load(master, tenant_id: int, vectors: np.ndarray) -> None:
+    await master.create_tenant({'id': tenant_id})
+    await master.delete_document(tenant_id, 'bench')
+    for start in range(0, len(vectors), INSERT_BATCH):
+        await master.create_chunks_batch([
+            {
+                'tenant_id': tenant_id,
+                'document_id': 'bench',
+                'document_type': 'knowledge',
+                'chunk_index': index,
+                'content': f"chunk {index}",
+                'embedding': vectors[index].tolist(),
+                'embedding_model': 'bench',
+                'chunk_metadata': {'group': index % METADATA_GROUPS},
+            }
+            for index in range(start, min(start + INSERT_BATCH, len(vectors)))
+        ])
+
+
+def _scenario_queries(rng: np.random.Generator, tenants: dict, small_tenants: list, queries: int):
+    """(name, [(tenant_id, query, metadata_filter, truth chunk indexes)])"""
+    def make(tenant_id, metadata_filter):
+        vectors = tenants[tenant_id]
+        indexes = np.arange(len(vectors))
+        if metadata_filter:
+            indexes = indexes[indexes % METADATA_GROUPS == metadata_filter['group']]
+        source = vectors[indexes[rng.integers(0, len(indexes))]]
+        query = _unit(source + rng.normal(scale=0.3, size=DIMENSIONS).astype(np.float32) / np.sqrt(DIMENSIONS))
+        scores = vectors[indexes] @ query
+        truth = indexes[np.argsort(-scores)[:TOP_K]]
+        return tenant_id, query, metadata_filter, set(truth.tolist())
+
+    return [
+        ('small tenants', [make(small_tenants[i % len(small_tenants)], None) for i in range(queries)]),
+        ('large tenant', [make(LARGE_TENANT, None) for _ in range(queries)]),
+        ('large tenant, 5% filter', [make(LARGE_TENANT, {'group': 0}) for _ in range(queries)]),
+    ]
+
+
+async def _run_scenario(master, cases) -> tuple:
+    # Warm-up query per tenant: lazy index build (local HNSW graph) and cold caches are not measured
+    for tenant_id in {case[0] for case in cases}:
+        await master.search_vector_storage_similar(tenant_id, cases[0][1].tolist(), limit=TOP_K, min_similarity=-1)
+
+    recalls, latencies = [], []
+    for tenant_id, query, metadata_filter, truth in cases:
+        started = time.perf_counter()
+        results = await master.search_vector_storage_similar(
+            tenant_id, query.tolist(), limit=TOP_K, min_similarity=-1, metadata_filter=metadata_filter
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        found = {result['chunk_index'] for result in results or []}
+        recalls.append(len(found & truth) / len(truth))
+    latencies.sort()
+    return float(np.mean(recalls)), latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95)]
+
+
+def _modes(database_manager: DatabaseManager, tenant_ids: list) -> list:
+    """(name, async setup) of strategies compared on current backend"""
+    repository = database_manager.get_master_repository().vector_storage
+
+    if database_manager.vector_index is not None:
+        def set_hnsw_min_rows(value):
+            async def setup():
+                for tenant_id in tenant_ids:
+                    database_manager.vector_index.get_store(tenant_id).hnsw_min_rows = value
+            return setup
+
+        modes = [('exact', set_hnsw_min_rows(float('inf')))]
+        if local_vector_index.hnswlib is not None:
+            modes.append(('hnsw', set_hnsw_min_rows(0)))
+            modes.append(('auto (hnsw_min_rows)', set_hnsw_min_rows(
+                database_manager.vector_index.get_store(LARGE_TENANT).hnsw_min_rows
+            )))
+        return modes
+
+    planner = database_manager.vector_search_planner
+
+    async def global_index():
+        repository.vector_search_planner = None
+
+    async def with_planner():
+        repository.vector_search_planner = planner
+        planner.invalidate()
+
+    async def with_tenant_index():
+        print(f"  sync_tenant_vector_indexes: {await database_manager.sync_tenant_vector_indexes()}")
+        await with_planner()
+
+    return [('global HNSW, defaults', global_index), ('planner', with_planner), ('planner + tenant index', with_tenant_index)]
+
+
+async def main(large_rows: int, small_tenants: int, small_rows: int, queries: int):
+    rng = np.random.default_rng(42)
+    centers = rng.normal(size=(CLUSTERS, DIMENSIONS)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_manager = _create_database_manager(_settings(directory, large_rows))
+        master = database_manager.get_master_repository()
+        small_ids = list(range(LARGE_TENANT + 1, LARGE_TENANT + 1 + small_tenants))
+
+        print(f"backend={database_manager.db_type}, large tenant {large_rows} rows, "
+              f"{small_tenants} small tenants x {small_rows} rows, {queries} queries per scenario, top {TOP_K}")
+        tenants = {LARGE_TENANT: _generate(rng, large_rows, centers)}
+        for tenant_id in small_ids:
+            tenants[tenant_id] = _generate(rng, small_rows, centers)
+        started = time.perf_counter()
+        for tenant_id, vectors in tenants.items():
+            await _load(master, tenant_id, vectors)
+        print(f"  loaded in {time.perf_counter() - started:.1f} s")
+        if database_manager.db_type == 'postgresql':
+            with database_manager.engine.connect() as connection:
+                connection.execute(text("analyze vector_storage"))
+                connection.commit()
+
+        scenarios = _scenario_queries(rng, tenants, small_ids, queries)
+        for mode, setup in _modes(database_manager, list(tenants)):
+            await setup()
+            print(f"{mode}:")
+            for name, cases in scenarios:
+                recall, p50, p95 = await _run_scenario(master, cases)
+                print(f"  {name:24}: recall@{TOP_K} {recall:.3f}, p50 {p50:7.2f} ms, p95 {p95:7.2f} ms")
+            stats = database_manager.get_vector_search_stats()
+            if stats and master.vector_storage.vector_search_planner is not None:
+                print(f"  plans: {stats['plans']}, by tenant index: {stats['tenant_index_plans']}")
+
+        database_manager.shutdown()
+
+
+if __name__ == '__main__':
+    large_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    small_tenants = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    small_rows = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    queries = int(sys.argv[4]) if len(sys.argv) > 4 else 50
+    asyncio.run(main(large_rows, small_tenants, small_rows, queries))
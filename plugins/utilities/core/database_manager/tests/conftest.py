@@ -0,0 +1,76 @@
+"""
+Local fixtures for database_manager tests
+"""
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# Import fixtures from tests/conftest
+from tests.conftest import logger, module_logger  # noqa: F401
+
+# Add parent plugin directories to sys.path (database_manager depends on data_converter and datetime_formatter)
+_plugin_dir = Path(__file__).parent.parent.parent  # plugins/utilities/core/
+for _path in (_plugin_dir, _plugin_dir.parent / 'foundation'):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+# Import through subfolder, preserving package structure for relative imports
+from data_converter.data_converter import DataConverter  # noqa: E402
+from database_manager.database_manager import DatabaseManager  # noqa: E402
+from datetime_formatter.datetime_formatter import DatetimeFormatter  # noqa: E402
+
+# Repository execution modes: sync engine in event loop thread, native async engine, sync engine in DB thread pool
+DATABASE_MODES = {
+    'sync': {},
+    'async_engine': {'async_engine': True},
+    'sync_executor': {'sync_executor': True},
+}
+
+
+@pytest.fixture
+async def create_database_manager(tmp_path):
+    """
+    Factory for DatabaseManager on temporary SQLite file
+    Keyword arguments override database_manager settings
+    """
+    managers = []
+
+    def _create(**overrides):
+        settings = {
+            'database_preset': 'sqlite',
+            'database': {'sqlite': {
+                'database_url': f"sqlite:///{tmp_path / f'test_{len(managers)}.db'}",
+                'connection_pool': {'pool_size': 5, 'max_overflow': 3},
+                'pragma_settings': {'journal_mode': 'WAL', 'busy_timeout': 5000},
+            }},
+        }
+        settings.update(overrides)
+
+        settings_manager = MagicMock()
+        settings_manager.get_plugin_settings.side_effect = lambda name: settings if name == 'database_manager' else {}
+        plugin_logger = MagicMock()
+        datetime_formatter = DatetimeFormatter(logger=plugin_logger, settings_manager=settings_manager)
+        data_converter = DataConverter(logger=plugin_logger, settings_manager=settings_manager, datetime_formatter=datetime_formatter)
+
+        manager = DatabaseManager(
+            logger=plugin_logger,
+            settings_manager=settings_manager,
+            datetime_formatter=datetime_formatter,
+            data_converter=data_converter
+        )
+        managers.append(manager)
+        return manager
+
+    yield _create
+
+    for manager in managers:
+        manager.shutdown()
+        await manager.async_shutdown()
+
+
+@pytest.fixture(params=list(DATABASE_MODES.values()), ids=list(DATABASE_MODES))
+def database_manager(create_database_manager, request):
+    """DatabaseManager with default settings in each repository execution mode"""
+    return create_database_manager(**request.param)
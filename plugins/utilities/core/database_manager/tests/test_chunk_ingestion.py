@@ -0,0 +1,150 @@
+"""
+Tests for streaming chunk ingestion: binary COPY encoding (PostgreSQL), committed batches, progress and resume
+"""
+
+import struct
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from database_manager.modules.pg_copy import COPY_HEADER, COPY_TRAILER
+from database_manager.repositories.vector_storage import CHUNKS_COPY, VectorStorageRepository
+from sqlalchemy.util import greenlet_spawn
+
+TENANT_ID = 1
+
+
+def decode_copy(payload):
+    """Tuples of raw field bytes (None for NULL) from binary COPY stream"""
+    assert payload.startswith(COPY_HEADER) and payload.endswith(COPY_TRAILER)
+    position, rows = len(COPY_HEADER), []
+    while position < len(payload) - len(COPY_TRAILER):
+        (count,), position = struct.unpack_from('>h', payload, position), position + 2
+        fields = []
+        for _ in range(count):
+            (length,), position = struct.unpack_from('>i', payload, position), position + 4
+            fields.append(None if length == -1 else payload[position:position + length])
+            position += max(length, 0)
+        rows.append(dict(zip(CHUNKS_COPY.columns, fields, strict=True)))
+    return rows
+
+
+async def stream(count, fail_at=None):
+    for index in range(count):
+        if index == fail_at:
+            raise RuntimeError('embedding provider failed')
+        yield {
+            'chunk_index': index,
+            'document_type': 'knowledge',
+            'content': f'part {index}',
+            'embedding': [1.0, float(index)],
+            'embedding_model': 'test-model',
+        }
+
+
+def test_binary_copy_encoding():
+    row = {
+        'tenant_id': 7, 'document_id': 'doc', 'chunk_index': 3, 'document_type': 'knowledge', 'role': 'user',
+        'chunk_metadata': {'chat_id': 1}, 'content': 'Привет', 'embedding': [0.5, -2.0, 1.0],
+        'embedding_model': None, 'created_at': datetime(2000, 1, 1, 0, 0, 1, 5), 'processed_at': datetime(1999, 12, 31),
+    }
+
+    [fields] = decode_copy(CHUNKS_COPY.encode([row]))
+
+    assert fields['tenant_id'] == struct.pack('>i', 7)
+    assert fields['content'] == 'Привет'.encode()
+    assert fields['chunk_metadata'] == b'\x01{"chat_id": 1}'
+    assert fields['embedding_model'] is None
+    # pgvector binary: dimensions, unused, big-endian float4
+    assert fields['embedding'] == struct.pack('>hh3f', 3, 0, 0.5, -2.0, 1.0)
+    assert fields['created_at'] == struct.pack('>q', 1000005)
+    assert fields['processed_at'] == struct.pack('>q', -86400 * 1000000)
+    assert CHUNKS_COPY.sql.startswith('copy vector_storage (tenant_id, document_id, chunk_index,')
+    assert 'content_tsv' not in CHUNKS_COPY.sql
+
+
+@pytest.mark.asyncio
+async def test_postgresql_ingest_with_copy(database_manager):
+    """Each batch is one COPY on session connection (psycopg2 path), stored chunks are skipped"""
+    session = MagicMock()
+    session.execute.return_value.scalar.return_value = 1
+    payloads = []
+    driver_connection = MagicMock(spec=['cursor'])
+    cursor = driver_connection.cursor.return_value.__enter__.return_value
+    cursor.copy_expert.side_effect = lambda sql, source: payloads.append((sql, source.read()))
+    session.connection.return_value.connection.driver_connection = driver_connection
+    planner = MagicMock()
+    repository = VectorStorageRepository(
+        MagicMock(return_value=session), logger=MagicMock(), data_converter=MagicMock(),
+        data_preparer=database_manager.data_preparer, vector_search_planner=planner
+    )
+
+    stats = await repository.ingest_chunks(TENANT_ID, 'doc', stream(7), batch_size=3)
+
+    assert stats == {'inserted': 5, 'skipped': 2, 'batches': 2, 'resumed_after': 1, 'last_chunk_index': 6}
+    assert [sql for sql, _ in payloads] == [CHUNKS_COPY.sql] * 2
+    rows = [row for _, payload in payloads for row in decode_copy(payload)]
+    assert [struct.unpack('>i', row['chunk_index'])[0] for row in rows] == [2, 3, 4, 5, 6]
+    assert rows[0]['document_id'] == b'doc' and rows[0]['role'] == b'user'
+    assert np.frombuffer(rows[0]['embedding'][4:], dtype='>f4')[:2].tolist() == [1.0, 2.0]
+    # Service timestamps are set by data_preparer
+    assert rows[0]['created_at'] is not None and rows[0]['processed_at'] is not None
+    assert session.commit.call_count == 3
+    planner.invalidate.assert_called_once_with(TENANT_ID)
+
+
+@pytest.mark.asyncio
+async def test_asyncpg_copy():
+    """asyncpg connection gets same payload through copy_to_table (run_sync body runs in greenlet)"""
+    driver_connection = MagicMock(spec=['copy_to_table'])
+    driver_connection.copy_to_table = AsyncMock(return_value='COPY 1')
+    session = MagicMock()
+    session.connection.return_value.connection.driver_connection = driver_connection
+
+    await greenlet_spawn(CHUNKS_COPY.copy, session, b'payload')
+
+    driver_connection.copy_to_table.assert_awaited_once_with(
+        'vector_storage', source=b'payload', columns=list(CHUNKS_COPY.columns), format='binary'
+    )
+
+
+@pytest.mark.asyncio
+class TestLocalIngestion:
+    """SQLite preset: same contract over local vector index"""
+
+    async def test_batches_and_progress(self, database_manager):
+        master = database_manager.get_master_repository()
+        reports = []
+
+        async def progress(stats):
+            reports.append((stats['inserted'], stats['last_chunk_index']))
+
+        stats = await master.ingest_chunks(TENANT_ID, 'doc', stream(25), batch_size=10, progress=progress)
+
+        assert stats == {'inserted': 25, 'skipped': 0, 'batches': 3, 'resumed_after': -1, 'last_chunk_index': 24}
+        assert reports == [(10, 9), (20, 19), (25, 24)]
+        chunks = await master.get_chunks_by_document(TENANT_ID, 'doc')
+        assert [chunk['chunk_index'] for chunk in chunks] == list(range(25))
+        assert chunks[3]['embedding'] == [1.0, 3.0]
+
+    async def test_resume_after_failure(self, database_manager):
+        master = database_manager.get_master_repository()
+        reports = []
+
+        assert await master.ingest_chunks(TENANT_ID, 'doc', stream(25, fail_at=15), batch_size=10,
+                                          progress=reports.append) is None
+        # First batch committed, chunks 10..14 of failed batch are not stored
+        assert await master.get_last_chunk_index(TENANT_ID, 'doc') == 9
+        assert len(reports) == 1
+
+        stats = await master.ingest_chunks(TENANT_ID, 'doc', stream(25), batch_size=10)
+
+        assert stats == {'inserted': 15, 'skipped': 10, 'batches': 2, 'resumed_after': 9, 'last_chunk_index': 24}
+        assert len(await master.get_chunks_by_document(TENANT_ID, 'doc')) == 25
+
+    async def test_order_required(self, database_manager):
+        master = database_manager.get_master_repository()
+
+        assert await master.ingest_chunks(TENANT_ID, 'doc', [{'chunk_index': 1}, {'chunk_index': 0}]) is None
+        assert await master.get_last_chunk_index(TENANT_ID, 'empty') == -1
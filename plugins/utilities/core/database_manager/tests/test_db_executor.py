@@ -0,0 +1,97 @@
+"""
+Tests for DB thread pool executor (sync_executor setting)
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from database_manager.modules.db_executor import DbExecutor
+
+
+@pytest.mark.asyncio
+class TestDbExecutor:
+    """Executor runs calls off event loop and reports queue statistics"""
+
+    async def test_runs_in_db_thread(self):
+        """Call runs in DB thread, result is returned to event loop"""
+        executor = DbExecutor(2)
+        try:
+            name = await executor.run(lambda: threading.current_thread().name)
+            assert name.startswith('db')
+            assert executor.get_stats()['completed'] == 1
+        finally:
+            executor.shutdown()
+
+    async def test_queue_depth_and_wait(self):
+        """Calls above pool size wait in queue, wait time is reported"""
+        executor = DbExecutor(1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+
+        try:
+            first = asyncio.ensure_future(executor.run(blocking))
+            second = asyncio.ensure_future(executor.run(time.sleep, 0))
+            await asyncio.to_thread(started.wait, 5)
+
+            stats = executor.get_stats()
+            assert stats['active'] == 1
+            assert stats['queue_depth'] == 1
+
+            await asyncio.sleep(0.02)
+            release.set()
+            await asyncio.gather(first, second)
+
+            stats = executor.get_stats()
+            assert stats['queue_depth'] == 0
+            assert stats['max_queue_depth'] >= 1
+            assert stats['completed'] == 2
+            assert stats['wait_max_ms'] >= 20
+        finally:
+            executor.shutdown()
+
+
+@pytest.mark.asyncio
+class TestSyncExecutorMode:
+    """Repositories with sync_executor setting"""
+
+    async def test_executor_sized_to_connection_pool(self, create_database_manager):
+        """Executor size is pool_size + max_overflow"""
+        manager = create_database_manager(sync_executor=True)
+        assert manager.get_executor_stats()['max_workers'] == 8
+
+    async def test_disabled_by_default(self, create_database_manager):
+        """Without setting there is no executor"""
+        assert create_database_manager().get_executor_stats() is None
+
+    async def test_repository_calls_through_executor(self, create_database_manager):
+        """Reads and writes go through executor, results are the same"""
+        manager = create_database_manager(sync_executor=True)
+        master = manager.get_master_repository()
+
+        assert await master.create_tenant({'id': 1}) == 1
+        assert await master.create_user({'user_id': 7, 'tenant_id': 1, 'username': 'u'})
+        assert await master.set_user_storage_records(1, 7, {'k': [1, 2]})
+
+        user = await master.get_user_by_id(7, 1)
+        records = await master.get_user_storage_records(1, 7)
+        assert user['username'] == 'u'
+        assert records[0]['value'] == [1, 2]
+        assert await master.delete_user_storage_records(1, 7, key='k') == 1
+
+        stats = manager.get_executor_stats()
+        assert stats['completed'] > 0
+        assert stats['active'] == 0
+
+    async def test_in_memory_sqlite_not_supported(self, create_database_manager):
+        """In-memory SQLite keeps calls in event loop thread"""
+        manager = create_database_manager(
+            sync_executor=True,
+            database={'sqlite': {'database_url': 'sqlite:///:memory:'}}
+        )
+        assert manager.get_executor_stats() is None
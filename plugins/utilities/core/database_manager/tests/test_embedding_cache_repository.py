@@ -0,0 +1,60 @@
+"""
+Tests for embedding cache table: lookup by text hash and persistence between cache instances
+"""
+
+from array import array
+
+import pytest
+
+from plugins.utilities.ai.ai_client.modules.embedding_cache import EmbeddingCache
+
+MODEL = 'text-embedding-3-small'
+
+
+def packed(*values):
+    return array('f', values).tobytes()
+
+
+@pytest.mark.asyncio
+class TestEmbeddingCacheRepository:
+    """Vectors are found by (model, dimensions, text_hash)"""
+
+    async def test_get_many(self, database_manager):
+        master = database_manager.get_master_repository()
+        assert await master.save_cached_embeddings(MODEL, 2, {'h1': packed(1, 2), 'h2': packed(3, 4)}) == 2
+
+        assert await master.get_cached_embeddings(MODEL, 2, ['h1', 'h2', 'h3']) == {'h1': packed(1, 2), 'h2': packed(3, 4)}
+        # Other dimensions or model is other key
+        assert await master.get_cached_embeddings(MODEL, 3, ['h1']) == {}
+        assert await master.get_cached_embeddings('other-model', 2, ['h1']) == {}
+
+    async def test_existing_key_kept(self, database_manager):
+        master = database_manager.get_master_repository()
+        await master.save_cached_embeddings(MODEL, 1, {'h1': packed(1)})
+        await master.save_cached_embeddings(MODEL, 1, {'h1': packed(2), 'h2': packed(3)})
+
+        assert await master.get_cached_embeddings(MODEL, 1, ['h1', 'h2']) == {'h1': packed(1), 'h2': packed(3)}
+
+    async def test_lookup_over_batch_size(self, database_manager):
+        master = database_manager.get_master_repository()
+        embeddings = {f'h{i}': packed(i) for i in range(1200)}
+        await master.save_cached_embeddings(MODEL, 1, embeddings)
+
+        assert await master.get_cached_embeddings(MODEL, 1, list(embeddings)) == embeddings
+
+
+@pytest.mark.asyncio
+async def test_db_tier_survives_restart(database_manager, logger):
+    """New cache instance (empty memory) finds vectors in table and promotes them to memory"""
+    first = EmbeddingCache(logger, database_manager=database_manager)
+    hashes, _ = await first.get_many(MODEL, 2, ['hello  world'])
+    await first.set_many(MODEL, 2, hashes, [[0.5, 0.25]])
+
+    second = EmbeddingCache(logger, database_manager=database_manager)
+    _, vectors = await second.get_many(MODEL, 2, ['hello world', 'other'])
+    assert vectors == [[0.5, 0.25], None]
+
+    await second.get_many(MODEL, 2, ['hello world'])
+    stats = second.get_stats()
+    assert (stats['db_hits'], stats['memory_hits'], stats['misses']) == (1, 1, 1)
+    assert stats['persistent'] is True
@@ -0,0 +1,118 @@
+"""
+Tests for hybrid (full-text + vector) search with reciprocal rank fusion
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from database_manager.modules.local_vector_index import fts_query
+from database_manager.repositories.vector_storage import VectorStorageRepository
+from sqlalchemy.dialects import postgresql
+
+TENANT_ID = 1
+
+
+def chunk(document_id, chunk_index, content, embedding, **fields):
+    return {
+        'tenant_id': TENANT_ID,
+        'document_id': document_id,
+        'chunk_index': chunk_index,
+        'document_type': fields.pop('document_type', 'knowledge'),
+        'content': content,
+        'embedding': embedding,
+        'embedding_model': 'test-model',
+        **fields,
+    }
+
+
+@pytest.fixture
+async def master(database_manager):
+    master = database_manager.get_master_repository()
+    await master.create_chunks_batch([
+        chunk('manual', 0, 'Error code E42 means the pump is overheated', [0.0, 1.0]),
+        chunk('manual', 1, 'Clean the filter every month', [1.0, 0.0]),
+        chunk('faq', 0, 'How to clean the pump filter', [0.9, 0.1], document_type='faq'),
+        chunk('news', 0, 'Company opened a new office', [0.0, 1.0], created_at=datetime(2020, 1, 1)),
+    ])
+    return master
+
+
+def test_fts_query():
+    """Words and phrases are quoted and required, FTS5 syntax in text is not interpreted"""
+    assert fts_query('pump filter') == '"pump" "filter"'
+    assert fts_query('"clean the filter" E42') == '"clean the filter" "E42"'
+    assert fts_query('NOT pump* OR (x)') == '"NOT" "pump" "OR" "x"'
+    assert fts_query('  ?! ') == ''
+
+
+@pytest.mark.asyncio
+class TestLocalHybridSearch:
+    """SQLite preset: FTS5 sidecar table and vector matrix"""
+
+    async def test_exact_term_found_by_lexical_ranking(self, master):
+        """Code E42 is found by words even though its vector is far from query"""
+        results = await master.search_vector_storage_hybrid(TENANT_ID, 'E42', [1.0, 0.0], limit=3)
+
+        assert results[0]['document_id'] == 'manual' and results[0]['chunk_index'] == 0
+        assert results[0]['lexical_rank'] == 1
+        assert results[0]['similarity'] == 0.0
+        assert set(results[0]) == {
+            'content', 'document_id', 'chunk_index', 'document_type', 'role', 'chunk_metadata', 'embedding_model',
+            'created_at', 'processed_at', 'tenant_id', 'similarity', 'score', 'lexical_rank', 'vector_rank'
+        }
+
+    async def test_both_rankings_fused(self, master):
+        """Chunk ranked by both lists gets highest score"""
+        results = await master.search_vector_storage_hybrid(TENANT_ID, 'clean filter', [1.0, 0.0], limit=2)
+
+        assert [(r['document_id'], r['lexical_rank'] is not None, r['vector_rank']) for r in results] == [
+            ('manual', True, 1), ('faq', True, 2)
+        ]
+        assert results[0]['score'] == pytest.approx(1 / 61 + 1 / (60 + results[0]['lexical_rank']), abs=1e-6)
+
+    async def test_lexical_only_and_weights(self, master):
+        results = await master.search_vector_storage_hybrid(TENANT_ID, 'pump')
+
+        assert {r['document_id'] for r in results} == {'manual', 'faq'}
+        assert all(r['vector_rank'] is None and r['similarity'] is None for r in results)
+
+        results = await master.search_vector_storage_hybrid(TENANT_ID, 'office', [1.0, 0.0], limit=1, lexical_weight=0)
+        assert results[0]['document_id'] == 'manual' and results[0]['chunk_index'] == 1
+
+    async def test_filters_and_min_similarity(self, master):
+        async def found(**filters):
+            results = await master.search_vector_storage_hybrid(TENANT_ID, 'pump', [1.0, 0.0], **filters)
+            return sorted((r['document_id'], r['chunk_index']) for r in results)
+
+        assert await found(document_type=['faq']) == [('faq', 0)]
+        assert await found(until_date=datetime(2021, 1, 1)) == [('news', 0)]
+        # Vector candidates are limited by similarity, lexical are kept
+        assert await found(min_similarity=0.95) == [('faq', 0), ('manual', 0), ('manual', 1)]
+
+    async def test_index_follows_updates_and_deletes(self, master):
+        await master.update_chunk(TENANT_ID, 'manual', 1, {'content': 'Replace the gasket yearly'})
+        await master.delete_document(TENANT_ID, 'faq')
+
+        assert [r['chunk_index'] for r in await master.search_vector_storage_hybrid(TENANT_ID, 'gasket')] == [1]
+        assert await master.search_vector_storage_hybrid(TENANT_ID, 'filter') == []
+
+
+def test_postgresql_single_statement():
+    """PostgreSQL query is one statement with both candidate lists, fusion and filters"""
+    session = MagicMock()
+    session.execute.return_value.all.return_value = []
+    repository = VectorStorageRepository(
+        MagicMock(return_value=session), logger=MagicMock(), data_converter=MagicMock(), data_preparer=MagicMock()
+    )
+
+    assert asyncio.run(repository.search_hybrid(
+        TENANT_ID, 'pump "error code"', [0.1] * 1024, document_type=['faq'], metadata_filter={'chat_id': 1}
+    )) == []
+
+    assert session.execute.call_count == 1
+    sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    for fragment in ('WITH lexical AS', 'semantic AS', 'fused AS', 'FULL OUTER JOIN', 'websearch_to_tsquery',
+                     'ts_rank_cd', '<=>', 'row_number() OVER', '@>'):
+        assert fragment in sql
@@ -0,0 +1,197 @@
+"""
+Tests for local vector index of SQLite preset: vector_storage repository contract on memory-mapped matrix and sidecar
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+from database_manager.modules.local_vector_index import TenantVectorStore, metadata_contains
+from database_manager.repositories.local_vector_storage import LocalVectorStorageRepository
+
+TENANT_ID = 1
+
+
+def chunk(document_id, chunk_index, embedding, **fields):
+    return {
+        'tenant_id': TENANT_ID,
+        'document_id': document_id,
+        'chunk_index': chunk_index,
+        'document_type': fields.pop('document_type', 'knowledge'),
+        'content': f'{document_id}-{chunk_index}',
+        'embedding': embedding,
+        'embedding_model': 'test-model',
+        **fields,
+    }
+
+
+@pytest.fixture
+def master(database_manager):
+    return database_manager.get_master_repository()
+
+
+@pytest.mark.asyncio
+class TestRepositoryContract:
+    """Master repository uses local index on SQLite with same methods and result fields"""
+
+    async def test_backend_selected(self, master):
+        assert isinstance(master.vector_storage, LocalVectorStorageRepository)
+
+    async def test_search_similar(self, master):
+        await master.create_chunks_batch([
+            chunk('doc', 0, [1.0, 0.0, 0.0]),
+            chunk('doc', 1, [0.8, 0.6, 0.0]),
+            chunk('doc', 2, [0.0, 0.0, 1.0]),
+            chunk('history', 0, None, document_type='chat_history'),
+        ])
+
+        results = await master.search_vector_storage_similar(TENANT_ID, [2.0, 0.0, 0.0], limit=5, min_similarity=0.5)
+
+        assert [(r['document_id'], r['chunk_index'], r['similarity']) for r in results] == [('doc', 0, 1.0), ('doc', 1, 0.8)]
+        assert set(results[0]) == {
+            'content', 'document_id', 'chunk_index', 'document_type', 'role', 'chunk_metadata',
+            'embedding_model', 'created_at', 'processed_at', 'similarity'
+        }
+        assert results[0]['role'] == 'user'
+
+    async def test_search_filters(self, master):
+        await master.create_chunks_batch([
+            chunk('a', 0, [1.0, 0.0], chunk_metadata={'chat_id': 1, 'tags': ['x', 'y']}),
+            chunk('b', 0, [1.0, 0.1], chunk_metadata={'chat_id': 2}, document_type='prompt'),
+            chunk('c', 0, [1.0, 0.2], created_at=datetime(2020, 1, 1)),
+        ])
+
+        async def found(**filters):
+            results = await master.search_vector_storage_similar(TENANT_ID, [1.0, 0.0], min_similarity=0, **filters)
+            return [r['document_id'] for r in results]
+
+        assert await found(document_type=['prompt']) == ['b']
+        assert await found(document_id='c') == ['c']
+        assert await found(metadata_filter={'tags': ['y']}) == ['a']
+        assert await found(until_date=datetime(2021, 1, 1)) == ['c']
+        assert await found(since_date=datetime(2021, 1, 1)) == ['a', 'b']
+
+    async def test_tenants_isolated(self, master):
+        await master.create_chunks_batch([chunk('doc', 0, [1.0, 0.0]), {**chunk('doc', 0, [1.0, 0.0]), 'tenant_id': 2}])
+        await master.delete_document(2, 'doc')
+
+        assert len(await master.search_vector_storage_similar(TENANT_ID, [1.0, 0.0])) == 1
+        assert await master.search_vector_storage_similar(2, [1.0, 0.0]) == []
+
+    async def test_recent_chunks_order(self, master):
+        await master.create_chunks_batch([
+            chunk('old', 0, None, created_at=datetime(2020, 1, 1)),
+            chunk('new', 1, None, created_at=datetime(2024, 1, 1)),
+            chunk('new', 0, None, created_at=datetime(2024, 1, 1), chunk_metadata={'chat_id': 5}),
+        ])
+
+        recent = await master.get_recent_vector_storage_chunks(TENANT_ID, 2)
+        assert [(r['document_id'], r['chunk_index']) for r in recent] == [('new', 0), ('new', 1)]
+        assert recent[0]['chunk_metadata'] == {'chat_id': 5}
+
+        filtered = await master.get_recent_vector_storage_chunks(TENANT_ID, 10, metadata_filter={'chat_id': 5})
+        assert [(r['document_id'], r['chunk_index']) for r in filtered] == [('new', 0)]
+
+    async def test_duplicate_batch_rolled_back(self, master):
+        assert await master.create_chunks_batch([chunk('doc', 0, [1.0, 0.0])]) == 1
+        assert await master.create_chunks_batch([chunk('doc', 1, [0.0, 1.0]), chunk('doc', 0, [1.0, 0.0])]) is None
+
+        assert [c['chunk_index'] for c in await master.get_chunks_by_document(TENANT_ID, 'doc')] == [0]
+        assert master.database_manager.get_vector_index_stats()['tenants'][TENANT_ID]['vectors'] == 1
+
+    async def test_update_and_delete_reuse_rows(self, master):
+        await master.create_chunks_batch([chunk('doc', 0, [1.0, 0.0]), chunk('doc', 1, [0.0, 1.0])])
+        await master.update_chunk(TENANT_ID, 'doc', 0, {'content': 'updated', 'embedding': [0.0, 1.0]})
+
+        updated = await master.get_chunk(TENANT_ID, 'doc', 0)
+        assert updated['content'] == 'updated'
+        assert updated['embedding'] == [0.0, 1.0]
+
+        assert await master.delete_document(TENANT_ID, 'doc') == 2
+        await master.create_chunks_batch([chunk('next', 0, [1.0, 0.0])])
+        stats = master.database_manager.get_vector_index_stats()['tenants'][TENANT_ID]
+        assert (stats['chunks'], stats['vectors']) == (1, 1)
+
+    async def test_dimension_mismatch(self, master):
+        await master.create_chunks_batch([chunk('doc', 0, [1.0, 0.0])])
+
+        assert await master.create_chunks_batch([chunk('doc', 1, [1.0, 0.0, 0.0])]) is None
+        assert await master.search_vector_storage_similar(TENANT_ID, [1.0, 0.0, 0.0]) is None
+
+    async def test_executor_mode(self, create_database_manager):
+        master = create_database_manager(sync_executor=True).get_master_repository()
+        await master.create_chunks_batch([chunk('doc', 0, [1.0, 0.0])])
+
+        assert len(await master.search_vector_storage_similar(TENANT_ID, [1.0, 0.0])) == 1
+
+
+class TestTenantVectorStore:
+    """Matrix growth, persistence and reduced precision"""
+
+    def _chunks(self, vectors):
+        now = datetime(2024, 1, 1)
+        return [chunk('doc', i, vector, created_at=now, processed_at=now) for i, vector in enumerate(vectors)]
+
+    def test_reopen_and_growth(self, tmp_path, logger):
+        vectors = np.random.default_rng(1).normal(size=(1500, 8)).astype(np.float32)
+        store = TenantVectorStore(str(tmp_path), logger)
+        store.add_chunks(self._chunks(vectors))
+        store.close()
+
+        reopened = TenantVectorStore(str(tmp_path), logger)
+        stats = reopened.get_stats()
+        assert (stats['vectors'], stats['dimensions']) == (1500, 8)
+        assert stats['capacity'] >= 1500
+
+        results = reopened.search(vectors[700].tolist(), 1, 0.0, _no_filter())
+        assert results[0]['chunk_index'] == 700
+        reopened.close()
+
+    def test_exact_search_matches_numpy(self, tmp_path, logger):
+        rng = np.random.default_rng(2)
+        vectors = rng.normal(size=(300, 16)).astype(np.float32)
+        query = rng.normal(size=16).astype(np.float32)
+        store = TenantVectorStore(str(tmp_path), logger)
+        store.add_chunks(self._chunks(vectors))
+
+        scores = vectors @ query / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+        expected = np.argsort(-scores)[:10].tolist()
+
+        results = store.search(query.tolist(), 10, -1.0, _no_filter())
+        assert [r['chunk_index'] for r in results] == expected
+        store.close()
+
+    def test_float16(self, tmp_path, logger):
+        vectors = np.random.default_rng(3).normal(size=(50, 32)).astype(np.float32)
+        store = TenantVectorStore(str(tmp_path), logger, dtype='float16')
+        store.add_chunks(self._chunks(vectors))
+
+        results = store.search(vectors[10].tolist(), 1, 0.0, _no_filter())
+        assert results[0]['chunk_index'] == 10
+        assert results[0]['similarity'] == pytest.approx(1.0, abs=1e-3)
+        assert (tmp_path / 'vectors.float16').exists()
+        store.close()
+
+    def test_hnsw(self, tmp_path, logger):
+        pytest.importorskip('hnswlib')
+        vectors = np.random.default_rng(4).normal(size=(200, 8)).astype(np.float32)
+        store = TenantVectorStore(str(tmp_path), logger, hnsw_min_rows=100)
+        store.add_chunks(self._chunks(vectors))
+
+        results = store.search(vectors[42].tolist(), 3, 0.0, _no_filter())
+        assert results[0]['chunk_index'] == 42
+        assert store.get_stats()['hnsw'] is True
+        store.close()
+
+
+def _no_filter():
+    from database_manager.modules.local_vector_index import ChunkFilter
+    return ChunkFilter()
+
+
+def test_metadata_contains_like_jsonb():
+    metadata = {'chat_id': 1, 'user': {'name': 'a', 'lang': 'ru'}, 'tags': ['x', 'y']}
+    assert metadata_contains(metadata, {'user': {'lang': 'ru'}, 'tags': ['y']})
+    assert not metadata_contains(metadata, {'chat_id': 2})
+    assert not metadata_contains(metadata, {'tags': ['z']})
+    assert not metadata_contains(None, {'chat_id': 1})
@@ -0,0 +1,115 @@
+"""
+Tests for query latency instrumentation: method tags, slow query log, pool usage and metrics export
+"""
+
+import pytest
+from database_manager.modules.query_stats import LatencyHistogram
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+METHOD = 'UserStorageRepository.get_records'
+
+
+async def _read_storage(database_manager):
+    master = database_manager.get_master_repository()
+    await master.create_tenant({'id': 1})
+    await master.set_user_storage_records(1, 10, {'token': 'secret-value-42'})
+    return await master.get_user_storage_records(1, 10)
+
+
+@pytest.mark.asyncio
+class TestQueryStats:
+    """Statement time is grouped by calling repository method"""
+
+    @pytest.mark.parametrize('mode', [{}, {'sync_executor': True}, {'async_engine': True}])
+    async def test_method_tags(self, create_database_manager, mode):
+        """Tag is kept in event loop, DB executor thread and async engine"""
+        manager = create_database_manager(query_stats=True, **mode)
+        assert await _read_storage(manager)
+
+        methods = manager.get_query_stats()['methods']
+        assert methods[METHOD]['count'] == 1
+        assert methods['UserStorageRepository.set_records']['count'] >= 1
+        assert methods['TenantRepository.create_tenant']['count'] >= 1
+        # Table creation happens outside repositories
+        assert methods['other']['count'] > 0
+
+    async def test_pool_usage_tracked(self, create_database_manager):
+        """Pool events: new connections, hold time and checked out count (engine is not patched)"""
+        manager = create_database_manager(query_stats=True)
+        raw_connection = manager.engine.raw_connection
+        await _read_storage(manager)
+
+        stats = manager.get_query_stats()
+        checkout = stats['pool_checkout']['primary']
+        assert checkout['count'] > 0
+        assert checkout['max_ms'] >= checkout['avg_ms'] >= 0
+        assert checkout['checked_out'] == 0 and checkout['max_checked_out'] >= 1
+        assert stats['pool_connect']['primary']['count'] >= 1
+        assert manager.engine.raw_connection == raw_connection
+
+        with manager.engine.connect():
+            assert manager.get_query_stats()['pool_checkout']['primary']['checked_out'] == 1
+
+        # Pool recreated on dispose keeps hooks
+        manager.engine.dispose()
+        connects = stats['pool_connect']['primary']['count']
+        with manager.engine.connect():
+            pass
+        assert manager.get_query_stats()['pool_connect']['primary']['count'] == connects + 1
+
+    async def test_slow_query_log_redacts_parameters(self, create_database_manager):
+        manager = create_database_manager(query_stats=True, slow_query_ms=0)
+        await _read_storage(manager)
+
+        messages = [call.args[0] for call in manager.logger.warning.call_args_list if '[SlowQuery]' in call.args[0]]
+        assert any(METHOD in message and 'values redacted' in message for message in messages)
+        assert not any('secret-value-42' in message for message in messages)
+        assert manager.get_query_stats()['slow_queries'] == len(messages)
+
+    async def test_errors_counted(self, create_database_manager):
+        manager = create_database_manager(query_stats=True)
+        with pytest.raises(OperationalError):
+            with manager.engine.connect() as connection:
+                connection.execute(text('SELECT * FROM missing_table'))
+
+        assert manager.get_query_stats()['methods']['other']['errors'] == 1
+
+    async def test_disabled_by_default(self, create_database_manager):
+        manager = create_database_manager()
+        await _read_storage(manager)
+
+        assert manager.get_query_stats() is None
+        assert manager.get_metrics() == ''
+
+    async def test_metrics_format(self, create_database_manager):
+        manager = create_database_manager(query_stats=True, sync_executor=True)
+        await _read_storage(manager)
+
+        metrics = manager.get_metrics()
+        assert '# TYPE db_query_duration_seconds histogram' in metrics
+        assert f'db_query_duration_seconds_count{{method="{METHOD}"}} 1' in metrics
+        assert f'db_query_duration_seconds_bucket{{method="{METHOD}",le="+Inf"}} 1' in metrics
+        assert 'db_pool_checkout_seconds_count{pool="primary"}' in metrics
+        assert 'db_pool_connect_seconds_count{pool="primary"}' in metrics
+        assert 'db_pool_checked_out{pool="primary"} 0' in metrics
+        assert 'db_executor_queue_depth 0' in metrics
+        assert metrics.endswith('\n')
+
+
+class TestLatencyHistogram:
+    """Bounded histogram percentiles"""
+
+    def test_percentiles_by_bucket_bound(self):
+        histogram = LatencyHistogram()
+        for elapsed_ms in [0.5] * 90 + [40] * 9 + [20000]:
+            histogram.add(elapsed_ms)
+
+        stats = histogram.to_dict()
+        assert stats['count'] == 100
+        assert stats['p50_ms'] == 1.0
+        assert stats['p95_ms'] == 50.0
+        # Above last bucket bound percentile falls back to max
+        assert stats['p99_ms'] == 50.0
+        assert stats['max_ms'] == 20000.0
+        assert histogram.percentile(1.0) == 20000.0
@@ -0,0 +1,224 @@
+"""
+Tests for read replica routing: db_read/db_write annotations, read-your-writes stickiness and replica health
+Primary and replica are separate SQLite files with different data, so result shows where query went
+"""
+
+import asyncio
+
+import pytest
+from database_manager.modules.replica_router import Replica, ReplicaRouter, db_read, db_write, is_read_context
+from database_manager.repositories.user_storage import UserStorageRepository
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+TENANT_ID = 1
+USER_ID = 10
+
+
+async def seed_source(database_manager, source):
+    master = database_manager.get_master_repository()
+    await master.create_tenant({'id': TENANT_ID})
+    await master.set_user_storage_records(TENANT_ID, USER_ID, {'source': source})
+
+
+def in_new_context(coro):
+    """Run coroutine as separate task (own copy of context, like processing of another event)"""
+    return asyncio.create_task(coro)
+
+
+@pytest.fixture
+def primary(create_database_manager):
+    return create_database_manager()
+
+
+@pytest.fixture
+def replica_manager(create_database_manager):
+    return create_database_manager()
+
+
+@pytest.fixture
+def lag():
+    """Replica lag reported to health check (None - check fails)"""
+    return {'seconds': 0.0}
+
+
+@pytest.fixture
+def create_router(replica_manager, lag):
+    routers = []
+
+    def _create(replicas=None, **kwargs):
+        if replicas is None:
+            replicas = [Replica('replica-1', replica_manager.engine, replica_manager.session_factory)]
+        router = ReplicaRouter(replicas, replica_manager.logger, health_check_interval=0, **kwargs)
+
+        def measure_lag(replica):
+            if lag['seconds'] is None:
+                raise ConnectionError("replica unavailable")
+            return lag['seconds']
+
+        router._measure_lag = measure_lag
+        router.start()
+        routers.append(router)
+        return router
+
+    yield _create
+
+    for router in routers:
+        router.stop()
+
+
+@pytest.fixture
+async def storage(primary, replica_manager, create_router):
+    """Routed repository on primary and marker value on each database"""
+    async def seed():
+        await seed_source(primary, 'primary')
+        await seed_source(replica_manager, 'replica')
+
+    await in_new_context(seed())
+    router = create_router()
+    repo = UserStorageRepository(session_factory=primary.session_factory, **{**primary._kwargs, 'replica_router': router})
+    return repo, router
+
+
+async def read_source(repo):
+    records = await repo.get_records(TENANT_ID, USER_ID, key='source')
+    return records[0]['value'] if records else None
+
+
+@pytest.mark.asyncio
+class TestRouting:
+    """Reads go to replica, writes and reads after write go to primary"""
+
+    async def test_read_goes_to_replica(self, storage):
+        repo, router = storage
+        assert await in_new_context(read_source(repo)) == 'replica'
+        assert router.get_stats()['replicas'][0]['reads'] == 1
+
+    async def test_write_goes_to_primary(self, storage, primary):
+        repo, _ = storage
+        await in_new_context(repo.set_records(TENANT_ID, USER_ID, {'written': 'yes'}))
+
+        records = await primary.get_master_repository().get_user_storage_records(TENANT_ID, USER_ID, key='written')
+        assert records[0]['value'] == 'yes'
+
+    async def test_read_your_writes_in_same_context(self, storage):
+        """After write, reads of same context stay on primary; other contexts still use replica"""
+        repo, router = storage
+
+        async def write_then_read():
+            await repo.set_records(TENANT_ID, USER_ID, {'source': 'primary-updated'})
+            return await read_source(repo)
+
+        assert await in_new_context(write_then_read()) == 'primary-updated'
+        assert await in_new_context(read_source(repo)) == 'replica'
+        assert router.get_stats()['sticky_reads'] == 1
+
+    async def test_sticky_window_expires(self, storage, create_router):
+        """With zero sticky window reads return to replica right after write"""
+        repo, _ = storage
+        repo.replica_router = create_router(sticky_seconds=0)
+
+        async def write_then_read():
+            await repo.set_records(TENANT_ID, USER_ID, {'other': 1})
+            return await read_source(repo)
+
+        assert await in_new_context(write_then_read()) == 'replica'
+
+    async def test_round_robin(self, create_router, replica_manager):
+        replicas = [Replica(f'replica-{i}', replica_manager.engine, replica_manager.session_factory) for i in range(2)]
+        router = create_router(replicas)
+
+        chosen = [router.choose_replica().name for _ in range(4)]
+        assert chosen == ['replica-0', 'replica-1', 'replica-0', 'replica-1']
+
+
+@pytest.mark.asyncio
+class TestHealth:
+    """Lagging or failing replicas drop out of rotation and come back after successful check"""
+
+    async def test_lagging_replica_excluded(self, storage, lag):
+        repo, router = storage
+        lag['seconds'] = 30.0
+        router.check_replicas()
+
+        assert await in_new_context(read_source(repo)) == 'primary'
+        stats = router.get_stats()
+        assert stats['fallback_reads'] == 1
+        assert stats['replicas'][0]['healthy'] is False
+        assert 'lag' in stats['replicas'][0]['last_error']
+
+        lag['seconds'] = 0.5
+        router.check_replicas()
+        assert await in_new_context(read_source(repo)) == 'replica'
+
+    async def test_failed_check_excluded(self, storage, lag):
+        repo, router = storage
+        lag['seconds'] = None
+        router.check_replicas()
+
+        assert await in_new_context(read_source(repo)) == 'primary'
+        assert router.get_stats()['replicas'][0]['lag_seconds'] is None
+
+    async def test_query_failure_removes_replica(self, primary, create_router, tmp_path):
+        """Connection error on replica takes it out of rotation before next health check"""
+        broken_engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        router = create_router([Replica('broken', broken_engine, sessionmaker(bind=broken_engine))])
+        repo = UserStorageRepository(session_factory=primary.session_factory, **{**primary._kwargs, 'replica_router': router})
+        await in_new_context(seed_source(primary, 'primary'))
+
+        # Failed read is repeated on primary, next read goes to primary
+        assert await in_new_context(read_source(repo)) == 'primary'
+        assert await in_new_context(read_source(repo)) == 'primary'
+
+        stats = router.get_stats()['replicas'][0]
+        assert stats['healthy'] is False
+        assert stats['failures'] == 1
+        broken_engine.dispose()
+
+    async def test_failed_read_retried_once_on_primary(self, primary, create_router, tmp_path):
+        """Replica error propagated by method is not returned to caller: read runs again on primary"""
+        broken_engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        router = create_router([Replica('broken', broken_engine, sessionmaker(bind=broken_engine))])
+        await in_new_context(seed_source(primary, 'primary'))
+        calls = []
+
+        class Repo(UserStorageRepository):
+            @db_read
+            async def count_records(self):
+                calls.append(is_read_context())
+                async with self._get_session() as session:
+                    return (await session.execute(text("SELECT COUNT(*) FROM user_storage"))).scalar()
+
+        repo = Repo(session_factory=primary.session_factory, **{**primary._kwargs, 'replica_router': router})
+
+        assert await in_new_context(repo.count_records()) == 1
+        assert calls == [True, True]
+        assert router.get_stats()['replicas'][0]['failures'] == 1
+        broken_engine.dispose()
+
+
+@pytest.mark.asyncio
+class TestAnnotations:
+    """db_read inside db_write stays on primary"""
+
+    async def test_nested_read_in_write(self):
+        chosen = []
+
+        class Repo:
+            @db_read
+            async def read(self):
+                chosen.append(is_read_context())
+
+            @db_write
+            async def read_then_write(self):
+                await self.read()
+
+        await Repo().read_then_write()
+        await in_new_context(Repo().read())
+        assert chosen == [False, True]
+
+    async def test_sync_function_rejected(self):
+        with pytest.raises(TypeError):
+            @db_read
+            def not_async(self):
+                pass
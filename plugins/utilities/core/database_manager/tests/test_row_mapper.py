@@ -0,0 +1,69 @@
+"""
+Tests for Core row mappers on hot read paths (same output as ORM + _to_dict_list)
+"""
+
+import pytest
+from database_manager.models import TenantStorage, UserStorage
+from sqlalchemy import insert, select
+
+# Stored texts covering JSON documents, typed literals, bytes and plain strings
+STORED_VALUES = [
+    '5', '-3', '1.5', '1e3', 'true', 'false', 'True', 'null', '"quoted"', '"7"',
+    '[1, "a", {"b": 2}]', '{"k": [1, 2]}', '{"raw": "bytes:6869"}', 'bytes:6869', 'bytes:zz',
+    'plain text', ' 42', '[not json', '', 'NaN', 'Infinity',
+]
+
+
+@pytest.mark.asyncio
+class TestRowMapper:
+    """Row mapper decodes only declared columns"""
+
+    async def test_storage_values_match_orm_path(self, database_manager):
+        """Storage values are decoded same way as before"""
+        master = database_manager.get_master_repository()
+        await master.create_tenant({'id': 1})
+        with database_manager.engine.begin() as connection:
+            connection.execute(insert(UserStorage), [
+                {'tenant_id': 1, 'user_id': 1, 'key': f"k{i}", 'value': value}
+                for i, value in enumerate(STORED_VALUES)
+            ])
+        repository = master.user_storage
+
+        records = await master.get_user_storage_records(1, 1)
+
+        async with repository._get_session() as session:
+            objects = (await session.execute(select(UserStorage).order_by(UserStorage.key))).scalars().all()
+            expected = await repository._to_dict_list(objects, convert_text_fields=['value'])
+        expected_values = {record['key']: record['value'] for record in expected}
+        assert {record['key']: record['value'] for record in records} == expected_values
+
+    async def test_key_columns_not_decoded(self, database_manager):
+        """String key columns keep their type (no JSON auto-detection)"""
+        master = database_manager.get_master_repository()
+        await master.create_tenant({'id': 1})
+        await master.set_storage_records(1, {'10': {'20': 'x'}})
+
+        record = (await master.get_storage_records(1))[0]
+
+        assert record['group_key'] == '10'
+        assert record['key'] == '20'
+        assert set(record) == {c.name for c in TenantStorage.__table__.columns}
+
+    async def test_user_record(self, database_manager):
+        """User is returned with all columns, missing user is None"""
+        master = database_manager.get_master_repository()
+        await master.create_tenant({'id': 1})
+        await master.create_user({'user_id': 7, 'tenant_id': 1, 'username': '123', 'is_premium': True})
+
+        user = await master.get_user_by_id(7, 1)
+
+        assert user['username'] == '123'
+        assert user['is_premium'] is True
+        assert user['created_at'] is not None
+        assert await master.get_user_by_id(8, 1) is None
+
+    async def test_mapper_cached(self, database_manager):
+        """Mapper is compiled once per column set"""
+        repository = database_manager.get_master_repository().user_storage
+        columns = [UserStorage.key, UserStorage.value]
+        assert repository._get_row_mapper(columns, typed_fields=['value']) is repository._get_row_mapper(columns, typed_fields=['value'])
@@ -0,0 +1,101 @@
+"""
+Tests for storage upsert (INSERT ... ON CONFLICT DO UPDATE) and precomputed column converters
+"""
+
+import pytest
+from database_manager.models import TenantStorage, UserStorage
+from sqlalchemy import event
+
+
+@pytest.fixture
+def statement_counter():
+    """Counts SQL statements executed by engine repositories use (async engine runs them on its sync_engine)"""
+    def _attach(database_manager):
+        statements = []
+        async_engine = database_manager.async_engine
+        engine = async_engine.sync_engine if async_engine is not None else database_manager.engine
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        return statements
+    return _attach
+
+
+@pytest.fixture
+async def master(database_manager):
+    master = database_manager.get_master_repository()
+    await master.create_tenant({'id': 1})
+    return master
+
+
+@pytest.mark.asyncio
+class TestStorageUpsert:
+    """New and existing keys are written with one statement"""
+
+    async def test_user_storage_insert_and_update(self, database_manager, master, statement_counter):
+        """Mixed new and existing keys: one statement, values replaced"""
+        assert await master.set_user_storage_records(1, 7, {'a': 1, 'b': 'x'})
+
+        statements = statement_counter(database_manager)
+        values = {f"key_{i}": i for i in range(50)}
+        values['a'] = [1, 2]
+        assert await master.set_user_storage_records(1, 7, values)
+
+        assert len([s for s in statements if s.lstrip().upper().startswith('INSERT')]) == 1
+        assert not [s for s in statements if s.lstrip().upper().startswith(('SELECT', 'UPDATE'))]
+
+        records = {r['key']: r['value'] for r in await master.get_user_storage_records(1, 7)}
+        assert len(records) == 52
+        assert records['a'] == [1, 2]
+        assert records['b'] == 'x'
+        assert records['key_49'] == 49
+
+    async def test_tenant_storage_insert_and_update(self, database_manager, master, statement_counter):
+        """Groups and keys are converted to strings, existing values replaced"""
+        assert await master.set_storage_records(1, {'settings': {'limit': 10}})
+
+        statements = statement_counter(database_manager)
+        assert await master.set_storage_records(1, {'settings': {'limit': 20, 'mode': 'fast'}, 5: {6: {'x': 1}}})
+
+        assert len([s for s in statements if s.lstrip().upper().startswith('INSERT')]) == 1
+
+        settings = {r['key']: r['value'] for r in await master.get_storage_records(1, group_key='settings')}
+        assert settings == {'limit': 20, 'mode': 'fast'}
+        assert (await master.get_storage_records(1, group_key='5', key='6'))[0]['value'] == {'x': 1}
+
+    async def test_empty_groups(self, master):
+        """Nothing to write is not an error"""
+        assert await master.set_storage_records(1, {'settings': {}})
+        assert await master.get_storage_records(1) == []
+
+
+@pytest.mark.asyncio
+class TestColumnConverters:
+    """Precomputed converters follow per-field conversion rules"""
+
+    async def test_same_result_as_single_field_conversion(self, database_manager):
+        """Batch preparation gives same values as field-by-field conversion"""
+        preparer = database_manager.data_preparer
+        fields = {'tenant_id': '3', 'user_id': 7.0, 'key': 15, 'value': {'a': [1, 2]}}
+
+        prepared = (await preparer.prepare_for_upsert(UserStorage, [fields]))[0]
+
+        for name, value in fields.items():
+            column = UserStorage.__table__.columns[name]
+            assert prepared[name] == await preparer._convert_single_field(column, value, name)
+        assert prepared['processed_at'] is not None
+
+    async def test_one_timestamp_per_batch(self, database_manager):
+        """Service fields are set once for whole batch"""
+        records = await database_manager.data_preparer.prepare_for_upsert(
+            TenantStorage,
+            [{'tenant_id': 1, 'group_key': 'g', 'key': str(i), 'value': i} for i in range(3)]
+        )
+        assert len({record['processed_at'] for record in records}) == 1
+
+    async def test_converters_cached(self, database_manager):
+        """Converters are built once per model"""
+        preparer = database_manager.data_preparer
+        assert preparer._get_column_converters(UserStorage) is preparer._get_column_converters(UserStorage)
@@ -0,0 +1,77 @@
+"""
+Tests for indexed search of users by storage value (value_hash column)
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from database_manager.models import UserStorage
+from sqlalchemy import select, update
+
+from tools.core_manager.modules.database.migration.data_backfill import DataBackfill
+
+
+async def _create_master(database_manager):
+    master = database_manager.get_master_repository()
+    await master.create_tenant({'id': 1})
+    return master
+
+
+@pytest.mark.asyncio
+class TestValueSearch:
+    """Search by normalized value hash"""
+
+    async def test_normalized_values_match(self, database_manager):
+        """JSON key order and value representation don't affect match"""
+        master = await _create_master(database_manager)
+        await master.set_user_storage_records(1, 10, {'plan': {'tier': 'pro', 'seats': 5}})
+        await master.set_user_storage_records(1, 11, {'plan': {'seats': 5, 'tier': 'pro'}})
+        await master.set_user_storage_records(1, 12, {'plan': {'seats': 1, 'tier': 'pro'}})
+        await master.set_user_storage_records(1, 13, {'level': 5})
+
+        assert await master.find_user_ids_by_storage_value(1, 'plan', '{"tier": "pro", "seats": 5}') == [10, 11]
+        assert await master.find_user_ids_by_storage_value(1, 'level', '5') == [13]
+        assert await master.find_user_ids_by_storage_value(1, 'level', 5) == [13]
+        assert await master.find_user_ids_by_storage_value(1, 'level', 6) == []
+
+    async def test_overwrite_updates_hash(self, database_manager):
+        """Upsert of existing key replaces hash"""
+        master = await _create_master(database_manager)
+        await master.set_user_storage_records(1, 10, {'status': 'trial'})
+        await master.set_user_storage_records(1, 10, {'status': 'active'})
+
+        assert await master.find_user_ids_by_storage_value(1, 'status', 'trial') == []
+        assert await master.find_user_ids_by_storage_value(1, 'status', 'active') == [10]
+
+    async def test_pagination_and_streaming(self, database_manager):
+        """Pages follow user_id order, iterator yields all pages"""
+        master = await _create_master(database_manager)
+        for user_id in (5, 3, 9, 1, 7):
+            await master.set_user_storage_records(1, user_id, {'active': True})
+
+        first = await master.find_user_ids_by_storage_value(1, 'active', True, limit=2)
+        second = await master.find_user_ids_by_storage_value(1, 'active', True, limit=2, after_user_id=first[-1])
+        assert first == [1, 3]
+        assert second == [5, 7]
+
+        pages = [page async for page in master.iter_user_ids_by_storage_value(1, 'active', True, batch_size=2)]
+        assert pages == [[1, 3], [5, 7], [9]]
+
+    async def test_rows_without_hash_backfilled_by_migration(self, database_manager):
+        """Search only reads index; rows written before value_hash column are filled by core_manager migration"""
+        master = await _create_master(database_manager)
+        await master.set_user_storage_records(1, 10, {'city': 'Paris'})
+        await master.set_user_storage_records(1, 11, {'city': 'Rome', 'tags': ['a', 'b']})
+        with database_manager.engine.begin() as connection:
+            connection.execute(update(UserStorage).values(value_hash=None))
+
+        assert await master.find_user_ids_by_storage_value(1, 'city', 'Rome') == []
+
+        backfill = DataBackfill(database_manager.engine, MagicMock(), MagicMock(), MagicMock())
+        assert backfill.backfill_user_storage_hashes(UserStorage) == 3
+
+        assert await master.find_user_ids_by_storage_value(1, 'city', 'Rome') == [11]
+        assert await master.find_user_ids_by_storage_value(1, 'tags', ['a', 'b']) == [11]
+        with database_manager.engine.connect() as connection:
+            hashes = connection.execute(select(UserStorage.value_hash)).scalars().all()
+        assert None not in hashes
@@ -0,0 +1,255 @@
+"""
+Tests for vector search planner (PostgreSQL): exact/HNSW choice by tenant slice, per-query settings, tenant indexes
+"""
+
+import re
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from database_manager.models import embedding_index_sql
+from database_manager.modules.vector_search_planner import EXACT, HNSW, VectorSearchPlanner
+from database_manager.repositories.vector_storage import VectorStorageRepository
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.elements import TextClause
+
+
+class FakeSession:
+    """Records executed SQL, answers tenant slice query with given values"""
+
+    def __init__(self, rows, has_index=False, version='0.8.0'):
+        self.slice = SimpleNamespace(rows=rows, has_index=has_index, version=version)
+        self.statements = []
+        self.queries = []
+
+    async def execute(self, statement, params=None):
+        if not isinstance(statement, TextClause):
+            compiled = statement.compile(dialect=postgresql.dialect())
+            self.queries.append(str(compiled))
+            self.params = compiled.params
+            statement = ''
+        sql = str(statement).strip()
+        self.statements.append(sql)
+        result = MagicMock()
+        result.one.return_value = self.slice
+        result.all.return_value = []
+        return result
+
+    @property
+    def settings(self):
+        return [sql for sql in self.statements if sql.startswith('set local')]
+
+
+@pytest.mark.asyncio
+class TestPlan:
+
+    async def test_small_tenant_exact(self):
+        planner = VectorSearchPlanner(MagicMock(), exact_max_rows=1000)
+        session = FakeSession(rows=500)
+
+        plan = await planner.plan(session, 1, limit=5)
+
+        assert plan.strategy == EXACT
+        assert session.settings == ['set local enable_indexscan = off']
+
+    async def test_large_tenant_hnsw_settings(self):
+        planner = VectorSearchPlanner(MagicMock(), exact_max_rows=1000, hnsw_ef_search=40, max_scan_tuples=5000)
+        session = FakeSession(rows=1001)
+
+        plan = await planner.plan(session, 1, limit=50)
+
+        assert (plan.strategy, plan.ef_search, plan.tenant_index) == (HNSW, 100, False)
+        assert session.settings == [
+            'set local hnsw.ef_search = 100',
+            'set local hnsw.iterative_scan = strict_order',
+            'set local hnsw.max_scan_tuples = 5000',
+        ]
+
+    async def test_iterative_scan_needs_pgvector_08(self):
+        planner = VectorSearchPlanner(MagicMock(), exact_max_rows=0)
+        session = FakeSession(rows=10, version='0.7.4')
+
+        await planner.plan(session, 1, limit=5)
+
+        assert session.settings == ['set local hnsw.ef_search = 40']
+        assert planner.get_stats()['iterative_scan_supported'] is False
+
+    async def test_slice_cached(self):
+        planner = VectorSearchPlanner(MagicMock(), stats_ttl=60)
+        session = FakeSession(rows=10)
+
+        await planner.plan(session, 1, limit=5)
+        await planner.plan(session, 1, limit=5)
+        planner.invalidate(1)
+        await planner.plan(session, 1, limit=5)
+
+        assert sum('from vector_storage' in sql for sql in session.statements) == 2
+        assert planner.get_stats()['plans'] == {EXACT: 3, HNSW: 0}
+
+    async def test_invalid_iterative_scan(self):
+        with pytest.raises(ValueError):
+            VectorSearchPlanner(MagicMock(), iterative_scan='fast')
+
+
+def make_repository(planner):
+    return VectorStorageRepository(
+        MagicMock(return_value=MagicMock()), logger=MagicMock(), data_converter=MagicMock(),
+        data_preparer=MagicMock(), vector_search_planner=planner
+    )
+
+
+@pytest.mark.asyncio
+class TestReducedPrecision:
+    """Coarse pass over halfvec / binary index, rerank of limit * rerank_factor candidates by exact distance"""
+
+    async def test_plan(self):
+        planner = VectorSearchPlanner(MagicMock(), exact_max_rows=100, index_precision='binary', rerank_factor=8)
+
+        plan = await planner.plan(FakeSession(rows=101), 1, limit=10)
+        assert (plan.coarse, plan.rerank_factor, plan.ef_search) == ('binary', 8, 160)
+
+        # Small slice: exact scan of full vectors, no coarse pass
+        plan = await planner.plan(FakeSession(rows=50), 2, limit=10)
+        assert (plan.strategy, plan.coarse) == (EXACT, None)
+
+    @pytest.mark.parametrize('precision, coarse_order', [
+        ('binary', 'CAST(binary_quantize(vector_storage.embedding) AS BIT(1024)) <~> binary_quantize('),
+        ('halfvec', 'CAST(vector_storage.embedding AS HALFVEC(1024)) <=> CAST('),
+    ])
+    async def test_search_similar_reranks(self, precision, coarse_order):
+        session = FakeSession(rows=1000)
+        repository = make_repository(VectorSearchPlanner(MagicMock(), exact_max_rows=10, index_precision=precision))
+        repository._get_session = MagicMock(return_value=AsyncContext(session))
+
+        assert await repository.search_similar(1, [0.1] * 1024, limit=5) == []
+
+        sql = ' '.join(session.queries[0].split())
+        assert f'ORDER BY {coarse_order}' in sql
+        assert re.search(r'LIMIT %\(param_\d\)s\) AS coarse ORDER BY coarse.distance LIMIT', sql)
+        # Coarse pass keeps limit * rerank_factor candidates
+        assert {5, 20} <= {value for value in session.params.values() if isinstance(value, int)}
+        assert re.search(r'vector_storage.embedding <=> %\(param_\d\)s AS distance', sql)
+
+    async def test_hybrid_uses_coarse_pass(self):
+        session = FakeSession(rows=1000)
+        repository = make_repository(VectorSearchPlanner(MagicMock(), exact_max_rows=10, index_precision='binary'))
+        repository._get_session = MagicMock(return_value=AsyncContext(session))
+
+        assert await repository.search_hybrid(1, 'pump', [0.1] * 1024, min_similarity=0.5) == []
+
+        sql = ' '.join(session.queries[0].split())
+        assert '<~> binary_quantize(' in sql
+        assert 'WHERE coarse.distance <=' in sql
+
+
+class AsyncContext:
+    def __init__(self, value):
+        self.value = value
+
+    async def __aenter__(self):
+        return self.value
+
+    async def __aexit__(self, *args):
+        return False
+
+
+def test_embedding_index_sql():
+    assert embedding_index_sql('binary') == (
+        'create index if not exists idx_vector_storage_embedding_bq_hnsw on vector_storage '
+        'using hnsw ((binary_quantize(embedding)::bit(1024)) bit_hamming_ops) with (m = 16, ef_construction = 64)'
+    )
+    assert embedding_index_sql('halfvec', tenant_id=3, concurrently=True) == (
+        'create index concurrently if not exists idx_vector_storage_embedding_half_hnsw_t3 on vector_storage '
+        'using hnsw ((embedding::halfvec(1024)) halfvec_cosine_ops) with (m = 16, ef_construction = 64) '
+        'where tenant_id = 3'
+    )
+
+
+def test_sync_embedding_index():
+    """Index of new precision is created, index of previous precision dropped"""
+    connection = MagicMock()
+    connection.execute.return_value.__iter__.return_value = iter([('idx_vector_storage_embedding_hnsw',)])
+    engine = MagicMock()
+    engine.connect.return_value.execution_options.return_value.__enter__.return_value = connection
+    planner = VectorSearchPlanner(MagicMock(), index_precision='halfvec')
+
+    assert planner.sync_embedding_index(engine) == {
+        'index': 'idx_vector_storage_embedding_half_hnsw', 'created': True, 'dropped': ['idx_vector_storage_embedding_hnsw']
+    }
+    executed = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert executed[1].startswith('create index concurrently if not exists idx_vector_storage_embedding_half_hnsw ')
+    assert executed[2] == 'drop index concurrently if exists idx_vector_storage_embedding_hnsw'
+
+
+@pytest.mark.asyncio
+async def test_repository_inlines_tenant_for_own_index():
+    """Partial index predicate (tenant_id = 7) is matched only against constant in query"""
+    planner = VectorSearchPlanner(MagicMock(), exact_max_rows=100)
+    session = FakeSession(rows=101, has_index=True)
+    repository = make_repository(planner)
+    conditions = repository._build_search_conditions(7)
+
+    await repository._plan_vector_search(session, 7, 5, conditions)
+
+    assert str(conditions[0].compile(dialect=postgresql.dialect())) == 'vector_storage.tenant_id = 7'
+    assert planner.get_stats()['tenant_index_plans'] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_similar_binds_metadata_filter():
+    """Metadata filter is JSONB parameter, quotes in values do not reach SQL text"""
+    session = FakeSession(rows=10)
+    repository = make_repository(VectorSearchPlanner(MagicMock()))
+    repository._get_session = MagicMock(return_value=AsyncContext(session))
+
+    assert await repository.search_similar(1, [0.1] * 1024, metadata_filter={'title': "O'Brien"}) == []
+
+    sql = ' '.join(session.queries[0].split())
+    assert re.search(r'vector_storage.chunk_metadata @> %\(param_\d\)s', sql)
+    assert "O'Brien" not in sql and {'title': "O'Brien"} in session.params.values()
+
+
+def test_sync_tenant_indexes():
+    """Index is created for large tenant and dropped for tenant below half of threshold"""
+    executed = []
+
+    def execute(statement, params=None):
+        sql = ' '.join(str(statement).split())
+        executed.append(sql)
+        result = MagicMock()
+        if 'group by tenant_id' in sql:
+            result.all.return_value = [(1, 1500), (2, 10), (3, 600), (5, 400)]
+        elif 'pg_indexes' in sql:
+            result.__iter__.return_value = iter([
+                ('idx_vector_storage_embedding_hnsw_t3',), ('idx_vector_storage_embedding_hnsw_t5',),
+                ('idx_vector_storage_embedding_hnsw_t9',),
+            ])
+        return result
+
+    connection = MagicMock()
+    connection.execute.side_effect = execute
+    engine = MagicMock()
+    engine.connect.return_value.execution_options.return_value.__enter__.return_value = connection
+    planner = VectorSearchPlanner(MagicMock(), tenant_index_min_rows=1000, tenant_index_m=24)
+
+    assert planner.sync_tenant_indexes(engine) == {'created': [1], 'dropped': [5, 9]}
+    engine.connect.return_value.execution_options.assert_called_once_with(isolation_level='AUTOCOMMIT')
+    assert (
+        'create index concurrently if not exists idx_vector_storage_embedding_hnsw_t1 on vector_storage '
+        'using hnsw (embedding vector_cosine_ops) with (m = 24, ef_construction = 64) where tenant_id = 1'
+    ) in executed
+    assert 'drop index concurrently if exists idx_vector_storage_embedding_hnsw_t9' in executed
+
+
+@pytest.mark.asyncio
+async def test_search_similar_orders_by_distance():
+    """Full precision search sorts by ascending <=> distance (only this order is served by HNSW index)"""
+    session = FakeSession(rows=1001)
+    repository = make_repository(VectorSearchPlanner(MagicMock(), exact_max_rows=1000))
+    repository._get_session = MagicMock(return_value=AsyncContext(session))
+
+    assert await repository.search_similar(1, [0.1] * 1024, limit=5) == []
+
+    sql = ' '.join(session.queries[0].split())
+    assert re.search(r'ORDER BY vector_storage.embedding <=> %\(param_\d\)s LIMIT %\(param_\d\)s$', sql)
+    assert 'DESC' not in sql
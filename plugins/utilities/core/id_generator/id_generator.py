@@ -58,26 +58,18 @@ class IdGenerator:
             # Calculate hash from seed
             hash_value = self._calculate_hash(seed)
             
-            # Check cache
-            cache_key = self._get_cache_key(hash_value)
-            cached_id = await self.cache_manager.get(cache_key)
-            if cached_id is not None:
-                return cached_id
-            
             # Get master repository
             master_repo = self.database_manager.get_master_repository()
             
-            # Use wrapper method to get or create ID
+            # Get from cache or get/create in DB (concurrent requests for the same seed share one DB call)
             # seed is always saved to DB (either user-provided or generated UUID) for debugging convenience
-            unique_id = await master_repo.get_or_create_id_sequence(
-                hash_value=hash_value,
-                seed=seed
+            cache_key = self._get_cache_key(hash_value)
+            unique_id = await self.cache_manager.get_or_load(
+                cache_key,
+                lambda: master_repo.get_or_create_id_sequence(hash_value=hash_value, seed=seed),
+                ttl=self.cache_ttl
             )
             
-            # Save to cache (if ID obtained)
-            if unique_id is not None:
-                await self.cache_manager.set(cache_key, unique_id, ttl=self.cache_ttl)
-            
             return unique_id
                 
         except Exception as e:
@@ -98,23 +98,19 @@ class UserManager:
         try:
             cache_key = self._get_cache_key(user_id, tenant_id)
             
-            # Check cache through cache_manager (if not forced refresh)
-            if not force_refresh:
-                cached_data = await self.cache_manager.get(cache_key)
-                if cached_data is not None:
-                    return cached_data.copy()
+            # Forced refresh - drop cached data, next load goes to DB
+            if force_refresh:
+                await self.cache_manager.delete(cache_key)
             
-            # Get from DB
+            # Get from cache or DB (concurrent misses share one DB query)
             master_repo = self._get_master_repository()
-            user_data = await master_repo.get_user_by_id(user_id, tenant_id)
+            user_data = await self.cache_manager.get_or_load(
+                cache_key,
+                lambda: master_repo.get_user_by_id(user_id, tenant_id),
+                ttl=self.cache_ttl
+            )
             
-            if user_data:
-                # Save to cache through cache_manager
-                await self.cache_manager.set(cache_key, user_data.copy(), ttl=self.cache_ttl)
-                
-                return user_data
-            else:
-                return None
+            return user_data.copy() if user_data else None
                 
         except Exception as e:
             self.logger.error(f"Error in get_user_data: {e}")
@@ -1,20 +1,39 @@
 """
 CacheManager - unified utility for global data caching
-In-memory cache for all services with TTL and invalidation support
+In-memory cache for all services with TTL, invalidation and bounded memory support
+Optional shared backend (Redis protocol) turns it into L1 of two-tier cache for multi-process deployments
 """
 
 import asyncio
-import random
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+import os
+import pickle
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .modules.eviction import create_policy
+from .modules.expiry_heap import ExpiryHeap
+from .modules.key_index import KeyIndex
+from .modules.shared_backend import create_shared_backend
+from .modules.size_estimator import estimate_size
+from .modules.snapshot import SnapshotReader, write_snapshot
+
+# Marker for missing key (None is a valid cached value)
+_MISSING = object()
 
 
 class CacheManager:
     """
     Unified utility for global data caching
     - In-memory cache (Python dicts)
-    - TTL support
-    - Pattern-based invalidation
+    - TTL support (monotonic deadlines, heap-based background expiry)
+    - Pattern-based invalidation (segment index, cost proportional to matched keys)
+    - Size limits (entries / approximate bytes) with LRU or LFU eviction
+    - Per-namespace quotas by key prefix
+    - get_or_load: single-flight loading and stale-while-revalidate
+    - Optional shared L2 backend with pub/sub invalidation between processes
+    - Optional snapshot on graceful shutdown, lazily restored on startup (warm start)
+    - Per-namespace hit/miss/set/expiration/eviction counters, entries and approximate memory
     """
     
     def __init__(self, **kwargs):
@@ -27,16 +46,81 @@ class CacheManager:
         # Main cache (flat dictionary, keys like "group:key")
         self._cache: Dict[str, Any] = {}
         
-        # Expiration time for TTL items (like Redis - store expired_at)
-        self._cache_expires_at: Dict[str, datetime] = {}
+        # Expiration deadline for TTL items (time.monotonic() seconds, like Redis - store expired_at)
+        self._cache_expires_at: Dict[str, float] = {}
+        
+        # Min-heap of deadlines - background cleanup touches only expiring keys
+        self._expiry_heap = ExpiryHeap()
+        
+        # Index of keys by colon-separated segments for invalidate_pattern
+        self._key_index = KeyIndex()
         
         # Default TTL to prevent memory leaks (if not explicitly specified in set())
         self._default_ttl = settings.get('default_ttl', 3600)  # 1 hour by default
         
-        # Periodic cleanup settings (algorithm like Redis)
+        # Periodic cleanup settings
         self._cleanup_interval = settings.get('cleanup_interval', 60)  # 1 minute by default
-        self._cleanup_sample_size = settings.get('cleanup_sample_size', 50)  # Sample size
-        self._cleanup_expired_threshold = settings.get('cleanup_expired_threshold', 0.25)  # 25% threshold
+        self._cleanup_batch_size = settings.get('cleanup_batch_size', 1000)  # Keys removed before yielding to event loop
+        
+        # Size limits (0 = unlimited) and eviction policy
+        self._max_entries = settings.get('max_entries', 0) or 0
+        self._max_memory_bytes = int((settings.get('max_memory_mb', 0) or 0) * 1024 * 1024)
+        self._eviction_policy = (settings.get('eviction_policy') or 'lru').lower()
+        self._policy = create_policy(self._eviction_policy)
+        self._is_bounded = self._max_entries > 0 or self._max_memory_bytes > 0
+        
+        # Namespace quotas: {"user": {"max_entries": ..., "max_memory_mb": ...}, "tenant:*": {...}}
+        # '*' segment means separate namespace for each value (e.g. each tenant gets own quota)
+        self._namespace_quotas: List[Tuple[List[str], int, int]] = self._parse_namespace_quotas(settings.get('namespace_quotas') or {})
+        self._namespace_policies: Dict[str, Any] = {}
+        self._namespace_usage: Dict[str, Dict[str, int]] = {}
+        self._key_namespace: Dict[str, Tuple[str, int, int]] = {}
+        
+        # Approximate size accounting walks value on every set: only for memory limits or explicit statistics
+        self._track_memory = (
+            self._max_memory_bytes > 0
+            or any(quota[2] > 0 for quota in self._namespace_quotas)
+            or bool(settings.get('track_memory_stats', False))
+        )
+        self._sizes: Dict[str, int] = {}
+        self._memory_used = 0
+        
+        # Eviction counters
+        self._evictions = 0
+        self._evictions_by_namespace: Dict[str, int] = {}
+        
+        # Per-namespace statistics, namespace = first stats_namespace_depth key segments
+        # (last segment is never included: 'user:123' -> 'user', 'tenant:1:config' with depth 2 -> 'tenant:1')
+        self._stats_namespace_depth = max(1, settings.get('stats_namespace_depth', 1) or 1)
+        self._namespace_stats: Dict[str, Dict[str, int]] = {}
+        
+        # get_or_load: in-flight loads per key (single-flight), soft expiry for stale-while-revalidate
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stale_after: Dict[str, float] = {}
+        self._load_stats: Dict[str, Dict[str, float]] = {}
+        
+        # Shared L2 backend (None = process-local cache, 'memory' backend)
+        # L1 keeps shared values at most l1_ttl seconds, other processes drop L1 copies on invalidation messages
+        self._shared = create_shared_backend(settings, self.logger)
+        self._backend_name = 'redis' if self._shared is not None else 'memory'
+        self._l1_ttl = settings.get('l1_ttl', 5)
+        self._local_only_patterns: List[str] = list(settings.get('local_only_patterns') or [])
+        self._instance_id = uuid.uuid4().hex
+        self._shared_errors = 0
+        # Incremented on every invalidation - L2 read racing with invalidation doesn't refill L1
+        self._invalidation_generation = 0
+        self._listener_task: Optional[asyncio.Task] = None
+        
+        # Snapshot: selected keys are saved on shutdown, on startup only key index is read,
+        # values are restored with remaining TTL on first access
+        self._snapshot_enabled = settings.get('snapshot_enabled', False)
+        self._snapshot_path = settings.get('snapshot_path') or 'data/cache/cache_snapshot.bin'
+        self._snapshot_patterns: List[str] = list(settings.get('snapshot_patterns') or [])
+        self._snapshot_min_ttl = settings.get('snapshot_min_ttl', 10)
+        self._snapshot: Optional[SnapshotReader] = None
+        self._snapshot_restored = 0
+        if self._snapshot_enabled:
+            self._open_snapshot()
         
         # Background task for periodic cleanup
         self._cleanup_task: Optional[asyncio.Task] = None
@@ -44,6 +128,27 @@ class CacheManager:
         
         # Start background task on initialization
         self._start_background_cleanup()
+        if self._shared is not None:
+            self._start_invalidation_listener()
+
+    def _parse_namespace_quotas(self, quotas: Dict[str, Any]) -> List[Tuple[List[str], int, int]]:
+        """
+        Convert namespace_quotas setting into list of (prefix segments, max_entries, max_memory_bytes)
+        Longer prefixes go first so the most specific quota wins
+        """
+        parsed = []
+        for prefix, quota in quotas.items():
+            if not isinstance(quota, dict):
+                self.logger.warning(f"Invalid namespace quota for '{prefix}', expected object")
+                continue
+            max_entries = quota.get('max_entries', 0) or 0
+            max_memory_bytes = int((quota.get('max_memory_mb', 0) or 0) * 1024 * 1024)
+            if max_entries <= 0 and max_memory_bytes <= 0:
+                continue
+            parsed.append((str(prefix).split(':'), max_entries, max_memory_bytes))
+        
+        parsed.sort(key=lambda item: len(item[0]), reverse=True)
+        return parsed
 
     # === Background tasks ===
 
@@ -92,6 +197,49 @@ class CacheManager:
             # Don't wait for task completion here, as this is a synchronous method
             # Task will complete when event loop stops
         self.logger.info("Background cache cleanup task stopped")
+    
+    def _start_invalidation_listener(self):
+        """
+        Start subscription to invalidation messages of other processes (synchronous method)
+        """
+        try:
+            self._listener_task = asyncio.ensure_future(self._invalidation_loop())
+            self.logger.info(f"Shared cache backend '{self._backend_name}' enabled (l1_ttl: {self._l1_ttl} sec)")
+        except RuntimeError as e:
+            self.logger.error(f"Failed to start cache invalidation listener: {e}. L1 copies will live up to l1_ttl after changes in other processes!")
+    
+    async def _invalidation_loop(self):
+        """
+        Background loop receiving invalidation messages, resubscribes after connection loss
+        """
+        while self._is_running:
+            try:
+                await self._shared.listen(self._handle_invalidation)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self._shared_errors += 1
+                self.logger.warning(f"Cache invalidation subscription lost: {e}, resubscribing")
+                # Messages could be missed while disconnected - drop L1 copies
+                self._clear_local()
+                await asyncio.sleep(1)
+    
+    async def _handle_invalidation(self, message: Dict[str, Any]) -> None:
+        """Apply invalidation from another process to L1 (without republishing)"""
+        if message.get('origin') == self._instance_id:
+            return
+        
+        self._invalidation_generation += 1
+        op = message.get('op')
+        if op == 'delete':
+            key = message.get('key', '')
+            self._invalidate_inflight(key)
+            self._discard_snapshot(key)
+            self._remove_key(key)
+        elif op == 'pattern':
+            self._invalidate_local_pattern(message.get('pattern', ''))
+        elif op == 'clear':
+            self._clear_local()
 
     # === Cache methods ===
     
@@ -105,68 +253,351 @@ class CacheManager:
             return False
         
         # If no expiration time - cache is eternal
-        if key not in self._cache_expires_at:
+        expires_at = self._cache_expires_at.get(key)
+        if expires_at is None:
             return True
         
-        # Simple time comparison (like Redis - store expired_at)
-        current_time = datetime.now()
-        if current_time >= self._cache_expires_at[key]:
+        # Simple float comparison with monotonic deadline
+        if time.monotonic() >= expires_at:
             # Remove expired item
-            self._cache.pop(key, None)
-            self._cache_expires_at.pop(key, None)
+            self._expire_key(key)
             return False
         
         return True
     
     async def _clean_expired_cache(self):
         """
-        Periodic cleanup of expired cache items (algorithm like Redis)
-        1. Take random sample from all items with TTL
-        2. If >25% expired - do full cleanup
-        3. If <25% - only sample
+        Periodic cleanup of expired cache items
+        Pops only deadlines that have passed from heap (no full key scan),
+        yields to event loop between batches
         """
+        while True:
+            now = time.monotonic()
+            expired_keys = self._expiry_heap.pop_expired(now, self._cache_expires_at, self._cleanup_batch_size)
+            
+            for key in expired_keys:
+                self._expire_key(key)
+            
+            if len(expired_keys) < self._cleanup_batch_size or self._expiry_heap.next_deadline() > now:
+                break
+            await asyncio.sleep(0)
         
-        current_time = datetime.now()
-        
-        # Get all keys with TTL
-        keys_with_ttl = list(self._cache_expires_at.keys())
-        
-        if not keys_with_ttl:
+        # Drop stale heap entries left by overwrites and deletes
+        self._expiry_heap.maybe_compact(self._cache_expires_at)
+    
+    # === Snapshot ===
+    
+    def _open_snapshot(self) -> None:
+        """
+        Map snapshot file left by previous graceful shutdown
+        File is removed right after mapping: snapshot is used once, crash restart won't bring back old data
+        """
+        if not os.path.exists(self._snapshot_path):
             return
+        try:
+            self._snapshot = SnapshotReader(self._snapshot_path, time.time())
+            self.logger.info(f"Cache snapshot opened: {len(self._snapshot)} entries available for warm start")
+        except Exception as e:
+            self.logger.warning(f"Failed to open cache snapshot '{self._snapshot_path}': {e}")
+        try:
+            os.remove(self._snapshot_path)
+        except OSError:
+            pass
+        if self._snapshot is not None and not len(self._snapshot):
+            self._close_snapshot()
+    
+    def _close_snapshot(self) -> None:
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+    
+    def _restore_from_snapshot(self, key: str) -> Any:
+        """Move key from snapshot to cache with remaining TTL (_MISSING if not in snapshot or expired)"""
+        try:
+            entry = self._snapshot.take(key)
+        except Exception as e:
+            self.logger.warning(f"Failed to restore key '{key}' from cache snapshot: {e}")
+            entry = None
+        if not len(self._snapshot):
+            self._close_snapshot()
+        if entry is None:
+            return _MISSING
         
-        # Take random sample (like Redis)
-        sample_size = min(self._cleanup_sample_size, len(keys_with_ttl))
-        sample_keys = random.sample(keys_with_ttl, sample_size)
-        
-        # Check sample
-        expired_in_sample = 0
-        for key in sample_keys:
-            if current_time >= self._cache_expires_at[key]:
-                expired_in_sample += 1
-        
-        # Calculate percentage of expired in sample
-        expired_ratio = expired_in_sample / sample_size if sample_size > 0 else 0
-        
-        # If >25% expired - do full cleanup
-        if expired_ratio >= self._cleanup_expired_threshold:
-            # Full cleanup - iterate all items
-            expired_keys = []
-            for key in keys_with_ttl:
-                if current_time >= self._cache_expires_at[key]:
-                    expired_keys.append(key)
+        value, expires_at, stale_after = entry
+        now = time.time()
+        if expires_at <= now:
+            return _MISSING
+        if self._set_local(key, value, expires_at - now):
+            if stale_after:
+                self._stale_after[key] = time.monotonic() + max(0.0, stale_after - now)
+            self._snapshot_restored += 1
+        return value
+    
+    def _discard_snapshot(self, key: str) -> None:
+        """Changed or invalidated key must not be restored from snapshot"""
+        if self._snapshot is not None:
+            self._snapshot.discard(key)
+    
+    def _save_snapshot(self) -> None:
+        """
+        Write keys matching snapshot_patterns with at least snapshot_min_ttl left
+        Entries of previous snapshot not accessed since startup are carried over
+        """
+        try:
+            now_monotonic = time.monotonic()
+            now = time.time()
+            entries = []
+            for key, value in list(self._cache.items()):
+                if not self._is_snapshot_key(key):
+                    continue
+                expires_at = self._cache_expires_at.get(key)
+                if expires_at is None or expires_at - now_monotonic < self._snapshot_min_ttl:
+                    continue
+                stale_after = self._stale_after.get(key)
+                entries.append((
+                    key,
+                    value,
+                    now + (expires_at - now_monotonic),
+                    now + (stale_after - now_monotonic) if stale_after is not None else 0.0
+                ))
             
-            # Remove expired
-            for key in expired_keys:
-                self._cache.pop(key, None)
-                self._cache_expires_at.pop(key, None)
-        else:
-            # <25% expired - remove only those found in sample
-            expired_keys = [key for key in sample_keys 
-                           if current_time >= self._cache_expires_at[key]]
+            if self._snapshot is not None:
+                for key in self._snapshot.keys():
+                    if key in self._cache or not self._is_snapshot_key(key):
+                        continue
+                    entry = self._snapshot.take(key)
+                    if entry is not None and entry[1] - now >= self._snapshot_min_ttl:
+                        entries.append((key, *entry))
+                self._close_snapshot()
             
-            for key in expired_keys:
-                self._cache.pop(key, None)
-                self._cache_expires_at.pop(key, None)
+            written, skipped = write_snapshot(self._snapshot_path, entries, now)
+            self.logger.info(f"Cache snapshot saved: {written} entries ({skipped} not serializable) to '{self._snapshot_path}'")
+        except Exception as e:
+            self.logger.error(f"Error saving cache snapshot: {e}")
+    
+    def _is_snapshot_key(self, key: str) -> bool:
+        """Empty snapshot_patterns means all keys"""
+        if not self._snapshot_patterns:
+            return True
+        return any(self._pattern_matches(key, pattern) for pattern in self._snapshot_patterns)
+    
+    # === Statistics ===
+    
+    def _stats_for(self, key: str) -> Dict[str, int]:
+        """Counters of key namespace"""
+        if self._stats_namespace_depth == 1:
+            namespace = key.partition(':')[0]
+        else:
+            segments = key.split(':')
+            namespace = ':'.join(segments[:max(1, min(self._stats_namespace_depth, len(segments) - 1))])
+        stats = self._namespace_stats.get(namespace)
+        if stats is None:
+            stats = self._namespace_stats[namespace] = {
+                'hits': 0, 'shared_hits': 0, 'misses': 0, 'sets': 0, 'deletes': 0,
+                'expirations': 0, 'evictions': 0, 'entries': 0, 'memory_bytes': 0
+            }
+        return stats
+    
+    def _expire_key(self, key: str) -> None:
+        """Remove expired key and count expiration"""
+        if self._remove_key(key):
+            self._stats_for(key)['expirations'] += 1
+    
+    # === Size limits and eviction ===
+    
+    def _resolve_namespace(self, key: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Find quota namespace for key: (namespace name, max_entries, max_memory_bytes)
+        Returns None if key is not covered by any quota
+        """
+        if not self._namespace_quotas:
+            return None
+        
+        key_segments = key.split(':')
+        for prefix_segments, max_entries, max_memory_bytes in self._namespace_quotas:
+            if len(key_segments) < len(prefix_segments):
+                continue
+            matched = True
+            for prefix_segment, key_segment in zip(prefix_segments, key_segments, strict=False):
+                if prefix_segment != '*' and prefix_segment != key_segment:
+                    matched = False
+                    break
+            if matched:
+                namespace = ':'.join(key_segments[:len(prefix_segments)])
+                return namespace, max_entries, max_memory_bytes
+        return None
+    
+    def _track_key(self, key: str, size: int, is_new: bool) -> None:
+        """Register key in key index, eviction policies and size accounting"""
+        if is_new:
+            self._key_index.add(key)
+        if self._is_bounded:
+            self._policy.add(key)
+        
+        size_delta = 0
+        if self._track_memory:
+            size_delta = size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+            self._memory_used += size_delta
+        
+        stats = self._stats_for(key)
+        if is_new:
+            stats['entries'] += 1
+        stats['memory_bytes'] += size_delta
+        
+        namespace_info = self._key_namespace.get(key)
+        new_in_namespace = namespace_info is None
+        if new_in_namespace:
+            namespace_info = self._resolve_namespace(key)
+            if namespace_info is None:
+                return
+            self._key_namespace[key] = namespace_info
+        
+        namespace = namespace_info[0]
+        policy = self._namespace_policies.get(namespace)
+        if policy is None:
+            policy = create_policy(self._eviction_policy)
+            self._namespace_policies[namespace] = policy
+        policy.add(key)
+        
+        usage = self._namespace_usage.setdefault(namespace, {'entries': 0, 'memory_bytes': 0})
+        if new_in_namespace:
+            usage['entries'] += 1
+        usage['memory_bytes'] += size_delta
+    
+    def _touch_key(self, key: str) -> None:
+        """Register access for eviction policies"""
+        if self._is_bounded:
+            self._policy.touch(key)
+        namespace_info = self._key_namespace.get(key)
+        if namespace_info is not None:
+            policy = self._namespace_policies.get(namespace_info[0])
+            if policy is not None:
+                policy.touch(key)
+    
+    def _remove_key(self, key: str) -> bool:
+        """Remove key from all internal structures"""
+        existed = key in self._cache
+        if existed:
+            self._key_index.remove(key)
+        self._cache.pop(key, None)
+        self._cache_expires_at.pop(key, None)
+        self._stale_after.pop(key, None)
+        self._policy.remove(key)
+        
+        size = self._sizes.pop(key, 0)
+        self._memory_used -= size
+        
+        if existed:
+            stats = self._stats_for(key)
+            stats['entries'] -= 1
+            stats['memory_bytes'] -= size
+        
+        namespace_info = self._key_namespace.pop(key, None)
+        if namespace_info is not None:
+            namespace = namespace_info[0]
+            policy = self._namespace_policies.get(namespace)
+            if policy is not None:
+                policy.remove(key)
+            usage = self._namespace_usage.get(namespace)
+            if usage is not None:
+                usage['entries'] -= 1
+                usage['memory_bytes'] -= size
+                if usage['entries'] <= 0:
+                    self._namespace_usage.pop(namespace, None)
+                    self._namespace_policies.pop(namespace, None)
+        
+        return existed
+    
+    def _evict_key(self, key: str, namespace: Optional[str] = None) -> None:
+        """Evict key and update counters"""
+        if namespace is None:
+            namespace_info = self._key_namespace.get(key)
+            namespace = namespace_info[0] if namespace_info else key.split(':', 1)[0]
+        if self._remove_key(key):
+            self._stats_for(key)['evictions'] += 1
+        self._evictions += 1
+        self._evictions_by_namespace[namespace] = self._evictions_by_namespace.get(namespace, 0) + 1
+    
+    def _enforce_limits(self, key: str) -> None:
+        """
+        Evict entries until namespace quota and global limits are satisfied
+        Just written key is never evicted by its own write
+        """
+        namespace_info = self._key_namespace.get(key)
+        if namespace_info is not None:
+            namespace, max_entries, max_memory_bytes = namespace_info
+            usage = self._namespace_usage.get(namespace, {})
+            policy = self._namespace_policies.get(namespace)
+            while policy is not None and (
+                (max_entries > 0 and usage.get('entries', 0) > max_entries)
+                or (max_memory_bytes > 0 and usage.get('memory_bytes', 0) > max_memory_bytes)
+            ):
+                victim = policy.victim(exclude=key)
+                if victim is None:
+                    break
+                self._evict_key(victim, namespace)
+        
+        while (
+            (self._max_entries > 0 and len(self._cache) > self._max_entries)
+            or (self._max_memory_bytes > 0 and self._memory_used > self._max_memory_bytes)
+        ):
+            victim = self._policy.victim(exclude=key)
+            if victim is None:
+                break
+            self._evict_key(victim)
+    
+    def _exceeds_single_entry_limit(self, key: str, size: int) -> bool:
+        """Check if value alone is larger than memory limit (global or namespace)"""
+        if self._max_memory_bytes > 0 and size > self._max_memory_bytes:
+            return True
+        namespace_info = self._key_namespace.get(key) or self._resolve_namespace(key)
+        return bool(namespace_info and namespace_info[2] > 0 and size > namespace_info[2])
+    
+    # === Shared backend helpers ===
+    
+    def _is_local_only(self, key: str) -> bool:
+        """Key is kept only in process memory (values too heavy or not serializable for shared backend)"""
+        return any(self._pattern_matches(key, pattern) for pattern in self._local_only_patterns)
+    
+    def _shared_error(self, operation: str, error: Exception) -> None:
+        """Shared backend failure: cache degrades to process-local, request is not failed"""
+        self._shared_errors += 1
+        self.logger.warning(f"Shared cache backend error on {operation}: {error}")
+    
+    async def _get_shared(self, key: str) -> Tuple[Any, Optional[float]]:
+        """Read value and remaining TTL from shared backend (_MISSING if not found or unavailable)"""
+        try:
+            data, remaining = await self._shared.get(key)
+        except Exception as e:
+            self._shared_error('get', e)
+            return _MISSING, None
+        if data is None:
+            return _MISSING, None
+        try:
+            return pickle.loads(data), remaining
+        except Exception as e:
+            self.logger.warning(f"Failed to deserialize shared cache value for key '{key}': {e}")
+            return _MISSING, None
+    
+    def _fill_l1(self, key: str, value: Any, remaining: Optional[float], stale_ttl: Optional[int] = None) -> None:
+        """Put value read from shared backend into L1 for at most l1_ttl seconds"""
+        if self._l1_ttl <= 0:
+            return
+        ttl = self._l1_ttl if remaining is None else min(self._l1_ttl, remaining)
+        if ttl <= 0 or not self._set_local(key, value, ttl):
+            return
+        if stale_ttl and remaining is not None:
+            # Shared value was stored with ttl + stale_ttl, fresh part is what is left beyond stale_ttl
+            self._stale_after[key] = time.monotonic() + max(0.0, remaining - stale_ttl)
+    
+    async def _publish_invalidation(self, message: Dict[str, Any]) -> None:
+        """Notify other processes to drop their L1 copies"""
+        message['origin'] = self._instance_id
+        try:
+            await self._shared.publish(message)
+        except Exception as e:
+            self._shared_error('publish', e)
     
     # === Basic methods ===
     
@@ -174,13 +605,39 @@ class CacheManager:
         """
         Get value from cache by key
         Lazy cleanup: check specific item on access (like Redis)
+        With shared backend: L1 miss is read from shared storage and kept in L1 for l1_ttl
         """
         try:
-            # Lazy cleanup: check validity of specific item
-            if not self._is_cache_valid(key):
+            value = self._cache.get(key, _MISSING)
+            if value is not _MISSING:
+                # Lazy cleanup: check deadline of specific item
+                expires_at = self._cache_expires_at.get(key)
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._touch_key(key)
+                    self._stats_for(key)['hits'] += 1
+                    return value
+                self._expire_key(key)
+            
+            stats = self._stats_for(key)
+            if self._snapshot is not None:
+                value = self._restore_from_snapshot(key)
+                if value is not _MISSING:
+                    stats['hits'] += 1
+                    return value
+            
+            if self._shared is None or self._is_local_only(key):
+                stats['misses'] += 1
                 return None
             
-            return self._cache.get(key)
+            generation = self._invalidation_generation
+            value, remaining = await self._get_shared(key)
+            if value is _MISSING:
+                stats['misses'] += 1
+                return None
+            stats['shared_hits'] += 1
+            if generation == self._invalidation_generation:
+                self._fill_l1(key, value, remaining)
+            return value
             
         except Exception as e:
             self.logger.error(f"Error getting value from cache for key '{key}': {e}")
@@ -190,84 +647,140 @@ class CacheManager:
         """
         Set value in cache
         If TTL not specified - uses default_ttl (memory leak protection)
+        With shared backend: value is written to shared storage, other processes drop their L1 copies
         """
         try:
-            # Set value
-            self._cache[key] = value
-            
             # Determine TTL (store expired_at like Redis)
             # If TTL not specified - use default
             final_ttl = ttl if ttl is not None else self._default_ttl
+            self._discard_snapshot(key)
+            self._stats_for(key)['sets'] += 1
+            
+            if self._shared is None or self._is_local_only(key):
+                return self._set_local(key, value, final_ttl)
             
-            # Set expiration time (always has TTL)
-            self._cache_expires_at[key] = datetime.now() + timedelta(seconds=final_ttl)
+            try:
+                data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                # Not serializable - keep in this process only, drop stale copies elsewhere
+                self.logger.warning(f"Value for key '{key}' can't be serialized for shared cache ({e}), cached locally only")
+                result = self._set_local(key, value, final_ttl)
+                await self._delete_shared(key)
+                return result
             
+            self._invalidation_generation += 1
+            if self._l1_ttl > 0:
+                self._set_local(key, value, min(final_ttl, self._l1_ttl))
+            else:
+                self._remove_key(key)
+            
+            try:
+                await self._shared.set(key, data, final_ttl)
+            except Exception as e:
+                self._shared_error('set', e)
+                return False
+            await self._publish_invalidation({'op': 'delete', 'key': key})
             return True
             
         except Exception as e:
             self.logger.error(f"Error setting value in cache for key '{key}': {e}")
             return False
     
+    def _set_local(self, key: str, value: Any, ttl: float) -> bool:
+        """Set value in process memory (L1)"""
+        # Approximate size (only when memory limits are configured)
+        size = estimate_size(value) if self._track_memory else 0
+        if size and self._exceeds_single_entry_limit(key, size):
+            self.logger.warning(f"Value for key '{key}' ({size} bytes) exceeds cache memory limit, not cached")
+            self._remove_key(key)
+            return False
+        
+        # Set value
+        is_new = key not in self._cache
+        self._cache[key] = value
+        self._stale_after.pop(key, None)
+        
+        # Set expiration deadline (always has TTL)
+        expires_at = time.monotonic() + ttl
+        self._cache_expires_at[key] = expires_at
+        self._expiry_heap.push(key, expires_at)
+        
+        # Eviction bookkeeping and limits
+        self._track_key(key, size, is_new)
+        self._enforce_limits(key)
+        
+        return True
+    
     async def delete(self, key: str) -> bool:
         """
         Delete value from cache
         """
         try:
-            # Check validity before deletion (lazy cleanup)
-            if not self._is_cache_valid(key):
-                # Key expired or doesn't exist
-                return False
+            # Load in progress must not repopulate deleted key
+            self._invalidate_inflight(key)
+            self._invalidation_generation += 1
             
-            deleted = False
-            if key in self._cache:
-                del self._cache[key]
-                deleted = True
+            deleted = self._snapshot is not None and key in self._snapshot
+            self._discard_snapshot(key)
+            
+            # Check validity before deletion (lazy cleanup)
+            deleted = (self._is_cache_valid(key) and self._remove_key(key)) or deleted
             
-            if key in self._cache_expires_at:
-                del self._cache_expires_at[key]
+            if self._shared is not None:
+                deleted = await self._delete_shared(key) or deleted
             
+            if deleted:
+                self._stats_for(key)['deletes'] += 1
             return deleted
             
         except Exception as e:
             self.logger.error(f"Error deleting value from cache for key '{key}': {e}")
             return False
     
+    async def _delete_shared(self, key: str) -> bool:
+        """Delete key from shared storage and notify other processes (local-only keys are only notified)"""
+        deleted = False
+        if not self._is_local_only(key):
+            try:
+                deleted = await self._shared.delete(key) > 0
+            except Exception as e:
+                self._shared_error('delete', e)
+        await self._publish_invalidation({'op': 'delete', 'key': key})
+        return deleted
+    
     async def exists(self, key: str) -> bool:
         """
         Check if key exists in cache
         """
-        return self._is_cache_valid(key)
+        if self._is_cache_valid(key):
+            return True
+        if self._snapshot is not None and key in self._snapshot and self._restore_from_snapshot(key) is not _MISSING:
+            return True
+        if self._shared is None or self._is_local_only(key):
+            return False
+        try:
+            return await self._shared.exists(key)
+        except Exception as e:
+            self._shared_error('exists', e)
+            return False
     
     async def invalidate_pattern(self, pattern: str) -> int:
         """
         Invalidate keys by pattern
-        Supports simple patterns: 'bot:*', 'tenant:123:*', '*:meta'
+        Supports simple patterns: 'bot:*', 'tenant:123:*', '*:meta', 'tenant:*:bot_id'
+        Matching uses segment index, so cost depends on number of matched keys, not cache size
+        With shared backend returns number of keys deleted from shared storage (if larger than local)
         """
         try:
-            deleted_count = 0
-            keys_to_delete = []
+            self._invalidation_generation += 1
+            deleted_count = self._invalidate_local_pattern(pattern)
             
-            # Simple pattern implementation
-            if pattern.endswith(':*'):
-                prefix = pattern[:-2]  # Remove ':*'
-                keys_to_delete = [key for key in self._cache.keys() if key.startswith(prefix + ':')]
-            elif pattern.startswith('*:'):
-                suffix = pattern[2:]  # Remove '*:'
-                keys_to_delete = [key for key in self._cache.keys() if key.endswith(':' + suffix)]
-            elif '*' in pattern:
-                # More complex pattern (can be extended later)
-                prefix, suffix = pattern.split('*', 1)
-                keys_to_delete = [
-                    key for key in self._cache.keys()
-                    if key.startswith(prefix) and key.endswith(suffix)
-                ]
-            else:
-                # Exact match
-                keys_to_delete = [pattern] if pattern in self._cache else []
-            
-            for key in keys_to_delete:
-                if await self.delete(key):
-                    deleted_count += 1
+            if self._shared is not None:
+                try:
+                    deleted_count = max(deleted_count, await self._shared.delete_pattern(pattern))
+                except Exception as e:
+                    self._shared_error('invalidate_pattern', e)
+                await self._publish_invalidation({'op': 'pattern', 'pattern': pattern})
             
             if deleted_count > 0:
                 self.logger.info(f"Invalidated {deleted_count} keys by pattern '{pattern}'")
@@ -278,14 +791,42 @@ class CacheManager:
             self.logger.error(f"Error invalidating by pattern '{pattern}': {e}")
             return 0
     
+    def _invalidate_local_pattern(self, pattern: str) -> int:
+        """Remove keys matching pattern from process memory"""
+        deleted_count = 0
+        
+        for key in [key for key in self._inflight if self._pattern_matches(key, pattern)]:
+            self._invalidate_inflight(key)
+        
+        if self._snapshot is not None:
+            for key in self._snapshot.keys():
+                if self._pattern_matches(key, pattern):
+                    self._snapshot.discard(key)
+                    deleted_count += 1
+        
+        for key in self._key_index.match(pattern):
+            # Expired keys are removed by validity check but not counted
+            if self._is_cache_valid(key) and self._remove_key(key):
+                self._stats_for(key)['deletes'] += 1
+                deleted_count += 1
+        
+        return deleted_count
+    
     async def clear(self) -> bool:
         """
         Clear entire cache
         """
         try:
-            count = len(self._cache)
-            self._cache.clear()
-            self._cache_expires_at.clear()
+            self._invalidation_generation += 1
+            count = self._clear_local()
+            
+            if self._shared is not None:
+                try:
+                    count = max(count, await self._shared.clear())
+                except Exception as e:
+                    self._shared_error('clear', e)
+                await self._publish_invalidation({'op': 'clear'})
+            
             self.logger.info(f"Cleared entire cache ({count} items)")
             return True
             
@@ -293,12 +834,302 @@ class CacheManager:
             self.logger.error(f"Error clearing cache: {e}")
             return False
     
+    def _clear_local(self) -> int:
+        """Clear process memory, returns number of removed items"""
+        count = len(self._cache)
+        if self._snapshot is not None:
+            count += len(self._snapshot)
+            self._close_snapshot()
+        self._inflight.clear()
+        self._cache.clear()
+        self._cache_expires_at.clear()
+        self._stale_after.clear()
+        self._expiry_heap.clear()
+        self._key_index.clear()
+        self._policy.clear()
+        self._namespace_policies.clear()
+        self._namespace_usage.clear()
+        self._key_namespace.clear()
+        self._sizes.clear()
+        self._memory_used = 0
+        for stats in self._namespace_stats.values():
+            stats['entries'] = 0
+            stats['memory_bytes'] = 0
+        return count
+    
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None,
+        cache_none: bool = False
+    ) -> Optional[Any]:
+        """
+        Get value from cache or load it through loader and cache
+        - Concurrent misses for the same key share one loader call (single-flight)
+        - stale_ttl: after ttl value is still served for stale_ttl seconds while refreshed in background
+        - None results are not cached unless cache_none=True
+        - With shared backend value loaded by another process is taken from shared storage before calling loader
+        Loader errors are propagated to all waiters and not cached
+        """
+        value = self._cache.get(key, _MISSING)
+        if value is not _MISSING:
+            now = time.monotonic()
+            expires_at = self._cache_expires_at.get(key)
+            if expires_at is not None and now >= expires_at:
+                self._expire_key(key)
+            else:
+                self._touch_key(key)
+                self._stats_for(key)['hits'] += 1
+                stale_after = self._stale_after.get(key)
+                if stale_after is not None and now >= stale_after and key not in self._inflight:
+                    # Serve stale value, refresh in background
+                    self._start_load(key, loader, ttl, stale_ttl, cache_none, refresh=True).add_done_callback(self._consume_refresh_result)
+                return value
+        
+        if self._snapshot is not None:
+            value = self._restore_from_snapshot(key)
+            if value is not _MISSING:
+                self._stats_for(key)['hits'] += 1
+                return value
+        
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._start_load(key, loader, ttl, stale_ttl, cache_none)
+        
+        # Shield: cancellation of one waiter must not cancel load for others
+        return await asyncio.shield(future)
+    
+    def _start_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[int], stale_ttl: Optional[int], cache_none: bool, refresh: bool = False) -> asyncio.Future:
+        """Start loader as task registered in in-flight table"""
+        task = asyncio.ensure_future(self._run_loader(key, loader, ttl, stale_ttl, cache_none, refresh))
+        self._inflight[key] = task
+        return task
+    
+    async def _run_loader(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[int], stale_ttl: Optional[int], cache_none: bool, refresh: bool = False) -> Any:
+        """Execute loader, record latency and cache result"""
+        # Shared storage first (background refresh goes straight to loader - shared copy is the same stale value)
+        if self._shared is not None and not refresh and not self._is_local_only(key):
+            value, remaining = await self._get_shared(key)
+            if value is not _MISSING:
+                self._stats_for(key)['shared_hits'] += 1
+                if self._inflight.get(key) is asyncio.current_task():
+                    del self._inflight[key]
+                    self._fill_l1(key, value, remaining, stale_ttl)
+                return value
+        
+        # Miss = loader call for absent key (background refresh served stale value as hit)
+        if not refresh:
+            self._stats_for(key)['misses'] += 1
+        
+        namespace = key.split(':', 1)[0]
+        stats = self._load_stats.get(namespace)
+        if stats is None:
+            stats = self._load_stats[namespace] = {'loads': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+        
+        started = time.monotonic()
+        try:
+            value = await loader()
+        except Exception:
+            stats['errors'] += 1
+            raise
+        finally:
+            elapsed_ms = (time.monotonic() - started) * 1000
+            stats['loads'] += 1
+            stats['total_ms'] += elapsed_ms
+            if elapsed_ms > stats['max_ms']:
+                stats['max_ms'] = elapsed_ms
+            # Load detached from in-flight table means key was invalidated during load
+            invalidated = self._inflight.get(key) is not asyncio.current_task()
+            if not invalidated:
+                del self._inflight[key]
+        
+        # Invalidated result is returned to its waiters but not cached
+        if invalidated or (value is None and not cache_none):
+            return value
+        
+        final_ttl = ttl if ttl is not None else self._default_ttl
+        if stale_ttl:
+            await self.set(key, value, ttl=final_ttl + stale_ttl)
+            if key in self._cache:
+                self._stale_after[key] = time.monotonic() + final_ttl
+        else:
+            await self.set(key, value, ttl=final_ttl)
+        return value
+    
+    def _consume_refresh_result(self, task: asyncio.Future) -> None:
+        """Log background refresh errors (stale value stays in cache)"""
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.logger.warning(f"Background cache refresh failed: {error}")
+    
+    def _invalidate_inflight(self, key: str) -> None:
+        """Detach in-flight load: its result is not cached, next miss starts a fresh load"""
+        self._inflight.pop(key, None)
+    
+    @staticmethod
+    def _pattern_matches(key: str, pattern: str) -> bool:
+        """Pattern check for single key (same semantics as invalidate_pattern)"""
+        if pattern.endswith(':*'):
+            return key.startswith(pattern[:-1])
+        if pattern.startswith('*:'):
+            return key.endswith(pattern[1:])
+        if '*' in pattern:
+            prefix, suffix = pattern.split('*', 1)
+            return key.startswith(prefix) and key.endswith(suffix)
+        return key == pattern
+    
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache size, hit/miss and eviction statistics
+        """
+        namespaces = {}
+        for namespace, usage in self._namespace_usage.items():
+            namespaces[namespace] = {
+                'entries': usage['entries'],
+                'memory_bytes': usage['memory_bytes'] if self._track_memory else None
+            }
+        
+        namespace_stats = {}
+        hits = shared_hits = misses = 0
+        for namespace, stats in self._namespace_stats.items():
+            namespace_stats[namespace] = {
+                **stats,
+                'memory_bytes': stats['memory_bytes'] if self._track_memory else None,
+                'hit_ratio': self._hit_ratio(stats['hits'] + stats['shared_hits'], stats['misses'])
+            }
+            hits += stats['hits']
+            shared_hits += stats['shared_hits']
+            misses += stats['misses']
+        
+        return {
+            'entries': len(self._cache),
+            'memory_bytes': self._memory_used if self._track_memory else None,
+            'max_entries': self._max_entries,
+            'max_memory_bytes': self._max_memory_bytes,
+            'eviction_policy': self._eviction_policy,
+            'evictions': self._evictions,
+            'evictions_by_namespace': dict(self._evictions_by_namespace),
+            'backend': self._backend_name,
+            'shared_errors': self._shared_errors,
+            'snapshot': {
+                'pending': len(self._snapshot) if self._snapshot is not None else 0,
+                'restored': self._snapshot_restored
+            },
+            'namespaces': namespaces,
+            'hits': hits,
+            'shared_hits': shared_hits,
+            'misses': misses,
+            'hit_ratio': self._hit_ratio(hits + shared_hits, misses),
+            'namespace_stats': namespace_stats,
+            'loads': {
+                namespace: {
+                    'loads': stats['loads'],
+                    'errors': stats['errors'],
+                    'avg_ms': round(stats['total_ms'] / stats['loads'], 3) if stats['loads'] else 0.0,
+                    'max_ms': round(stats['max_ms'], 3)
+                }
+                for namespace, stats in self._load_stats.items()
+            }
+        }
+    
+    @staticmethod
+    def _hit_ratio(hits: int, misses: int) -> Optional[float]:
+        total = hits + misses
+        return round(hits / total, 4) if total else None
+    
+    async def get_metrics(self) -> str:
+        """
+        Export statistics in Prometheus text format (counters and gauges labeled by namespace)
+        """
+        counters = (
+            ('hits', 'Cache hits (process memory)'),
+            ('shared_hits', 'Cache hits served from shared backend'),
+            ('misses', 'Cache misses'),
+            ('sets', 'Cache writes'),
+            ('deletes', 'Keys deleted or invalidated'),
+            ('expirations', 'Keys removed by TTL'),
+            ('evictions', 'Keys evicted by size limits'),
+        )
+        gauges = (
+            ('entries', 'Entries in process memory'),
+            ('memory_bytes', 'Approximate size of cached values in bytes'),
+        )
+        
+        lines = []
+        for name, help_text in counters:
+            lines.append(f"# HELP cache_{name}_total {help_text}")
+            lines.append(f"# TYPE cache_{name}_total counter")
+            for namespace, stats in sorted(self._namespace_stats.items()):
+                lines.append(f'cache_{name}_total{{namespace="{self._escape_label(namespace)}"}} {stats[name]}')
+        for name, help_text in gauges:
+            if name == 'memory_bytes' and not self._track_memory:
+                continue
+            lines.append(f"# HELP cache_{name} {help_text}")
+            lines.append(f"# TYPE cache_{name} gauge")
+            for namespace, stats in sorted(self._namespace_stats.items()):
+                lines.append(f'cache_{name}{{namespace="{self._escape_label(namespace)}"}} {stats[name]}')
+        
+        lines.append("# HELP cache_loads_total get_or_load loader calls")
+        lines.append("# TYPE cache_loads_total counter")
+        for namespace, stats in sorted(self._load_stats.items()):
+            lines.append(f'cache_loads_total{{namespace="{self._escape_label(namespace)}"}} {stats["loads"]}')
+        lines.append("# HELP cache_load_errors_total get_or_load loader errors")
+        lines.append("# TYPE cache_load_errors_total counter")
+        for namespace, stats in sorted(self._load_stats.items()):
+            lines.append(f'cache_load_errors_total{{namespace="{self._escape_label(namespace)}"}} {stats["errors"]}')
+        lines.append("# HELP cache_load_seconds_total Total get_or_load loader time")
+        lines.append("# TYPE cache_load_seconds_total counter")
+        for namespace, stats in sorted(self._load_stats.items()):
+            lines.append(f'cache_load_seconds_total{{namespace="{self._escape_label(namespace)}"}} {stats["total_ms"] / 1000:.6f}')
+        
+        lines.append("# HELP cache_shared_errors_total Shared backend errors")
+        lines.append("# TYPE cache_shared_errors_total counter")
+        lines.append(f"cache_shared_errors_total {self._shared_errors}")
+        
+        return '\n'.join(lines) + '\n'
+    
+    @staticmethod
+    def _escape_label(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    
     # === Helper methods ===
     
     def shutdown(self):
         """
         Stop background cache cleanup task (for graceful shutdown)
+        Writes snapshot if enabled; shared backend connection is closed in async_shutdown
         """
         self.stop_background_cleanup()
+        
+        if self._snapshot_enabled:
+            self._save_snapshot()
+        self._close_snapshot()
+    
+    async def async_shutdown(self):
+        """
+        Stop invalidation listener and close shared backend connection
+        Awaited on event loop that owns connection (shutdown itself runs in worker thread)
+        """
+        if self._shared is None:
+            return
+        
+        shared, self._shared = self._shared, None
+        if self._listener_task and not self._listener_task.done():
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                self.logger.warning(f"Error stopping cache invalidation listener: {e}")
+        
+        try:
+            await shared.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing shared cache backend: {e}")
     
 
@@ -0,0 +1,135 @@
+"""
+Eviction policies for CacheManager
+LRU and LFU with O(1) touch/add/remove/victim operations
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class LRUPolicy:
+    """
+    Least Recently Used: victim is the key that was accessed longest ago
+    """
+    
+    def __init__(self):
+        self._order: "OrderedDict[str, None]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._order)
+    
+    def add(self, key: str) -> None:
+        """Register new key (or refresh existing one)"""
+        self._order[key] = None
+        self._order.move_to_end(key)
+    
+    def touch(self, key: str) -> None:
+        """Register access to key"""
+        if key in self._order:
+            self._order.move_to_end(key)
+    
+    def remove(self, key: str) -> None:
+        """Forget key"""
+        self._order.pop(key, None)
+    
+    def victim(self, exclude: Optional[str] = None) -> Optional[str]:
+        """Get key to evict (without removing it)"""
+        for key in self._order:
+            if key != exclude:
+                return key
+        return None
+    
+    def clear(self) -> None:
+        self._order.clear()
+
+
+class LFUPolicy:
+    """
+    Least Frequently Used: victim is the key with the lowest access count
+    Ties are resolved by LRU order inside frequency bucket
+    """
+    
+    def __init__(self):
+        self._freq: Dict[str, int] = {}
+        self._buckets: Dict[int, "OrderedDict[str, None]"] = {}
+        self._min_freq = 0
+    
+    def __len__(self) -> int:
+        return len(self._freq)
+    
+    def _bucket_add(self, key: str, freq: int) -> None:
+        bucket = self._buckets.get(freq)
+        if bucket is None:
+            bucket = OrderedDict()
+            self._buckets[freq] = bucket
+        bucket[key] = None
+    
+    def _bucket_remove(self, key: str, freq: int) -> None:
+        bucket = self._buckets.get(freq)
+        if bucket is None:
+            return
+        bucket.pop(key, None)
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = min(self._buckets) if self._buckets else 0
+    
+    def add(self, key: str) -> None:
+        """Register new key (overwrite keeps accumulated frequency)"""
+        if key in self._freq:
+            self.touch(key)
+            return
+        self._freq[key] = 1
+        self._bucket_add(key, 1)
+        self._min_freq = 1
+    
+    def touch(self, key: str) -> None:
+        """Register access to key"""
+        freq = self._freq.get(key)
+        if freq is None:
+            return
+        self._bucket_remove(key, freq)
+        self._freq[key] = freq + 1
+        self._bucket_add(key, freq + 1)
+        if self._min_freq not in self._buckets:
+            self._min_freq = freq + 1
+    
+    def remove(self, key: str) -> None:
+        """Forget key"""
+        freq = self._freq.pop(key, None)
+        if freq is not None:
+            self._bucket_remove(key, freq)
+    
+    def victim(self, exclude: Optional[str] = None) -> Optional[str]:
+        """Get key to evict (without removing it)"""
+        if not self._buckets:
+            return None
+        
+        # Fast path: least frequent bucket
+        for key in self._buckets.get(self._min_freq, ()):
+            if key != exclude:
+                return key
+        
+        # Only excluded key in min bucket - check next buckets
+        for freq in sorted(self._buckets):
+            for key in self._buckets[freq]:
+                if key != exclude:
+                    return key
+        return None
+    
+    def clear(self) -> None:
+        self._freq.clear()
+        self._buckets.clear()
+        self._min_freq = 0
+
+
+EVICTION_POLICIES = {
+    'lru': LRUPolicy,
+    'lfu': LFUPolicy,
+}
+
+
+def create_policy(name: str):
+    """Create eviction policy by name (lru by default)"""
+    policy_class = EVICTION_POLICIES.get((name or 'lru').lower(), LRUPolicy)
+    return policy_class()
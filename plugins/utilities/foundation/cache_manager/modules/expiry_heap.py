@@ -0,0 +1,57 @@
+"""
+Min-heap of expiration deadlines (monotonic clock) with lazy deletion
+"""
+
+import heapq
+from typing import Dict, List, Tuple
+
+
+class ExpiryHeap:
+    """
+    Heap of (deadline, key) entries
+    - Source of truth for deadlines is the expires_at dict owned by CacheManager
+    - Overwritten/deleted keys leave stale entries, they are skipped on pop (lazy deletion)
+    - Heap is rebuilt when stale entries dominate
+    """
+    
+    # Rebuild when heap is this many times larger than live keys (and above minimum size)
+    COMPACT_RATIO = 2
+    COMPACT_MIN_SIZE = 1024
+    
+    def __init__(self):
+        self._heap: List[Tuple[float, str]] = []
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def push(self, key: str, deadline: float) -> None:
+        heapq.heappush(self._heap, (deadline, key))
+    
+    def pop_expired(self, now: float, expires_at: Dict[str, float], limit: int) -> List[str]:
+        """
+        Pop up to limit keys whose actual deadline has passed
+        Cost is proportional to number of expiring (and stale) entries, not cache size
+        """
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] <= now and len(expired) < limit:
+            deadline, key = heapq.heappop(heap)
+            # Skip stale entry: key deleted or re-set with another deadline
+            if expires_at.get(key) == deadline:
+                expired.append(key)
+        return expired
+    
+    def next_deadline(self) -> float:
+        """Nearest deadline in heap (may be stale), inf if empty"""
+        return self._heap[0][0] if self._heap else float('inf')
+    
+    def maybe_compact(self, expires_at: Dict[str, float]) -> bool:
+        """Rebuild heap from live deadlines if stale entries dominate"""
+        if len(self._heap) < self.COMPACT_MIN_SIZE or len(self._heap) <= self.COMPACT_RATIO * len(expires_at):
+            return False
+        self._heap = [(deadline, key) for key, deadline in expires_at.items()]
+        heapq.heapify(self._heap)
+        return True
+    
+    def clear(self) -> None:
+        self._heap.clear()
@@ -0,0 +1,169 @@
+"""
+Hierarchical index of cache keys by colon-separated segments
+Makes pattern invalidation proportional to number of matched keys instead of cache size
+"""
+
+from typing import Dict, List, Optional, Set
+
+
+class _Node:
+    """Trie node: one key segment"""
+    
+    __slots__ = ('children', 'key', 'size')
+    
+    def __init__(self):
+        self.children: Optional[Dict[str, "_Node"]] = None  # Created lazily (most nodes are leaves)
+        self.key: Optional[str] = None  # Full key if node terminates a key
+        self.size = 0  # Number of keys in subtree (including this node)
+
+
+class KeyIndex:
+    """
+    Segment trie ("tenant" -> "123" -> "config") plus index by last segment
+    - prefix patterns ('tenant:123:*') walk the trie and collect the subtree
+    - suffix patterns ('*:meta') use last segment index
+    - 'prefix*suffix' patterns pick the smaller of both candidate sets
+    """
+    
+    def __init__(self):
+        self._root = _Node()
+        self._by_last_segment: Dict[str, Set[str]] = {}
+    
+    def __len__(self) -> int:
+        return self._root.size
+    
+    def add(self, key: str) -> None:
+        """Add key to index (no-op if already indexed)"""
+        segments = key.split(':')
+        
+        path = [self._root]
+        node = self._root
+        for segment in segments:
+            children = node.children
+            if children is None:
+                children = node.children = {}
+            child = children.get(segment)
+            if child is None:
+                child = children[segment] = _Node()
+            path.append(child)
+            node = child
+        
+        if node.key is not None:
+            return
+        node.key = key
+        
+        # Subtree sizes are updated only for really new keys
+        for path_node in path:
+            path_node.size += 1
+        
+        last_keys = self._by_last_segment.get(segments[-1])
+        if last_keys is None:
+            last_keys = self._by_last_segment[segments[-1]] = set()
+        last_keys.add(key)
+    
+    def remove(self, key: str) -> None:
+        """Remove key from index (no-op if not indexed)"""
+        segments = key.split(':')
+        
+        # Collect path to prune empty nodes afterwards
+        path = [self._root]
+        node = self._root
+        for segment in segments:
+            if node.children is None or segment not in node.children:
+                return
+            node = node.children[segment]
+            path.append(node)
+        if node.key is None:
+            return
+        node.key = None
+        
+        for path_node in path:
+            path_node.size -= 1
+        
+        # Prune empty branches bottom-up
+        for depth in range(len(segments), 0, -1):
+            child = path[depth]
+            if child.size > 0:
+                break
+            parent = path[depth - 1]
+            del parent.children[segments[depth - 1]]
+            if not parent.children:
+                parent.children = None
+        
+        last_keys = self._by_last_segment.get(segments[-1])
+        if last_keys is not None:
+            last_keys.discard(key)
+            if not last_keys:
+                del self._by_last_segment[segments[-1]]
+    
+    def clear(self) -> None:
+        self._root = _Node()
+        self._by_last_segment.clear()
+    
+    def _find_node(self, segments: List[str]) -> Optional[_Node]:
+        node = self._root
+        for segment in segments:
+            if node.children is None:
+                return None
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+    
+    def _collect(self, node: _Node, result: List[str]) -> None:
+        """Collect all keys in subtree"""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.key is not None:
+                result.append(current.key)
+            if current.children:
+                stack.extend(current.children.values())
+    
+    def _prefix_candidates(self, prefix: str) -> Optional[_Node]:
+        """
+        Find subtree containing all keys that start with prefix string
+        Only complete segments of prefix are used (last partial segment is filtered by caller)
+        """
+        complete_segments = prefix.split(':')[:-1]
+        if not complete_segments:
+            return self._root
+        return self._find_node(complete_segments)
+    
+    def match(self, pattern: str) -> List[str]:
+        """
+        Get keys matching pattern (same semantics as CacheManager.invalidate_pattern):
+        'prefix:*', '*:suffix', 'prefix*suffix' (single '*') or exact key
+        """
+        if pattern.endswith(':*'):
+            prefix = pattern[:-2] + ':'
+            return self._match_prefix_suffix(prefix, '')
+        
+        if pattern.startswith('*:'):
+            return self._match_prefix_suffix('', ':' + pattern[2:])
+        
+        if '*' in pattern:
+            prefix, suffix = pattern.split('*', 1)
+            return self._match_prefix_suffix(prefix, suffix)
+        
+        node = self._find_node(pattern.split(':'))
+        return [pattern] if node is not None and node.key is not None else []
+    
+    def _match_prefix_suffix(self, prefix: str, suffix: str) -> List[str]:
+        """Keys that start with prefix and end with suffix"""
+        subtree = self._prefix_candidates(prefix)
+        if subtree is None:
+            return []
+        
+        # Last segment index can be used only if suffix contains full last segment
+        suffix_candidates = None
+        if ':' in suffix:
+            suffix_candidates = self._by_last_segment.get(suffix.rsplit(':', 1)[1], set())
+        
+        if suffix_candidates is not None and len(suffix_candidates) < subtree.size:
+            candidates = suffix_candidates
+        else:
+            candidates = []
+            self._collect(subtree, candidates)
+        
+        return [key for key in candidates if key.startswith(prefix) and key.endswith(suffix)]
@@ -0,0 +1,182 @@
+"""
+Shared (L2) cache backends for multi-process deployments
+CacheManager keeps its in-process dict as L1, shared backend stores serialized values
+and delivers invalidation messages to other processes via pub/sub
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class SharedBackend(ABC):
+    """
+    Interface of shared cache storage
+    Values are opaque bytes (serialization is done by CacheManager)
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Tuple[Optional[bytes], Optional[float]]:
+        """Get value and remaining TTL in seconds (None if key has no TTL)"""
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, data: bytes, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete_pattern(self, pattern: str) -> int:
+        ...
+
+    @abstractmethod
+    async def clear(self) -> int:
+        ...
+
+    @abstractmethod
+    async def publish(self, message: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    async def listen(self, handler: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
+        """Subscribe to invalidation channel and call handler for each message (runs until cancelled)"""
+        ...
+
+    @abstractmethod
+    async def close(self) -> None:
+        ...
+
+
+class RedisBackend(SharedBackend):
+    """
+    Backend for any server speaking Redis protocol (Redis, Valkey, KeyDB, Dragonfly)
+    - All keys are stored under key_prefix, so several installations can share one server
+    - Pattern deletion uses SCAN (non-blocking for server), never KEYS
+    """
+
+    # Keys per SCAN iteration / DEL call
+    SCAN_BATCH_SIZE = 500
+
+    def __init__(self, client: Any, key_prefix: str, channel: str):
+        self.client = client
+        self.key_prefix = key_prefix
+        self.channel = channel
+
+    def _full_key(self, key: str) -> str:
+        return f"{self.key_prefix}{key}"
+
+    def _scan_pattern(self, pattern: str) -> str:
+        """Convert cache pattern to Redis glob (only '*' is wildcard, other glob chars are escaped)"""
+        return ''.join(f"\\{char}" if char in '?[]\\' else char for char in f"{self.key_prefix}{pattern}")
+
+    async def get(self, key: str) -> Tuple[Optional[bytes], Optional[float]]:
+        full_key = self._full_key(key)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.get(full_key)
+            pipe.pttl(full_key)
+            data, pttl = await pipe.execute()
+        if data is None:
+            return None, None
+        # PTTL: -1 = no expiration, -2 = key vanished between commands
+        return data, (pttl / 1000 if pttl is not None and pttl >= 0 else None)
+
+    async def set(self, key: str, data: bytes, ttl: float) -> None:
+        # PX keeps sub-second TTLs, minimum 1 ms
+        await self.client.set(self._full_key(key), data, px=max(1, int(ttl * 1000)))
+
+    async def delete(self, key: str) -> int:
+        return int(await self.client.delete(self._full_key(key)) or 0)
+
+    async def exists(self, key: str) -> bool:
+        return bool(await self.client.exists(self._full_key(key)))
+
+    async def delete_pattern(self, pattern: str) -> int:
+        return await self._delete_matching(self._scan_pattern(pattern))
+
+    async def clear(self) -> int:
+        return await self._delete_matching(f"{self._scan_pattern('')}*")
+
+    async def _delete_matching(self, match: str) -> int:
+        deleted = 0
+        batch = []
+        async for full_key in self.client.scan_iter(match=match, count=self.SCAN_BATCH_SIZE):
+            batch.append(full_key)
+            if len(batch) >= self.SCAN_BATCH_SIZE:
+                deleted += int(await self.client.delete(*batch) or 0)
+                batch = []
+        if batch:
+            deleted += int(await self.client.delete(*batch) or 0)
+        return deleted
+
+    async def publish(self, message: Dict[str, Any]) -> None:
+        await self.client.publish(self.channel, json.dumps(message))
+
+    async def listen(self, handler: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
+        pubsub = self.client.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None:
+                    continue
+                data = message.get('data')
+                if isinstance(data, bytes):
+                    data = data.decode('utf-8')
+                await handler(json.loads(data))
+        finally:
+            try:
+                await pubsub.unsubscribe(self.channel)
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def _load_redis_module() -> Optional[Any]:
+    """Lazy import of redis.asyncio (optional dependency)"""
+    try:
+        import redis.asyncio as redis_asyncio
+        return redis_asyncio
+    except ImportError:
+        return None
+
+
+def create_shared_backend(settings: Dict[str, Any], logger: Any) -> Optional[SharedBackend]:
+    """
+    Create shared backend from cache_manager settings
+    Returns None for 'memory' backend or if backend can't be created (cache stays process-local)
+    """
+    backend = (settings.get('backend') or 'memory').lower()
+    if backend == 'memory':
+        return None
+
+    if backend != 'redis':
+        logger.error(f"Unknown cache backend '{backend}', using process-local memory cache")
+        return None
+
+    redis_asyncio = _load_redis_module()
+    if redis_asyncio is None:
+        logger.error("Cache backend 'redis' requires 'redis' package (pip install redis), using process-local memory cache")
+        return None
+
+    redis_url = settings.get('redis_url') or 'redis://localhost:6379/0'
+    key_prefix = settings.get('key_prefix') or 'cache:'
+    channel = settings.get('invalidation_channel') or f"{key_prefix}invalidate"
+
+    try:
+        client = redis_asyncio.from_url(redis_url, decode_responses=False)
+    except Exception as e:
+        logger.error(f"Failed to create Redis client for cache backend: {e}, using process-local memory cache")
+        return None
+
+    return RedisBackend(client, key_prefix, channel)
+
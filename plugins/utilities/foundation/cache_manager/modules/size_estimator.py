@@ -0,0 +1,49 @@
+"""
+Approximate memory size of cached values
+"""
+
+import sys
+from typing import Any
+
+# Scalars without nested objects - getsizeof is exact enough
+_SCALAR_TYPES = (str, bytes, bytearray, int, float, bool, type(None))
+
+
+def estimate_size(value: Any, max_objects: int = 100000) -> int:
+    """
+    Approximate deep size of value in bytes
+    Walks dict/list/tuple/set containers (shared objects counted once),
+    stops after max_objects to bound cost for huge structures
+    """
+    if isinstance(value, _SCALAR_TYPES):
+        return sys.getsizeof(value)
+    
+    total = 0
+    seen = set()
+    stack = [value]
+    visited = 0
+    
+    while stack and visited < max_objects:
+        obj = stack.pop()
+        obj_id = id(obj)
+        if obj_id in seen:
+            continue
+        seen.add(obj_id)
+        visited += 1
+        
+        try:
+            total += sys.getsizeof(obj)
+        except TypeError:
+            continue
+        
+        if isinstance(obj, _SCALAR_TYPES):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, '__dict__'):
+            stack.append(obj.__dict__)
+    
+    return total
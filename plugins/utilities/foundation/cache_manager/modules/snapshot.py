@@ -0,0 +1,129 @@
+"""
+Cache snapshot file: written on graceful shutdown, memory-mapped on startup
+Only key headers are read at startup, values are unpickled on first access
+
+File layout (little-endian):
+- header: magic 'CMSNAP', format version (uint16), entry count (uint32), save time (float64, unix)
+- entries: key length (uint16), value length (uint32), expires at (float64, unix),
+  stale after (float64, unix, 0 = none), key (utf-8), value (pickle)
+"""
+
+import mmap
+import os
+import pickle
+from struct import Struct
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+MAGIC = b'CMSNAP'
+VERSION = 1
+
+_HEADER = Struct('<6sHId')
+_ENTRY = Struct('<HIdd')
+
+
+def write_snapshot(path: str, entries: Iterable[Tuple[str, Any, float, float]], saved_at: float) -> Tuple[int, int]:
+    """
+    Write entries (key, value, expires_at, stale_after) atomically (temp file + rename)
+    Values that can't be pickled are skipped
+    Returns (written entries, skipped entries)
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    written = 0
+    skipped = 0
+    with open(tmp_path, 'wb') as file:
+        # Entry count is patched after writing entries
+        file.write(_HEADER.pack(MAGIC, VERSION, 0, saved_at))
+        for key, value, expires_at, stale_after in entries:
+            try:
+                data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                skipped += 1
+                continue
+            key_bytes = key.encode('utf-8')
+            file.write(_ENTRY.pack(len(key_bytes), len(data), expires_at, stale_after))
+            file.write(key_bytes)
+            file.write(data)
+            written += 1
+        file.seek(0)
+        file.write(_HEADER.pack(MAGIC, VERSION, written, saved_at))
+    os.replace(tmp_path, path)
+    return written, skipped
+
+
+class SnapshotReader:
+    """
+    Memory-mapped snapshot: index of keys is built on open, values are unpickled on demand
+    Each key can be taken once (restored into cache or discarded by invalidation)
+    """
+
+    def __init__(self, path: str, now: float):
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._index: Dict[str, Tuple[int, int, float, float]] = {}
+        try:
+            self._build_index(now)
+        except Exception:
+            self.close()
+            raise
+
+    def _build_index(self, now: float) -> None:
+        buffer = self._mmap
+        if len(buffer) < _HEADER.size:
+            raise ValueError("snapshot file is truncated")
+        magic, version, count, _ = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("not a cache snapshot file")
+        if version != VERSION:
+            raise ValueError(f"unsupported snapshot version {version}")
+
+        offset = _HEADER.size
+        for _ in range(count):
+            key_length, value_length, expires_at, stale_after = _ENTRY.unpack_from(buffer, offset)
+            offset += _ENTRY.size
+            key = bytes(buffer[offset:offset + key_length]).decode('utf-8')
+            offset += key_length
+            if offset + value_length > len(buffer):
+                raise ValueError("snapshot file is truncated")
+            # Entries expired while process was down are not indexed
+            if expires_at > now:
+                self._index[key] = (offset, value_length, expires_at, stale_after)
+            offset += value_length
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def keys(self):
+        return list(self._index)
+
+    def take(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        """Remove key from snapshot and return (value, expires_at, stale_after) or None"""
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return None
+        offset, length, expires_at, stale_after = entry
+        value = pickle.loads(self._mmap[offset:offset + length])
+        return value, expires_at, stale_after
+
+    def discard(self, key: str) -> None:
+        self._index.pop(key, None)
+
+    def clear(self) -> None:
+        self._index.clear()
+
+    def close(self) -> None:
+        self._index.clear()
+        try:
+            self._mmap.close()
+        finally:
+            self._file.close()
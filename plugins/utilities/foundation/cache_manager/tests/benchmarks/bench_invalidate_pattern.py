@@ -0,0 +1,71 @@
+"""
+Benchmark: invalidate_pattern with segment index vs linear scan on 1M keys
+
+Run from project root:
+    python plugins/utilities/foundation/cache_manager/tests/benchmarks/bench_invalidate_pattern.py [keys]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# plugins/utilities/foundation/ - import through subfolder, preserving package structure
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from cache_manager.cache_manager import CacheManager  # noqa: E402
+
+
+def _linear_scan(keys, pattern):
+    """Previous implementation: scan every key"""
+    if pattern.endswith(':*'):
+        prefix = pattern[:-2]
+        return [key for key in keys if key.startswith(prefix + ':')]
+    if pattern.startswith('*:'):
+        suffix = pattern[2:]
+        return [key for key in keys if key.endswith(':' + suffix)]
+    prefix, suffix = pattern.split('*', 1)
+    return [key for key in keys if key.startswith(prefix) and key.endswith(suffix)]
+
+
+async def main(total_keys: int):
+    settings_manager = MagicMock()
+    settings_manager.get_plugin_settings.return_value = {'default_ttl': 3600, 'cleanup_interval': 3600}
+    cache = CacheManager(logger=MagicMock(), settings_manager=settings_manager)
+    
+    # ~1000 tenants, users spread across tenants, plus per-tenant config/meta/scenarios
+    tenants = 1000
+    started = time.perf_counter()
+    for i in range(total_keys - tenants * 3):
+        await cache.set(f"user:{i}:{i % tenants}", i)
+    for tenant_id in range(tenants):
+        await cache.set(f"tenant:{tenant_id}:config", tenant_id)
+        await cache.set(f"tenant:{tenant_id}:meta", tenant_id)
+        await cache.set(f"tenant:{tenant_id}:scenarios", tenant_id)
+    print(f"Filled {len(cache._cache)} keys in {time.perf_counter() - started:.2f}s")
+    
+    for pattern in ['tenant:123:*', '*:meta', 'tenant:*:scenarios', 'user:777:*']:
+        keys = list(cache._cache.keys())
+        started = time.perf_counter()
+        scan_result = _linear_scan(keys, pattern)
+        scan_time = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        index_result = cache._key_index.match(pattern)
+        match_time = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        deleted = await cache.invalidate_pattern(pattern)
+        invalidate_time = time.perf_counter() - started
+        
+        assert set(scan_result) == set(index_result)
+        print(
+            f"{pattern:<22} matched={len(index_result):<6} linear_scan={scan_time * 1000:8.2f}ms "
+            f"index_match={match_time * 1000:8.3f}ms invalidate={invalidate_time * 1000:8.3f}ms deleted={deleted}"
+        )
+    
+    cache.shutdown()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
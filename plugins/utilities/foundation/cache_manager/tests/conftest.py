@@ -1,8 +1,12 @@
 """
 Local fixtures for cache_manager tests
 """
+import asyncio
+import re
 import sys
+import time
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
@@ -10,15 +14,13 @@ import pytest
 # Import fixtures from tests/conftest
 from tests.conftest import logger, module_logger, settings_manager  # noqa: F401
 
-# Automatically add parent plugin directory to sys.path
-# This allows using imports like "from cache_manager import ..."
-# instead of "from plugins.utilities.foundation.cache_manager.cache_manager import ..."
-# and makes tests independent of folder structure above plugin level
-_plugin_dir = Path(__file__).parent.parent
+# Add parent plugin directory to sys.path
+_plugin_dir = Path(__file__).parent.parent.parent  # plugins/utilities/foundation/
 if str(_plugin_dir) not in sys.path:
     sys.path.insert(0, str(_plugin_dir))
 
-from cache_manager import CacheManager
+# Import through subfolder, preserving package structure for relative imports
+from cache_manager.cache_manager import CacheManager
 
 
 @pytest.fixture
@@ -30,8 +32,7 @@ def mock_settings_manager():
     mock.get_plugin_settings.return_value = {
         'default_ttl': 3600,  # 1 hour
         'cleanup_interval': 0.01,  # 0.01 seconds for fast tests
-        'cleanup_sample_size': 10,  # Small sample for tests
-        'cleanup_expired_threshold': 0.25,  # 25%
+        'cleanup_batch_size': 10,  # Small batch for tests
     }
     
     return mock
@@ -50,9 +51,197 @@ def cache_manager_with_short_ttl(logger, mock_settings_manager):
     mock_settings_manager.get_plugin_settings.return_value = {
         'default_ttl': 0.01,  # 0.01 seconds (10 ms) for fast tests
         'cleanup_interval': 0.01,  # 0.01 seconds for tests
-        'cleanup_sample_size': 10,
-        'cleanup_expired_threshold': 0.25,
+        'cleanup_batch_size': 10,
     }
     
     return CacheManager(logger=logger, settings_manager=mock_settings_manager)
 
+
+
+@pytest.fixture
+def create_cache_manager(logger, mock_settings_manager):  # noqa: F811
+    """Factory for CacheManager with overridden settings (limits, quotas, etc.)"""
+    def _create(**overrides):
+        settings = {
+            'default_ttl': 3600,
+            'cleanup_interval': 0.01,
+            'cleanup_batch_size': 10,
+        }
+        settings.update(overrides)
+        mock_settings_manager.get_plugin_settings.return_value = settings
+        return CacheManager(logger=logger, settings_manager=mock_settings_manager)
+    
+    return _create
+
+
+class FakeRedisServer:
+    """In-process stand-in for Redis server: key storage with PX expiry and pub/sub channels"""
+    
+    def __init__(self):
+        self.data = {}
+        self.subscribers = {}
+        self.fail = False
+    
+    def check(self):
+        if self.fail:
+            raise ConnectionError("fake redis is down")
+    
+    def get(self, key):
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self.data[key]
+            return None
+        return value
+    
+    def pttl(self, key):
+        if self.get(key) is None:
+            return -2
+        expires_at = self.data[key][1]
+        return -1 if expires_at is None else int((expires_at - time.monotonic()) * 1000)
+
+
+class FakePipeline:
+    def __init__(self, server):
+        self.server = server
+        self.commands = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *args):
+        return False
+    
+    def get(self, key):
+        self.commands.append(lambda: self.server.get(key))
+    
+    def pttl(self, key):
+        self.commands.append(lambda: self.server.pttl(key))
+    
+    async def execute(self):
+        self.server.check()
+        return [command() for command in self.commands]
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self.server = server
+        self.queue = asyncio.Queue()
+        self.channels = []
+    
+    async def subscribe(self, channel):
+        self.server.check()
+        self.channels.append(channel)
+        self.server.subscribers.setdefault(channel, []).append(self.queue)
+    
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+    
+    async def unsubscribe(self, channel):
+        queues = self.server.subscribers.get(channel, [])
+        if self.queue in queues:
+            queues.remove(self.queue)
+    
+    async def aclose(self):
+        pass
+
+
+class FakeRedisClient:
+    """Subset of redis.asyncio.Redis used by RedisBackend"""
+    
+    def __init__(self, server):
+        self.server = server
+        self.closed = False
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.server)
+    
+    async def set(self, key, value, px=None):
+        self.server.check()
+        expires_at = time.monotonic() + px / 1000 if px else None
+        self.server.data[key] = (value, expires_at)
+        return True
+    
+    async def delete(self, *keys):
+        self.server.check()
+        return sum(1 for key in keys if self.server.get(key) is not None and self.server.data.pop(key, None))
+    
+    async def exists(self, key):
+        self.server.check()
+        return int(self.server.get(key) is not None)
+    
+    async def scan_iter(self, match='*', count=None):
+        self.server.check()
+        # Redis glob: '*' wildcard, backslash escapes next character
+        regex = ''
+        escaped = False
+        for char in match:
+            if escaped:
+                regex += re.escape(char)
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '*':
+                regex += '.*'
+            else:
+                regex += re.escape(char)
+        for key in list(self.server.data):
+            if re.fullmatch(regex, key) and self.server.get(key) is not None:
+                yield key
+    
+    async def publish(self, channel, message):
+        self.server.check()
+        queues = self.server.subscribers.get(channel, [])
+        for queue in queues:
+            queue.put_nowait({'type': 'message', 'channel': channel, 'data': message.encode('utf-8')})
+        return len(queues)
+    
+    def pubsub(self):
+        return FakePubSub(self.server)
+    
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_redis_server():
+    """Shared fake Redis server (one per test, like one server for all worker processes)"""
+    return FakeRedisServer()
+
+
+@pytest.fixture
+async def create_shared_cache_manager(request, fake_redis_server, monkeypatch):
+    """Factory for CacheManager instances (simulated worker processes) sharing one fake Redis server"""
+    test_logger = request.getfixturevalue('logger')
+    from cache_manager.modules import shared_backend
+    
+    fake_module = SimpleNamespace(from_url=lambda url, **kwargs: FakeRedisClient(fake_redis_server))
+    monkeypatch.setattr(shared_backend, '_load_redis_module', lambda: fake_module)
+    
+    managers = []
+    
+    def _create(**overrides):
+        settings = {
+            'default_ttl': 3600,
+            'cleanup_interval': 0.01,
+            'cleanup_batch_size': 10,
+            'backend': 'redis',
+            'l1_ttl': 60,
+        }
+        settings.update(overrides)
+        plugin_settings_manager = MagicMock()
+        plugin_settings_manager.get_plugin_settings.return_value = settings
+        manager = CacheManager(logger=test_logger, settings_manager=plugin_settings_manager)
+        managers.append(manager)
+        return manager
+    
+    yield _create
+    
+    for manager in managers:
+        manager.shutdown()
+        await manager.async_shutdown()
@@ -0,0 +1,132 @@
+"""
+Tests for size limits, eviction policies and namespace quotas
+"""
+import pytest
+
+
+@pytest.mark.asyncio
+class TestEviction:
+    """Tests for bounded cache"""
+    
+    async def test_unlimited_by_default(self, cache_manager):
+        """Test that cache has no limits without settings"""
+        for i in range(200):
+            await cache_manager.set(f"test:{i}", i)
+        
+        stats = await cache_manager.get_stats()
+        assert stats['entries'] == 200
+        assert stats['evictions'] == 0
+    
+    async def test_lru_evicts_least_recently_used(self, create_cache_manager):
+        """Test LRU eviction by max_entries"""
+        cache = create_cache_manager(max_entries=3, eviction_policy='lru')
+        
+        await cache.set("test:1", 1)
+        await cache.set("test:2", 2)
+        await cache.set("test:3", 3)
+        
+        # Access first key - second becomes least recently used
+        assert await cache.get("test:1") == 1
+        await cache.set("test:4", 4)
+        
+        assert await cache.get("test:2") is None
+        assert await cache.get("test:1") == 1
+        assert await cache.get("test:3") == 3
+        assert await cache.get("test:4") == 4
+        
+        stats = await cache.get_stats()
+        assert stats['entries'] == 3
+        assert stats['evictions'] == 1
+        assert stats['evictions_by_namespace'] == {'test': 1}
+    
+    async def test_lfu_evicts_least_frequently_used(self, create_cache_manager):
+        """Test LFU eviction by max_entries"""
+        cache = create_cache_manager(max_entries=3, eviction_policy='lfu')
+        
+        await cache.set("test:1", 1)
+        await cache.set("test:2", 2)
+        await cache.set("test:3", 3)
+        
+        for _ in range(3):
+            await cache.get("test:1")
+            await cache.get("test:3")
+        await cache.get("test:2")
+        
+        await cache.set("test:4", 4)
+        
+        # test:2 has the lowest frequency among old keys
+        assert await cache.get("test:2") is None
+        assert await cache.get("test:1") == 1
+        assert await cache.get("test:4") == 4
+    
+    async def test_memory_limit(self, create_cache_manager):
+        """Test eviction by approximate memory size"""
+        cache = create_cache_manager(max_memory_mb=0.01)  # ~10 KB
+        
+        for i in range(20):
+            await cache.set(f"blob:{i}", "x" * 1000)
+        
+        stats = await cache.get_stats()
+        assert stats['memory_bytes'] <= stats['max_memory_bytes']
+        assert stats['evictions'] > 0
+        
+        # Last written value always stays
+        assert await cache.get("blob:19") == "x" * 1000
+    
+    async def test_value_larger_than_limit_not_cached(self, create_cache_manager):
+        """Test that single value larger than memory limit is rejected"""
+        cache = create_cache_manager(max_memory_mb=0.001)  # ~1 KB
+        
+        await cache.set("small:1", "x")
+        result = await cache.set("huge:1", "x" * 10000)
+        
+        assert result is False
+        assert await cache.get("huge:1") is None
+        assert await cache.get("small:1") == "x"
+    
+    async def test_namespace_quota_does_not_evict_other_namespaces(self, create_cache_manager):
+        """Test that namespace overflow evicts only its own keys"""
+        cache = create_cache_manager(namespace_quotas={'user': {'max_entries': 2}})
+        
+        await cache.set("tenant:1:config", {"a": 1})
+        for i in range(5):
+            await cache.set(f"user:{i}:1", {"user_id": i})
+        
+        assert await cache.get("tenant:1:config") == {"a": 1}
+        assert await cache.get("user:3:1") is not None
+        assert await cache.get("user:4:1") is not None
+        assert await cache.get("user:0:1") is None
+        
+        stats = await cache.get_stats()
+        assert stats['namespaces']['user']['entries'] == 2
+        assert stats['evictions_by_namespace'] == {'user': 3}
+    
+    async def test_wildcard_namespace_quota_per_tenant(self, create_cache_manager):
+        """Test that '*' segment gives separate quota to each tenant"""
+        cache = create_cache_manager(namespace_quotas={'tenant:*': {'max_entries': 2}})
+        
+        for i in range(4):
+            await cache.set(f"tenant:1:key{i}", i)
+        await cache.set("tenant:2:config", "cfg")
+        
+        stats = await cache.get_stats()
+        assert stats['namespaces']['tenant:1']['entries'] == 2
+        assert stats['namespaces']['tenant:2']['entries'] == 1
+        assert await cache.get("tenant:2:config") == "cfg"
+    
+    async def test_delete_and_clear_release_accounting(self, create_cache_manager):
+        """Test that delete/clear release namespace and memory accounting"""
+        cache = create_cache_manager(max_memory_mb=1, namespace_quotas={'user': {'max_entries': 10}})
+        
+        await cache.set("user:1:1", "x" * 100)
+        await cache.set("user:2:1", "x" * 100)
+        await cache.delete("user:1:1")
+        
+        stats = await cache.get_stats()
+        assert stats['namespaces']['user']['entries'] == 1
+        
+        await cache.clear()
+        stats = await cache.get_stats()
+        assert stats['entries'] == 0
+        assert stats['memory_bytes'] == 0
+        assert stats['namespaces'] == {}
@@ -0,0 +1,116 @@
+"""
+Tests for get_or_load (single-flight loading, stale-while-revalidate)
+"""
+import asyncio
+
+import pytest
+
+
+@pytest.mark.asyncio
+class TestGetOrLoad:
+    """Tests for get_or_load"""
+    
+    async def test_miss_loads_and_caches(self, cache_manager):
+        """Test that miss calls loader once and caches result"""
+        calls = []
+        
+        async def loader():
+            calls.append(1)
+            return {"user_id": 1}
+        
+        assert await cache_manager.get_or_load("user:1:1", loader) == {"user_id": 1}
+        assert await cache_manager.get_or_load("user:1:1", loader) == {"user_id": 1}
+        assert len(calls) == 1
+        assert await cache_manager.get("user:1:1") == {"user_id": 1}
+    
+    async def test_concurrent_misses_share_one_load(self, cache_manager):
+        """Test single-flight: concurrent misses for one key call loader once"""
+        calls = []
+        
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 42
+        
+        results = await asyncio.gather(*[cache_manager.get_or_load("id:hash:abc", loader) for _ in range(20)])
+        
+        assert results == [42] * 20
+        assert len(calls) == 1
+    
+    async def test_none_not_cached_by_default(self, cache_manager):
+        """Test that None result is not cached unless cache_none=True"""
+        calls = []
+        
+        async def loader():
+            calls.append(1)
+            return None
+        
+        assert await cache_manager.get_or_load("tenant:1:config", loader) is None
+        assert await cache_manager.get_or_load("tenant:1:config", loader) is None
+        assert len(calls) == 2
+        
+        assert await cache_manager.get_or_load("tenant:2:config", loader, cache_none=True) is None
+        assert await cache_manager.get_or_load("tenant:2:config", loader, cache_none=True) is None
+        assert len(calls) == 3
+    
+    async def test_loader_error_propagates_to_all_waiters(self, cache_manager):
+        """Test that loader error is raised for every waiter and not cached"""
+        async def failing_loader():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+        
+        results = await asyncio.gather(
+            *[cache_manager.get_or_load("user:1:1", failing_loader) for _ in range(3)],
+            return_exceptions=True
+        )
+        
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert await cache_manager.exists("user:1:1") is False
+        
+        stats = await cache_manager.get_stats()
+        assert stats['loads']['user']['errors'] == 1
+    
+    async def test_stale_while_revalidate(self, cache_manager):
+        """Test that stale value is served while refreshed in background"""
+        version = {"value": 1}
+        
+        async def loader():
+            return version["value"]
+        
+        assert await cache_manager.get_or_load("tenant:1:config", loader, ttl=0.01, stale_ttl=10) == 1
+        
+        version["value"] = 2
+        await asyncio.sleep(0.02)
+        
+        # Stale value returned immediately, refresh scheduled
+        assert await cache_manager.get_or_load("tenant:1:config", loader, ttl=0.01, stale_ttl=10) == 1
+        await asyncio.sleep(0.01)
+        assert await cache_manager.get("tenant:1:config") == 2
+    
+    async def test_invalidation_during_load_is_not_overwritten(self, cache_manager):
+        """Test that delete during in-flight load prevents caching of old result"""
+        started = asyncio.Event()
+        
+        async def slow_loader():
+            started.set()
+            await asyncio.sleep(0.02)
+            return "old"
+        
+        load_task = asyncio.create_task(cache_manager.get_or_load("tenant:1:config", slow_loader))
+        await started.wait()
+        await cache_manager.invalidate_pattern("tenant:1:*")
+        
+        assert await load_task == "old"
+        assert await cache_manager.exists("tenant:1:config") is False
+    
+    async def test_load_latency_recorded(self, cache_manager):
+        """Test that load latency is recorded per namespace"""
+        async def loader():
+            return 1
+        
+        await cache_manager.get_or_load("id:hash:1", loader)
+        await cache_manager.get_or_load("id:hash:2", loader)
+        
+        stats = await cache_manager.get_stats()
+        assert stats['loads']['id']['loads'] == 2
+        assert stats['loads']['id']['errors'] == 0
@@ -0,0 +1,106 @@
+"""
+Tests for segment key index used by invalidate_pattern
+"""
+import random
+
+import pytest
+from cache_manager.modules.key_index import KeyIndex
+
+
+def _naive_match(keys, pattern):
+    """Reference implementation (previous linear scan in invalidate_pattern)"""
+    if pattern.endswith(':*'):
+        prefix = pattern[:-2]
+        return {key for key in keys if key.startswith(prefix + ':')}
+    if pattern.startswith('*:'):
+        suffix = pattern[2:]
+        return {key for key in keys if key.endswith(':' + suffix)}
+    if '*' in pattern:
+        prefix, suffix = pattern.split('*', 1)
+        return {key for key in keys if key.startswith(prefix) and key.endswith(suffix)}
+    return {pattern} if pattern in keys else set()
+
+
+class TestKeyIndex:
+    """Tests for KeyIndex"""
+    
+    def test_patterns_match_linear_scan(self):
+        """Test that index gives the same result as linear scan for all pattern types"""
+        rng = random.Random(42)
+        keys = set()
+        for _ in range(2000):
+            kind = rng.choice(['user', 'tenant', 'bot', 'id'])
+            if kind == 'user':
+                keys.add(f"user:{rng.randint(1, 50)}:{rng.randint(1, 5)}")
+            elif kind == 'tenant':
+                keys.add(f"tenant:{rng.randint(1, 30)}:{rng.choice(['config', 'meta', 'scenarios', 'bot_id'])}")
+            elif kind == 'bot':
+                keys.add(f"bot:{rng.randint(1, 100)}")
+            else:
+                keys.add(f"id:{rng.randint(1, 200)}")
+        keys.add("meta")
+        keys.add("tenant")
+        
+        index = KeyIndex()
+        for key in keys:
+            index.add(key)
+        
+        patterns = [
+            'bot:*', 'tenant:*', 'tenant:5:*', 'user:1:*', '*:meta', '*:bot_id',
+            'tenant:*:bot_id', 'tenant:*:scenarios', 'user:*1', 'ten*', '*', 'tenant:5:config',
+            'missing:*', '*:missing', 'bot:7', 'tenant:1*', '*:5:config',
+        ]
+        for pattern in patterns:
+            assert set(index.match(pattern)) == _naive_match(keys, pattern), pattern
+    
+    def test_remove_prunes_and_keeps_consistency(self):
+        """Test that removed keys disappear from all pattern results"""
+        index = KeyIndex()
+        for i in range(10):
+            index.add(f"tenant:{i}:config")
+            index.add(f"tenant:{i}:meta")
+        
+        for i in range(5):
+            index.remove(f"tenant:{i}:meta")
+        index.remove("tenant:missing:meta")  # No-op
+        
+        assert len(index) == 15
+        assert len(index.match('*:meta')) == 5
+        assert index.match('tenant:1:*') == ['tenant:1:config']
+        
+        for i in range(10):
+            index.remove(f"tenant:{i}:config")
+        assert sorted(index.match('tenant:*')) == sorted(f"tenant:{i}:meta" for i in range(5, 10))
+    
+    def test_add_is_idempotent(self):
+        """Test that adding existing key doesn't change size"""
+        index = KeyIndex()
+        index.add("bot:1")
+        index.add("bot:1")
+        
+        assert len(index) == 1
+        index.remove("bot:1")
+        assert len(index) == 0
+
+
+@pytest.mark.asyncio
+class TestIndexedInvalidation:
+    """Tests for index consistency inside CacheManager"""
+    
+    async def test_expired_keys_not_counted(self, cache_manager):
+        """Test that expired keys are removed but not counted"""
+        import asyncio
+        await cache_manager.set("tenant:1:meta", 1, ttl=0.01)
+        await cache_manager.set("tenant:2:meta", 2)
+        await asyncio.sleep(0.02)
+        
+        assert await cache_manager.invalidate_pattern("*:meta") == 1
+        assert len(cache_manager._key_index) == 0
+    
+    async def test_overwrite_keeps_single_index_entry(self, cache_manager):
+        """Test that overwriting key doesn't duplicate it in index"""
+        await cache_manager.set("tenant:1:bot_id", 1)
+        await cache_manager.set("tenant:1:bot_id", 2)
+        
+        assert await cache_manager.invalidate_pattern("tenant:*:bot_id") == 1
+        assert await cache_manager.get("tenant:1:bot_id") is None
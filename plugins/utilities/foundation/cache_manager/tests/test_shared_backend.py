@@ -0,0 +1,198 @@
+"""
+Tests for shared (L2) cache backend: several CacheManager instances emulate worker processes
+sharing one in-process fake Redis server
+"""
+
+import asyncio
+
+import pytest
+
+
+async def _until(condition, timeout: float = 1.0):
+    """Wait until condition() is true (invalidation messages are delivered asynchronously)"""
+    deadline = asyncio.get_event_loop().time() + timeout
+    while not condition():
+        if asyncio.get_event_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.005)
+    return True
+
+
+async def _subscribed(fake_redis_server, count: int):
+    """Wait until listeners of all managers are subscribed"""
+    assert await _until(lambda: sum(len(queues) for queues in fake_redis_server.subscribers.values()) >= count)
+
+
+@pytest.mark.asyncio
+class TestBackendSelection:
+    """Backend selection and fallback"""
+
+    async def test_memory_backend_by_default(self, cache_manager):
+        """Default backend is process-local memory"""
+        stats = await cache_manager.get_stats()
+        assert stats['backend'] == 'memory'
+
+    async def test_redis_without_package_falls_back_to_memory(self, create_cache_manager, monkeypatch):
+        """Missing redis package keeps cache process-local"""
+        from cache_manager.modules import shared_backend
+        monkeypatch.setattr(shared_backend, '_load_redis_module', lambda: None)
+
+        manager = create_cache_manager(backend='redis')
+
+        assert (await manager.get_stats())['backend'] == 'memory'
+        assert await manager.set('user:1', {'name': 'A'})
+        assert await manager.get('user:1') == {'name': 'A'}
+
+    async def test_redis_backend_enabled(self, create_shared_cache_manager):
+        """Redis backend is reported in stats"""
+        manager = create_shared_cache_manager()
+        assert (await manager.get_stats())['backend'] == 'redis'
+
+    async def test_async_shutdown_closes_connection(self, create_shared_cache_manager, fake_redis_server):
+        """Listener and connection are closed on owning loop, cache keeps working locally"""
+        manager = create_shared_cache_manager()
+        await _subscribed(fake_redis_server, 1)
+        client = manager._shared.client
+
+        manager.shutdown()
+        await manager.async_shutdown()
+
+        assert client.closed
+        assert manager._listener_task.done()
+        assert (await manager.get_stats())['backend'] == 'redis'
+        assert await manager.set('user:1', 'a')
+        assert await manager.get('user:1') == 'a'
+
+
+@pytest.mark.asyncio
+class TestSharedCache:
+    """Values and invalidations shared between processes"""
+
+    async def test_value_visible_in_other_process(self, create_shared_cache_manager, fake_redis_server):
+        """Value set in one process is read by another from shared storage"""
+        first = create_shared_cache_manager()
+        second = create_shared_cache_manager()
+
+        await first.set('user:1', {'name': 'A'})
+
+        assert await second.get('user:1') == {'name': 'A'}
+        # Read value is kept in L1 of second process
+        assert 'user:1' in second._cache
+        assert await second.exists('user:1')
+
+    async def test_set_drops_l1_copy_in_other_process(self, create_shared_cache_manager, fake_redis_server):
+        """Overwrite in one process invalidates L1 copy in another"""
+        first = create_shared_cache_manager()
+        second = create_shared_cache_manager()
+        await _subscribed(fake_redis_server, 2)
+
+        await first.set('tenant:1:config', {'v': 1})
+        assert await second.get('tenant:1:config') == {'v': 1}
+
+        await first.set('tenant:1:config', {'v': 2})
+
+        assert await _until(lambda: 'tenant:1:config' not in second._cache)
+        assert await second.get('tenant:1:config') == {'v': 2}
+
+    async def test_delete_and_pattern_invalidation_reach_other_process(self, create_shared_cache_manager, fake_redis_server):
+        """delete and invalidate_pattern remove keys from shared storage and L1 of other processes"""
+        first = create_shared_cache_manager()
+        second = create_shared_cache_manager()
+        await _subscribed(fake_redis_server, 2)
+
+        for key in ('tenant:1:bot_id', 'tenant:1:meta', 'tenant:2:bot_id', 'user:5'):
+            await first.set(key, key)
+            await second.get(key)
+
+        assert await first.invalidate_pattern('tenant:1:*') == 2
+        await first.delete('user:5')
+
+        assert await _until(lambda: 'tenant:1:meta' not in second._cache and 'user:5' not in second._cache)
+        assert await second.get('tenant:1:bot_id') is None
+        assert await second.get('user:5') is None
+        assert await second.get('tenant:2:bot_id') == 'tenant:2:bot_id'
+
+    async def test_clear_reaches_other_process(self, create_shared_cache_manager, fake_redis_server):
+        """clear empties shared storage and L1 of other processes"""
+        first = create_shared_cache_manager()
+        second = create_shared_cache_manager()
+        await _subscribed(fake_redis_server, 2)
+
+        await first.set('bot:1', 'a')
+        await second.get('bot:1')
+
+        await first.clear()
+
+        assert await _until(lambda: not second._cache)
+        assert await second.get('bot:1') is None
+
+    async def test_local_only_keys_not_shared_but_invalidated(self, create_shared_cache_manager, fake_redis_server):
+        """Local-only keys stay in process memory, their invalidation is still broadcast"""
+        first = create_shared_cache_manager(local_only_patterns=['tenant:*:scenarios'])
+        second = create_shared_cache_manager(local_only_patterns=['tenant:*:scenarios'])
+        await _subscribed(fake_redis_server, 2)
+
+        await first.set('tenant:1:scenarios', {'tree': 1})
+        await second.set('tenant:1:scenarios', {'tree': 1})
+        assert not fake_redis_server.data
+
+        await first.invalidate_pattern('tenant:*:scenarios')
+
+        assert await _until(lambda: 'tenant:1:scenarios' not in second._cache)
+
+    async def test_l1_ttl_bounds_local_copy(self, create_shared_cache_manager):
+        """L1 copy lives at most l1_ttl, shared copy keeps full TTL"""
+        first = create_shared_cache_manager(l1_ttl=0.02)
+
+        await first.set('user:1', 'a', ttl=60)
+        await asyncio.sleep(0.03)
+
+        assert 'user:1' not in first._cache or not first._is_cache_valid('user:1')
+        assert await first.get('user:1') == 'a'
+
+    async def test_get_or_load_uses_value_loaded_by_other_process(self, create_shared_cache_manager):
+        """Loader is not called when another process already loaded the value"""
+        first = create_shared_cache_manager()
+        second = create_shared_cache_manager()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return {'loaded': True}
+
+        assert await first.get_or_load('user:7', loader) == {'loaded': True}
+        assert await second.get_or_load('user:7', loader) == {'loaded': True}
+        assert len(calls) == 1
+
+    async def test_non_serializable_value_cached_locally(self, create_shared_cache_manager, fake_redis_server):
+        """Value that can't be pickled stays in process memory"""
+        manager = create_shared_cache_manager()
+
+        assert await manager.set('tenant:1:handler', lambda: None)
+
+        assert await manager.get('tenant:1:handler') is not None
+        assert not fake_redis_server.data
+
+
+@pytest.mark.asyncio
+class TestSharedBackendFailures:
+    """Shared storage failures degrade to process-local cache"""
+
+    async def test_unavailable_backend_returns_miss(self, create_shared_cache_manager, fake_redis_server):
+        """Read errors are treated as miss and counted"""
+        manager = create_shared_cache_manager()
+        fake_redis_server.fail = True
+
+        assert await manager.get('user:1') is None
+        assert await manager.set('user:1', 'a') is False
+        assert (await manager.get_stats())['shared_errors'] >= 2
+
+    async def test_get_or_load_calls_loader_when_backend_down(self, create_shared_cache_manager, fake_redis_server):
+        """Loader still runs when shared storage is unavailable"""
+        manager = create_shared_cache_manager()
+        fake_redis_server.fail = True
+
+        async def loader():
+            return 'fresh'
+
+        assert await manager.get_or_load('user:1', loader) == 'fresh'
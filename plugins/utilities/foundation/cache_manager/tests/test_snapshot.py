@@ -0,0 +1,120 @@
+"""
+Tests for cache snapshot on shutdown and lazy warm start
+"""
+
+import os
+import time
+
+import pytest
+
+
+@pytest.fixture
+def snapshot_settings(tmp_path):
+    return {
+        'snapshot_enabled': True,
+        'snapshot_path': str(tmp_path / 'cache' / 'snapshot.bin'),
+        'snapshot_patterns': ['user:*', 'tenant:*'],
+        'snapshot_min_ttl': 1,
+    }
+
+
+@pytest.mark.asyncio
+class TestSnapshot:
+    """Snapshot save and restore"""
+
+    async def test_restore_after_restart(self, create_cache_manager, snapshot_settings):
+        """Selected keys survive restart, other namespaces are not saved"""
+        first = create_cache_manager(**snapshot_settings)
+        await first.set('user:1', {'name': 'A'}, ttl=600)
+        await first.set('tenant:1:config', {'id': 1}, ttl=600)
+        await first.set('bot:1', 'not saved', ttl=600)
+        first.shutdown()
+        assert os.path.exists(snapshot_settings['snapshot_path'])
+
+        second = create_cache_manager(**snapshot_settings)
+
+        # Only index is read on startup, file is consumed
+        assert second._cache == {}
+        assert not os.path.exists(snapshot_settings['snapshot_path'])
+        assert await second.get('user:1') == {'name': 'A'}
+        assert await second.get('tenant:1:config') == {'id': 1}
+        assert await second.get('bot:1') is None
+
+        stats = await second.get_stats()
+        assert stats['snapshot']['restored'] == 2
+        assert stats['snapshot']['pending'] == 0
+        second.shutdown()
+
+    async def test_remaining_ttl_preserved(self, create_cache_manager, snapshot_settings):
+        """Restored key keeps remaining TTL, short-lived keys are not saved"""
+        first = create_cache_manager(**snapshot_settings)
+        await first.set('user:1', 'long', ttl=600)
+        await first.set('user:2', 'short', ttl=0.5)
+        first.shutdown()
+
+        second = create_cache_manager(**snapshot_settings)
+        assert await second.get('user:2') is None
+        assert await second.get('user:1') == 'long'
+
+        remaining = second._cache_expires_at['user:1'] - time.monotonic()
+        assert 590 < remaining <= 600
+        second.shutdown()
+
+    async def test_invalidated_keys_not_restored(self, create_cache_manager, snapshot_settings):
+        """Keys changed or invalidated after startup are not taken from snapshot"""
+        first = create_cache_manager(**snapshot_settings)
+        for key in ('user:1', 'user:2', 'tenant:1:meta', 'tenant:2:meta'):
+            await first.set(key, 'old', ttl=600)
+        first.shutdown()
+
+        second = create_cache_manager(**snapshot_settings)
+        assert await second.delete('user:1')
+        await second.set('user:2', 'new')
+        assert await second.invalidate_pattern('tenant:1:*') == 1
+
+        assert await second.get('user:1') is None
+        assert await second.get('user:2') == 'new'
+        assert await second.get('tenant:1:meta') is None
+        assert await second.exists('tenant:2:meta')
+        second.shutdown()
+
+    async def test_pending_entries_carried_over(self, create_cache_manager, snapshot_settings):
+        """Entries not accessed since startup are written again on next shutdown"""
+        first = create_cache_manager(**snapshot_settings)
+        await first.set('user:1', 'a', ttl=600)
+        first.shutdown()
+
+        second = create_cache_manager(**snapshot_settings)
+        second.shutdown()
+
+        third = create_cache_manager(**snapshot_settings)
+        assert await third.get('user:1') == 'a'
+        third.shutdown()
+
+    async def test_get_or_load_uses_snapshot(self, create_cache_manager, snapshot_settings):
+        """get_or_load takes value from snapshot without calling loader"""
+        first = create_cache_manager(**snapshot_settings)
+        await first.set('user:1', 'a', ttl=600)
+        first.shutdown()
+
+        second = create_cache_manager(**snapshot_settings)
+
+        async def loader():
+            raise AssertionError("loader must not be called")
+
+        assert await second.get_or_load('user:1', loader) == 'a'
+        second.shutdown()
+
+    async def test_corrupted_file_ignored(self, create_cache_manager, snapshot_settings):
+        """Invalid snapshot is ignored and removed"""
+        path = snapshot_settings['snapshot_path']
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(b'garbage data')
+
+        manager = create_cache_manager(**snapshot_settings)
+
+        assert await manager.get('user:1') is None
+        assert not os.path.exists(path)
+        manager.shutdown()
+
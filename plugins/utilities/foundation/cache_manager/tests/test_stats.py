@@ -0,0 +1,133 @@
+"""
+Tests for per-namespace cache statistics and metrics export
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.mark.asyncio
+class TestNamespaceStats:
+    """Hit/miss/set/expiration/eviction counters by namespace"""
+
+    async def test_hits_misses_sets(self, cache_manager):
+        """Counters are grouped by first key segment"""
+        await cache_manager.set('user:1', {'name': 'A'})
+        await cache_manager.get('user:1')
+        await cache_manager.get('user:1')
+        await cache_manager.get('user:2')
+        await cache_manager.get('tenant:1:config')
+
+        stats = await cache_manager.get_stats()
+        user = stats['namespace_stats']['user']
+        assert user['sets'] == 1
+        assert user['hits'] == 2
+        assert user['misses'] == 1
+        assert user['hit_ratio'] == pytest.approx(2 / 3, abs=1e-4)
+        assert stats['namespace_stats']['tenant']['misses'] == 1
+        assert stats['hits'] == 2
+        assert stats['misses'] == 2
+
+    async def test_entries_and_memory(self, create_cache_manager):
+        """Entries and approximate memory follow sets and deletes"""
+        cache_manager = create_cache_manager(track_memory_stats=True)
+        await cache_manager.set('user:1', 'x' * 1000)
+        await cache_manager.set('user:2', 'y' * 1000)
+        await cache_manager.set('id:seed', 5)
+
+        stats = (await cache_manager.get_stats())['namespace_stats']
+        assert stats['user']['entries'] == 2
+        assert stats['user']['memory_bytes'] > 2000
+        assert stats['id']['entries'] == 1
+
+        await cache_manager.delete('user:1')
+        await cache_manager.invalidate_pattern('user:*')
+
+        stats = (await cache_manager.get_stats())['namespace_stats']
+        assert stats['user']['entries'] == 0
+        assert stats['user']['memory_bytes'] == 0
+        assert stats['user']['deletes'] == 2
+
+    async def test_expirations_counted(self, cache_manager):
+        """Lazy and background expiry both count as expirations"""
+        await cache_manager.set('user:1', 'a', ttl=0.01)
+        await cache_manager.set('user:2', 'b', ttl=0.01)
+        await asyncio.sleep(0.02)
+
+        assert await cache_manager.get('user:1') is None
+        await cache_manager._clean_expired_cache()
+
+        user = (await cache_manager.get_stats())['namespace_stats']['user']
+        assert user['expirations'] == 2
+        assert user['entries'] == 0
+
+    async def test_evictions_counted(self, create_cache_manager):
+        """Evictions are counted for namespace of evicted key"""
+        manager = create_cache_manager(max_entries=2)
+        await manager.set('user:1', 1)
+        await manager.set('user:2', 2)
+        await manager.set('tenant:1:config', 3)
+
+        stats = (await manager.get_stats())['namespace_stats']
+        assert stats['user']['evictions'] == 1
+        assert stats['tenant']['entries'] == 1
+
+    async def test_namespace_depth(self, create_cache_manager):
+        """Depth 2 splits tenants, last segment never forms namespace"""
+        manager = create_cache_manager(stats_namespace_depth=2)
+        await manager.set('tenant:1:config', 1)
+        await manager.set('tenant:2:config', 2)
+        await manager.set('user:5', 3)
+
+        stats = (await manager.get_stats())['namespace_stats']
+        assert set(stats) == {'tenant:1', 'tenant:2', 'user'}
+
+    async def test_get_or_load_counts_loads_as_misses(self, cache_manager):
+        """Loader call is a miss, cached result is a hit"""
+        async def loader():
+            return 'v'
+
+        await cache_manager.get_or_load('user:1', loader)
+        await cache_manager.get_or_load('user:1', loader)
+
+        user = (await cache_manager.get_stats())['namespace_stats']['user']
+        assert user['misses'] == 1
+        assert user['hits'] == 1
+
+    async def test_memory_stats_disabled(self, create_cache_manager):
+        """Without memory limits memory is not tracked by default (no size estimate on set)"""
+        manager = create_cache_manager()
+        await manager.set('user:1', 'a')
+
+        stats = await manager.get_stats()
+        assert stats['namespace_stats']['user']['memory_bytes'] is None
+        assert 'cache_memory_bytes' not in await manager.get_metrics()
+        assert manager._sizes == {}
+
+    async def test_memory_quota_enables_tracking(self, create_cache_manager):
+        """Memory quota needs sizes even when statistics are off"""
+        manager = create_cache_manager(namespace_quotas={'user': {'max_memory_mb': 1}})
+        await manager.set('user:1', 'x' * 1000)
+
+        stats = await manager.get_stats()
+        assert stats['namespace_stats']['user']['memory_bytes'] > 1000
+
+
+@pytest.mark.asyncio
+class TestMetricsExport:
+    """Prometheus text export"""
+
+    async def test_metrics_format(self, cache_manager):
+        """Counters and gauges are labeled by namespace"""
+        await cache_manager.set('user:1', 'a')
+        await cache_manager.get('user:1')
+
+        metrics = await cache_manager.get_metrics()
+
+        assert '# TYPE cache_hits_total counter' in metrics
+        assert 'cache_hits_total{namespace="user"} 1' in metrics
+        assert 'cache_sets_total{namespace="user"} 1' in metrics
+        assert 'cache_entries{namespace="user"} 1' in metrics
+        assert 'cache_shared_errors_total 0' in metrics
+        assert metrics.endswith('\n')
@@ -175,3 +175,39 @@ class TestTTL:
         assert key not in cache_manager._cache
         assert key not in cache_manager._cache_expires_at
 
+    
+    async def test_background_cleanup_removes_only_expired(self, cache_manager):
+        """Test that periodic cleanup removes expired keys without access"""
+        for i in range(25):
+            await cache_manager.set(f"short:{i}", i, ttl=0.01)
+        await cache_manager.set("long:1", 1)
+        
+        await asyncio.sleep(0.02)
+        await cache_manager._clean_expired_cache()
+        
+        # Expired keys removed in batches (batch size 10), live key untouched
+        assert "short:0" not in cache_manager._cache
+        assert len(cache_manager._cache) == 1
+        assert await cache_manager.get("long:1") == 1
+    
+    async def test_background_cleanup_respects_overwritten_ttl(self, cache_manager):
+        """Test that stale heap entry doesn't expire key re-set with longer TTL"""
+        key = "test:reset"
+        await cache_manager.set(key, "old", ttl=0.01)
+        await cache_manager.set(key, "new", ttl=3600)
+        
+        await asyncio.sleep(0.02)
+        await cache_manager._clean_expired_cache()
+        
+        assert await cache_manager.get(key) == "new"
+    
+    async def test_expiry_heap_compaction(self, cache_manager):
+        """Test that heap is rebuilt when stale entries dominate"""
+        key = "test:overwrite"
+        for i in range(3000):
+            await cache_manager.set(key, i)
+        
+        await cache_manager._clean_expired_cache()
+        
+        assert len(cache_manager._expiry_heap) == 1
+        assert await cache_manager.get(key) == 2999
@@ -25,6 +25,7 @@ class MessageAction:
             reply = data.get('reply')
             message_edit = data.get('message_edit')
             message_reply = data.get('message_reply')
+            message_edit_only = data.get('message_edit_only', False)
             message_id = data.get('message_id')
             parse_mode = data.get('parse_mode', 'HTML')
             attachment = data.get('attachment')
@@ -119,10 +120,16 @@ class MessageAction:
                                 # Save message ID of first chat
                                 last_message_id = target_message_id
                                 continue  # Successfully edited, move to next chat
+                            edit_error = result.get('error', 'Unknown error')
                             # If editing failed - fallback to sending new message
-                        except Exception:
+                        except Exception as e:
                             # If editing error - fallback to sending new message
-                            pass
+                            edit_error = str(e)
+                        
+                        # Edit only (e.g. streamed text): failed edit is error, new message is not sent
+                        if message_edit_only:
+                            errors.append(f"Error editing message {target_message_id} in chat {current_chat_id}: {edit_error}")
+                            continue
                     
                     # Send new message (either because not editing, or not first chat, or fallback on error)
                     if attachment:
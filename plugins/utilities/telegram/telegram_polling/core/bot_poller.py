@@ -3,7 +3,8 @@ BotPoller - individual polling for one bot
 """
 
 import asyncio
-from typing import Callable, Optional
+import time
+from typing import Any, Callable, Dict, Optional
 
 import aiohttp
 
@@ -44,6 +45,12 @@ class BotPoller:
         
         # Polling start time for event filtering
         self.polling_start_time = None
+        self.polling_start_timestamp = None
+        
+        # Stale backlog filter (same semantics as event_processor time filter)
+        self.skip_stale_updates = settings.get('skip_stale_updates', False)
+        self.startup_time_offset = settings.get('startup_time_offset', 0)
+        self.skipped_stale_updates = 0
         
         # Callback for events
         self.event_callback: Optional[Callable] = None
@@ -114,6 +121,8 @@ class BotPoller:
             
             # Set polling start time
             self.polling_start_time = await self.datetime_formatter.now_local()
+            self.polling_start_timestamp = time.time()
+            self.skipped_stale_updates = 0
             
             # Reset critical errors counter on startup
             self.consecutive_critical_errors = 0
@@ -288,16 +297,25 @@ class BotPoller:
                 updates = await self._get_updates()
                 
                 # Process each update
+                skipped_in_batch = 0
                 for update in updates:
                     self.offset = update['update_id'] + 1
                     
-                    # Add system data with polling start time
+                    # Stale backlog is dropped before parsing, only offset is advanced
+                    event_timestamp = self.get_update_timestamp(update)
+                    if self._is_stale_update(event_timestamp):
+                        skipped_in_batch += 1
+                        continue
+                    
+                    # Add system data with polling start time and raw event time (for event_processor time filter)
                     if 'system' not in update:
                         update['system'] = {}
                     
                     update['system'].update({
                         'bot_id': self.bot_id,
-                        'polling_start_time': self.polling_start_time
+                        'polling_start_time': self.polling_start_time,
+                        'polling_start_timestamp': self.polling_start_timestamp,
+                        'event_timestamp': event_timestamp
                     })
                     
                     # Pass event to callback
@@ -311,6 +329,14 @@ class BotPoller:
                             self.logger.error(f"[Bot-{self.bot_id}] Error processing event: {e}")
                             # Continue processing other events
                 
+                if skipped_in_batch:
+                    self.skipped_stale_updates += skipped_in_batch
+                    self.logger.info(f"[Bot-{self.bot_id}] Skipped {skipped_in_batch} stale updates from backlog (total: {self.skipped_stale_updates})")
+                    
+                    # Whole batch was backlog - request next one immediately to drain it faster
+                    if skipped_in_batch == len(updates):
+                        continue
+                
                 # Delay between requests (standard for Telegram Bot API)
                 if self.is_running:
                     try:
@@ -357,6 +383,35 @@ class BotPoller:
                 if self.is_running:
                     await asyncio.sleep(self.retry_delay)
     
+    @staticmethod
+    def get_update_timestamp(update: Dict[str, Any]) -> Optional[int]:
+        """
+        Get raw event time (epoch seconds) from update without parsing
+        Passed to event_processor in system.event_timestamp
+        """
+        for update_type in ('message', 'edited_message', 'channel_post', 'edited_channel_post'):
+            message = update.get(update_type)
+            if message:
+                return message.get('edit_date') or message.get('date')
+        
+        for update_type in ('chat_member', 'my_chat_member', 'chat_join_request'):
+            payload = update.get(update_type)
+            if payload:
+                return payload.get('date')
+        
+        # callback_query, pre_checkout_query etc. have no own date
+        return None
+    
+    def _is_stale_update(self, event_timestamp: Optional[int]) -> bool:
+        """Check whether update was created before polling start (considering startup_time_offset)"""
+        if not self.skip_stale_updates or self.polling_start_timestamp is None:
+            return False
+        
+        if not event_timestamp:
+            return False
+        
+        return (self.polling_start_timestamp - event_timestamp) > self.startup_time_offset
+    
     async def _get_updates(self):
         """Get updates via Telegram API with filtering"""
         try:
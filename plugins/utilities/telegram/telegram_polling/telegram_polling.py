@@ -24,6 +24,14 @@ class TelegramPollingUtility:
         # Get settings
         self.settings = self.settings_manager.get_plugin_settings('telegram_polling')
         
+        # Stale backlog filter uses the same time filter settings as event_processor
+        event_processor_settings = self.settings_manager.get_plugin_settings('event_processor')
+        self.settings['skip_stale_updates'] = (
+            self.settings.get('skip_stale_updates', True)
+            and event_processor_settings.get('enable_time_comparison', False)
+        )
+        self.settings['startup_time_offset'] = event_processor_settings.get('startup_time_offset', 0)
+        
         # Create polling manager
         self.polling_manager = PollingManager(
             self.settings, 
@@ -103,6 +111,17 @@ class TelegramPollingUtility:
             self.logger.error(f"Error checking polling activity: {e}")
             return False
     
+    def get_skipped_updates_stats(self) -> Dict[int, int]:
+        """Get number of stale backlog updates skipped per bot"""
+        try:
+            return {
+                bot_id: poller.skipped_stale_updates
+                for bot_id, poller in self.polling_manager.active_pollers.items()
+            }
+        except Exception as e:
+            self.logger.error(f"Error getting skipped updates stats: {e}")
+            return {}
+    
     async def stop_all_polling(self) -> bool:
         """Stop polling for all bots"""
         try:
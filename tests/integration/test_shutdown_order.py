@@ -147,3 +147,34 @@ async def test_shutdown_plugins_stop_internal_tasks():
     assert shutdown_calls.get('cache_manager'), \
         "cache_manager.shutdown() should be called"
 
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_async_shutdown_runs_on_application_loop(settings_manager):
+    """
+    Verify that plugin async_shutdown is awaited on application event loop after plugin shutdown
+    (shutdown itself runs in worker thread, loop-bound connections must be closed on their loop)
+    """
+    calls = []
+    app_loop = asyncio.get_running_loop()
+    
+    class LoopBoundPlugin:
+        def shutdown(self):
+            calls.append('shutdown')
+        
+        async def async_shutdown(self):
+            calls.append(('async_shutdown', asyncio.get_running_loop() is app_loop))
+    
+    di_container = DIContainer(logger=MagicMock(), plugins_manager=MagicMock(), settings_manager=settings_manager)
+    di_container._utilities['loop_bound'] = LoopBoundPlugin()
+    
+    app = Application()
+    app.settings_manager = settings_manager
+    app.di_container = di_container
+    app.is_running = True
+    app._background_tasks = []
+    
+    await app._async_shutdown()
+    
+    assert calls == ['shutdown', ('async_shutdown', True)]
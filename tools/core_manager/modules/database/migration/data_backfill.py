@@ -0,0 +1,76 @@
+"""
+Модуль для заполнения данных новых колонок после миграции схемы
+value_hash в user_storage для строк, записанных до появления колонки
+"""
+
+import importlib
+from typing import Any, Dict
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+
+class _DefaultPluginSettings:
+    """settings_manager для DataConverter вне DI: настройки плагина по умолчанию"""
+
+    def get_plugin_settings(self, plugin_name: str) -> Dict[str, Any]:
+        return {}
+
+
+class DataBackfill:
+    """Класс для заполнения вычисляемых колонок существующих строк"""
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, engine, logger, formatter, translator):
+        self.engine = engine
+        self.logger = logger
+        self.formatter = formatter
+        self.translator = translator
+
+    def backfill_user_storage_hashes(self, table_class: Any) -> int:
+        """
+        Заполняет value_hash строк user_storage без хеша (поиск пользователей по значению идет только по индексу)
+        Хеш считается тем же кодом, что и при записи в репозитории, батчами по первичному ключу
+        Возвращает количество обновленных строк
+        """
+        # plugins.utilities.core.database_manager.models: data_converter - соседний плагин database_manager
+        package = table_class.__module__.rpartition('.')[0]
+        plugins_package = package.rpartition('.')[0]
+        user_storage = importlib.import_module(f"{package}.repositories.user_storage")
+        data_converter_module = importlib.import_module(
+            f"{plugins_package}.data_converter.data_converter" if plugins_package else "data_converter.data_converter"
+        )
+        data_converter = data_converter_module.DataConverter(
+            logger=self.logger,
+            settings_manager=_DefaultPluginSettings(),
+            datetime_formatter=None
+        )
+
+        updated = 0
+        with Session(self.engine) as session:
+            while True:
+                rows = session.execute(
+                    select(table_class.tenant_id, table_class.user_id, table_class.key, table_class.value)
+                    .where(table_class.value_hash.is_(None))
+                    .limit(self.BATCH_SIZE)
+                ).all()
+                if not rows:
+                    break
+
+                # Bulk UPDATE by primary key
+                session.execute(update(table_class), [
+                    {
+                        'tenant_id': row.tenant_id,
+                        'user_id': row.user_id,
+                        'key': row.key,
+                        'value_hash': user_storage.storage_value_hash(data_converter.decode_stored_value(row.value))
+                    }
+                    for row in rows
+                ])
+                session.commit()
+                updated += len(rows)
+
+        if updated:
+            self.formatter.print_success(self.translator.get("database.value_hashes_backfilled", count=updated))
+        return updated
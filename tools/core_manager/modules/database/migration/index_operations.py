@@ -3,7 +3,8 @@
 Пересоздание индексов, удаление старых индексов и constraints
 """
 
-from typing import Any
+import importlib
+from typing import Any, Optional
 
 from sqlalchemy import inspect, text
 from sqlalchemy.exc import OperationalError
@@ -12,12 +13,14 @@ from sqlalchemy.exc import OperationalError
 class IndexOperations:
     """Класс для операций с индексами"""
     
-    def __init__(self, engine, db_type: str, logger, formatter, translator):
+    def __init__(self, engine, db_type: str, logger, formatter, translator, vector_search_config: Optional[dict] = None):
         self.engine = engine
         self.db_type = db_type
         self.logger = logger
         self.formatter = formatter
         self.translator = translator
+        # database.postgresql.vector_search: точность HNSW индекса vector_storage (index_precision, index_m, index_ef_construction)
+        self.vector_search_config = vector_search_config or {}
 
     def recreate_indexes(self, table_class: Any) -> bool:
         """Пересоздает индексы для таблицы"""
@@ -85,6 +88,10 @@ class IndexOperations:
                 except Exception as e:
                     self.formatter.print_error(self.translator.get("database.error_create_index", name=idx.name, error=str(e)))
             
+            # HNSW индекс vector_storage не объявлен в модели: его точность задаётся настройкой
+            if table.name == 'vector_storage':
+                self.create_embedding_index(table_class)
+            
             self.formatter.print_success(self.translator.get("database.indexes_recreated", table_name=table.name))
             return True
             
@@ -92,6 +99,30 @@ class IndexOperations:
             self.formatter.print_error(self.translator.get("database.error_recreate_indexes", name=table_class.__table__.name, error=str(e)))
             raise
     
+    def create_embedding_index(self, table_class: Any) -> bool:
+        """Создает HNSW индекс vector_storage выбранной точности (vector, halfvec, binary) - только PostgreSQL"""
+        if self.db_type != 'postgresql':
+            return True
+        
+        # SQL индекса берём из модуля моделей (единый источник с database_manager)
+        models_module = importlib.import_module(table_class.__module__)
+        precision = self.vector_search_config.get('index_precision', 'vector')
+        name = models_module.EMBEDDING_INDEX_NAMES[precision]
+        self.formatter.print_info(self.translator.get("database.create_index", name=name))
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text(models_module.embedding_index_sql(
+                    precision,
+                    self.vector_search_config.get('index_m', 16),
+                    self.vector_search_config.get('index_ef_construction', 64)
+                )))
+                conn.commit()
+            self.formatter.print_success(self.translator.get("database.index_created", name=name))
+            return True
+        except Exception as e:
+            self.formatter.print_error(self.translator.get("database.error_create_index", name=name, error=str(e)))
+            return False
+    
     def restore_foreign_keys_in_dependent_tables(self, parent_table_name: str, table_class_map: dict) -> bool:
         """Восстанавливает FK constraints в зависимых таблицах после пересоздания родительской таблицы"""
         try:
@@ -6,6 +6,7 @@ from typing import Optional
 from sqlalchemy import inspect
 
 from ..connection.database_connection import DatabaseConnection
+from .data_backfill import DataBackfill
 from .index_operations import IndexOperations
 from .json_validator import JSONValidator
 from .metadata import TableMetadataCache
@@ -45,7 +46,8 @@ class UniversalMigration:
             db_type,
             logger,
             formatter,
-            translator
+            translator,
+            vector_search_config=db_connection.db_config.get_config().get('vector_search')
         )
 
         self.json_validator = JSONValidator(
@@ -65,6 +67,13 @@ class UniversalMigration:
             translator
         )
 
+        self.data_backfill = DataBackfill(
+            db_connection.engine,
+            logger,
+            formatter,
+            translator
+        )
+
         self._db_type = db_type
 
     def migrate_database(self, target_table: Optional[str] = None, backup_path: Optional[str] = None) -> bool:
@@ -108,6 +117,8 @@ class UniversalMigration:
                     try:
                         if not self.table_ops.create_table(table_class):
                             raise Exception(f"Failed to create table {table_name}")
+                        if table_name == 'vector_storage':
+                            self.index_ops.create_embedding_index(table_class)
                         self.formatter.print_success(self.translator.get("database.indexes_created_auto", table_name=table_name))
                         continue
                     except Exception as e:
@@ -145,6 +156,14 @@ class UniversalMigration:
                             col_type = col_info.get('type') if isinstance(col_info, dict) else col_info
                             nullable = col_info.get('nullable', True) if isinstance(col_info, dict) else True
 
+                            # Generated column: database computes values for existing rows itself
+                            computed = table_class.__table__.columns[col].computed
+                            if computed is not None:
+                                stored = " STORED" if computed.persisted else ""
+                                conn.execute(text(f'ALTER TABLE {table_name} ADD COLUMN {col} {col_type} GENERATED ALWAYS AS ({computed.sqltext}){stored}'))
+                                conn.commit()
+                                continue
+
                             column_obj = getattr(table_class, col, None)
                             has_default = False
                             default_value = None
@@ -279,6 +298,13 @@ class UniversalMigration:
                 self.formatter.print_info(self.translator.get("database.recreating_indexes", table_name=table_name))
                 self.index_ops.recreate_indexes(table_class)
 
+            if 'user_storage' in tables_to_migrate:
+                self.formatter.print_info(self.translator.get("database.backfilling_value_hashes"))
+                try:
+                    self.data_backfill.backfill_user_storage_hashes(tables_to_migrate['user_storage'])
+                except Exception as e:
+                    self.formatter.print_warning(self.translator.get("database.value_hashes_backfill_failed", error=str(e)))
+
             self.formatter.print_info(self.translator.get("database.cleaning_temp_tables"))
             self.cleanup_temp_tables()
 
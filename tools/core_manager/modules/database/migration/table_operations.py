@@ -94,7 +94,12 @@ class TableOperations:
             autoincrement_fields = self.metadata_cache.get_autoincrement_fields_cached(table.name)
             autoincrement_columns = [field['column_name'] for field in autoincrement_fields]
             old_column_names = [col['name'] for col in old_columns]
-            common_columns = [c for c in new_columns if c in old_column_names and c not in autoincrement_columns]
+            # Генерируемые колонки (GENERATED ALWAYS) вычисляются БД в новой таблице
+            computed_columns = {col.name for col in table.columns if col.computed is not None}
+            common_columns = [
+                c for c in new_columns
+                if c in old_column_names and c not in autoincrement_columns and c not in computed_columns
+            ]
             
             select_cols = ', '.join(common_columns)
             insert_cols = ', '.join(common_columns)